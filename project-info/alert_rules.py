@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Alert Rules
+Declarative rules from config.json over dashboard signals, re-evaluated only where inputs changed
+"""
+
+import base64
+import hashlib
+import http.client
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+STATE_FILE = CACHE_DIR / 'alerts-state.json'
+CONFIG_FILE = Path(__file__).parent / 'config.json'
+MIGRATIONS_DIR = PROJECT_ROOT / 'supabase' / 'migrations'
+
+SEVERITIES = ['info', 'warning', 'critical']
+
+DEFAULT_COOLDOWN = 3600
+DEFAULT_MAX_PER_RUN = 10
+WEBHOOK_TIMEOUT = 3
+
+# Network signals are only re-collected this often, however often rules are evaluated
+PROBE_INTERVAL = 60
+
+DEFAULT_SINKS = [{'type': 'file', 'path': '.cache/alerts.jsonl'}]
+
+DEFAULT_RULES = [
+    {'name': 'supabase-down', 'signal': 'projects', 'when': {'probe': {'in': ['down', 'error']}},
+     'severity': 'critical', 'message': '{subject}: Supabase is {probe} ({error})'},
+    {'name': 'migrations-behind', 'signal': 'projects', 'when': {'migrations_behind': {'>': 0}},
+     'severity': 'warning', 'message': '{subject} is {migrations_behind} migrations behind'},
+    {'name': 'function-deploys-failing', 'signal': 'functions',
+     'when': {'error_rate': {'>=': 0.2}, 'deploys': {'>=': 3}},
+     'severity': 'warning', 'message': '{subject}: {failures} of the last {deploys} deploys failed'},
+    {'name': 'user-near-limit', 'signal': 'usage', 'when': {'max_pct': {'>=': 0.9}},
+     'severity': 'info', 'message': 'User {subject} ({tier}) has used {max_pct:.0%} of their {max_action} limit'},
+    {'name': 'secret-exposed', 'signal': 'secrets', 'when': {},
+     'severity': 'critical', 'message': '{key} is exposed to the browser via {location}'},
+    {'name': 'migration-lint', 'signal': 'migrations', 'when': {'check': {'in': ['rls_disabled', 'destructive']}},
+     'severity': 'warning', 'message': '{migration}: {detail}'}
+]
+
+OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '>': lambda a, b: a is not None and a > b,
+    '>=': lambda a, b: a is not None and a >= b,
+    '<': lambda a, b: a is not None and a < b,
+    '<=': lambda a, b: a is not None and a <= b,
+    'in': lambda a, b: a in b,
+    'not in': lambda a, b: a not in b
+}
+
+class RuleError(Exception):
+    """A rule or sink in config.json is malformed"""
+
+# ===== Signals =====
+# Each signal has a cheap fingerprint (file mtimes, time buckets) and a collector returning
+# {subject: {field: value}}. Collectors only run when the fingerprint moved.
+
+def mtime(path):
+    """Modification time, or None when the path is missing"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def tree_mtimes(directory, pattern='*'):
+    """Sorted (name, mtime) of the files under a directory"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted((str(p.relative_to(directory)), mtime(p)) for p in directory.rglob(pattern) if p.is_file())
+
+def projects_fingerprint():
+    """Registered projects change with config.json; probes are redone every PROBE_INTERVAL"""
+    return [mtime(CONFIG_FILE), int(time.time() // PROBE_INTERVAL)]
+
+def collect_projects():
+    """Probe status and drift of every registered project"""
+    from project_registry import compare_projects
+
+    report = compare_projects()
+    return {p['name']: {
+        'probe': p['probe']['status'],
+        'probe_ms': p['probe']['ms'],
+        'error': p['probe']['error'],
+        'exists': p['exists'],
+        'env_file': p['env_file'],
+        'missing_keys': len(p['missing_keys']),
+        'migrations_behind': len(p['missing_migrations']),
+        'functions_missing': len(p['missing_functions'])
+    } for p in report['projects']}
+
+def functions_fingerprint():
+    """Deploy history is append-only"""
+    from deploy_runner import HISTORY_FILE
+    return [mtime(HISTORY_FILE)]
+
+def collect_functions():
+    """Deploy failure rate per edge function over the recorded history"""
+    from deploy_runner import deploy_history
+
+    return {step['function']: {
+        'deploys': step['deploys'],
+        'failures': step['failures'],
+        'error_rate': round(step['failures'] / step['deploys'], 4),
+        'median': step['median']
+    } for step in deploy_history()['steps']}
+
+def usage_fingerprint():
+    """The table mirror is the only source of per-user usage"""
+    from table_mirror import MIRROR_DB
+    return [mtime(MIRROR_DB), mtime(MIGRATIONS_DIR)]
+
+def collect_usage():
+    """Current-period usage against the subscriber's tier limits, per user"""
+    from local_supabase import USAGE_COLUMNS, Database, parse_timestamp
+    from table_mirror import MIRROR_DB, Mirror
+
+    if not MIRROR_DB.exists():
+        return {}
+    tiers = {row['id']: row for row in Database.from_migrations().table('subscription_tiers').rows.values()}
+    mirror = Mirror(MIRROR_DB)
+    try:
+        tables = {row['table'] for row in mirror.query('SELECT table_name AS "table" FROM _sync_state')}
+        if not {'usage_limits', 'subscriptions'} <= tables:
+            return {}
+        subscribed = {row['user_id']: row['tier_id'] for row in mirror.query(
+            "SELECT user_id, tier_id FROM subscriptions WHERE status = 'active'")}
+        rows = mirror.query('SELECT * FROM usage_limits')
+    finally:
+        mirror.close()
+
+    now = datetime.now(timezone.utc)
+    facts = {}
+    for row in rows:
+        if not (row['period_start'] and row['period_end']
+                and parse_timestamp(row['period_start']) <= now <= parse_timestamp(row['period_end'])):
+            continue
+        tier = subscribed.get(row['user_id'], 'free')
+        limits = tiers.get(tier, {})
+        fact = {'tier': tier, 'max_pct': 0.0, 'max_action': None}
+        for action, (limit_column, used_column) in USAGE_COLUMNS.items():
+            used, limit = row.get(used_column) or 0, limits.get(limit_column)
+            fact[f"{action}_used"] = used
+            # -1 is unlimited
+            if limit and limit > 0:
+                pct = round(used / limit, 4)
+                fact[f"{action}_pct"] = pct
+                if pct > fact['max_pct']:
+                    fact['max_pct'], fact['max_action'] = pct, action
+        facts[row['user_id']] = fact
+    return facts
+
+# Secrets that must never reach the browser, by value shape
+SECRET_PATTERNS = [
+    ('Stripe secret key', re.compile(r'\b[sr]k_(?:live|test)_[0-9A-Za-z]{10,}')),
+    ('Stripe webhook secret', re.compile(r'\bwhsec_[0-9A-Za-z]{10,}'))
+]
+SECRET_KEYS = ['SUPABASE_SERVICE_ROLE_KEY', 'STRIPE_SECRET_KEY', 'STRIPE_WEBHOOK_SECRET']
+BUNDLE_SUFFIXES = ('.js', '.mjs', '.html', '.map', '.css', '.json')
+
+def env_files():
+    """The env files Vite reads"""
+    return [PROJECT_ROOT / name for name in ('.env', '.env.local', '.env.production', '.env.production.local')]
+
+def dist_dirs():
+    """Build output of every app"""
+    from bundle_analyzer import APPS
+    return [(PROJECT_ROOT if app == 'gembooth' else PROJECT_ROOT / app) / 'dist' for app in APPS]
+
+def secrets_fingerprint():
+    """Env files and every built file"""
+    return [[mtime(p) for p in env_files()], [tree_mtimes(d) for d in dist_dirs()]]
+
+def is_service_role(value):
+    """A Supabase JWT whose payload carries the service_role claim"""
+    parts = value.split('.')
+    if len(parts) != 3:
+        return False
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=' * (-len(parts[1]) % 4)))
+    except (ValueError, TypeError):
+        return False
+    return isinstance(payload, dict) and payload.get('role') == 'service_role'
+
+def secret_kind(value):
+    """What kind of secret a value is, or None"""
+    for kind, pattern in SECRET_PATTERNS:
+        if pattern.fullmatch(value):
+            return kind
+    return 'Supabase service role key' if is_service_role(value) else None
+
+def collect_secrets():
+    """Secrets under a VITE_ prefix (inlined into the bundle) and secret values found in dist/"""
+    from gembooth_dashboard import read_env_file
+
+    facts = {}
+    secrets = {}
+    for path in env_files():
+        for key, value in read_env_file(path).items():
+            kind = secret_kind(value)
+            if key in SECRET_KEYS or kind:
+                secrets.setdefault(value, key)
+            if key.startswith('VITE_') and kind:
+                facts[f"{path.name}:{key}"] = {'key': key, 'kind': kind, 'location': f"the VITE_ prefix in {path.name}"}
+
+    needles = [(value.encode(), key) for value, key in secrets.items() if len(value) >= 16]
+    for dist in dist_dirs():
+        if not dist.is_dir():
+            continue
+        for path in dist.rglob('*'):
+            if not (path.is_file() and path.suffix in BUNDLE_SUFFIXES):
+                continue
+            data = path.read_bytes()
+            location = str(path.relative_to(PROJECT_ROOT))
+            for needle, key in needles:
+                if needle in data:
+                    facts[f"{location}:{key}"] = {'key': key, 'kind': 'env value', 'location': location}
+            text = data.decode('utf-8', 'ignore')
+            for kind, pattern in SECRET_PATTERNS:
+                if pattern.search(text):
+                    facts.setdefault(f"{location}:{kind}", {'key': kind, 'kind': kind, 'location': location})
+    return facts
+
+def migrations_fingerprint():
+    """Migration files"""
+    return tree_mtimes(MIGRATIONS_DIR, '*.sql')
+
+def collect_migrations():
+    """Lint findings: tables without row level security, RLS without policies, destructive statements"""
+    from local_supabase import sql_statements, table_name
+
+    created, secured, policies, facts = {}, set(), set(), {}
+    for path in sorted(MIGRATIONS_DIR.glob('*.sql')):
+        for statement in sql_statements(path.read_text(encoding='utf-8')):
+            flat = ' '.join(statement.split())
+            match = re.match(r'CREATE TABLE (?:IF NOT EXISTS )?([\w."]+)', flat, re.IGNORECASE)
+            if match:
+                created.setdefault(table_name(match.group(1)), path.name)
+            match = re.match(r'ALTER TABLE (?:ONLY )?([\w."]+) ENABLE ROW LEVEL SECURITY', flat, re.IGNORECASE)
+            if match:
+                secured.add(table_name(match.group(1)))
+            match = re.match(r'CREATE POLICY (?:"[^"]*"|\w+) ON ([\w."]+)', flat, re.IGNORECASE)
+            if match:
+                policies.add(table_name(match.group(1)))
+            match = re.match(r'(DROP TABLE|TRUNCATE|ALTER TABLE [\w."]+ DROP COLUMN)\b', flat, re.IGNORECASE)
+            if match:
+                facts[f"destructive:{path.name}:{flat[:60]}"] = {
+                    'check': 'destructive', 'table': None, 'migration': path.name, 'detail': flat[:120]}
+
+    for table, migration in created.items():
+        if '.' in table:
+            continue
+        if table not in secured:
+            facts[f"rls_disabled:{table}"] = {'check': 'rls_disabled', 'table': table, 'migration': migration,
+                                             'detail': f"{table} has no row level security"}
+        elif table not in policies:
+            facts[f"no_policies:{table}"] = {'check': 'no_policies', 'table': table, 'migration': migration,
+                                            'detail': f"{table} enables row level security but has no policies"}
+    return facts
+
+SIGNALS = {
+    'projects': (projects_fingerprint, collect_projects),
+    'functions': (functions_fingerprint, collect_functions),
+    'usage': (usage_fingerprint, collect_usage),
+    'secrets': (secrets_fingerprint, collect_secrets),
+    'migrations': (migrations_fingerprint, collect_migrations)
+}
+
+# ===== Rules =====
+
+def digest(value):
+    """Short stable hash of a JSON-able value"""
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode(), digest_size=8).hexdigest()
+
+def compile_rule(rule):
+    """Validate a rule and turn its conditions into (field, test, operand) triples"""
+    for field in ('name', 'signal'):
+        if not rule.get(field):
+            raise RuleError(f"Rule without a {field}: {rule}")
+    if rule['signal'] not in SIGNALS:
+        raise RuleError(f"Rule {rule['name']}: unknown signal {rule['signal']!r} (one of {', '.join(SIGNALS)})")
+    if rule.get('severity', 'warning') not in SEVERITIES:
+        raise RuleError(f"Rule {rule['name']}: severity must be one of {', '.join(SEVERITIES)}")
+
+    conditions = []
+    for field, condition in (rule.get('when') or {}).items():
+        if not isinstance(condition, dict):
+            condition = {'==': condition}
+        for op, operand in condition.items():
+            if op not in OPERATORS:
+                raise RuleError(f"Rule {rule['name']}: unknown operator {op!r} on {field}")
+            conditions.append((field, OPERATORS[op], operand))
+    return {
+        'name': rule['name'],
+        'signal': rule['signal'],
+        'severity': rule.get('severity', 'warning'),
+        'message': rule.get('message', '{subject} matched ' + rule['name']),
+        'cooldown': rule.get('cooldown', DEFAULT_COOLDOWN),
+        'conditions': conditions,
+        'hash': digest(rule)
+    }
+
+def matches(rule, fact):
+    """Every condition holds (a missing field never matches)"""
+    try:
+        return all(field in fact and test(fact[field], operand) for field, test, operand in rule['conditions'])
+    except TypeError:
+        return False
+
+def render(rule, subject, fact):
+    """The rule's message with the fact's fields filled in"""
+    try:
+        return rule['message'].format(subject=subject, **fact)
+    except (KeyError, ValueError, TypeError, IndexError):
+        return f"{subject} matched {rule['name']}"
+
+def load_config(config_file=CONFIG_FILE):
+    """Rules and sinks from config.json's "alerts" block, or the defaults"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            alerts = json.load(f).get('alerts') or {}
+    except (OSError, ValueError):
+        alerts = {}
+    return {
+        'rules': alerts.get('rules') or DEFAULT_RULES,
+        'sinks': alerts.get('sinks') or DEFAULT_SINKS,
+        'max_per_run': alerts.get('max_per_run', DEFAULT_MAX_PER_RUN)
+    }
+
+# ===== Sinks =====
+
+def at_least(notification, sink):
+    """The notification is as severe as the sink asks for"""
+    return SEVERITIES.index(notification['severity']) >= SEVERITIES.index(sink.get('min_severity', 'info'))
+
+def deliver_file(sink, notifications):
+    """Append JSON lines"""
+    path = Path(sink.get('path', '.cache/alerts.jsonl'))
+    path = path if path.is_absolute() else Path(__file__).parent / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for notification in notifications:
+            f.write(json.dumps(notification) + '\n')
+
+def deliver_desktop(sink, notifications):
+    """notify-send on Linux, osascript on macOS; nothing elsewhere"""
+    for notification in notifications:
+        title = f"GemBooth {notification['severity']}" + (' resolved' if notification['status'] == 'resolved' else '')
+        if shutil.which('notify-send'):
+            urgency = 'critical' if notification['severity'] == 'critical' else 'normal'
+            command = ['notify-send', '-u', urgency, title, notification['message']]
+        elif shutil.which('osascript'):
+            command = ['osascript', '-e',
+                       f"display notification {json.dumps(notification['message'])} with title {json.dumps(title)}"]
+        else:
+            return
+        subprocess.run(command, timeout=WEBHOOK_TIMEOUT, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def deliver_webhook(sink, notifications):
+    """POST the batch as JSON"""
+    parts = urlsplit(sink['url'])
+    factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    conn = factory(parts.netloc, timeout=sink.get('timeout', WEBHOOK_TIMEOUT))
+    try:
+        conn.request('POST', parts.path or '/', body=json.dumps({'alerts': notifications}),
+                     headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+    finally:
+        conn.close()
+
+SINKS = {
+    'file': deliver_file,
+    'desktop': deliver_desktop,
+    'webhook': deliver_webhook
+}
+
+# ===== Engine =====
+
+class AlertEngine:
+    """Evaluates rules against signals, keeping fired alerts and per-subject digests between runs"""
+
+    def __init__(self, config=None, state_file=STATE_FILE):
+        config = config or load_config()
+        self.rules = [compile_rule(rule) for rule in config['rules']]
+        names = [rule['name'] for rule in self.rules]
+        duplicated = {name for name in names if names.count(name) > 1}
+        if duplicated:
+            raise RuleError(f"Duplicate rule names: {', '.join(sorted(duplicated))}")
+        for sink in config['sinks']:
+            if sink.get('type') not in SINKS:
+                raise RuleError(f"Unknown sink type {sink.get('type')!r} (one of {', '.join(SINKS)})")
+        self.sinks = config['sinks']
+        self.max_per_run = config['max_per_run']
+        self.state_file = state_file
+        self.lock = threading.Lock()
+
+        self.by_signal = {}
+        for rule in self.rules:
+            self.by_signal.setdefault(rule['signal'], []).append(rule)
+
+    def load_state(self):
+        """Fingerprints, fact digests and alerts from the last run"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'signals': {}, 'rules': {}, 'active': {}, 'last_sent': {}}
+
+    def save_state(self, state):
+        """Persist state atomically"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_file)
+
+    def evaluate(self, deliver=True, force=False):
+        """One pass: collect changed signals, fire and resolve alerts, deliver; returns a report"""
+        with self.lock:
+            started = time.perf_counter()
+            state = self.load_state()
+            now = time.time()
+            notifications = []
+            stats = {'signals_collected': 0, 'signals_skipped': 0, 'evaluations': 0, 'errors': {}}
+            rule_hashes = {rule['name']: rule['hash'] for rule in self.rules}
+
+            # Alerts of rules deleted from config.json resolve silently
+            for key in [k for k, alert in state['active'].items() if alert['rule'] not in rule_hashes]:
+                del state['active'][key]
+
+            for signal, rules in self.by_signal.items():
+                fingerprint_fn, collect_fn = SIGNALS[signal]
+                previous = state['signals'].get(signal, {})
+                changed_rules = [r for r in rules if state['rules'].get(r['name']) != r['hash']]
+                try:
+                    fingerprint = digest(fingerprint_fn())
+                    if not force and not changed_rules and previous.get('fingerprint') == fingerprint:
+                        stats['signals_skipped'] += 1
+                        continue
+                    facts = collect_fn()
+                except Exception as e:  # A broken source must not stop the other signals
+                    stats['errors'][signal] = str(e) or type(e).__name__
+                    continue
+                stats['signals_collected'] += 1
+
+                digests = {subject: digest(fact) for subject, fact in facts.items()}
+                old_digests = previous.get('facts', {})
+                changed = {s for s, d in digests.items() if old_digests.get(s) != d}
+                removed = set(old_digests) - set(digests)
+                for rule in rules:
+                    subjects = set(digests) if force or rule in changed_rules else changed
+                    for subject in subjects:
+                        stats['evaluations'] += 1
+                        self.apply(state, rule, subject, facts[subject] if matches(rule, facts[subject]) else None,
+                                   now, notifications)
+                    for subject in removed:
+                        self.apply(state, rule, subject, None, now, notifications)
+                state['signals'][signal] = {'fingerprint': fingerprint, 'facts': digests}
+
+            # Rules of a signal that failed to collect keep their old hash, so they are retried next time
+            state['rules'] = {rule['name']: state['rules'].get(rule['name']) if rule['signal'] in stats['errors']
+                              else rule['hash'] for rule in self.rules}
+            delivered, suppressed = self.deliver(notifications, state, now) if deliver else ([], 0)
+            # A dry run leaves the state alone, so its alerts still fire on the next real pass
+            if deliver:
+                self.save_state(state)
+
+            return {
+                'active': sorted(state['active'].values(), key=lambda a: (-SEVERITIES.index(a['severity']),
+                                                                          a['rule'], a['subject'])),
+                'notifications': notifications,
+                'delivered': len(delivered),
+                'suppressed': suppressed,
+                'rules': len(self.rules),
+                'sinks': [sink['type'] for sink in self.sinks],
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+                **stats
+            }
+
+    def apply(self, state, rule, subject, fact, now, notifications):
+        """Fire when a rule starts matching a subject, resolve when it stops; unchanged alerts stay quiet"""
+        key = f"{rule['name']}|{subject}"
+        active = state['active'].get(key)
+        if fact is not None:
+            message = render(rule, subject, fact)
+            if active:
+                active['message'] = message
+                return
+            state['active'][key] = {'key': key, 'rule': rule['name'], 'signal': rule['signal'], 'subject': subject,
+                                    'severity': rule['severity'], 'message': message, 'since': now}
+            notifications.append({'key': key, 'status': 'firing', 'rule': rule['name'], 'subject': subject,
+                                  'severity': rule['severity'], 'message': message, 'time': now,
+                                  'cooldown': rule['cooldown']})
+        elif active:
+            del state['active'][key]
+            notifications.append({'key': key, 'status': 'resolved', 'rule': rule['name'], 'subject': subject,
+                                  'severity': rule['severity'], 'message': active['message'], 'time': now,
+                                  'cooldown': rule['cooldown']})
+
+    def deliver(self, notifications, state, now):
+        """Send notifications past their cooldown, at most max_per_run per pass plus one summary"""
+        last_sent = state['last_sent']
+        due = []
+        for notification in notifications:
+            # A subject flapping in and out of a rule only notifies once per cooldown
+            if notification['status'] == 'firing' and now - last_sent.get(notification['key'], 0) < notification['cooldown']:
+                continue
+            if notification['status'] == 'resolved' and notification['key'] not in last_sent:
+                continue
+            due.append(notification)
+        due.sort(key=lambda n: -SEVERITIES.index(n['severity']))
+        sent, suppressed = due[:self.max_per_run], len(due) - self.max_per_run
+        if suppressed > 0:
+            sent.append({'key': 'summary', 'status': 'firing', 'rule': 'summary', 'subject': None,
+                         'severity': sent[-1]['severity'], 'time': now, 'cooldown': 0,
+                         'message': f"{suppressed} more alerts not sent (see the dashboard)"})
+        for notification in sent:
+            if notification['status'] == 'firing' and notification['key'] != 'summary':
+                last_sent[notification['key']] = now
+
+        for sink in self.sinks:
+            batch = [n for n in sent if at_least(n, sink)]
+            if not batch:
+                continue
+            try:
+                SINKS[sink['type']](sink, batch)
+            except (OSError, http.client.HTTPException, subprocess.SubprocessError) as e:
+                print(f"Alert sink {sink['type']} failed: {e}", file=sys.stderr)
+        # Forget cooldowns long past, so the state does not grow with every subject ever seen
+        longest = max([rule['cooldown'] for rule in self.rules] + [0])
+        for key in [k for k, t in last_sent.items() if now - t > longest and k not in state['active']]:
+            del last_sent[key]
+        return sent, max(suppressed, 0)
+
+_engine = None
+_engine_config = None
+
+def evaluate_alerts(deliver=True):
+    """Evaluate with an engine rebuilt only when config.json's alerts change"""
+    global _engine, _engine_config
+    config = load_config()
+    if _engine is None or config != _engine_config:
+        _engine, _engine_config = AlertEngine(config), config
+    return _engine.evaluate(deliver=deliver)
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import Colors
+
+    args = sys.argv[1:]
+    interval = float(args[args.index('--watch') + 1]) if '--watch' in args else None
+    try:
+        engine = AlertEngine()
+    except RuleError as e:
+        print(f"{Colors.RED}{e}{Colors.ENDC}")
+        sys.exit(2)
+
+    colors = {'critical': Colors.RED, 'warning': Colors.YELLOW, 'info': Colors.CYAN}
+    while True:
+        report = engine.evaluate(deliver='--dry-run' not in args, force='--force' in args)
+        for n in report['notifications']:
+            mark = '✓' if n['status'] == 'resolved' else '●'
+            print(f"{colors[n['severity']]}{mark} [{n['severity']}] {n['message']}{Colors.ENDC}")
+        for signal, error in report['errors'].items():
+            print(f"{Colors.RED}{signal}: {error}{Colors.ENDC}")
+        print(f"{len(report['active'])} active, {len(report['notifications'])} changed, {report['delivered']} sent "
+              f"({report['rules']} rules, {report['signals_collected']} signals collected, "
+              f"{report['signals_skipped']} unchanged, {report['elapsed_ms']:.0f} ms)")
+        if interval is None:
+            break
+        time.sleep(interval)
+
+if __name__ == '__main__':
+    main()
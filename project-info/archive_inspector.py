@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Archive Inspector
+Lists zip archives without extracting and detects drift from their extracted trees
+"""
+
+import json
+import os
+import sys
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+LISTING_CACHE = CACHE_DIR / 'archive-listings.json'
+CRC_CACHE = CACHE_DIR / 'archive-crcs.json'
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', '.cache', '__pycache__'}
+
+CHUNK_SIZE = 64 * 1024
+PREVIEW_LIMIT = 64 * 1024
+
+# Central directory listings by archive name, valid while the stamp matches
+_memory_cache = {}
+
+def load_json(path, default):
+    """Read a JSON cache file, falling back to a default"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    """Write a JSON cache file"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+def find_archives(root=PROJECT_ROOT):
+    """Return [(archive_name, extracted_dir_or_None)] for top-level zips"""
+    return [(p.name, p.stem if (root / p.stem).is_dir() else None)
+            for p in sorted(root.glob('*.zip'))]
+
+def archive_path(name, root=PROJECT_ROOT):
+    """Resolve a known archive name, rejecting anything else"""
+    if name not in {n for n, _ in find_archives(root)}:
+        raise FileNotFoundError(f"Unknown archive: {name}")
+    return root / name
+
+def read_listing(path):
+    """Read a zip's central directory into {member: [crc, size, compressed, date]}"""
+    with zipfile.ZipFile(path) as archive:
+        return {
+            info.filename: [info.CRC, info.file_size, info.compress_size,
+                            datetime(*info.date_time).isoformat()]
+            for info in archive.infolist() if not info.is_dir()
+        }
+
+def cached_listing(path, disk_cache):
+    """Central directory for an archive, re-read only when its mtime or size changes"""
+    st = path.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    for cache in (_memory_cache, disk_cache):
+        cached = cache.get(path.name)
+        if cached and cached['stamp'] == stamp:
+            _memory_cache[path.name] = cached
+            return cached['members'], False
+
+    cached = {'stamp': stamp, 'members': read_listing(path)}
+    _memory_cache[path.name] = disk_cache[path.name] = cached
+    return cached['members'], True
+
+def file_crc(path):
+    """Streaming CRC-32 of a file, comparable with zip member CRCs"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+def tree_crcs(directory, cache):
+    """Return ({relpath: [crc, size]}, rehashed_count), hashing only changed files"""
+    results = {}
+    rehashed = 0
+    for dirpath, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            full = os.path.join(dirpath, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            cached = cache.get(full)
+            if not (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+                cached = cache[full] = [st.st_mtime_ns, st.st_size, file_crc(full)]
+                rehashed += 1
+            relpath = os.path.relpath(full, directory).replace(os.sep, '/')
+            results[relpath] = [cached[2], st.st_size]
+    return results, rehashed
+
+def compare(listing, tree):
+    """Classify files as added (disk only), removed (zip only) or modified"""
+    common = sorted(listing.keys() & tree.keys())
+    return {
+        'added': sorted(tree.keys() - listing.keys()),
+        'removed': sorted(listing.keys() - tree.keys()),
+        'modified': [{'member': name, 'zip_size': listing[name][1], 'disk_size': tree[name][1]}
+                     for name in common if listing[name][0] != tree[name][0]],
+        'unchanged': sum(1 for name in common if listing[name][0] == tree[name][0])
+    }
+
+def inspect_archives(root=PROJECT_ROOT):
+    """List every archive and compare it with its extracted directory"""
+    listings = load_json(LISTING_CACHE, {}) if not _memory_cache else {}
+    crcs = load_json(CRC_CACHE, {})
+    listings_changed = False
+    rehashed = 0
+    reports = []
+
+    for name, directory in find_archives(root):
+        path = root / name
+        members, changed = cached_listing(path, listings)
+        listings_changed |= changed
+
+        drift = None
+        if directory:
+            tree, count = tree_crcs(root / directory, crcs)
+            drift = compare(members, tree)
+            rehashed += count
+
+        reports.append({
+            'archive': name,
+            'directory': directory,
+            'size': path.stat().st_size,
+            'members': [{'name': m, 'crc': f"{v[0]:08x}", 'size': v[1], 'compressed': v[2], 'date': v[3]}
+                        for m, v in sorted(members.items())],
+            'total_size': sum(v[1] for v in members.values()),
+            'drift': drift
+        })
+
+    if listings_changed:
+        save_json(LISTING_CACHE, {r['archive']: _memory_cache[r['archive']] for r in reports})
+    if rehashed:
+        save_json(CRC_CACHE, crcs)
+    return reports
+
+def is_env_file(member):
+    """.env, .env.local, .env.production and the like, at any depth"""
+    name = member.rsplit('/', 1)[-1]
+    return name == '.env' or name.startswith('.env.')
+
+def mask_env(content, mask):
+    """Env file text with every value replaced by mask(value)"""
+    lines = []
+    for line in content.splitlines(keepends=True):
+        key, sep, value = line.partition('=')
+        stripped = value.strip()
+        if sep and stripped and not key.lstrip().startswith('#'):
+            line = key + sep + value.replace(stripped, mask(stripped), 1)
+        lines.append(line)
+    return ''.join(lines)
+
+def preview_member(archive, member, limit=PREVIEW_LIMIT, root=PROJECT_ROOT, mask=None):
+    """Stream the first `limit` bytes of one member without extracting the archive; env values go through mask"""
+    with zipfile.ZipFile(archive_path(archive, root)) as zf:
+        try:
+            info = zf.getinfo(member)
+        except KeyError:
+            raise FileNotFoundError(f"{member} not found in {archive}")
+        with zf.open(info) as f:
+            data = f.read(limit)
+
+    binary = b'\0' in data[:1024]
+    content = '' if binary else data.decode('utf-8', errors='replace')
+    if mask and is_env_file(member):
+        content = mask_env(content, mask)
+    return {
+        'archive': archive,
+        'member': member,
+        'size': info.file_size,
+        'truncated': info.file_size > len(data),
+        'binary': binary,
+        'content': content
+    }
+
+def main():
+    """Command line entry point: drift summary, or a preview with ARCHIVE MEMBER"""
+    args = sys.argv[1:]
+    try:
+        result = preview_member(args[0], args[1]) if len(args) >= 2 else inspect_archives()
+    except FileNotFoundError as e:
+        print(e)
+        sys.exit(1)
+
+    if len(args) >= 2 and not result['binary']:
+        print(result['content'])
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Asset Pipeline
+Minified, content-hashed web dashboard assets with gzip and brotli copies
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CACHE_DIR = Path(__file__).parent / '.cache'
+ASSET_DIR = CACHE_DIR / 'assets'
+STATIC_DIR = Path(__file__).parent / 'static'
+MANIFEST_FILE = ASSET_DIR / 'manifest.json'
+
+SOURCES = ('css/style.css', 'js/app.js')
+
+# Precompressed siblings, best first; the brotli one is only written when the module is installed
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+MIME_TYPES = {'.css': 'text/css; charset=utf-8', '.js': 'text/javascript; charset=utf-8'}
+
+# Characters a JavaScript regex literal can follow (anything else makes `/` a division)
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = re.compile(r'(?<![\w$.])(?:return|typeof|case|do|else|in|of|void|yield|await)$')
+
+# Spaces next to these are never needed between JavaScript tokens
+JS_PUNCTUATION = re.compile(r' ?([{}()\[\];,:=<>?!&|]) ?')
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+def scan_js(source):
+    """Split JavaScript into ('code', text) and ('literal', text) chunks, dropping comments
+
+    Strings, template literals and regex literals are kept verbatim. Template
+    substitutions (`${...}`) are scanned as code, so literals nested inside
+    them are handled too.
+    """
+    chunks = []
+    code = []
+    # One entry per open template literal: brace depth inside its current ${...}
+    templates = []
+    i, n = 0, len(source)
+
+    def last_significant():
+        text = ''.join(code).rstrip()
+        for kind, chunk in reversed(chunks):
+            if text:
+                break
+            text = chunk.rstrip() if kind == 'code' else chunk
+        return text
+
+    def regex_allowed(before):
+        return not before or before[-1] in REGEX_PRECEDERS or REGEX_KEYWORDS.search(before) is not None
+
+    def flush():
+        if code:
+            chunks.append(('code', ''.join(code)))
+            code.clear()
+
+    def read_template(start):
+        """Read template text from start up to a closing backtick or a ${; returns the end index"""
+        j = start
+        while j < n:
+            if source[j] == '\\':
+                j += 2
+            elif source[j] == '`':
+                return j + 1
+            elif source.startswith('${', j):
+                return j + 2
+            else:
+                j += 1
+        return n
+
+    while i < n:
+        c = source[i]
+        if templates and c == '}' and templates[-1] == 0:
+            flush()
+            end = read_template(i + 1)
+            chunks.append(('literal', source[i:end]))
+            if source[end - 1] == '`':
+                templates.pop()
+            i = end
+        elif c == '`':
+            flush()
+            end = read_template(i + 1)
+            chunks.append(('literal', source[i:end]))
+            if source[end - 1] == '{':
+                templates.append(0)
+            i = end
+        elif c in '\'"':
+            flush()
+            j = i + 1
+            while j < n and source[j] != c and source[j] != '\n':
+                j += 2 if source[j] == '\\' else 1
+            chunks.append(('literal', source[i:j + 1]))
+            i = j + 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif source.startswith('/*', i):
+            end = n if source.find('*/', i + 2) == -1 else source.find('*/', i + 2) + 2
+            # A comment spanning lines still ends a statement for automatic semicolon insertion
+            code.append('\n' if '\n' in source[i:end] else ' ')
+            i = end
+        elif c == '/' and regex_allowed(last_significant()):
+            flush()
+            j, in_class = i + 1, False
+            while j < n and source[j] != '\n' and (source[j] != '/' or in_class):
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and source[j].isalpha():
+                j += 1
+            chunks.append(('literal', source[i:j]))
+            i = j
+        else:
+            if templates and c == '{':
+                templates[-1] += 1
+            elif templates and c == '}':
+                templates[-1] -= 1
+            code.append(c)
+            i += 1
+    flush()
+    return chunks
+
+def minify_js(source):
+    """Strip comments, indentation (also in HTML templates), blank lines and spaces around punctuation
+
+    Newlines are kept so automatic semicolon insertion still applies.
+    """
+    out = []
+    for kind, text in scan_js(source):
+        if kind == 'literal':
+            if text[0] in '`}' and '<' in text:
+                # Indentation inside HTML templates only becomes collapsible whitespace in the DOM
+                text = re.sub(r'\n\s+', '\n', text)
+            out.append(text)
+            continue
+        text = re.sub(r'[ \t]*\n\s*', '\n', text)
+        text = re.sub(r'[ \t]+', ' ', text)
+        out.append(JS_PUNCTUATION.sub(r'\1', text))
+    return ''.join(out).strip() + '\n'
+
+def minify_css(source):
+    """Strip comments and whitespace that CSS does not need"""
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', source)
+    out = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            out.append(part)
+            continue
+        part = re.sub(r'/\*.*?\*/', '', part, flags=re.S)
+        part = re.sub(r'\s+', ' ', part)
+        # Not around ':' on the left, which would turn `a :hover` into `a:hover`
+        part = re.sub(r' ?([{};,>]) ?', r'\1', part)
+        part = part.replace(': ', ':').replace(';}', '}')
+        out.append(part)
+    return ''.join(out).strip() + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def compress(data):
+    """{encoding: bytes} for every encoding available here"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+def source_mtimes(static_dir=STATIC_DIR):
+    """Modification time of every source, to notice edits"""
+    return {name: os.stat(static_dir / name).st_mtime_ns for name in SOURCES}
+
+def build_assets(static_dir=STATIC_DIR, out_dir=ASSET_DIR):
+    """Minify, fingerprint and precompress every source; returns the manifest"""
+    static_dir, out_dir = Path(static_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    assets = {}
+    for name in SOURCES:
+        path = static_dir / name
+        raw = path.read_bytes()
+        data = MINIFIERS[path.suffix](raw.decode('utf-8')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f"{path.stem}.{digest}{path.suffix}"
+        sizes = {'raw': len(raw), 'minified': len(data)}
+        (out_dir / filename).write_bytes(data)
+        for encoding, variant in compress(data).items():
+            (out_dir / (filename + dict(ENCODINGS)[encoding])).write_bytes(variant)
+            sizes[encoding] = len(variant)
+        assets[name] = {'file': filename, 'digest': digest, 'sizes': sizes}
+
+    manifest = {'sources': source_mtimes(static_dir), 'assets': assets}
+    (out_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    # Drop fingerprinted files from earlier builds
+    current = {a['file'] for a in assets.values()}
+    for old in out_dir.iterdir():
+        base = old.name[:-len(old.suffix)] if old.suffix in ('.gz', '.br') else old.name
+        if old.name != 'manifest.json' and base not in current:
+            old.unlink()
+    return manifest
+
+def get_manifest():
+    """The current manifest, rebuilt when a source changed since the last build"""
+    global _manifest
+    with _manifest_lock:
+        mtimes = source_mtimes()
+        if _manifest is None and MANIFEST_FILE.exists():
+            try:
+                _manifest = json.loads(MANIFEST_FILE.read_text(encoding='utf-8'))
+            except ValueError:
+                _manifest = None
+        if _manifest is None or _manifest['sources'] != mtimes or \
+                not all((ASSET_DIR / a['file']).exists() for a in _manifest['assets'].values()):
+            _manifest = build_assets()
+        return _manifest
+
+def asset_url(name):
+    """URL of the fingerprinted copy of static/<name>"""
+    return f"/assets/{get_manifest()['assets'][name]['file']}"
+
+def accepted_encodings(header):
+    """Encodings an Accept-Encoding header allows (q=0 excluded)"""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = re.search(r'q=([0-9.]+)', params)
+        if coding and (q is None or float(q.group(1)) > 0):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def resolve_asset(filename, accept_encoding=''):
+    """(path, encoding or None, mimetype) of the best variant of a built asset"""
+    current = {a['file'] for a in get_manifest()['assets'].values()}
+    if filename not in current:
+        raise FileNotFoundError(f"Unknown asset: {filename}")
+    accepted = accepted_encodings(accept_encoding)
+    mimetype = MIME_TYPES[Path(filename).suffix]
+    for encoding, suffix in ENCODINGS:
+        path = ASSET_DIR / (filename + suffix)
+        if (encoding in accepted or '*' in accepted) and path.exists():
+            return path, encoding, mimetype
+    return ASSET_DIR / filename, None, mimetype
+
+def main():
+    """Build the assets and print their sizes"""
+    from gembooth_dashboard import Colors
+
+    manifest = build_assets()
+    for name, asset in manifest['assets'].items():
+        sizes = asset['sizes']
+        line = f"{name:<16} → {asset['file']:<28} {sizes['raw']:>7,} raw  {sizes['minified']:>7,} min  {sizes['gzip']:>6,} gz"
+        if 'br' in sizes:
+            line += f"  {sizes['br']:>6,} br"
+        print(line)
+    if brotli is None:
+        print(f"{Colors.YELLOW}brotli not installed; only gzip copies written (pip install brotli){Colors.ENDC}")
+    print(f"\nWritten to {ASSET_DIR}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Benchmarks
+Times env parsing, section providers, /api routes, CLI rendering, startup and GUI pages against a baseline
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+RESULTS_DIR = CACHE_DIR / 'benchmarks'
+BASELINE_FILE = RESULTS_DIR / 'baseline.json'
+SCRIPT = Path(__file__).resolve()
+
+GROUPS = ['env', 'sections', 'web', 'cli', 'startup', 'gui']
+ENTRY_POINTS = ['gembooth_dashboard', 'dashboard_web', 'dashboard_gui']
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.20
+
+# Differences smaller than this are timer and scheduler noise, whatever the ratio
+NOISE_MS = 1.0
+
+# Routes that need query arguments are not benchmarked
+SKIP_ROUTES = {'/api/archives/preview'}
+ROUTE_QUERIES = {'/api/palette': '?q=deploy'}
+
+def measure(func, repeat):
+    """Call func `repeat` times; returns each duration in milliseconds"""
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - started) * 1000)
+    return runs
+
+def result(group, runs, **extra):
+    """One benchmark's summary"""
+    return dict(extra, group=group, runs=[round(r, 3) for r in runs],
+                median_ms=round(statistics.median(runs), 3), min_ms=round(min(runs), 3))
+
+def worker_env(repeat):
+    """.env parsing as done by the CLI (synthetic file) and the web app (.env.local)"""
+    from gembooth_dashboard import read_env_file
+    from dashboard_web import load_env_data
+
+    with tempfile.NamedTemporaryFile('w', suffix='.env', delete=False) as f:
+        for i in range(200):
+            f.write(f"# comment {i}\nVITE_KEY_{i}=value-{i}-{'x' * 40}\n\n")
+    try:
+        return {
+            'env read_env_file 200 keys': result('env', measure(lambda: read_env_file(f.name), repeat * 20)),
+            'env load_env_data': result('env', measure(load_env_data, repeat * 20))
+        }
+    finally:
+        os.unlink(f.name)
+
+def worker_sections(repeat):
+    """Every section data provider, first call (cold) and later calls (warm)"""
+    from dependency_analyzer import analyze_dependencies
+    from bundle_analyzer import all_latest_reports
+    from code_metrics import collect_metrics
+    from duplicate_detector import find_duplicates
+    from archive_inspector import inspect_archives
+    from gemini_proxy import cache_summary
+    from table_mirror import mirror_summary
+    from bucket_audit import load_report
+    from deploy_runner import deploy_history
+
+    providers = [('dependencies', analyze_dependencies), ('bundle', all_latest_reports),
+                 ('metrics', lambda: collect_metrics(record=False)), ('duplicates', find_duplicates), ('archives', inspect_archives),
+                 ('gemini-cache', cache_summary), ('mirror', mirror_summary), ('storage-audit', load_report),
+                 ('deploys', deploy_history)]
+    results = {}
+    for name, provider in providers:
+        results[f"section {name} cold"] = result('sections', measure(provider, 1))
+        results[f"section {name} warm"] = result('sections', measure(provider, repeat))
+    return results
+
+def worker_web(repeat):
+    """Every argument-free GET /api route through the Flask test client, cold then warm"""
+    import dashboard_web
+    import timeseries
+    from alert_rules import evaluate_alerts
+
+    # Benchmark requests must not land in the real latency history or send real alert notifications
+    scratch = tempfile.TemporaryDirectory()
+    timeseries._store = timeseries.TimeSeriesStore(Path(scratch.name) / 'timeseries')
+    dashboard_web.evaluate_alerts = lambda: evaluate_alerts(deliver=False)
+    client = dashboard_web.app.test_client()
+    routes = sorted(rule.rule for rule in dashboard_web.app.url_map.iter_rules()
+                    if rule.rule.startswith('/api/') and not rule.arguments and 'GET' in rule.methods
+                    and rule.rule not in SKIP_ROUTES)
+    results = {}
+    for route in routes:
+        status = []
+        get = lambda: status.append(client.get(route + ROUTE_QUERIES.get(route, '')).status_code)
+        results[f"web GET {route} cold"] = result('web', measure(get, 1), status=status[0])
+        results[f"web GET {route} warm"] = result('web', measure(get, repeat), status=status[-1])
+    timeseries.flush()
+    timeseries._store.close()
+    scratch.cleanup()
+    return results
+
+def worker_gui(repeat):
+    """Build every GUI page and let Tk lay it out (needs a display)"""
+    import tkinter as tk
+    from dashboard_gui import ModernDashboard
+
+    root = tk.Tk()
+    started = time.perf_counter()
+    app = ModernDashboard(root)
+    root.update()
+    results = {'gui startup': result('gui', [(time.perf_counter() - started) * 1000])}
+
+    for text, show in app.pages:
+        def build():
+            app.open_page(text, show)
+            root.update_idletasks()
+        results[f"gui page {text.split(' ', 1)[-1]}"] = result('gui', measure(build, repeat))
+    root.destroy()
+    return results
+
+WORKERS = {'env': worker_env, 'sections': worker_sections, 'web': worker_web, 'gui': worker_gui}
+
+def run_worker(group, repeat, env=None):
+    """Run a worker group in a fresh interpreter so cold timings are really cold"""
+    completed = subprocess.run([sys.executable, str(SCRIPT), '--worker', group, '--repeat', str(repeat)],
+                               cwd=SCRIPT.parent, capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        return {f"{group} (failed)": {'group': group, 'skipped': completed.stderr.strip().splitlines()[-1:]}}
+    return json.loads(completed.stdout)
+
+def bench_startup(repeat):
+    """Interpreter start plus importing each entry point"""
+    results = {}
+    for module in ENTRY_POINTS:
+        argv = [sys.executable, '-c', f'import {module}']
+        probe = subprocess.run(argv, cwd=SCRIPT.parent, capture_output=True, text=True)
+        if probe.returncode != 0:
+            results[f"startup import {module}"] = {'group': 'startup', 'skipped': probe.stderr.strip().splitlines()[-1:]}
+            continue
+        runs = measure(lambda: subprocess.run(argv, cwd=SCRIPT.parent, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL), repeat)
+        results[f"startup import {module}"] = result('startup', runs)
+    bare = measure(lambda: subprocess.run([sys.executable, '-c', 'pass']), repeat)
+    results['startup bare interpreter'] = result('startup', bare)
+    return results
+
+def bench_cli(repeat):
+    """gembooth_dashboard.py --all, rendered to /dev/null"""
+    argv = [sys.executable, str(SCRIPT.parent / 'gembooth_dashboard.py'), '--all']
+    runs = measure(lambda: subprocess.run(argv, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+                                          stderr=subprocess.DEVNULL), repeat)
+    return {'cli --all': result('cli', runs)}
+
+def bench_gui(repeat):
+    """GUI pages on $DISPLAY, or on a throwaway Xvfb display"""
+    if os.environ.get('DISPLAY'):
+        return run_worker('gui', repeat)
+    if not shutil.which('Xvfb'):
+        return {'gui pages': {'group': 'gui', 'skipped': ['No $DISPLAY and Xvfb is not installed']}}
+
+    display = f":{90 + os.getpid() % 500}"
+    xvfb = subprocess.Popen(['Xvfb', display, '-screen', '0', '1600x1000x24', '-nolisten', 'tcp'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(0.5)
+        return run_worker('gui', repeat, env=dict(os.environ, DISPLAY=display))
+    finally:
+        xvfb.terminate()
+        xvfb.wait()
+
+def machine_metadata():
+    """What the numbers were measured on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'load_average': list(os.getloadavg()) if hasattr(os, 'getloadavg') else None,
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+def run_benchmarks(groups=GROUPS, repeat=DEFAULT_REPEAT):
+    """Run the selected groups and return {'metadata', 'results'}"""
+    results = {}
+    for group in groups:
+        if group in ('env', 'sections', 'web'):
+            results.update(run_worker(group, repeat))
+        elif group == 'cli':
+            results.update(bench_cli(max(1, repeat // 2)))
+        elif group == 'startup':
+            results.update(bench_startup(repeat))
+        elif group == 'gui':
+            results.update(bench_gui(repeat))
+    return {'metadata': machine_metadata(), 'repeat': repeat, 'results': results}
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """[(name, baseline ms, current ms, ratio, regressed)] for benchmarks present in both runs"""
+    rows = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or 'median_ms' not in now or 'median_ms' not in before:
+            continue
+        ratio = now['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        regressed = ratio > 1 + threshold and now['median_ms'] - before['median_ms'] > NOISE_MS
+        rows.append((name, before['median_ms'], now['median_ms'], ratio, regressed))
+    return rows
+
+def save(report, path):
+    """Write a report as JSON"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    repeat = int(args[args.index('--repeat') + 1]) if '--repeat' in args else DEFAULT_REPEAT
+
+    if '--worker' in args:
+        group = args[args.index('--worker') + 1]
+        json.dump(WORKERS[group](repeat), sys.stdout)
+        return
+
+    from gembooth_dashboard import Colors
+
+    groups = args[args.index('--only') + 1].split(',') if '--only' in args else GROUPS
+    threshold = float(args[args.index('--threshold') + 1]) if '--threshold' in args else DEFAULT_THRESHOLD
+    unknown = [g for g in groups if g not in GROUPS]
+    if unknown:
+        print(f"Unknown groups: {', '.join(unknown)} (choose from {', '.join(GROUPS)})")
+        sys.exit(2)
+
+    report = run_benchmarks(groups, repeat)
+    path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    save(report, path)
+
+    baseline = None
+    if BASELINE_FILE.exists() and '--save-baseline' not in args:
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    changes = {name: (before, ratio, regressed)
+               for name, before, _, ratio, regressed in (compare(report, baseline, threshold) if baseline else [])}
+
+    width = max(len(name) for name in report['results'])
+    for name, bench in report['results'].items():
+        if 'skipped' in bench:
+            print(f"{name:<{width}}  {Colors.YELLOW}skipped: {' '.join(bench['skipped'])}{Colors.ENDC}")
+            continue
+        line = f"{name:<{width}}  {bench['median_ms']:>10.2f} ms  (min {bench['min_ms']:.2f})"
+        if name in changes:
+            before, ratio, regressed = changes[name]
+            color = Colors.RED if regressed else Colors.GREEN if ratio < 1 - threshold else Colors.ENDC
+            line += f"  {color}{ratio:>5.2f}x vs {before:.2f} ms{Colors.ENDC}"
+        print(line)
+
+    print(f"\nResults: {path.relative_to(PROJECT_ROOT)}")
+    if '--save-baseline' in args or baseline is None:
+        save(report, BASELINE_FILE)
+        print(f"Baseline: {BASELINE_FILE.relative_to(PROJECT_ROOT)}")
+        return
+
+    regressions = [name for name, (_, _, regressed) in changes.items() if regressed]
+    if baseline['metadata'].get('machine') != report['metadata']['machine'] or \
+            baseline['metadata'].get('cpus') != report['metadata']['cpus']:
+        print(f"{Colors.YELLOW}Baseline was recorded on different hardware; ratios are indicative only{Colors.ENDC}")
+    if regressions:
+        print(f"{Colors.RED}{len(regressions)} regressions over {threshold:.0%}:{Colors.ENDC} {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"{Colors.GREEN}No regressions over {threshold:.0%} against the baseline{Colors.ENDC}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Storage Bucket Audit
+Checks an export of user-photos/user-gifs against limits, references and duplicates
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from table_mirror import MIRROR_DB
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+MANIFEST_DB = CACHE_DIR / 'bucket-manifest.sqlite3'
+REPORT_FILE = CACHE_DIR / 'bucket-audit.json'
+STORAGE_MIGRATION = PROJECT_ROOT / 'supabase' / 'migrations' / '20250106000002_storage_setup.sql'
+
+# `supabase storage cp -r ss:///user-photos storage/user-photos --experimental`
+DEFAULT_EXPORT = PROJECT_ROOT / 'storage'
+BUCKETS = ['user-photos', 'user-gifs']
+
+# Bucket rows in the storage migration: (id, name, public, file_size_limit, ARRAY[mime types])
+BUCKET_PATTERN = re.compile(r"\(\s*'([\w-]+)',\s*'[\w-]+',\s*\w+,\s*(\d+),\s*ARRAY\[([^\]]*)\]\s*\)")
+
+MIME_TYPES = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png',
+              '.webp': 'image/webp', '.gif': 'image/gif'}
+
+# Below this many changed objects the process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+BATCH_SIZE = 256
+
+# dHash distance treated as "near-identical"; 4 bands of 16 bits find every
+# pair within 3 bits (pigeonhole), bands shared by more images are skipped
+NEAR_DISTANCE = 3
+BANDS = 4
+MAX_BAND_SIZE = 500
+
+REPORT_LIMIT = 20
+
+def bucket_limits(path=STORAGE_MIGRATION):
+    """Return {bucket: (file_size_limit, allowed_mime_types)} from the storage migration"""
+    try:
+        sql = path.read_text(encoding='utf-8')
+    except OSError:
+        return {}
+    return {bucket: (int(limit), re.findall(r"'([^']+)'", mimes))
+            for bucket, limit, mimes in BUCKET_PATTERN.findall(sql)}
+
+def walk_bucket(directory):
+    """Yield (name, size, mtime_ns) for every object below a bucket directory"""
+    stack = [(directory, '')]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, f"{prefix}{entry.name}/"))
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                yield f"{prefix}{entry.name}", st.st_size, st.st_mtime_ns
+
+def content_digest(path, size):
+    """BLAKE2 digest of a file, read through mmap to avoid copying it into Python"""
+    digest = hashlib.blake2b(digest_size=16)
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            digest.update(mm)
+    return digest.hexdigest()
+
+def perceptual_hash(path):
+    """64-bit difference hash of an image's first frame, or None without Pillow"""
+    if Image is None or os.path.splitext(path)[1].lower() not in MIME_TYPES:
+        return None
+    try:
+        with Image.open(path) as img:
+            pixels = list(img.convert('L').resize((9, 8)).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+def hash_batch(batch):
+    """Hash a batch of [(bucket, name, path, size)] (runs in a worker)"""
+    results = []
+    for bucket, name, path, size in batch:
+        try:
+            results.append((bucket, name, content_digest(path, size), perceptual_hash(path)))
+        except OSError:
+            continue
+    return results
+
+class Manifest:
+    """SQLite record of every object's size, mtime and hashes, updated incrementally"""
+
+    def __init__(self, path=MANIFEST_DB):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS objects (bucket TEXT, name TEXT, size INTEGER, '
+                              'mtime_ns INTEGER, digest TEXT, phash TEXT, PRIMARY KEY (bucket, name))')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS objects_digest ON objects (digest)')
+
+    def stamps(self, bucket):
+        """Return {name: (size, mtime_ns)}, or None for objects whose hashing never finished"""
+        return {name: (size, mtime) if digest else None for name, size, mtime, digest in
+                self.conn.execute('SELECT name, size, mtime_ns, digest FROM objects WHERE bucket = ?', (bucket,))}
+
+    def refresh(self, root, buckets):
+        """Stat every object and hash only new or changed ones; returns the number hashed"""
+        stale = []
+        with self.conn:
+            for bucket in buckets:
+                known = self.stamps(bucket)
+                for name, size, mtime in walk_bucket(root / bucket):
+                    if known.pop(name, None) != (size, mtime):
+                        stale.append((bucket, name, str(root / bucket / name), size))
+                        self.conn.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, NULL, NULL)',
+                                          (bucket, name, size, mtime))
+                self.conn.executemany('DELETE FROM objects WHERE bucket = ? AND name = ?',
+                                      [(bucket, name) for name in known])
+
+        batches = [stale[i:i + BATCH_SIZE] for i in range(0, len(stale), BATCH_SIZE)]
+        if len(stale) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor() as pool:
+                for future in as_completed([pool.submit(hash_batch, batch) for batch in batches]):
+                    self.store(future.result())
+        else:
+            for batch in batches:
+                self.store(hash_batch(batch))
+        return len(stale)
+
+    def store(self, results):
+        """Save one batch of hashes (committed per batch so an interrupted run keeps its progress)"""
+        with self.conn:
+            self.conn.executemany('UPDATE objects SET digest = ?, phash = ? WHERE bucket = ? AND name = ?',
+                                  [(digest, phash, bucket, name) for bucket, name, digest, phash in results])
+
+    def rows(self, sql, params=()):
+        """Run a query against the manifest"""
+        return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Close the manifest"""
+        self.conn.close()
+
+def object_key(url):
+    """Map a storage URL to (bucket, object name), or None for other URLs"""
+    for bucket in BUCKETS:
+        marker = f"/{bucket}/"
+        if url and marker in url:
+            return bucket, url.split(marker, 1)[1].split('?', 1)[0]
+    return None
+
+def referenced_objects(mirror_path=MIRROR_DB):
+    """Object paths referenced by photos/gifs rows in the table mirror, or None before a sync"""
+    if not Path(mirror_path).exists():
+        return None
+    conn = sqlite3.connect(str(mirror_path))
+    try:
+        urls = conn.execute('SELECT input_image_url FROM photos UNION ALL SELECT output_image_url FROM photos '
+                            'UNION ALL SELECT gif_url FROM gifs').fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+    return {key for key in (object_key(url) for (url,) in urls) if key}
+
+def hamming(a, b):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+def near_duplicate_groups(images):
+    """Group [(key, phash, size)] into clusters within NEAR_DISTANCE bits"""
+    parent = list(range(len(images)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    chars = 16 // BANDS
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        for i, (_, phash, _) in enumerate(images):
+            buckets[phash[band * chars:(band + 1) * chars]].append(i)
+        for members in buckets.values():
+            if len(members) < 2 or len(members) > MAX_BAND_SIZE:
+                continue
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    if find(i) != find(j) and hamming(images[i][1], images[j][1]) <= NEAR_DISTANCE:
+                        parent[find(i)] = find(j)
+
+    clusters = defaultdict(list)
+    for i in range(len(images)):
+        clusters[find(i)].append(images[i])
+    return [c for c in clusters.values() if len(c) > 1]
+
+def audit_buckets(root=DEFAULT_EXPORT, buckets=BUCKETS, manifest_path=MANIFEST_DB, mirror_path=MIRROR_DB):
+    """Refresh the manifest and report limits, orphans, duplicates and reclaimable bytes"""
+    root = Path(root)
+    started = time.perf_counter()
+    limits = bucket_limits()
+    manifest = Manifest(manifest_path)
+    try:
+        hashed = manifest.refresh(root, buckets)
+        objects = {(bucket, name): (size, digest, phash) for bucket, name, size, digest, phash in
+                   manifest.rows('SELECT bucket, name, size, digest, phash FROM objects WHERE digest IS NOT NULL')}
+    finally:
+        manifest.close()
+
+    references = referenced_objects(mirror_path)
+    reclaimable = set()
+
+    def unreferenced(key):
+        # Without the mirror nothing is known to be unused, so nothing is counted as reclaimable
+        return references is not None and key not in references
+
+    bucket_reports = []
+    for bucket in buckets:
+        limit, allowed = limits.get(bucket, (None, []))
+        keys = [k for k in objects if k[0] == bucket]
+        over = sorted((k for k in keys if limit and objects[k][0] > limit), key=lambda k: -objects[k][0])
+        disallowed = sorted(k for k in keys if allowed and
+                            MIME_TYPES.get(os.path.splitext(k[1])[1].lower()) not in allowed)
+        bucket_reports.append({
+            'bucket': bucket,
+            'objects': len(keys),
+            'bytes': sum(objects[k][0] for k in keys),
+            'limit': limit,
+            'allowed_types': allowed,
+            'over_limit_count': len(over),
+            'over_limit': [{'name': k[1], 'size': objects[k][0]} for k in over[:REPORT_LIMIT]],
+            'disallowed_count': len(disallowed),
+            'disallowed': [k[1] for k in disallowed[:REPORT_LIMIT]]
+        })
+
+    orphans = None
+    if references is not None:
+        orphan_keys = sorted((k for k in objects if k not in references), key=lambda k: -objects[k][0])
+        reclaimable.update(orphan_keys)
+        orphans = {
+            'count': len(orphan_keys),
+            'bytes': sum(objects[k][0] for k in orphan_keys),
+            'largest': [{'bucket': k[0], 'name': k[1], 'size': objects[k][0]} for k in orphan_keys[:REPORT_LIMIT]]
+        }
+
+    # Byte-identical copies: keep a referenced copy when there is one
+    by_digest = defaultdict(list)
+    for key, (size, digest, _) in objects.items():
+        by_digest[digest].append(key)
+    identical = []
+    for digest, keys in by_digest.items():
+        if len(keys) < 2:
+            continue
+        keys.sort(key=lambda k: (unreferenced(k), k))
+        # Copies still used by photos/gifs rows stay, even when another copy is kept
+        reclaimable.update(k for k in keys[1:] if unreferenced(k))
+        identical.append({'digest': digest, 'size': objects[keys[0]][0], 'count': len(keys),
+                          'names': [f"{b}/{n}" for b, n in keys[:5]]})
+    identical.sort(key=lambda g: -g['size'] * (g['count'] - 1))
+
+    # Perceptually near-identical images: one representative per digest, keep the largest
+    near = None
+    if Image is not None:
+        images = [(keys[0], objects[keys[0]][2], objects[keys[0]][0])
+                  for keys in by_digest.values() if objects[keys[0]][2]]
+        near = []
+        for cluster in near_duplicate_groups(images):
+            cluster.sort(key=lambda item: -item[2])
+            reclaimable.update(key for key, _, _ in cluster[1:] if unreferenced(key))
+            near.append({'count': len(cluster), 'bytes': sum(size for _, _, size in cluster[1:]),
+                         'names': [f"{b}/{n}" for (b, n), _, _ in cluster[:5]]})
+        near.sort(key=lambda g: -g['bytes'])
+
+    report = {
+        'root': str(root),
+        'exists': all((root / bucket).is_dir() for bucket in buckets),
+        'buckets': bucket_reports,
+        'orphans': orphans,
+        'identical_groups': len(identical),
+        'identical_bytes': sum(g['size'] * (g['count'] - 1) for g in identical),
+        'identical': identical[:REPORT_LIMIT],
+        'near_groups': None if near is None else len(near),
+        'near_bytes': None if near is None else sum(g['bytes'] for g in near),
+        'near': None if near is None else near[:REPORT_LIMIT],
+        'reclaimable_bytes': sum(objects[k][0] for k in reclaimable),
+        'hashed': hashed,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        'audited_at': time.time()
+    }
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def load_report():
+    """Most recent audit report, or None if no audit has run"""
+    try:
+        with open(REPORT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    root = Path(args[args.index('--root') + 1]) if '--root' in args else DEFAULT_EXPORT
+    if not any((root / bucket).is_dir() for bucket in BUCKETS):
+        print(f"No bucket export found in {root}")
+        print(f"Export with: supabase storage cp -r ss:///user-photos {root / 'user-photos'} --experimental")
+        sys.exit(1)
+
+    report = audit_buckets(root)
+    for bucket in report['buckets']:
+        print(f"{bucket['bucket']}: {bucket['objects']} objects, {bucket['bytes']} bytes, "
+              f"{bucket['over_limit_count']} over limit, {bucket['disallowed_count']} disallowed types")
+    if report['orphans'] is None:
+        print("Orphans: skipped (run table_mirror.py first)")
+    else:
+        print(f"Orphans: {report['orphans']['count']} ({report['orphans']['bytes']} bytes)")
+    print(f"Identical copies: {report['identical_groups']} groups ({report['identical_bytes']} bytes)")
+    if report['near_groups'] is None:
+        print("Near-identical images: skipped (pip install Pillow)")
+    else:
+        print(f"Near-identical images: {report['near_groups']} groups ({report['near_bytes']} bytes)")
+    print(f"Reclaimable: {report['reclaimable_bytes']} bytes "
+          f"({report['hashed']} objects hashed in {report['duration_ms']:.0f} ms)")
+
+if __name__ == '__main__':
+    main()
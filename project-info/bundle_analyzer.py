@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Bundle Analyzer
+Measures what `npm run build` produced and tracks chunk sizes over time
+"""
+
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+HISTORY_FILE = CACHE_DIR / 'bundle-history.jsonl'
+
+APPS = ['gembooth', 'fit-check', 'pixshop', 'past-forward', 'gemini-co-drawing']
+
+# Vite warns above 500 kB per chunk; mobile budget is on the gzipped size
+CHUNK_WARNING_LIMIT = 500 * 1024
+MOBILE_GZIP_BUDGET = 170 * 1024
+
+# A chunk regresses when it grows past both limits versus the recent median
+REGRESSION_RATIO = 0.10
+REGRESSION_MIN_BYTES = 2 * 1024
+REGRESSION_WINDOW = 5
+
+# Vite appends an 8-character content hash: index-BxY3k_9a.js
+HASH_PATTERN = re.compile(r'-[A-Za-z0-9_-]{8}(?=\.[a-z0-9]+$)')
+
+def chunk_key(relpath):
+    """Stable chunk name with the content hash stripped"""
+    return HASH_PATTERN.sub('-[hash]', relpath.replace(os.sep, '/'))
+
+def measure_file(path):
+    """Return raw, gzip and brotli sizes for one file (runs in a worker)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return {
+        'raw': len(data),
+        'gzip': len(gzip.compress(data, compresslevel=9)),
+        'brotli': len(brotli.compress(data, quality=11)) if brotli else None
+    }
+
+def source_breakdown(map_path, depth=3):
+    """Attribute a chunk's pre-minification bytes to source directories"""
+    try:
+        with open(map_path, 'r', encoding='utf-8') as f:
+            source_map = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    groups = {}
+    contents = source_map.get('sourcesContent') or []
+    for source, content in zip(source_map.get('sources', []), contents):
+        parts = [p for p in source.replace('\\', '/').split('/') if p not in ('', '.', '..')]
+        if 'node_modules' in parts:
+            idx = parts.index('node_modules')
+            scoped = parts[idx + 1].startswith('@')
+            group = '/'.join(parts[idx:idx + (3 if scoped else 2)])
+        else:
+            group = '/'.join(parts[:depth - 1] if len(parts) >= depth else parts[:-1]) or source
+        groups[group] = groups.get(group, 0) + len((content or '').encode('utf-8'))
+
+    return sorted(({'source': g, 'bytes': b} for g, b in groups.items()), key=lambda d: -d['bytes'])[:10]
+
+def scan_dist(dist_dir, workers=None):
+    """Measure every file in a build output directory in parallel"""
+    dist_dir = Path(dist_dir)
+    files = sorted(p for p in dist_dir.rglob('*') if p.is_file() and p.suffix != '.map')
+    if not files:
+        return []
+
+    if len(files) == 1:
+        sizes = [measure_file(files[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or min(len(files), os.cpu_count() or 1)) as pool:
+            sizes = list(pool.map(measure_file, files))
+
+    chunks = []
+    for path, size in zip(files, sizes):
+        relpath = str(path.relative_to(dist_dir))
+        chunk = {'file': relpath.replace(os.sep, '/'), 'key': chunk_key(relpath), **size}
+        map_path = path.with_name(path.name + '.map')
+        if map_path.exists():
+            chunk['sources'] = source_breakdown(map_path)
+        chunks.append(chunk)
+
+    chunks.sort(key=lambda c: -c['raw'])
+    return chunks
+
+def run_build(app_dir):
+    """Run `npm run build` for an app and return (duration_seconds, output)"""
+    npm = 'npm.cmd' if sys.platform == 'win32' else 'npm'
+    started = time.perf_counter()
+    result = subprocess.run([npm, 'run', 'build'], cwd=app_dir,
+                            capture_output=True, text=True)
+    duration = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"npm run build failed in {app_dir}:\n{result.stderr or result.stdout}")
+    return duration, result.stdout
+
+def load_history(app=None):
+    """Read recorded builds, oldest first"""
+    if not HISTORY_FILE.exists():
+        return []
+    builds = []
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                build = json.loads(line)
+            except ValueError:
+                continue
+            if app is None or build.get('app') == app:
+                builds.append(build)
+    return builds
+
+def append_history(build):
+    """Append one build record to the history store"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(build, separators=(',', ':')) + '\n')
+
+def find_regressions(build, previous, window=REGRESSION_WINDOW):
+    """Compare each chunk's gzip size with the median of the previous builds"""
+    recent = previous[-window:]
+    regressions = []
+    for chunk in build['chunks']:
+        history = sorted(
+            c['gzip'] for b in recent for c in b['chunks'] if c['key'] == chunk['key']
+        )
+        if not history:
+            continue
+        baseline = history[len(history) // 2]
+        growth = chunk['gzip'] - baseline
+        if growth > REGRESSION_MIN_BYTES and growth > baseline * REGRESSION_RATIO:
+            regressions.append({
+                'key': chunk['key'],
+                'baseline': baseline,
+                'gzip': chunk['gzip'],
+                'growth': growth
+            })
+    return regressions
+
+def oversized_chunks(build):
+    """JS chunks over Vite's warning limit or the mobile gzip budget"""
+    return [c for c in build['chunks'] if c['file'].endswith('.js')
+            and (c['raw'] > CHUNK_WARNING_LIMIT or c['gzip'] > MOBILE_GZIP_BUDGET)]
+
+def analyze_build(app='gembooth', build=False):
+    """Optionally build an app, then measure and record its dist/ output"""
+    app_dir = PROJECT_ROOT if app == 'gembooth' else PROJECT_ROOT / app
+    duration = None
+    if build:
+        duration, _ = run_build(app_dir)
+
+    dist_dir = app_dir / 'dist'
+    if not dist_dir.is_dir():
+        raise FileNotFoundError(f"No build output at {dist_dir} - run `npm run build` first")
+
+    previous = load_history(app)
+    record = {
+        'app': app,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'duration': round(duration, 2) if duration is not None else None,
+        'chunks': scan_dist(dist_dir)
+    }
+    for size in ('raw', 'gzip', 'brotli'):
+        values = [c[size] for c in record['chunks']]
+        record[f'total_{size}'] = None if None in values else sum(values)
+
+    append_history(record)
+    return bundle_report(record, previous)
+
+def bundle_report(record, previous):
+    """Combine a build record with its regressions and size trend"""
+    return {
+        'build': record,
+        'regressions': find_regressions(record, previous),
+        'oversized': [c['key'] for c in oversized_chunks(record)],
+        'trend': [
+            {'timestamp': b['timestamp'], 'total_gzip': b['total_gzip'], 'duration': b['duration']}
+            for b in (previous + [record])[-30:]
+        ]
+    }
+
+def latest_report(app='gembooth'):
+    """Report for the most recently recorded build, without rebuilding"""
+    builds = load_history(app)
+    if not builds:
+        return {'build': None, 'regressions': [], 'oversized': [], 'trend': []}
+    return bundle_report(builds[-1], builds[:-1])
+
+def all_latest_reports():
+    """Latest report for every app that has a recorded build"""
+    by_app = {}
+    for build in load_history():
+        by_app.setdefault(build.get('app'), []).append(build)
+    return {app: bundle_report(by_app[app][-1], by_app[app][:-1]) for app in APPS if app in by_app}
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import Colors, print_section, print_info
+    from dependency_analyzer import format_size
+
+    args = sys.argv[1:]
+    app = args[args.index('--app') + 1] if '--app' in args else 'gembooth'
+
+    try:
+        report = analyze_build(app, build='--build' in args)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"{Colors.RED}{e}{Colors.ENDC}")
+        sys.exit(1)
+
+    record = report['build']
+    print_section(f"Bundle Report - {app}")
+    if record['duration'] is not None:
+        print_info("Build Time", f"{record['duration']}s")
+    print_info("Total", f"{format_size(record['total_raw'])} raw, {format_size(record['total_gzip'])} gzip, "
+                        f"{format_size(record['total_brotli'])} brotli")
+
+    for chunk in record['chunks']:
+        flag = f" {Colors.RED}⚠ oversized{Colors.ENDC}" if chunk['key'] in report['oversized'] else ""
+        print(f"  {Colors.YELLOW}{chunk['file']}{Colors.ENDC}: {format_size(chunk['raw'])} / "
+              f"{format_size(chunk['gzip'])} gz / {format_size(chunk['brotli'])} br{flag}")
+
+    for reg in report['regressions']:
+        print(f"  {Colors.RED}▲ {reg['key']} grew {format_size(reg['growth'])} gzip "
+              f"(was {format_size(reg['baseline'])}){Colors.ENDC}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Code Metrics
+Counts lines, files and bytes per language and sub-app, with daily history
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+FILE_CACHE = CACHE_DIR / 'metrics-files.json'
+HISTORY_COLUMNS = CACHE_DIR / 'metrics-columns.json'
+HISTORY_DATA = CACHE_DIR / 'metrics-history.bin'
+
+SUB_APPS = ['src', 'fit-check', 'pixshop', 'past-forward', 'gemini-co-drawing',
+            'supabase', 'api', 'project-info']
+
+LANGUAGES = {
+    '.js': 'JavaScript', '.jsx': 'JavaScript', '.cjs': 'JavaScript', '.mjs': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript',
+    '.css': 'CSS',
+    '.html': 'HTML',
+    '.sql': 'SQL',
+    '.py': 'Python',
+    '.json': 'JSON',
+    '.md': 'Markdown',
+    '.sh': 'Shell', '.bat': 'Shell',
+    '.toml': 'TOML'
+}
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', '.cache', '__pycache__', '.vercel', '.temp'}
+
+# Below this many changed files the process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+MISSING = -1
+
+def count_file(path):
+    """Return (lines, bytes) for one file (runs in a worker)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    lines = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        lines += 1
+    return lines, len(data)
+
+def iter_source_files(root=PROJECT_ROOT):
+    """Yield (relative_path, stat) for every tracked-language file"""
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in LANGUAGES:
+                continue
+            full = os.path.join(dirpath, name)
+            try:
+                yield os.path.relpath(full, root).replace(os.sep, '/'), os.stat(full)
+            except OSError:
+                continue
+
+def load_json(path, default):
+    """Read a JSON cache file, falling back to a default"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    """Write a JSON cache file"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+def scan_files(root=PROJECT_ROOT):
+    """Count every file, recounting only those whose mtime or size changed"""
+    cache = load_json(FILE_CACHE, {})
+    results = {}
+    stale = []
+
+    for relpath, st in iter_source_files(root):
+        cached = cache.get(relpath)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            results[relpath] = cached
+        else:
+            stale.append((relpath, st))
+
+    paths = [os.path.join(root, relpath) for relpath, _ in stale]
+    if len(paths) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as pool:
+            counts = list(pool.map(count_file, paths, chunksize=32))
+    else:
+        counts = [count_file(p) for p in paths]
+
+    for (relpath, st), (lines, size) in zip(stale, counts):
+        results[relpath] = [st.st_mtime_ns, st.st_size, lines, size]
+
+    if stale or len(results) != len(cache):
+        save_json(FILE_CACHE, results)
+    return results
+
+def sub_app_of(relpath):
+    """Which sub-app a path belongs to"""
+    top = relpath.split('/', 1)[0]
+    return top if top in SUB_APPS and '/' in relpath else '(root)'
+
+def project_stats(root=PROJECT_ROOT):
+    """Measure the overview counts that used to be hard-coded"""
+    migrations = sorted((root / 'supabase' / 'migrations').glob('*.sql'))
+    sql = '\n'.join(p.read_text(encoding='utf-8', errors='replace') for p in migrations)
+
+    tables = set(re.findall(r'create\s+table\s+(?:if\s+not\s+exists\s+)?(?:public\.)?"?(\w+)"?',
+                            sql, re.IGNORECASE))
+    tables -= set(re.findall(r'drop\s+table\s+(?:if\s+exists\s+)?(?:public\.)?"?(\w+)"?',
+                             sql, re.IGNORECASE))
+
+    buckets = set()
+    for statement in re.findall(r'insert\s+into\s+storage\.buckets.*?;', sql, re.IGNORECASE | re.DOTALL):
+        values = re.split(r'\bvalues\b', statement, maxsplit=1, flags=re.IGNORECASE)[-1]
+        buckets.update(re.findall(r"\(\s*'([^']+)'", values))
+
+    functions_dir = root / 'supabase' / 'functions'
+    functions = [p.name for p in functions_dir.iterdir()
+                 if (p / 'index.ts').exists()] if functions_dir.is_dir() else []
+
+    modes_file = root / 'src' / 'lib' / 'modes.js'
+    modes = re.findall(r"^  ['\"]?[\w-]+['\"]?:\s*\{", modes_file.read_text(encoding='utf-8'),
+                       re.MULTILINE) if modes_file.exists() else []
+
+    return {
+        'database_tables': len(tables),
+        'edge_functions': len(functions),
+        'storage_buckets': len(buckets),
+        'ai_modes': len(modes),
+        'migrations': len(migrations)
+    }
+
+def aggregate(files):
+    """Roll per-file counts up by language and sub-app"""
+    totals = {'files': 0, 'lines': 0, 'bytes': 0}
+    by_language = {}
+    by_app = {}
+    for relpath, (_, _, lines, size) in files.items():
+        language = LANGUAGES[os.path.splitext(relpath)[1].lower()]
+        for bucket in (totals,
+                       by_language.setdefault(language, {'files': 0, 'lines': 0, 'bytes': 0}),
+                       by_app.setdefault(sub_app_of(relpath), {'files': 0, 'lines': 0, 'bytes': 0})):
+            bucket['files'] += 1
+            bucket['lines'] += lines
+            bucket['bytes'] += size
+    return totals, by_language, by_app
+
+def snapshot_values(totals, by_language, by_app, stats):
+    """Flatten one measurement into {series_name: value}"""
+    values = {f'total.{k}': v for k, v in totals.items()}
+    for language, counts in by_language.items():
+        values[f'lang.{language}.lines'] = counts['lines']
+    for app, counts in by_app.items():
+        values[f'app.{app}.lines'] = counts['lines']
+        values[f'app.{app}.files'] = counts['files']
+    for key, value in stats.items():
+        values[f'stat.{key}'] = value
+    return values
+
+_history_lock = threading.Lock()
+
+@contextmanager
+def history_locked(lock_path):
+    """Serialize history updates across threads and, where fcntl exists, across processes"""
+    with _history_lock:
+        Path(lock_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'a+b') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+class MetricsHistory:
+    """Daily snapshots stored as one flat int64 array of fixed-width rows.
+
+    Each row is [day_ordinal, value_0, value_1, ...] with column names kept
+    in a sidecar JSON file. New series widen every row (rare); everything
+    else is an append or an in-place overwrite of today's row.
+    """
+
+    def __init__(self, data_path=HISTORY_DATA, columns_path=HISTORY_COLUMNS):
+        self.data_path = Path(data_path)
+        self.columns_path = Path(columns_path)
+        self.lock_path = self.data_path.with_suffix('.lock')
+        with history_locked(self.lock_path):
+            self.load()
+
+    def load(self):
+        """Read columns and rows from disk (callers hold the history lock)"""
+        self.columns = load_json(self.columns_path, [])
+        self.data = array('q')
+        if self.data_path.exists() and self.columns:
+            with open(self.data_path, 'rb') as f:
+                self.data.frombytes(f.read())
+        # A row cut short by an interrupted write is dropped rather than shifting every later row
+        extra = len(self.data) % self.width
+        if extra:
+            del self.data[len(self.data) - extra:]
+            with open(self.data_path, 'r+b') as f:
+                f.truncate(len(self.data) * self.data.itemsize)
+
+    @property
+    def width(self):
+        """Row width: the day column plus one per series"""
+        return len(self.columns) + 1
+
+    def __len__(self):
+        """Number of stored daily snapshots"""
+        return len(self.data) // self.width if self.columns else 0
+
+    def _widen(self, new_columns):
+        """Add columns, padding existing rows with MISSING"""
+        old_width = self.width
+        self.columns.extend(new_columns)
+        widened = array('q')
+        for start in range(0, len(self.data), old_width):
+            widened.extend(self.data[start:start + old_width])
+            widened.extend([MISSING] * len(new_columns))
+        self.data = widened
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(self.data_path, 'wb') as f:
+            self.data.tofile(f)
+        save_json(self.columns_path, self.columns)
+
+    def record(self, values, day=None):
+        """Store today's snapshot, replacing an earlier one from the same day"""
+        day = (day or date.today()).toordinal()
+        with history_locked(self.lock_path):
+            # Another instance (thread, dashboard or process) may have written since this one loaded
+            self.load()
+            new_columns = [name for name in sorted(values) if name not in self.columns]
+            if new_columns:
+                self._widen(new_columns)
+
+            row = array('q', [day] + [values.get(name, MISSING) for name in self.columns])
+            CACHE_DIR.mkdir(exist_ok=True)
+            if len(self) and self.data[-self.width] == day:
+                if self.data[-self.width:] == row:
+                    return
+                self.data[-self.width:] = row
+                with open(self.data_path, 'r+b') as f:
+                    f.seek(-self.width * row.itemsize, os.SEEK_END)
+                    row.tofile(f)
+            else:
+                self.data.extend(row)
+                with open(self.data_path, 'ab') as f:
+                    row.tofile(f)
+
+    def series(self, name, limit=None):
+        """Return [(iso_date, value)] for one series, oldest first"""
+        if name not in self.columns:
+            return []
+        width = self.width
+        offset = self.columns.index(name) + 1
+        days = self.data[0::width]
+        values = self.data[offset::width]
+        if limit:
+            days, values = days[-limit:], values[-limit:]
+        return [(date.fromordinal(d).isoformat(), v) for d, v in zip(days, values) if v != MISSING]
+
+def collect_metrics(record=True, trend_days=90):
+    """Measure the repository and (by default) store today's snapshot"""
+    files = scan_files()
+    totals, by_language, by_app = aggregate(files)
+    stats = project_stats()
+
+    history = MetricsHistory()
+    if record:
+        history.record(snapshot_values(totals, by_language, by_app, stats))
+
+    return {
+        'totals': totals,
+        'languages': dict(sorted(by_language.items(), key=lambda kv: -kv[1]['lines'])),
+        'apps': dict(sorted(by_app.items(), key=lambda kv: -kv[1]['lines'])),
+        'stats': stats,
+        'trend': {
+            'total.lines': history.series('total.lines', trend_days),
+            'total.files': history.series('total.files', trend_days)
+        },
+        'snapshots': len(history)
+    }
+
+def sparkline(values):
+    """Render a list of numbers as a unicode sparkline"""
+    if len(values) < 2:
+        return ''
+    ticks = '▁▂▃▄▅▆▇█'
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return ''.join(ticks[int((v - low) / span * (len(ticks) - 1))] for v in values)
+
+if __name__ == '__main__':
+    json.dump(collect_metrics(), sys.stdout, indent=2)
+    print()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Command Palette
+Fuzzy search across every command, link, mode, table and function
+"""
+
+from collections import defaultdict
+
+# Entry kinds and the action each one runs when selected
+KIND_ACTIONS = {
+    'command': 'copy',
+    'link': 'open',
+    'mode': 'navigate',
+    'table': 'navigate',
+    'function': 'navigate',
+    'section': 'navigate'
+}
+
+MAX_PREFIX = 4
+
+def make_entry(kind, title, value, subtitle='', target=''):
+    """Build a palette entry"""
+    return {
+        'kind': kind,
+        'title': title,
+        'subtitle': subtitle,
+        'value': value,
+        'target': target,
+        'action': KIND_ACTIONS.get(kind, 'navigate')
+    }
+
+def normalize(text):
+    """Lowercase text and collapse everything that is not a letter or digit"""
+    chars = [c if c.isalnum() else ' ' for c in text.lower()]
+    return ' '.join(''.join(chars).split())
+
+def trigrams(text):
+    """Return the set of trigrams of a normalized string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def subsequence_score(query, text):
+    """Score a fuzzy subsequence match, or return None if query does not match"""
+    score = 0
+    pos = 0
+    prev = -2
+    for ch in query:
+        idx = text.find(ch, pos)
+        if idx < 0:
+            return None
+        if idx == prev + 1:
+            score += 3
+        elif idx == 0 or text[idx - 1] == ' ':
+            score += 2
+        else:
+            score += 1
+        prev = idx
+        pos = idx + 1
+    return score - (len(text) - len(query)) * 0.01
+
+class PaletteIndex:
+    """Precomputed trigram and word-prefix index over palette entries"""
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.texts = []
+        self.grams = defaultdict(list)
+        self.prefixes = defaultdict(list)
+
+        for i, entry in enumerate(self.entries):
+            text = normalize(f"{entry['title']} {entry['subtitle']} {entry['value']} {entry['kind']}")
+            self.texts.append(text)
+
+            for gram in trigrams(text):
+                self.grams[gram].append(i)
+
+            seen = set()
+            for word in text.split():
+                for n in range(1, min(len(word), MAX_PREFIX) + 1):
+                    prefix = word[:n]
+                    if prefix not in seen:
+                        seen.add(prefix)
+                        self.prefixes[prefix].append(i)
+
+    def candidates(self, query):
+        """Return candidate entry ids with their trigram hit counts"""
+        hits = defaultdict(int)
+        words = query.split()
+
+        # Short words go through the prefix table, longer ones through trigrams
+        for word in words:
+            if len(word) <= MAX_PREFIX:
+                for i in self.prefixes.get(word, ()):
+                    hits[i] += 2
+        if len(query) >= 3:
+            for gram in trigrams(query):
+                for i in self.grams.get(gram, ()):
+                    hits[i] += 1
+        return hits
+
+    def search(self, query, limit=10):
+        """Return the best matching entries for a query"""
+        query = normalize(query)
+        if not query:
+            return self.entries[:limit]
+
+        hits = self.candidates(query)
+        compact = query.replace(' ', '')
+        min_hits = max(1, len(trigrams(query)) // 2)
+        scored = []
+
+        if hits:
+            pool = hits.items()
+        else:
+            # Nothing shares a trigram or prefix, fall back to a subsequence scan
+            pool = ((i, 0) for i in range(len(self.entries)))
+
+        for i, count in pool:
+            text = self.texts[i]
+            fuzzy = subsequence_score(compact, text)
+            if fuzzy is None and count < min_hits:
+                continue
+            score = count + (fuzzy or 0)
+            if text.startswith(query):
+                score += 10
+            elif query in text:
+                score += 5
+            scored.append((score, i))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [self.entries[i] for _, i in scored[:limit]]
+
+def build_entries(commands=(), links=(), modes=(), tables=(), functions=(), sections=()):
+    """Build palette entries from the (name, value) pairs each dashboard already has"""
+    entries = []
+    for desc, cmd in commands:
+        entries.append(make_entry('command', desc, cmd, target='commands'))
+    for name, url in links:
+        entries.append(make_entry('link', name, url, target='links'))
+    for name, desc in modes:
+        entries.append(make_entry('mode', name, name, desc, target='ai-modes'))
+    for name, desc in tables:
+        entries.append(make_entry('table', name, name, desc, target='supabase'))
+    for name, desc in functions:
+        entries.append(make_entry('function', name, name, desc, target='supabase'))
+    for name, key in sections:
+        entries.append(make_entry('section', name, key, target=key))
+    return entries
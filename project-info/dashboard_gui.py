@@ -7,8 +7,31 @@ A sleek, modern graphical interface for project information
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import os
+import sys
+import base64
+import queue
+import webbrowser
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from command_palette import PaletteIndex, build_entries
+from dependency_analyzer import analyze_dependencies, format_size, install_size_label
+from bundle_analyzer import all_latest_reports
+from code_metrics import collect_metrics, sparkline
+from duplicate_detector import find_duplicates
+from archive_inspector import inspect_archives, preview_member
+from gemini_proxy import cache_summary
+from table_mirror import mirror_summary
+from bucket_audit import load_report
+from gui_monitor import LagMonitor, load_stalls
+from profiler import profile_mode, profiling, profiling_active, span
+from project_registry import compare_projects
+from stripe_events import DEFAULT_EXPORT, billing_summary
+from alert_rules import RuleError, evaluate_alerts
+from timeseries import history
+from deploy_runner import DEFAULT_CONCURRENCY, deploy_history, list_functions, start_deploy
+from thumbnail_cache import gallery_page, get_cache, resolve_object
 
 class ModernDashboard:
     """Professional dashboard with modern UI/UX"""
@@ -29,6 +52,91 @@ class ModernDashboard:
         'sidebar_bg': '#0e1628'
     }
 
+    # Shared page data (also indexed by the command palette)
+    TABLES = [
+        ("profiles", "User profiles, avatars, bios"),
+        ("photos", "Photo metadata and URLs"),
+        ("gifs", "Generated GIF files"),
+        ("usage_stats", "User analytics"),
+        ("favorite_modes", "User's favorite AI modes"),
+        ("subscription_tiers", "Pricing tiers"),
+        ("subscriptions", "User subscriptions"),
+        ("usage_limits", "Monthly limits"),
+        ("payments", "Payment history")
+    ]
+
+    FUNCTIONS = [
+        ("process-image", "Transform photos with Gemini API"),
+        ("create-gif", "Server-side GIF generation"),
+        ("create-checkout-session", "Stripe checkout initialization"),
+        ("create-portal-session", "Stripe customer portal"),
+        ("stripe-webhook", "Handle Stripe webhook events")
+    ]
+
+    COMMANDS = {
+        'development': [
+            ("Start dev server", "npm run dev"),
+            ("Build production", "npm run build"),
+            ("Preview build", "npm run preview"),
+            ("Gemini cache proxy", "python project-info/gemini_proxy.py")
+        ],
+        'supabase': [
+            ("Apply migrations", "supabase db push"),
+            ("Deploy all functions", "supabase functions deploy"),
+            ("Deploy in parallel", "python project-info/deploy_runner.py"),
+            ("View function logs", "supabase functions logs [name]"),
+            ("Set secret", "supabase secrets set KEY=value"),
+            ("List secrets", "supabase secrets list"),
+            ("Offline stand-in", "python project-info/local_supabase.py"),
+            ("Sync table mirror", "python project-info/table_mirror.py"),
+            ("Audit storage", "python project-info/bucket_audit.py")
+        ],
+        'deployment': [
+            ("Preview deployment", "vercel"),
+            ("Production deploy", "vercel --prod")
+        ]
+    }
+
+    LINKS = {
+        'stripe': [
+            ("Dashboard", "https://dashboard.stripe.com"),
+            ("Test Mode", "https://dashboard.stripe.com/test/dashboard"),
+            ("API Keys", "https://dashboard.stripe.com/test/apikeys"),
+            ("Webhooks", "https://dashboard.stripe.com/test/webhooks")
+        ],
+        'external': [
+            ("Gemini API", "https://ai.google.dev"),
+            ("Vercel", "https://vercel.com/dashboard"),
+            ("React Docs", "https://react.dev"),
+            ("Vite Docs", "https://vitejs.dev")
+        ]
+    }
+
+    MODES = [
+        ("🎨 Renaissance", "Classical renaissance painting"),
+        ("😃 Cartoon", "Cute simple cartoon style"),
+        ("🏛️ Statue", "Classical marble sculpture"),
+        ("🍌 Banana", "Person wearing banana costume"),
+        ("✨ 80s", "Retro 1980s yearbook photo"),
+        ("🎩 19th Century", "Victorian daguerreotype"),
+        ("🍣 Anime", "Photorealistic anime character"),
+        ("🌈 Psychedelic", "1960s psychedelic poster art"),
+        ("🎮 8-bit", "Minimalist pixel art (80x80)"),
+        ("🧔🏻 Big Beard", "Epic huge beard transformation"),
+        ("💥 Comic Book", "Classic comic panel style"),
+        ("👵🏻 Old", "Aged 60+ years transformation"),
+        ("🎬 Film Noir", "1940s dramatic black & white"),
+        ("🧱 Claymation", "Stop-motion clay character"),
+        ("🤖 Cyberpunk", "Futuristic neon dystopia"),
+        ("🖼️ Oil Painting", "Classical oil with brushstrokes"),
+        ("🎨 Pop Art", "Andy Warhol style"),
+        ("🧟 Zombie", "Horror movie undead"),
+        ("🦸 Superhero", "Comic book hero costume"),
+        ("⚔️ Medieval Knight", "Full plate armor warrior"),
+        ("⛪ Stained Glass", "Gothic cathedral window"),
+        ("💧 Watercolor", "Soft watercolor painting")
+    ]
+
     def __init__(self, root):
         self.root = root
         self.root.title("GemBooth Project Dashboard")
@@ -41,9 +149,25 @@ class ModernDashboard:
         # Load environment variables
         self.load_env_data()
 
+        # Event-loop lag heartbeat and page/card build timings
+        self.monitor = LagMonitor(self.root)
+
         # Create main layout
         self.create_layout()
 
+        # Live lag overlay (F12 toggles it)
+        self.lag_overlay = tk.Label(self.root, bg=self.COLORS['sidebar_bg'], fg=self.COLORS['text_secondary'],
+                                    font=('Consolas', 8), padx=8, pady=2)
+        self.lag_overlay.place(relx=1.0, rely=1.0, anchor='se')
+        self.root.bind('<F12>', lambda e: self.toggle_lag_overlay())
+        self.monitor.attach_overlay(self.lag_overlay)
+        self.monitor.start()
+
+        # Command palette (Ctrl+K)
+        self.palette_index = None
+        self.root.bind('<Control-k>', lambda e: self.open_command_palette())
+        self.root.bind('<Control-K>', lambda e: self.open_command_palette())
+
         # Center window
         self.center_window()
 
@@ -127,7 +251,7 @@ class ModernDashboard:
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=30, pady=30)
 
         # Show overview by default
-        self.show_overview()
+        self.open_page("📊 Overview", self.show_overview)
 
     def create_sidebar(self, parent):
         """Create navigation sidebar"""
@@ -161,12 +285,47 @@ class ModernDashboard:
             ("🔗 Quick Links", self.show_links),
             ("📁 Structure", self.show_structure),
             ("🎨 AI Modes", self.show_ai_modes),
+            ("📦 Dependencies", self.show_dependencies),
+            ("🏗️ Bundle Size", self.show_bundle),
+            ("📈 Code Metrics", self.show_metrics),
+            ("🧬 Duplicates", self.show_duplicates),
+            ("🗜️ Archives", self.show_archives),
+            ("♻️ Gemini Cache", self.show_gemini_cache),
+            ("🪞 Mirror", self.show_mirror),
+            ("🪣 Storage Audit", self.show_storage_audit),
+            ("🖼️ Gallery", self.show_gallery),
+            ("🚀 Deploy", self.show_deploy),
+            ("⏱️ GUI Lag", self.show_gui_lag),
+            ("🌐 Projects", self.show_projects),
+            ("🚨 Alerts", self.show_alerts),
+            ("📉 History", self.show_history),
             ("🔧 Troubleshoot", self.show_troubleshooting),
         ]
 
+        # More pages than fit under the logo: the buttons scroll in a canvas (wheel or scrollbar)
+        nav_area = tk.Frame(sidebar, bg=self.COLORS['sidebar_bg'])
+        nav_area.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        nav_canvas = tk.Canvas(nav_area, bg=self.COLORS['sidebar_bg'], highlightthickness=0)
+        nav_scrollbar = ttk.Scrollbar(nav_area, orient='vertical', command=nav_canvas.yview)
+        nav = tk.Frame(nav_canvas, bg=self.COLORS['sidebar_bg'])
+        nav_window = nav_canvas.create_window((0, 0), window=nav, anchor='nw')
+        nav.bind('<Configure>', lambda e: nav_canvas.configure(scrollregion=nav_canvas.bbox('all')))
+        nav_canvas.bind('<Configure>', lambda e: nav_canvas.itemconfigure(nav_window, width=e.width))
+        nav_canvas.configure(yscrollcommand=nav_scrollbar.set)
+        nav_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        nav_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def on_wheel(event):
+            step = -1 if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0 else 1
+            nav_canvas.yview_scroll(step * 2, 'units')
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            nav_canvas.bind(sequence, on_wheel)
+
+        self.pages = nav_buttons
         for text, command in nav_buttons:
-            btn = tk.Button(sidebar, text=text,
-                          command=command,
+            btn = tk.Button(nav, text=text,
+                          command=lambda text=text, command=command: self.open_page(text, command),
                           bg=self.COLORS['sidebar_bg'],
                           fg=self.COLORS['text_secondary'],
                           activebackground=self.COLORS['bg_light'],
@@ -175,9 +334,11 @@ class ModernDashboard:
                           anchor='w',
                           font=('Segoe UI', 11),
                           padx=20,
-                          pady=15,
+                          pady=8,
                           cursor='hand2')
-            btn.pack(fill=tk.X, padx=10, pady=2)
+            btn.pack(fill=tk.X, padx=10, pady=1)
+            for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+                btn.bind(sequence, on_wheel)
 
             # Hover effects
             btn.bind('<Enter>', lambda e, b=btn: b.config(bg=self.COLORS['bg_light'],
@@ -185,6 +346,22 @@ class ModernDashboard:
             btn.bind('<Leave>', lambda e, b=btn: b.config(bg=self.COLORS['sidebar_bg'],
                                                            fg=self.COLORS['text_secondary']))
 
+    def open_page(self, name, show):
+        """Show a page, timing the build; when profiling, also time Tk laying it out"""
+        name = name.split(' ', 1)[-1]
+        with self.monitor.timed(name), span(name, 'compute'):
+            show()
+        if profiling_active():
+            with span(name, 'render'):
+                self.root.update_idletasks()
+
+    def toggle_lag_overlay(self):
+        """Show or hide the lag overlay"""
+        if self.lag_overlay.winfo_ismapped():
+            self.lag_overlay.place_forget()
+        else:
+            self.lag_overlay.place(relx=1.0, rely=1.0, anchor='se')
+
     def clear_content(self):
         """Clear content area"""
         for widget in self.content_frame.winfo_children():
@@ -203,7 +380,8 @@ class ModernDashboard:
         content_frame = ttk.Frame(card, style='Card.TFrame')
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
 
-        content_func(content_frame)
+        with self.monitor.timed(title):
+            content_func(content_frame)
 
         return card
 
@@ -257,12 +435,17 @@ class ModernDashboard:
 
         self.create_card(cards, "📋 Project Information", project_content)
 
-        # Quick Stats Card
+        # Quick Stats Card (measured from migrations, functions and modes.js)
+        metrics = collect_metrics()
+
         def stats_content(frame):
-            self.create_info_row(frame, "Database Tables", "9 tables", self.COLORS['success'])
-            self.create_info_row(frame, "Edge Functions", "5 functions", self.COLORS['success'])
-            self.create_info_row(frame, "Storage Buckets", "2 buckets", self.COLORS['success'])
-            self.create_info_row(frame, "AI Modes", "22 modes", self.COLORS['success'])
+            stats = metrics['stats']
+            trend = [value for _, value in metrics['trend']['total.lines']]
+            self.create_info_row(frame, "Database Tables", f"{stats['database_tables']} tables", self.COLORS['success'])
+            self.create_info_row(frame, "Edge Functions", f"{stats['edge_functions']} functions", self.COLORS['success'])
+            self.create_info_row(frame, "Storage Buckets", f"{stats['storage_buckets']} buckets", self.COLORS['success'])
+            self.create_info_row(frame, "AI Modes", f"{stats['ai_modes']} modes", self.COLORS['success'])
+            self.create_info_row(frame, "Source Lines", f"{metrics['totals']['lines']:,}  {sparkline(trend)}")
 
         self.create_card(cards, "📊 Quick Statistics", stats_content)
 
@@ -410,19 +593,7 @@ class ModernDashboard:
 
         # Database Tables
         def tables_content(frame):
-            tables = [
-                ("profiles", "User profiles, avatars, bios"),
-                ("photos", "Photo metadata and URLs"),
-                ("gifs", "Generated GIF files"),
-                ("usage_stats", "User analytics"),
-                ("favorite_modes", "User's favorite AI modes"),
-                ("subscription_tiers", "Pricing tiers"),
-                ("subscriptions", "User subscriptions"),
-                ("usage_limits", "Monthly limits"),
-                ("payments", "Payment history")
-            ]
-
-            for table, desc in tables:
+            for table, desc in self.TABLES:
                 row = ttk.Frame(frame, style='Card.TFrame')
                 row.pack(fill=tk.X, pady=3)
 
@@ -451,15 +622,7 @@ class ModernDashboard:
 
         # Edge Functions
         def functions_content(frame):
-            functions = [
-                ("process-image", "Transform photos with Gemini API"),
-                ("create-gif", "Server-side GIF generation"),
-                ("create-checkout-session", "Stripe checkout initialization"),
-                ("create-portal-session", "Stripe customer portal"),
-                ("stripe-webhook", "Handle Stripe webhook events")
-            ]
-
-            for func, desc in functions:
+            for func, desc in self.FUNCTIONS:
                 row = ttk.Frame(frame, style='Card.TFrame')
                 row.pack(fill=tk.X, pady=3)
 
@@ -551,6 +714,31 @@ class ModernDashboard:
 
         self.create_card(cards, "💰 Subscription Tiers", tiers_content)
 
+        # Billing activity from exported events
+        billing = billing_summary()
+
+        def billing_content(frame):
+            if not billing:
+                self.create_info_row(frame, "Exports", f"none in {DEFAULT_EXPORT.name}/", self.COLORS['warning'])
+                return
+            for row in billing['mrr']:
+                self.create_info_row(frame, f"MRR {row['tier'].title()} ({row['subscribers']})",
+                                     f"{row['mrr'] / 100:,.2f} {row['currency'].upper()}", self.COLORS['success'])
+            self.create_info_row(frame, "Free / Trialing", f"{billing['free']} / {billing['trialing']}")
+            churn, recovery, funnel = billing['churn'], billing['recovery'], billing['funnel']
+            if churn['rate'] is not None:
+                self.create_info_row(frame, f"Churn ({churn['window_days']}d)",
+                                     f"{churn['rate']:.1%} ({churn['canceled']} canceled)",
+                                     self.COLORS['warning'] if churn['rate'] > 0.05 else self.COLORS['success'])
+            if recovery['rate'] is not None:
+                self.create_info_row(frame, "Payment Recovery",
+                                     f"{recovery['rate']:.1%} ({recovery['recovered']} of {recovery['failed']})")
+            self.create_info_row(frame, "Trials Converted", f"{funnel['conversions']} of {funnel['trials']}")
+            self.create_info_row(frame, "Upgrades / Downgrades", f"{funnel['upgrades']} / {funnel['downgrades']}")
+            self.create_info_row(frame, "Events", f"{billing['events']:,} from {billing['files']} exports")
+
+        self.create_card(cards, "📈 Billing Activity", billing_content)
+
     def show_commands(self):
         """Show quick commands"""
         self.clear_content()
@@ -574,40 +762,21 @@ class ModernDashboard:
 
         # Development Commands
         def dev_content(frame):
-            commands = [
-                ("Start dev server", "npm run dev"),
-                ("Build production", "npm run build"),
-                ("Preview build", "npm run preview")
-            ]
-
-            for desc, cmd in commands:
+            for desc, cmd in self.COMMANDS['development']:
                 self.create_command_row(frame, desc, cmd)
 
         self.create_card(scrollable_frame, "⚡ Development", dev_content)
 
         # Supabase Commands
         def supabase_content(frame):
-            commands = [
-                ("Apply migrations", "supabase db push"),
-                ("Deploy all functions", "supabase functions deploy"),
-                ("View function logs", "supabase functions logs [name]"),
-                ("Set secret", "supabase secrets set KEY=value"),
-                ("List secrets", "supabase secrets list")
-            ]
-
-            for desc, cmd in commands:
+            for desc, cmd in self.COMMANDS['supabase']:
                 self.create_command_row(frame, desc, cmd)
 
         self.create_card(scrollable_frame, "🗄️ Supabase", supabase_content)
 
         # Deployment Commands
         def deploy_content(frame):
-            commands = [
-                ("Preview deployment", "vercel"),
-                ("Production deploy", "vercel --prod")
-            ]
-
-            for desc, cmd in commands:
+            for desc, cmd in self.COMMANDS['deployment']:
                 self.create_command_row(frame, desc, cmd)
 
         self.create_card(scrollable_frame, "🚀 Deployment", deploy_content)
@@ -668,55 +837,41 @@ class ModernDashboard:
 
         # Supabase Links
         def supabase_links(frame):
-            url = self.env_data.get('VITE_SUPABASE_URL', '')
-            if url:
-                project_ref = url.replace('https://', '').replace('.supabase.co', '')
-                links = [
-                    ("Dashboard", f"https://supabase.com/dashboard/project/{project_ref}"),
-                    ("Database", f"https://supabase.com/dashboard/project/{project_ref}/editor"),
-                    ("Storage", f"https://supabase.com/dashboard/project/{project_ref}/storage/buckets"),
-                    ("Functions", f"https://supabase.com/dashboard/project/{project_ref}/functions")
-                ]
-            else:
-                links = [("Dashboard", "https://supabase.com/dashboard")]
-
-            for name, link in links:
+            for name, link in self.get_supabase_links():
                 self.create_link_row(frame, name, link)
 
         self.create_card(cards, "🗄️ Supabase Dashboards", supabase_links)
 
         # Stripe Links
         def stripe_links(frame):
-            links = [
-                ("Dashboard", "https://dashboard.stripe.com"),
-                ("Test Mode", "https://dashboard.stripe.com/test/dashboard"),
-                ("API Keys", "https://dashboard.stripe.com/test/apikeys"),
-                ("Webhooks", "https://dashboard.stripe.com/test/webhooks")
-            ]
-
-            for name, link in links:
+            for name, link in self.LINKS['stripe']:
                 self.create_link_row(frame, name, link)
 
         self.create_card(cards, "💳 Stripe Dashboards", stripe_links)
 
         # External Resources
         def external_links(frame):
-            links = [
-                ("Gemini API", "https://ai.google.dev"),
-                ("Vercel", "https://vercel.com/dashboard"),
-                ("React Docs", "https://react.dev"),
-                ("Vite Docs", "https://vitejs.dev")
-            ]
-
-            for name, link in links:
+            for name, link in self.LINKS['external']:
                 self.create_link_row(frame, name, link)
 
         self.create_card(cards, "📚 External Resources", external_links)
 
+    def get_supabase_links(self):
+        """Supabase dashboard links for the configured project"""
+        url = self.env_data.get('VITE_SUPABASE_URL', '')
+        if not url:
+            return [("Dashboard", "https://supabase.com/dashboard")]
+
+        project_ref = url.replace('https://', '').replace('.supabase.co', '')
+        return [
+            ("Dashboard", f"https://supabase.com/dashboard/project/{project_ref}"),
+            ("Database", f"https://supabase.com/dashboard/project/{project_ref}/editor"),
+            ("Storage", f"https://supabase.com/dashboard/project/{project_ref}/storage/buckets"),
+            ("Functions", f"https://supabase.com/dashboard/project/{project_ref}/functions")
+        ]
+
     def create_link_row(self, parent, name, url):
         """Create a clickable link row"""
-        import webbrowser
-
         row = ttk.Frame(parent, style='Card.TFrame')
         row.pack(fill=tk.X, pady=5)
 
@@ -842,32 +997,7 @@ class ModernDashboard:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        modes = [
-            ("🎨 Renaissance", "Classical renaissance painting"),
-            ("😃 Cartoon", "Cute simple cartoon style"),
-            ("🏛️ Statue", "Classical marble sculpture"),
-            ("🍌 Banana", "Person wearing banana costume"),
-            ("✨ 80s", "Retro 1980s yearbook photo"),
-            ("🎩 19th Century", "Victorian daguerreotype"),
-            ("🍣 Anime", "Photorealistic anime character"),
-            ("🌈 Psychedelic", "1960s psychedelic poster art"),
-            ("🎮 8-bit", "Minimalist pixel art (80x80)"),
-            ("🧔🏻 Big Beard", "Epic huge beard transformation"),
-            ("💥 Comic Book", "Classic comic panel style"),
-            ("👵🏻 Old", "Aged 60+ years transformation"),
-            ("🎬 Film Noir", "1940s dramatic black & white"),
-            ("🧱 Claymation", "Stop-motion clay character"),
-            ("🤖 Cyberpunk", "Futuristic neon dystopia"),
-            ("🖼️ Oil Painting", "Classical oil with brushstrokes"),
-            ("🎨 Pop Art", "Andy Warhol style"),
-            ("🧟 Zombie", "Horror movie undead"),
-            ("🦸 Superhero", "Comic book hero costume"),
-            ("⚔️ Medieval Knight", "Full plate armor warrior"),
-            ("⛪ Stained Glass", "Gothic cathedral window"),
-            ("💧 Watercolor", "Soft watercolor painting")
-        ]
-
-        for i, (mode, desc) in enumerate(modes):
+        for i, (mode, desc) in enumerate(self.MODES):
             card = tk.Frame(scrollable_frame, bg=self.COLORS['card_bg'],
                           relief=tk.FLAT, padx=15, pady=15)
             card.pack(fill=tk.X, pady=5)
@@ -889,6 +1019,886 @@ class ModernDashboard:
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+    def show_dependencies(self):
+        """Show dependency graph from package-lock.json"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Dependencies",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        report = analyze_dependencies()
+        if 'error' in report:
+            self.create_info_row(self.content_frame, "Error", report['error'], self.COLORS['accent'])
+            return
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def summary_content(frame):
+            self.create_info_row(frame, "Lockfile", report['lockfile'])
+            self.create_info_row(frame, "Packages", f"{report['total_packages']} ({report['dev_packages']} dev-only)",
+                               self.COLORS['success'])
+            self.create_info_row(frame, "Install Size", install_size_label(report))
+            self.create_info_row(frame, "Duplicates", str(len(report['duplicates'])),
+                               self.COLORS['warning'] if report['duplicates'] else self.COLORS['success'])
+
+        self.create_card(scrollable_frame, "🔒 Lockfile Summary", summary_content)
+
+        def apps_content(frame):
+            for app in report['apps']:
+                text = f"{app['direct']} direct, {app['transitive']} transitive, {len(app['exclusive'])} only here"
+                if app['unresolved']:
+                    text += f"  ⚠ not in lockfile: {', '.join(app['unresolved'])}"
+                self.create_info_row(frame, app['name'], text)
+
+        self.create_card(scrollable_frame, "🧩 Apps", apps_content)
+
+        def heaviest_content(frame):
+            for dep in report['top_level'][:10]:
+                label = f"{dep['name']}{' (dev)' if dep['dev'] else ''}"
+                self.create_info_row(frame, label, f"{dep['version']} · {dep['transitive']} transitive")
+
+        self.create_card(scrollable_frame, "🏋️ Heaviest Direct Dependencies", heaviest_content)
+
+        if report['duplicates']:
+            def duplicates_content(frame):
+                for dup in report['duplicates']:
+                    self.create_info_row(frame, dup['name'], ', '.join(dup['versions']), self.COLORS['warning'])
+
+            self.create_card(scrollable_frame, "♊ Duplicate Versions", duplicates_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_bundle(self):
+        """Show recorded build output sizes"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Build Output & Bundle Size",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        reports = all_latest_reports()
+        if not reports:
+            def empty_content(frame):
+                self.create_info_row(frame, "No builds yet", "Record one with:", self.COLORS['warning'])
+                self.create_command_row(frame, "Build and record bundle sizes",
+                                      "python project-info/bundle_analyzer.py --build")
+
+            self.create_card(self.content_frame, "🏗️ Bundle Size", empty_content)
+            return
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        for app, report in reports.items():
+            def app_content(frame, report=report):
+                record = report['build']
+                self.create_info_row(frame, "Built", record['timestamp'] + (
+                    f" in {record['duration']}s" if record['duration'] is not None else ""))
+                self.create_info_row(frame, "Total", f"{format_size(record['total_raw'])} raw / "
+                                                     f"{format_size(record['total_gzip'])} gzip",
+                                   self.COLORS['success'])
+                for reg in report['regressions']:
+                    self.create_info_row(frame, "▲ Regression",
+                                       f"{reg['key']} +{format_size(reg['growth'])} gzip",
+                                       self.COLORS['accent'])
+                for chunk in record['chunks'][:10]:
+                    oversized = chunk['key'] in report['oversized']
+                    self.create_info_row(frame, chunk['file'],
+                                       f"{format_size(chunk['raw'])} ({format_size(chunk['gzip'])} gzip)"
+                                       + ("  ⚠ oversized" if oversized else ""),
+                                       self.COLORS['warning'] if oversized else None)
+
+            self.create_card(scrollable_frame, f"📦 {app}", app_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_metrics(self):
+        """Show code size per language and sub-app"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Code Metrics",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        metrics = collect_metrics()
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def totals_content(frame):
+            totals = metrics['totals']
+            trend = [value for _, value in metrics['trend']['total.lines']]
+            self.create_info_row(frame, "Files", f"{totals['files']:,}", self.COLORS['success'])
+            self.create_info_row(frame, "Lines", f"{totals['lines']:,}", self.COLORS['success'])
+            self.create_info_row(frame, "Size", format_size(totals['bytes']))
+            self.create_info_row(frame, "Trend", sparkline(trend) or "Collecting daily snapshots")
+
+        self.create_card(scrollable_frame, "📊 Totals", totals_content)
+
+        for card_title, rows in (("🧩 By Sub-App", metrics['apps']), ("🔤 By Language", metrics['languages'])):
+            def rows_content(frame, rows=rows):
+                for name, counts in rows.items():
+                    self.create_info_row(frame, name, f"{counts['lines']:,} lines · {counts['files']} files · "
+                                                      f"{format_size(counts['bytes'])}")
+
+            self.create_card(scrollable_frame, card_title, rows_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_duplicates(self):
+        """Show near-duplicate files ranked by estimated savings"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Duplicate Code",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        report = find_duplicates(limit=25)
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def summary_content(frame):
+            self.create_info_row(frame, "Files Scanned", str(report['files']))
+            self.create_info_row(frame, "Archives", ', '.join(report['archives']) or "None")
+            self.create_info_row(frame, "Near-Duplicate Pairs", str(report['total_pairs']), self.COLORS['warning'])
+            self.create_info_row(frame, "Estimated Savings", format_size(report['estimated_savings']),
+                                 self.COLORS['success'])
+
+        self.create_card(scrollable_frame, "📊 Summary", summary_content)
+
+        def pairs_content(frame):
+            for pair in report['pairs']:
+                self.create_info_row(frame, f"{pair['similarity']:.0%} · ~{format_size(pair['savings'])}",
+                                     f"{pair['a']}:{pair['lines_a'][0]}-{pair['lines_a'][1]}\n"
+                                     f"{pair['b']}:{pair['lines_b'][0]}-{pair['lines_b'][1]}")
+
+        self.create_card(scrollable_frame, "✂️ Dedupe Opportunities", pairs_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_archives(self):
+        """Show zip archive contents and drift from their extracted directories"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Archives",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        for report in inspect_archives():
+            def archive_content(frame, report=report):
+                drift = report['drift']
+                self.create_info_row(frame, "Members", f"{len(report['members'])} "
+                                                       f"({format_size(report['total_size'])} unpacked)")
+                self.create_info_row(frame, "Extracted To", f"{report['directory']}/" if report['directory']
+                                     else "Not extracted")
+                if drift:
+                    in_sync = not (drift['added'] or drift['removed'] or drift['modified'])
+                    self.create_info_row(frame, "Status", f"{'In sync' if in_sync else 'Drifted'} · "
+                                                          f"{drift['unchanged']} unchanged",
+                                         self.COLORS['success'] if in_sync else self.COLORS['warning'])
+                    for label, items in (("Added on disk", drift['added']),
+                                         ("Missing on disk", drift['removed']),
+                                         ("Modified", [m['member'] for m in drift['modified']])):
+                        if items:
+                            self.create_info_row(frame, label, '\n'.join(items), self.COLORS['warning'])
+
+                members = tk.Listbox(frame,
+                                   bg=self.COLORS['bg_medium'],
+                                   fg=self.COLORS['text_secondary'],
+                                   selectbackground=self.COLORS['accent'],
+                                   selectforeground=self.COLORS['text_primary'],
+                                   relief=tk.FLAT,
+                                   highlightthickness=0,
+                                   activestyle='none',
+                                   height=min(len(report['members']), 10),
+                                   font=('Consolas', 9))
+                for member in report['members']:
+                    members.insert(tk.END, f"{member['name']}  ({format_size(member['size'])})")
+                members.pack(fill=tk.X, pady=(10, 0))
+                members.bind('<Double-Button-1>', lambda e, r=report, lb=members: self.open_archive_preview(
+                    r['archive'], r['members'][lb.curselection()[0]]['name']) if lb.curselection() else None)
+
+            self.create_card(scrollable_frame, f"🗜️ {report['archive']}", archive_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def open_archive_preview(self, archive, member):
+        """Show the start of one archive member in a window"""
+        preview = preview_member(archive, member)
+
+        window = tk.Toplevel(self.root, bg=self.COLORS['card_bg'])
+        window.title(f"{archive} → {member}")
+        window.geometry("760x520")
+
+        text = tk.Text(window,
+                      bg=self.COLORS['bg_medium'],
+                      fg=self.COLORS['text_primary'],
+                      relief=tk.FLAT,
+                      wrap=tk.NONE,
+                      font=('Consolas', 9))
+        if preview['binary']:
+            text.insert('1.0', f"Binary file ({format_size(preview['size'])})")
+        else:
+            text.insert('1.0', preview['content'])
+            if preview['truncated']:
+                text.insert(tk.END, f"\n… truncated, {format_size(preview['size'])} total")
+        text.configure(state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def show_gemini_cache(self):
+        """Show hit rate and savings of the Gemini caching proxy"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Gemini Cache",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        summary = cache_summary()
+
+        def savings_content(frame):
+            self.create_info_row(frame, "Hit Rate",
+                                 f"{summary['hit_rate']:.0%} ({summary['hits']} hits / {summary['misses']} misses)",
+                                 self.COLORS['success'])
+            self.create_info_row(frame, "Bytes Saved", format_size(summary['bytes_saved']))
+            self.create_info_row(frame, "Cost Avoided", f"${summary['cost_avoided']:.2f}", self.COLORS['success'])
+            self.create_info_row(frame, "Time Saved", f"{summary['seconds_saved']:.0f}s")
+            self.create_info_row(frame, "Upstream Errors", str(summary['errors']),
+                                 self.COLORS['warning'] if summary['errors'] else None)
+
+        self.create_card(self.content_frame, "💰 Savings", savings_content)
+
+        def cache_content(frame):
+            self.create_info_row(frame, "Cached Responses",
+                                 f"{summary['entries']} ({format_size(summary['cache_bytes'])})")
+            self.create_info_row(frame, "Start Proxy", "python project-info/gemini_proxy.py", self.COLORS['info'])
+            self.create_info_row(frame, "Point Dev Server", f"VITE_GEMINI_BASE_URL=http://127.0.0.1:{summary['port']}",
+                                 self.COLORS['info'])
+
+        self.create_card(self.content_frame, "♻️ Cache", cache_content)
+
+    def show_mirror(self):
+        """Show production usage from the local table mirror"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Production Mirror",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        summary = mirror_summary()
+        if not summary['synced']:
+            def empty_content(frame):
+                self.create_info_row(frame, "No mirror yet", "python project-info/table_mirror.py",
+                                     self.COLORS['warning'])
+            self.create_card(self.content_frame, "🪞 Mirror", empty_content)
+            return
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def tables_content(frame):
+            for table in summary['tables']:
+                synced = datetime.fromtimestamp(table['synced_at']).strftime('%Y-%m-%d %H:%M')
+                self.create_info_row(frame, table['table'],
+                                     f"{table['rows']} rows · {table['watermark'] or '-'} · synced {synced}")
+
+        self.create_card(scrollable_frame, "🪞 Tables", tables_content)
+
+        def usage_content(frame):
+            for row in summary['modes']:
+                self.create_info_row(frame, row['mode'] or "(none)", f"{row['photos']} photos")
+            for row in summary['tiers']:
+                self.create_info_row(frame, f"{row['tier_id']} subscribers", str(row['subscribers']),
+                                     self.COLORS['success'])
+            for row in summary['revenue']:
+                self.create_info_row(frame, f"Revenue ({row['currency']})",
+                                     f"{row['total']:.2f} from {row['payments']} payments", self.COLORS['success'])
+
+        self.create_card(scrollable_frame, "📊 Usage", usage_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_storage_audit(self):
+        """Show the last storage bucket audit"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Storage Audit",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        report = load_report()
+        if not report:
+            def empty_content(frame):
+                self.create_info_row(frame, "No audit yet", "python project-info/bucket_audit.py",
+                                     self.COLORS['warning'])
+            self.create_card(self.content_frame, "🪣 Storage", empty_content)
+            return
+
+        # Scrollable content
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_dark'], highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = ttk.Frame(canvas, style='Main.TFrame')
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def summary_content(frame):
+            orphans = report['orphans']
+            self.create_info_row(frame, "Reclaimable", format_size(report['reclaimable_bytes']), self.COLORS['success'])
+            self.create_info_row(frame, "Orphans", "Sync the table mirror first" if orphans is None else
+                                 f"{orphans['count']} ({format_size(orphans['bytes'])})")
+            self.create_info_row(frame, "Identical Copies",
+                                 f"{report['identical_groups']} groups ({format_size(report['identical_bytes'])})")
+            self.create_info_row(frame, "Near-Identical", "pip install Pillow" if report['near_groups'] is None else
+                                 f"{report['near_groups']} groups ({format_size(report['near_bytes'])})")
+
+        self.create_card(scrollable_frame, "♻️ Reclaimable Space", summary_content)
+
+        for bucket in report['buckets']:
+            def bucket_content(frame, bucket=bucket):
+                self.create_info_row(frame, "Objects", f"{bucket['objects']} ({format_size(bucket['bytes'])})")
+                self.create_info_row(frame, "Over Limit", str(bucket['over_limit_count']),
+                                     self.COLORS['accent'] if bucket['over_limit_count'] else self.COLORS['success'])
+                for obj in bucket['over_limit'][:5]:
+                    self.create_info_row(frame, obj['name'], format_size(obj['size']), self.COLORS['warning'])
+                self.create_info_row(frame, "Disallowed Types", str(bucket['disallowed_count']))
+
+            self.create_card(scrollable_frame, f"🪣 {bucket['bucket']}", bucket_content)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def show_gallery(self):
+        """Show generated photos and GIFs, drawing only the thumbnails in view"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Gallery",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        page_size = 200
+        tile = 180
+        first_page = gallery_page(0, page_size)
+        total = first_page['total']
+        if not total:
+            def empty_content(frame):
+                self.create_info_row(frame, "No mirror yet" if not first_page['synced'] else "No images",
+                                     "python project-info/table_mirror.py", self.COLORS['warning'])
+            self.create_card(self.content_frame, "🖼️ Gallery", empty_content)
+            return
+
+        available = first_page['available']
+        subtitle = tk.Label(self.content_frame,
+                            text=f"{total:,} images" + ("" if available else " · install Pillow to render thumbnails"),
+                            bg=self.COLORS['bg_dark'], fg=self.COLORS['text_secondary'],
+                            font=('Segoe UI', 10))
+        subtitle.pack(anchor='w', pady=(0, 10))
+
+        canvas = tk.Canvas(self.content_frame, bg=self.COLORS['bg_medium'], highlightthickness=0,
+                           yscrollincrement=tile // 4)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
+
+        pages = {0: first_page['items']}
+        drawn = {}
+        images = {}
+        ready = queue.Queue()
+        redraw_pending = [False]
+        if not hasattr(self, 'thumbnail_threads'):
+            self.thumbnail_threads = ThreadPoolExecutor(max_workers=4)
+
+        def item_at(index):
+            page = index // page_size
+            if page not in pages:
+                pages[page] = gallery_page(page * page_size, page_size)['items']
+            items = pages[page]
+            return items[index % page_size] if index % page_size < len(items) else None
+
+        def render_job(index, item):
+            # Skip tiles that scrolled away before a worker picked them up
+            if index not in drawn:
+                return
+            data, _ = get_cache().get(resolve_object(item['bucket'], item['name']), 'png')
+            ready.put((index, data))
+
+        def report_failure(index):
+            # Exceptions stay inside the future; hand them to poll() so the tile says why it is empty
+            def done(future):
+                if future.exception() is not None:
+                    ready.put((index, future.exception()))
+            return done
+
+        def redraw():
+            redraw_pending[0] = False
+            if not canvas.winfo_exists():
+                return
+            cols = max(1, canvas.winfo_width() // tile)
+            canvas.configure(scrollregion=(0, 0, cols * tile, -(-total // cols) * tile))
+            top = canvas.canvasy(0)
+            first = max(0, int(top // tile) - 1) * cols
+            last = min(total, (int((top + canvas.winfo_height()) // tile) + 2) * cols)
+
+            for index in [i for i, c in drawn.items() if i < first or i >= last or c != cols]:
+                canvas.delete(f"tile{index}")
+                drawn.pop(index)
+                images.pop(index, None)
+
+            for index in range(first, last):
+                if index in drawn:
+                    continue
+                item = item_at(index)
+                if item is None:
+                    continue
+                x, y = (index % cols) * tile, (index // cols) * tile
+                drawn[index] = cols
+                canvas.create_rectangle(x + 4, y + 4, x + tile - 4, y + tile - 4, fill=self.COLORS['card_bg'],
+                                        outline='', tags=(f"tile{index}",))
+                canvas.create_text(x + 10, y + tile - 12, anchor='w', fill=self.COLORS['text_secondary'],
+                                   text='GIF' if item['kind'] == 'gif' else (item['mode'] or ''),
+                                   font=('Segoe UI', 8), tags=(f"tile{index}", 'label'))
+                if available and item['version']:
+                    self.thumbnail_threads.submit(render_job, index, item).add_done_callback(
+                        report_failure(index))
+
+        def schedule(*args):
+            if not redraw_pending[0]:
+                redraw_pending[0] = True
+                canvas.after_idle(redraw)
+
+        def poll():
+            if not canvas.winfo_exists():
+                return
+            while not ready.empty():
+                index, data = ready.get_nowait()
+                cols = drawn.get(index)
+                if cols is None:
+                    continue
+                x, y = (index % cols) * tile, (index // cols) * tile
+                if not isinstance(data, Exception):
+                    try:
+                        images[index] = tk.PhotoImage(data=base64.b64encode(data))
+                    except tk.TclError as e:
+                        data = e
+                if isinstance(data, Exception):
+                    canvas.create_text(x + tile // 2, y + tile // 2, width=tile - 20, fill=self.COLORS['accent'],
+                                       text=f"⚠️ {str(data) or type(data).__name__}"[:120],
+                                       font=('Segoe UI', 8), tags=(f"tile{index}",))
+                    continue
+                canvas.create_image(x + tile // 2, y + tile // 2, image=images[index], tags=(f"tile{index}",))
+                canvas.tag_raise('label')
+            canvas.after(40, poll)
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            schedule()
+
+        def on_wheel(event):
+            step = -1 if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0 else 1
+            canvas.yview_scroll(step * 2, 'units')
+
+        canvas.configure(yscrollcommand=on_scroll)
+        canvas.bind('<Configure>', schedule)
+        canvas.bind('<MouseWheel>', on_wheel)
+        canvas.bind('<Button-4>', on_wheel)
+        canvas.bind('<Button-5>', on_wheel)
+
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        schedule()
+        poll()
+
+    def show_deploy(self):
+        """Deploy edge functions in parallel, streaming their output into the page"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Deploy Edge Functions",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        functions = list_functions()
+        history = {step['function']: step for step in deploy_history()['steps']}
+        selected = {}
+        status_labels = {}
+        concurrency = tk.IntVar(value=DEFAULT_CONCURRENCY)
+        deploy_button = [None]
+
+        def functions_content(frame):
+            for fn in functions:
+                row = tk.Frame(frame, bg=self.COLORS['card_bg'])
+                row.pack(fill=tk.X, pady=2)
+                selected[fn] = tk.BooleanVar(value=True)
+                tk.Checkbutton(row, text=fn, variable=selected[fn],
+                               bg=self.COLORS['card_bg'], fg=self.COLORS['text_primary'],
+                               selectcolor=self.COLORS['bg_dark'], activebackground=self.COLORS['card_bg'],
+                               font=('Segoe UI', 10), anchor='w').pack(side=tk.LEFT)
+                median = history.get(fn, {}).get('median')
+                status_labels[fn] = tk.Label(row, text=f"~{median:.1f}s" if median is not None else "",
+                                             bg=self.COLORS['card_bg'], fg=self.COLORS['text_secondary'],
+                                             font=('Segoe UI', 10))
+                status_labels[fn].pack(side=tk.RIGHT)
+
+            controls = tk.Frame(frame, bg=self.COLORS['card_bg'])
+            controls.pack(fill=tk.X, pady=(10, 0))
+            tk.Label(controls, text="Parallel deploys:", bg=self.COLORS['card_bg'],
+                     fg=self.COLORS['text_secondary'], font=('Segoe UI', 10, 'bold')).pack(side=tk.LEFT)
+            tk.Spinbox(controls, from_=1, to=max(1, len(functions)), width=4, textvariable=concurrency,
+                       bg=self.COLORS['bg_dark'], fg=self.COLORS['text_primary'],
+                       relief=tk.FLAT).pack(side=tk.LEFT, padx=10)
+            deploy_button[0] = tk.Button(controls, text="🚀 Deploy",
+                                         bg=self.COLORS['accent'], fg=self.COLORS['text_primary'],
+                                         font=('Segoe UI', 9, 'bold'), relief=tk.FLAT, cursor='hand2',
+                                         padx=12, pady=4, command=lambda: start())
+            deploy_button[0].pack(side=tk.RIGHT)
+
+        self.create_card(self.content_frame, "⚡ Functions", functions_content)
+
+        log = scrolledtext.ScrolledText(self.content_frame,
+                                        bg=self.COLORS['bg_dark'],
+                                        fg=self.COLORS['text_secondary'],
+                                        font=('Consolas', 9),
+                                        wrap=tk.NONE,
+                                        height=14,
+                                        padx=10,
+                                        pady=10)
+        log.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        def follow(run, seq):
+            if not log.winfo_exists():
+                return
+            width = max(len(fn) for fn in run.functions)
+            for event in run.follow(seq, timeout=0):
+                seq = event['seq'] + 1
+                if event['kind'] == 'line':
+                    log.insert(tk.END, f"{event['function']:<{width}} │ {event['text']}\n")
+                elif event['kind'] == 'status' and event['function'] in status_labels:
+                    done = event['status'] != 'running'
+                    status_labels[event['function']].config(
+                        text=f"{event['status']} {event['duration']:.1f}s" if done else event['status'],
+                        fg=self.COLORS['success'] if event['status'] == 'ok' else
+                        self.COLORS['accent'] if event['status'] == 'failed' else self.COLORS['info'])
+                elif event['kind'] == 'done':
+                    log.insert(tk.END, f"\n{len(run.functions)} functions in {event['wall_time']:.1f}s "
+                                       f"(sequential would take ~{event['step_total']:.1f}s)\n")
+                    deploy_button[0].config(state=tk.NORMAL)
+                    log.see(tk.END)
+                    return
+            log.see(tk.END)
+            log.after(50, follow, run, seq)
+
+        def start():
+            try:
+                names = [fn for fn, var in selected.items() if var.get()]
+                self.deploy_run = start_deploy(names, concurrency.get())
+            except (ValueError, tk.TclError) as e:
+                messagebox.showerror("Deploy", str(e))
+                return
+            log.delete('1.0', tk.END)
+            deploy_button[0].config(state=tk.DISABLED)
+            follow(self.deploy_run, 0)
+
+        # Reattach to a deploy still running from an earlier visit to this page
+        run = getattr(self, 'deploy_run', None)
+        if run is not None and not run.done:
+            deploy_button[0].config(state=tk.DISABLED)
+            follow(run, 0)
+
+    def show_gui_lag(self):
+        """Show event-loop lag, the slowest page and card builds, and logged stalls"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="GUI Lag",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        lag = self.monitor.lag_summary()
+        slowest = self.monitor.slowest()
+        stalls = load_stalls(limit=15)
+
+        def lag_content(frame):
+            self.create_info_row(frame, "Lag p50 / p95", f"{lag['p50']:.1f} ms / {lag['p95']:.1f} ms")
+            self.create_info_row(frame, "Worst Recent Lag", f"{lag['max']:.1f} ms",
+                                 self.COLORS['warning'] if lag['max'] >= self.monitor.stall_ms else self.COLORS['success'])
+            self.create_info_row(frame, "Stalls This Session", f"{self.monitor.stalls} over {self.monitor.stall_ms} ms")
+            self.create_info_row(frame, "Heartbeat", f"every {self.monitor.heartbeat_ms} ms (F12 toggles the overlay)")
+
+        self.create_card(self.content_frame, "💓 Event Loop", lag_content)
+
+        def builds_content(frame):
+            for path, count, mean, peak in slowest:
+                self.create_info_row(frame, path, f"{peak:.1f} ms max, {mean:.1f} ms mean ({count}x)",
+                                     self.COLORS['warning'] if peak >= self.monitor.stall_ms else None)
+
+        self.create_card(self.content_frame, "🏗️ Slowest Builds", builds_content)
+
+        def stalls_content(frame):
+            if not stalls:
+                self.create_info_row(frame, "No stalls logged", str(self.monitor.log_path.name), self.COLORS['success'])
+            for stall in stalls:
+                when = datetime.fromtimestamp(stall['time']).strftime('%m-%d %H:%M:%S')
+                self.create_info_row(frame, when, f"{stall['lag_ms']:.0f} ms · {stall['section']}", self.COLORS['warning'])
+
+        self.create_card(self.content_frame, "🐢 Recent Stalls", stalls_content)
+
+    def show_projects(self):
+        """Compare every project in config.json; probes run in the background and fill in when done"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Projects & Environments",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        report = compare_projects(probe=False)
+        projects = report['projects']
+        probe_labels = {}
+        if not hasattr(self, 'project_probes'):
+            self.project_probes = ThreadPoolExecutor(max_workers=1)
+        probes = self.project_probes.submit(compare_projects)
+
+        def cell(grid, row, column, text, color):
+            label = tk.Label(grid, text=text, bg=self.COLORS['card_bg'], fg=color, font=('Segoe UI', 10), anchor='w')
+            label.grid(row=row, column=column, sticky='w', padx=(0, 16), pady=2)
+            return label
+
+        def mark(grid, row, column, ok):
+            cell(grid, row, column, "✓" if ok else "✗", self.COLORS['success'] if ok else self.COLORS['accent'])
+
+        def matrix_content(frame):
+            grid = tk.Frame(frame, bg=self.COLORS['card_bg'])
+            grid.pack(fill=tk.X)
+            for column, project in enumerate(projects, 1):
+                cell(grid, 0, column, project['name'], self.COLORS['text_primary'])
+
+            rows = [("Probe", None), ("Migrations", None)] + [(key, 'key') for key in report['keys']] + \
+                   [(fn, 'function') for fn in report['functions']]
+            for row, (label, kind) in enumerate(rows, 1):
+                cell(grid, row, 0, label, self.COLORS['text_secondary'])
+                for column, project in enumerate(projects, 1):
+                    if label == "Probe":
+                        probe_labels[project['name']] = cell(grid, row, column, "checking…",
+                                                             self.COLORS['text_secondary'])
+                    elif label == "Migrations":
+                        behind = len(project['missing_migrations'])
+                        cell(grid, row, column, f"{project['migration_count']}" + (f" ({behind} behind)" if behind else ""),
+                             self.COLORS['warning'] if behind else self.COLORS['success'])
+                    elif kind == 'key':
+                        mark(grid, row, column, project['keys'][label])
+                    else:
+                        mark(grid, row, column, label in project['functions'])
+
+        self.create_card(self.content_frame, "🌐 Comparison", matrix_content)
+
+        def notes_content(frame):
+            for project in projects:
+                if not project['exists']:
+                    self.create_info_row(frame, project['name'], f"{project['root']} does not exist", self.COLORS['accent'])
+                elif not project['env_file']:
+                    self.create_info_row(frame, project['name'], "no env file", self.COLORS['warning'])
+            self.create_info_row(frame, "Registry", f"{len(projects)} projects in project-info/config.json "
+                                                    f"(scanned in {report['elapsed_ms']:.0f} ms)")
+
+        self.create_card(self.content_frame, "📝 Notes", notes_content)
+
+        colors = {'up': self.COLORS['success'], 'auth': self.COLORS['warning'], 'skipped': self.COLORS['text_secondary']}
+
+        def fill_probes():
+            if not title.winfo_exists():
+                return
+            if not probes.done():
+                title.after(100, fill_probes)
+                return
+            for project in probes.result()['projects']:
+                status = project['probe']
+                text = status['status'] + (f" {status['ms']:.0f}ms" if status['ms'] is not None else "")
+                probe_labels[project['name']].config(text=text, fg=colors.get(status['status'], self.COLORS['accent']))
+
+        fill_probes()
+
+    def show_alerts(self):
+        """Evaluate the alert rules from config.json in the background and list what is firing"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Alerts",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        if not hasattr(self, 'alert_evaluations'):
+            self.alert_evaluations = ThreadPoolExecutor(max_workers=1)
+        evaluation = self.alert_evaluations.submit(evaluate_alerts)
+        frames = {}
+
+        def alerts_content(frame):
+            frames['alerts'] = frame
+            tk.Label(frame, text="Evaluating rules…", bg=self.COLORS['card_bg'], fg=self.COLORS['text_secondary'],
+                     font=('Segoe UI', 10), anchor='w').pack(anchor='w')
+
+        self.create_card(self.content_frame, "🚨 Firing", alerts_content)
+
+        colors = {'critical': self.COLORS['accent'], 'warning': self.COLORS['warning'], 'info': self.COLORS['info']}
+
+        def fill_alerts():
+            if not title.winfo_exists():
+                return
+            if not evaluation.done():
+                title.after(100, fill_alerts)
+                return
+            frame = frames['alerts']
+            for child in frame.winfo_children():
+                child.destroy()
+            try:
+                report = evaluation.result()
+            except RuleError as e:
+                self.create_info_row(frame, "config.json", str(e), self.COLORS['accent'])
+                return
+            if not report['active']:
+                self.create_info_row(frame, "Status", "✓ Nothing firing", self.COLORS['success'])
+            for alert in report['active']:
+                self.create_info_row(frame, alert['rule'], alert['message'], colors[alert['severity']])
+            for signal, error in report['errors'].items():
+                self.create_info_row(frame, signal, error, self.COLORS['warning'])
+            self.create_info_row(frame, "Evaluated", f"{report['rules']} rules, {report['signals_collected']} signals "
+                                                     f"collected, {report['delivered']} sent "
+                                                     f"({report['elapsed_ms']:.0f} ms)", self.COLORS['text_secondary'])
+
+        fill_alerts()
+
+    def show_history(self, range_name='24h'):
+        """Chart probe and API latency from the time-series store"""
+        self.clear_content()
+
+        title = ttk.Label(self.content_frame, text="Latency History",
+                         style='Title.TLabel')
+        title.pack(anchor='w', pady=(0, 20))
+
+        data = history(range_name, points=200)
+
+        ranges = tk.Frame(self.content_frame, bg=self.COLORS['bg_dark'])
+        ranges.pack(anchor='w', pady=(0, 10))
+        for name in data['ranges']:
+            tk.Button(ranges, text=name, command=lambda name=name: self.show_history(name),
+                      bg=self.COLORS['accent'] if name == data['range'] else self.COLORS['bg_light'],
+                      fg=self.COLORS['text_primary'], relief=tk.FLAT, padx=10, cursor='hand2').pack(side=tk.LEFT, padx=2)
+
+        width, height = 560, 120
+
+        def chart(frame, points):
+            canvas = tk.Canvas(frame, width=width, height=height, bg=self.COLORS['bg_medium'], highlightthickness=0)
+            canvas.pack(anchor='w', pady=(0, 5))
+            span_ms = data['end'] - data['start']
+            measured = [p for p in points if p[1] is not None]
+            top = max([p[3] for p in measured] + [1])
+            x = lambda t: (t - data['start']) / span_ms * width
+            y = lambda ms: height - ms / top * (height - 10)
+            for p in points:
+                if p[5]:
+                    canvas.create_rectangle(x(p[0]), 0, x(p[0]) + 3, height, fill=self.COLORS['accent'], width=0)
+            for index, color in ((3, self.COLORS['text_secondary']), (1, self.COLORS['info'])):
+                coords = [c for p in measured for c in (x(p[0]), y(p[index]))]
+                if len(coords) >= 4:
+                    canvas.create_line(*coords, fill=color, width=1.5)
+            canvas.create_text(4, 4, text=f"{top:.0f} ms", anchor='nw', fill=self.COLORS['text_secondary'],
+                               font=('Segoe UI', 8))
+
+        for target, points in sorted(data['series'].items()):
+            def series_content(frame, target=target, points=points):
+                chart(frame, points)
+                latest = data['latest'].get(target, {})
+                ok = latest.get('status') and latest['status'] < 500
+                self.create_info_row(frame, "Latest", f"{latest.get('latency') or '-'} ms, status "
+                                                      f"{latest.get('status') or 'unreachable'}",
+                                     self.COLORS['success'] if ok else self.COLORS['accent'])
+                failed = sum(p[5] for p in points)
+                self.create_info_row(frame, "Errors", f"{failed} of {sum(p[4] for p in points)}",
+                                     self.COLORS['accent'] if failed else self.COLORS['success'])
+
+            self.create_card(self.content_frame, ("🌐 " if target.startswith('probe:') else "⚡ ") + target,
+                             series_content)
+
+        def store_content(frame):
+            if not data['series']:
+                self.create_info_row(frame, "Samples", "none yet - open Projects or run timeseries.py --sample 30",
+                                     self.COLORS['warning'])
+            for tier, usage in data['disk'].items():
+                self.create_info_row(frame, tier, f"{usage['segments']} segments, {usage['bytes'] / 1024:.0f} KB")
+            self.create_info_row(frame, "Query", f"{data['resolution']} data, {data['bucket_ms'] / 1000:.0f}s buckets "
+                                                 f"({data['elapsed_ms']:.1f} ms)", self.COLORS['text_secondary'])
+
+        self.create_card(self.content_frame, "💾 Store", store_content)
+
     def show_troubleshooting(self):
         """Show troubleshooting guide"""
         self.clear_content()
@@ -976,11 +1986,104 @@ class ModernDashboard:
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+    def get_page_commands(self):
+        """Map palette navigation targets (show_ai_modes -> 'ai-modes') to (label, page builder) for every sidebar page"""
+        return {show.__name__[len('show_'):].replace('_', '-'): (text, show) for text, show in self.pages}
+
+    def build_palette_index(self):
+        """Index every command, link, mode, table and function"""
+        sections = [(text.split(' ', 1)[-1], key) for key, (text, _) in self.get_page_commands().items()]
+        return PaletteIndex(build_entries(
+            commands=[cmd for group in self.COMMANDS.values() for cmd in group],
+            links=self.get_supabase_links() + [link for group in self.LINKS.values() for link in group],
+            modes=self.MODES,
+            tables=self.TABLES,
+            functions=self.FUNCTIONS,
+            sections=sections
+        ))
+
+    def open_command_palette(self):
+        """Show the Ctrl+K fuzzy search palette"""
+        if self.palette_index is None:
+            self.palette_index = self.build_palette_index()
+
+        palette = tk.Toplevel(self.root, bg=self.COLORS['card_bg'])
+        palette.title("Command Palette")
+        palette.transient(self.root)
+        palette.geometry(f"640x400+{self.root.winfo_rootx() + 380}+{self.root.winfo_rooty() + 120}")
+
+        query = tk.StringVar()
+        entry = tk.Entry(palette, textvariable=query,
+                        bg=self.COLORS['bg_medium'],
+                        fg=self.COLORS['text_primary'],
+                        insertbackground=self.COLORS['text_primary'],
+                        relief=tk.FLAT,
+                        font=('Segoe UI', 13))
+        entry.pack(fill=tk.X, padx=10, pady=10, ipady=6)
+
+        results = tk.Listbox(palette,
+                           bg=self.COLORS['card_bg'],
+                           fg=self.COLORS['text_secondary'],
+                           selectbackground=self.COLORS['accent'],
+                           selectforeground=self.COLORS['text_primary'],
+                           relief=tk.FLAT,
+                           highlightthickness=0,
+                           activestyle='none',
+                           font=('Segoe UI', 10))
+        results.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        matches = []
+
+        def refresh(*_):
+            matches[:] = self.palette_index.search(query.get(), limit=15)
+            results.delete(0, tk.END)
+            for item in matches:
+                detail = item['subtitle'] if item['action'] == 'navigate' else item['value']
+                results.insert(tk.END, f"[{item['kind']}]  {item['title']}  —  {detail}")
+            if matches:
+                results.selection_set(0)
+
+        def move(step):
+            if not matches:
+                return 'break'
+            current = results.curselection()
+            index = ((current[0] if current else 0) + step) % len(matches)
+            results.selection_clear(0, tk.END)
+            results.selection_set(index)
+            results.see(index)
+            return 'break'
+
+        def run(*_):
+            current = results.curselection()
+            if not matches or not current:
+                return
+            item = matches[current[0]]
+            palette.destroy()
+            if item['action'] == 'copy':
+                self.copy_to_clipboard(item['value'])
+            elif item['action'] == 'open':
+                webbrowser.open(item['value'])
+            else:
+                pages = self.get_page_commands()
+                # Through open_page, so palette visits are timed, profiled and named in the stall log
+                self.open_page(*pages.get(item['target'], pages['overview']))
+
+        query.trace_add('write', refresh)
+        entry.bind('<Down>', lambda e: move(1))
+        entry.bind('<Up>', lambda e: move(-1))
+        entry.bind('<Return>', run)
+        results.bind('<Double-Button-1>', run)
+        palette.bind('<Escape>', lambda e: palette.destroy())
+
+        refresh()
+        entry.focus_set()
+
 def main():
     """Main entry point"""
-    root = tk.Tk()
-    app = ModernDashboard(root)
-    root.mainloop()
+    with profiling('gui', profile_mode(sys.argv[1:])):
+        root = tk.Tk()
+        app = ModernDashboard(root)
+        root.mainloop()
 
 if __name__ == "__main__":
     main()
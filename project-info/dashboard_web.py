@@ -4,15 +4,135 @@ GemBooth Project Dashboard - Web Version
 Modern web-based dashboard using Flask
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
+from functools import wraps
 from pathlib import Path
+import hmac
+import json
 import os
+import sys
+import time
 from datetime import datetime
 
+from command_palette import PaletteIndex, build_entries
+from dependency_analyzer import analyze_dependencies
+from bundle_analyzer import all_latest_reports
+from code_metrics import collect_metrics
+from duplicate_detector import find_duplicates
+from archive_inspector import inspect_archives, preview_member
+from gemini_proxy import cache_summary
+from table_mirror import mirror_summary
+from bucket_audit import load_report
+from project_registry import compare_projects
+from stripe_events import billing_summary
+from alert_rules import RuleError, evaluate_alerts
+from timeseries import RANGES, history, record_later
+from deploy_runner import DEFAULT_CONCURRENCY, DeployInProgress, deploy_history, get_run, list_functions, start_deploy
+from section_cache import SectionCache
+from web_metrics import WebMetrics
+from profiler import (MODES, profile_mode, profiling, profiling_active, span, start_thread_profile,
+                      stop_thread_profile)
+from asset_pipeline import asset_url, resolve_asset
+from thumbnail_cache import MIME_TYPES, default_format, gallery_page, get_cache, resolve_object, thumbnails_available
+
 app = Flask(__name__,
            template_folder='templates',
            static_folder='static')
 
+metrics = WebMetrics()
+section_cache = SectionCache(observer=lambda name, seconds: metrics.section_compute.observe(seconds, name))
+metrics.watch_section_cache(section_cache)
+
+@app.before_request
+def start_timer():
+    """Stamp the request start and count it as in flight"""
+    request.environ['gembooth.started'] = time.perf_counter()
+    metrics.request_started()
+
+@app.after_request
+def record_request(response):
+    """Record latency, status and size per route"""
+    req = request._get_current_object()
+    started = req.environ.get('gembooth.started')
+    if started is not None:
+        rule = req.url_rule
+        elapsed = time.perf_counter() - started
+        metrics.request_finished(rule.rule if rule else 'unmatched', req.method, response.status_code,
+                                 None if response.is_streamed else response.content_length, elapsed)
+        # Streams stay open for minutes, which would only flatten the latency history; the sample is queued
+        # and written by a background thread, so the request never waits on the store's file lock
+        if rule and rule.rule.startswith('/api/') and not response.is_streamed:
+            record_later(f"web:{rule.rule}", elapsed * 1000, response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request(error=None):
+    """Stop counting the request as in flight, even when it raised"""
+    if request.environ.pop('gembooth.started', None) is not None:
+        metrics.request_closed()
+    if request.environ.pop('gembooth.profile', None) is not None:
+        stop_thread_profile()
+
+def is_admin():
+    """Anyone sending DASHBOARD_PROFILE_TOKEN when it is set, otherwise only this machine"""
+    token = os.environ.get('DASHBOARD_PROFILE_TOKEN') or load_env_data().get('DASHBOARD_PROFILE_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token)
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+@app.before_request
+def start_request_profile():
+    """Profile just this request when asked with ?__profile=1 (&__mode=sample)"""
+    if request.args.get('__profile') != '1':
+        return None
+    if not is_admin():
+        return jsonify({'error': 'Profiling is limited to local requests or X-Profile-Token'}), 403
+    if profiling_active():
+        return jsonify({'error': 'The whole server is already being profiled (--profile)'}), 409
+    mode = request.args.get('__mode', 'cprofile')
+    if mode not in MODES:
+        return jsonify({'error': f"__mode must be one of {', '.join(MODES)}"}), 400
+    request.environ['gembooth.profile'] = start_thread_profile(mode)
+    return None
+
+@app.after_request
+def return_request_profile(response):
+    """Replace a profiled request's response with its collapsed stacks and span timings"""
+    if request.environ.pop('gembooth.profile', None) is None:
+        return response
+    profiler = stop_thread_profile()
+    headers = {'Server-Timing': profiler.server_timing(), 'X-Profile-Mode': profiler.mode,
+               'X-Profile-Status': str(response.status_code)}
+    if 'X-Section-Cache' in response.headers:
+        headers['X-Section-Cache'] = response.headers['X-Section-Cache']
+    return Response(profiler.folded(), content_type='text/plain; charset=utf-8', headers=headers)
+
+@app.after_request
+def revalidate_api(response):
+    """ETag every /api JSON response so the browser's section cache can revalidate with If-None-Match"""
+    if request.method != 'GET' or response.status_code != 200 or response.is_streamed \
+            or response.mimetype != 'application/json' or not request.path.startswith('/api/'):
+        return response
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def cached_section(name, ttl):
+    """Serve a section's JSON from the section cache; concurrent requests share one computation"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper():
+            def compute():
+                # Background refreshes run outside the request, so give them their own app context
+                with app.app_context(), span(name, 'compute'):
+                    return view().get_data()
+            started = time.perf_counter()
+            body, outcome = section_cache.get(name, compute, ttl)
+            metrics.section_lookups.observe(time.perf_counter() - started, name, outcome)
+            return Response(body, mimetype='application/json', headers={'X-Section-Cache': outcome})
+        return wrapper
+    return decorator
+
 def load_env_data():
     """Load environment variables from .env.local"""
     env_data = {}
@@ -39,13 +159,38 @@ def mask_key(key):
 
 @app.route('/')
 def index():
-    """Main dashboard page"""
-    return render_template('index.html')
+    """Main dashboard page (revalidated every time so it always points at the current assets)"""
+    return Response(render_template('index.html', asset_url=asset_url), mimetype='text/html',
+                    headers={'Cache-Control': 'no-cache'})
+
+@app.route('/sw.js')
+def service_worker():
+    """Service worker; served from the root so its scope covers the whole dashboard"""
+    response = app.send_static_file('js/sw.js')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/assets/<name>')
+def asset(name):
+    """Serve a fingerprinted asset, precompressed when the browser accepts it; names change with content"""
+    try:
+        path, encoding, mimetype = resolve_asset(name, request.headers.get('Accept-Encoding', ''))
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable', 'Vary': 'Accept-Encoding',
+               'ETag': f'"{name}-{encoding or "identity"}"'}
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return Response(status=304, headers=headers)
+    return Response(path.read_bytes(), content_type=mimetype, headers=headers)
 
 @app.route('/api/overview')
+@cached_section('overview', ttl=30)
 def api_overview():
     """API endpoint for project overview"""
     env_data = load_env_data()
+    code = collect_metrics()
 
     return jsonify({
         'project': {
@@ -55,12 +200,10 @@ def api_overview():
             'tech_stack': 'React 18 + Vite + Supabase + Stripe + Gemini AI',
             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         },
-        'stats': {
-            'database_tables': 8,
-            'edge_functions': 5,
-            'storage_buckets': 2,
-            'ai_modes': 13
-        },
+        'stats': dict(code['stats'],
+                      source_files=code['totals']['files'],
+                      source_lines=code['totals']['lines']),
+        'trend': [value for _, value in code['trend']['total.lines']],
         'status': {
             'environment': '✅ Configured' if env_data else '❌ Missing',
             'gemini': '✅ Set' if env_data.get('VITE_GEMINI_API_KEY') else '❌ Missing',
@@ -125,8 +268,9 @@ def api_supabase():
     })
 
 @app.route('/api/stripe')
+@cached_section('stripe', ttl=30)
 def api_stripe():
-    """API endpoint for Stripe information"""
+    """API endpoint for Stripe information and billing activity from exported events"""
     return jsonify({
         'test_cards': [
             {'name': 'Success', 'number': '4242 4242 4242 4242'},
@@ -137,7 +281,8 @@ def api_stripe():
             {'name': 'Free', 'price': '$0/month', 'limits': '10 photos, 2 GIFs/month'},
             {'name': 'Pro', 'price': '$9.99/month', 'limits': '100 photos, 20 GIFs/month'},
             {'name': 'Premium', 'price': '$19.99/month', 'limits': 'Unlimited photos & GIFs'}
-        ]
+        ],
+        'billing': billing_summary()
     })
 
 @app.route('/api/commands')
@@ -147,23 +292,30 @@ def api_commands():
         'development': [
             {'description': 'Start dev server', 'command': 'npm run dev'},
             {'description': 'Build for production', 'command': 'npm run build'},
-            {'description': 'Preview production build', 'command': 'npm run preview'}
+            {'description': 'Preview production build', 'command': 'npm run preview'},
+            {'description': 'Start Gemini caching proxy', 'command': 'python project-info/gemini_proxy.py --port 8787'}
         ],
         'supabase': [
             {'description': 'Link to project', 'command': 'supabase link --project-ref [YOUR_REF]'},
             {'description': 'Apply migrations', 'command': 'supabase db push'},
             {'description': 'Deploy all functions', 'command': 'supabase functions deploy'},
             {'description': 'Deploy specific function', 'command': 'supabase functions deploy [name]'},
+            {'description': 'Deploy functions in parallel', 'command': 'python project-info/deploy_runner.py --concurrency 5'},
             {'description': 'View function logs', 'command': 'supabase functions logs [name]'},
             {'description': 'Set environment secret', 'command': 'supabase secrets set KEY=value'},
-            {'description': 'List all secrets', 'command': 'supabase secrets list'}
+            {'description': 'List all secrets', 'command': 'supabase secrets list'},
+            {'description': 'Start offline Supabase stand-in', 'command': 'python project-info/local_supabase.py --port 54321'},
+            {'description': 'Sync local table mirror', 'command': 'python project-info/table_mirror.py'},
+            {'description': 'Audit exported storage buckets', 'command': 'python project-info/bucket_audit.py --root storage'}
         ],
         'deployment': [
             {'description': 'Deploy to preview', 'command': 'vercel'},
             {'description': 'Deploy to production', 'command': 'vercel --prod'}
         ],
         'stripe': [
-            {'description': 'Fetch product prices', 'command': 'node get-stripe-prices.js'}
+            {'description': 'Fetch product prices', 'command': 'node get-stripe-prices.js'},
+            {'description': 'Stress-test webhook (self-test)', 'command': 'python project-info/webhook_replayer.py'},
+            {'description': 'Replay signed events at an endpoint', 'command': 'python project-info/webhook_replayer.py --url [WEBHOOK_URL]'}
         ]
     })
 
@@ -220,6 +372,186 @@ def api_ai_modes():
         ]
     })
 
+@app.route('/api/dependencies')
+@cached_section('dependencies', ttl=300)
+def api_dependencies():
+    """API endpoint for the dependency graph from package-lock.json"""
+    return jsonify(analyze_dependencies())
+
+@app.route('/api/bundle')
+@cached_section('bundle', ttl=30)
+def api_bundle():
+    """API endpoint for recorded build output sizes"""
+    return jsonify({'apps': all_latest_reports()})
+
+@app.route('/api/metrics')
+@cached_section('metrics', ttl=60)
+def api_metrics():
+    """API endpoint for lines, files and bytes per language and sub-app"""
+    return jsonify(collect_metrics())
+
+@app.route('/api/duplicates')
+@cached_section('duplicates', ttl=300)
+def api_duplicates():
+    """API endpoint for near-duplicate files across sub-apps and zip archives"""
+    return jsonify(find_duplicates())
+
+@app.route('/api/archives')
+@cached_section('archives', ttl=120)
+def api_archives():
+    """API endpoint for zip archive listings and drift from their extracted directories"""
+    return jsonify({'archives': inspect_archives()})
+
+@app.route('/api/archives/preview')
+def api_archive_preview():
+    """API endpoint streaming the start of one archive member, with env file values masked"""
+    try:
+        return jsonify(preview_member(request.args.get('archive', ''), request.args.get('member', ''),
+                                      mask=mask_key))
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+
+@app.route('/api/gemini-cache')
+@cached_section('gemini-cache', ttl=5)
+def api_gemini_cache():
+    """API endpoint for Gemini caching proxy hit rate and savings"""
+    return jsonify(cache_summary())
+
+@app.route('/api/mirror')
+@cached_section('mirror', ttl=15)
+def api_mirror():
+    """API endpoint for production usage served from the local table mirror"""
+    return jsonify(mirror_summary())
+
+@app.route('/api/storage-audit')
+@cached_section('storage-audit', ttl=30)
+def api_storage_audit():
+    """API endpoint for the last storage bucket audit"""
+    return jsonify({'report': load_report()})
+
+@app.route('/api/gallery')
+def api_gallery():
+    """API endpoint for one page of generated photos and GIFs from the table mirror"""
+    page = gallery_page(request.args.get('offset', 0, type=int), request.args.get('limit', 200, type=int))
+    for item in page['items']:
+        item['thumb'] = (f"/thumbs/{item['bucket']}/{item['name']}?v={item['version']}"
+                         if item['version'] and page['available'] else None)
+    return jsonify(page)
+
+@app.route('/thumbs/<bucket>/<path:name>')
+def thumbnail(bucket, name):
+    """Serve a cached thumbnail; URLs carry the source version so they never go stale"""
+    try:
+        path = resolve_object(bucket, name)
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    if not thumbnails_available():
+        return jsonify({'error': 'Thumbnails need Pillow: pip install Pillow'}), 501
+
+    cache = get_cache()
+    fmt = default_format()
+    etag = f'"{cache.source_digest(path)}-{fmt}"'
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable', 'ETag': etag}
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers=headers)
+    try:
+        data, _ = cache.get(path, fmt)
+    except (OSError, ValueError) as e:
+        return jsonify({'error': str(e)}), 415
+    return Response(data, mimetype=MIME_TYPES[fmt], headers=headers)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and section cache metrics in Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/section-cache')
+def api_section_cache():
+    """API endpoint for per-section hit, miss and coalesce counters"""
+    return jsonify(section_cache.summary())
+
+@app.route('/api/deploy')
+def api_deploy():
+    """API endpoint for deployable edge functions and deploy history"""
+    return jsonify({'functions': list_functions(), 'concurrency': DEFAULT_CONCURRENCY, **deploy_history()})
+
+@app.route('/api/deploy', methods=['POST'])
+def api_deploy_start():
+    """Start deploying the selected edge functions in parallel"""
+    # Deploys reach production: only this machine (or X-Profile-Token), only from this page, only as JSON,
+    # so a form or no-preflight fetch from another site cannot start one
+    if not is_admin():
+        return jsonify({'error': 'Deploys are limited to local requests or X-Profile-Token'}), 403
+    if request.headers.get('Origin') != request.host_url.rstrip('/'):
+        return jsonify({'error': 'Deploys must be started from the dashboard itself'}), 403
+    if not request.is_json:
+        return jsonify({'error': 'Expected application/json'}), 415
+    body = request.get_json(silent=True)
+    functions = body.get('functions') if isinstance(body, dict) else None
+    if not isinstance(functions, list) or not functions:
+        return jsonify({'error': 'Select at least one edge function'}), 400
+    try:
+        run = start_deploy(functions, int(body.get('concurrency') or DEFAULT_CONCURRENCY))
+    except DeployInProgress as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(run.summary()), 202
+
+@app.route('/api/deploy/<int:run_id>/stream')
+def api_deploy_stream(run_id):
+    """Stream a deploy run's output as server-sent events, resuming from Last-Event-ID"""
+    run = get_run(run_id)
+    if run is None:
+        return jsonify({'error': f'Unknown deploy run: {run_id}'}), 404
+    after = request.headers.get('Last-Event-ID', -1, type=int) + 1
+
+    def events(seq):
+        while True:
+            batch = run.follow(seq)
+            if not batch and run.done:
+                # Resumed at or past the done event; pick up anything emitted just before the run finished
+                batch = run.follow(seq)
+                if not batch:
+                    return
+            elif not batch:
+                # A real timed-out wait; keeps the connection open through proxies while a step is quiet
+                yield ': keep-alive\n\n'
+                continue
+            for event in batch:
+                seq = event['seq'] + 1
+                yield f"id: {event['seq']}\ndata: {json.dumps(event)}\n\n"
+                if event['kind'] == 'done':
+                    return
+
+    return Response(stream_with_context(events(after)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/projects')
+@cached_section('projects', ttl=15)
+def api_projects():
+    """API endpoint comparing every project registered in config.json"""
+    return jsonify(compare_projects())
+
+@app.route('/api/alerts')
+@cached_section('alerts', ttl=30)
+def api_alerts():
+    """API endpoint evaluating the alert rules from config.json"""
+    try:
+        return jsonify(evaluate_alerts())
+    except RuleError as e:
+        return jsonify({'error': str(e), 'active': [], 'errors': {}})
+
+@app.route('/api/history')
+def api_history():
+    """API endpoint for probe and API latency history"""
+    range_name = request.args.get('range', '24h')
+    if range_name not in RANGES:
+        return jsonify({'error': f"range must be one of {', '.join(RANGES)}"}), 400
+    points = min(max(request.args.get('points', 240, type=int), 10), 1000)
+    targets = request.args.get('targets')
+    return jsonify(history(range_name, targets.split(',') if targets else None, points))
+
 @app.route('/api/troubleshooting')
 def api_troubleshooting():
     """API endpoint for troubleshooting guide"""
@@ -271,8 +603,73 @@ def api_troubleshooting():
         ]
     })
 
+# Palette index cache, keyed by Supabase URL since links depend on it
+_palette_cache = {}
+
+SECTIONS = [
+    ('Overview', 'overview'),
+    ('API Keys', 'api-keys'),
+    ('Supabase', 'supabase'),
+    ('Stripe', 'stripe'),
+    ('Commands', 'commands'),
+    ('Quick Links', 'links'),
+    ('AI Modes', 'ai-modes'),
+    ('Dependencies', 'dependencies'),
+    ('Bundle Size', 'bundle'),
+    ('Code Metrics', 'metrics'),
+    ('Duplicates', 'duplicates'),
+    ('Archives', 'archives'),
+    ('Gemini Cache', 'gemini-cache'),
+    ('Production Mirror', 'mirror'),
+    ('Storage Audit', 'storage-audit'),
+    ('Gallery', 'gallery'),
+    ('Deploy', 'deploy'),
+    ('Projects', 'projects'),
+    ('Alerts', 'alerts'),
+    ('History', 'history'),
+    ('Troubleshoot', 'troubleshooting')
+]
+
+def get_palette_index():
+    """Build (or reuse) the command palette index from the section endpoints"""
+    cache_key = load_env_data().get('VITE_SUPABASE_URL', '')
+    if cache_key in _palette_cache:
+        return _palette_cache[cache_key]
+
+    commands = api_commands().get_json()
+    links = api_links().get_json()
+    supabase = api_supabase().get_json()
+    modes = api_ai_modes().get_json()['modes']
+
+    index = PaletteIndex(build_entries(
+        commands=[(c['description'], c['command']) for group in commands.values() for c in group],
+        links=[(l['name'], l['url']) for group in links.values() for l in group if l['url'] != '#'],
+        modes=[(f"{m['emoji']} {m['name']}", m['description']) for m in modes],
+        tables=[(t['name'], t['description']) for t in supabase['tables']],
+        functions=[(f['name'], f['description']) for f in supabase['edge_functions']],
+        sections=SECTIONS
+    ))
+    _palette_cache.clear()
+    _palette_cache[cache_key] = index
+    return index
+
+@app.route('/api/palette')
+def api_palette():
+    """API endpoint for command palette search"""
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 50)
+
+    return jsonify({
+        'query': query,
+        'results': get_palette_index().search(query, limit)
+    })
+
 def main():
-    """Main entry point"""
+    """Main entry point; `export [dir]` writes a static copy instead of serving"""
+    if sys.argv[1:2] == ['export']:
+        from static_export import main as export_main
+        return export_main(sys.argv[2:], sys.modules[__name__])
+
     print("🎨 GemBooth Dashboard - Web Version")
     print("=" * 50)
     print("\n🌐 Starting web server...")
@@ -280,7 +677,12 @@ def main():
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\n✨ Press Ctrl+C to stop the server\n")
 
-    app.run(host='127.0.0.1', port=5555, debug=True)
+    mode = profile_mode(sys.argv[1:])
+    if mode:
+        print(f"🔬 Profiling ({mode}) until the server stops\n")
+    with profiling('web', mode):
+        # The reloader would run the app in a child process, and cProfile only sees the thread that enabled it
+        app.run(host='127.0.0.1', port=5555, debug=True, use_reloader=mode is None, threaded=mode != 'cprofile')
 
 if __name__ == '__main__':
     main()
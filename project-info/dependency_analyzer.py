@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Dependency Analyzer
+Streams package-lock.json and reports the real dependency graph
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+CACHE_FILE = CACHE_DIR / 'dependencies.json'
+
+CHUNK_SIZE = 64 * 1024
+
+# Apps sharing the root lockfile (sub-apps have no lockfile of their own)
+APPS = [
+    ('gembooth', '.'),
+    ('fit-check', 'fit-check'),
+    ('pixshop', 'pixshop'),
+    ('past-forward', 'past-forward'),
+    ('gemini-co-drawing', 'gemini-co-drawing')
+]
+
+DEP_FIELDS = ('dependencies', 'optionalDependencies', 'peerDependencies')
+
+# In-process cache so repeated requests skip even the cache file read
+_memory_cache = {}
+
+def _skip_ws(buf, pos):
+    """Advance past whitespace and commas"""
+    while pos < len(buf) and buf[pos] in ' \t\r\n,':
+        pos += 1
+    return pos
+
+def iter_lock_packages(path, chunk_size=CHUNK_SIZE):
+    """Yield (install_path, entry) pairs from a lockfile's "packages" map.
+
+    The file is read in chunks and each entry is decoded as soon as it is
+    complete, so memory stays proportional to one entry plus one chunk.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"{path} has no \"packages\" map (lockfileVersion 2+ required)")
+            buf += chunk
+            key_pos = buf.find('"packages"')
+            brace = buf.find('{', key_pos) if key_pos >= 0 else -1
+            if brace >= 0:
+                buf = buf[brace + 1:]
+                break
+
+        pos = 0
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos < len(buf) and buf[pos] == '}':
+                return
+            try:
+                if pos >= len(buf):
+                    raise json.JSONDecodeError('need more data', buf, pos)
+                key, end = decoder.raw_decode(buf, pos)
+                colon = _skip_ws(buf, end)
+                if colon >= len(buf) or buf[colon] != ':':
+                    raise json.JSONDecodeError('need more data', buf, colon)
+                value, end = decoder.raw_decode(buf, _skip_ws(buf, colon + 1))
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+            yield key, value
+            pos = end
+
+def package_name(install_path):
+    """Package name from a lockfile install path"""
+    return install_path.rsplit('node_modules/', 1)[-1]
+
+def resolve(packages, parent, name):
+    """Resolve a dependency the way Node does: nearest node_modules upwards"""
+    base = parent
+    while True:
+        candidate = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+        if candidate in packages:
+            return candidate
+        if not base:
+            return None
+        cut = base.rfind('/node_modules/')
+        base = base[:cut] if cut >= 0 else ''
+
+def closure(packages, roots):
+    """Return every install path reachable from the given root paths"""
+    seen = set()
+    stack = [r for r in roots if r]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        entry = packages[current]
+        for field in DEP_FIELDS:
+            for dep in entry.get(field, {}):
+                target = resolve(packages, current, dep)
+                if target and target not in seen:
+                    stack.append(target)
+    return seen
+
+def direct_deps(manifest):
+    """Runtime plus dev dependencies of a package.json-shaped dict"""
+    return {**manifest.get('dependencies', {}), **manifest.get('devDependencies', {})}
+
+def read_manifest(app_dir):
+    """Read direct dependencies from an app's package.json"""
+    manifest = PROJECT_ROOT / app_dir / 'package.json'
+    if not manifest.exists():
+        return None
+    with open(manifest, 'r', encoding='utf-8') as f:
+        return direct_deps(json.load(f))
+
+def dir_size(path):
+    """Size on disk of one installed package, excluding nested node_modules"""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        if 'node_modules' in dirs:
+            dirs.remove('node_modules')
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def inputs_hash(lockfile):
+    """Hash the lockfile, every app manifest and the state of node_modules the report depends on"""
+    digest = hashlib.sha256()
+    with open(lockfile, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    for _, app_dir in APPS:
+        manifest = PROJECT_ROOT / app_dir / 'package.json'
+        if manifest.exists():
+            digest.update(manifest.read_bytes())
+    # npm rewrites node_modules/.package-lock.json on every install, so sizes are re-measured after one
+    node_modules = PROJECT_ROOT / 'node_modules'
+    for path in (node_modules / '.package-lock.json', node_modules):
+        try:
+            digest.update(f"{path.name}:{path.stat().st_mtime_ns}".encode('utf-8'))
+            break
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+def build_report(lockfile):
+    """Parse the lockfile and compute the dependency report"""
+    started = time.perf_counter()
+    packages = {}
+    root_entry = {}
+    for install_path, entry in iter_lock_packages(lockfile):
+        if install_path == '':
+            root_entry = entry
+        elif not entry.get('link'):
+            packages[install_path] = entry
+
+    # Which apps reach each package
+    reached_by = {}
+    apps = []
+    for app_name, app_dir in APPS:
+        deps = direct_deps(root_entry) if app_dir == '.' else read_manifest(app_dir)
+        if deps is None:
+            continue
+
+        roots = [resolve(packages, '', name) for name in deps]
+        unresolved = sorted(name for name, r in zip(deps, roots) if r is None)
+        reachable = closure(packages, roots)
+        for install_path in reachable:
+            reached_by.setdefault(install_path, set()).add(app_name)
+
+        apps.append({
+            'name': app_name,
+            'direct': len(deps),
+            'transitive': len(reachable),
+            'unresolved': unresolved,
+            '_reachable': reachable
+        })
+
+    # The root manifest reaches every package the sub-apps install, so a sub-app's exclusives are
+    # counted among the sub-apps only; the root app's are the packages no sub-app needs
+    root_name = next((name for name, app_dir in APPS if app_dir == '.'), None)
+    for app in apps:
+        ignored = set() if app['name'] == root_name else {root_name}
+        app['exclusive'] = sorted({package_name(p) for p in app.pop('_reachable')
+                                   if reached_by[p] - ignored == {app['name']}})
+
+    # Duplicate versions of the same package name
+    versions = {}
+    for install_path, entry in packages.items():
+        versions.setdefault(package_name(install_path), set()).add(entry.get('version', '?'))
+    duplicates = sorted(
+        ({'name': name, 'versions': sorted(v)} for name, v in versions.items() if len(v) > 1),
+        key=lambda d: (-len(d['versions']), d['name'])
+    )
+
+    # Heaviest top-level dependencies by transitive package count
+    top_level = []
+    for name in direct_deps(root_entry):
+        install_path = resolve(packages, '', name)
+        if install_path:
+            top_level.append({
+                'name': name,
+                'version': packages[install_path].get('version', '?'),
+                'dev': bool(packages[install_path].get('dev')),
+                'transitive': len(closure(packages, [install_path])) - 1
+            })
+    top_level.sort(key=lambda d: -d['transitive'])
+
+    # Install size is only measurable when node_modules is present; lockfiles v2+ carry no package sizes
+    sizes = {}
+    if (PROJECT_ROOT / 'node_modules').is_dir():
+        for install_path in packages:
+            full = PROJECT_ROOT / install_path
+            if full.is_dir():
+                sizes[install_path] = dir_size(full)
+    largest = sorted(
+        ({'name': package_name(p), 'version': packages[p].get('version', '?'), 'size': s}
+         for p, s in sizes.items()),
+        key=lambda d: -d['size']
+    )[:15]
+
+    return {
+        'lockfile': os.path.relpath(lockfile, PROJECT_ROOT),
+        'total_packages': len(packages),
+        'dev_packages': sum(1 for e in packages.values() if e.get('dev')),
+        'apps': apps,
+        'duplicates': duplicates,
+        'top_level': top_level,
+        'install_size': sum(sizes.values()) if sizes else None,
+        'largest': largest,
+        'parse_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def analyze_dependencies(lockfile=None):
+    """Return the dependency report, reusing the cached one if inputs are unchanged"""
+    lockfile = Path(lockfile or PROJECT_ROOT / 'package-lock.json')
+    if not lockfile.exists():
+        return {'error': f"{lockfile.name} not found"}
+
+    key = inputs_hash(lockfile)
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    report = None
+    if CACHE_FILE.exists():
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('hash') == key:
+                report = cached['report']
+        except (OSError, ValueError, KeyError):
+            report = None
+
+    if report is None:
+        report = build_report(lockfile)
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'hash': key, 'report': report}, f)
+
+    _memory_cache.clear()
+    _memory_cache[key] = report
+    return report
+
+def format_size(num_bytes):
+    """Human readable byte size"""
+    if num_bytes is None:
+        return 'unknown'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+def install_size_label(report):
+    """Install size as shown by the dashboards, saying why it is missing without node_modules"""
+    if report['install_size'] is None:
+        return 'unavailable (no node_modules, run npm install)'
+    return format_size(report['install_size'])
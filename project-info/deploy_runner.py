@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Deploy Runner
+Deploys edge functions concurrently, streaming output and recording step durations
+"""
+
+import itertools
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from statistics import median
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+HISTORY_FILE = CACHE_DIR / 'deploy-history.jsonl'
+FUNCTIONS_DIR = PROJECT_ROOT / 'supabase' / 'functions'
+
+DEFAULT_CONCURRENCY = 5
+
+# Functions called by Stripe or before login (see LIVE_MODE_DEPLOYMENT.md)
+NO_VERIFY_JWT = {'create-checkout-session', 'create-portal-session', 'stripe-webhook'}
+
+# Finished runs kept in memory for late subscribers
+MAX_RUNS = 10
+
+class DeployInProgress(ValueError):
+    """A requested function is already being deployed by an unfinished run"""
+
+def list_functions():
+    """Edge function names under supabase/functions"""
+    if not FUNCTIONS_DIR.is_dir():
+        return []
+    return sorted(p.name for p in FUNCTIONS_DIR.iterdir() if p.is_dir() and not p.name.startswith(('_', '.')))
+
+def supabase_command():
+    """The Supabase CLI, falling back to npx like deploy-functions.sh"""
+    return ['supabase'] if shutil.which('supabase') else ['npx', 'supabase@latest']
+
+def deploy_command(function, project_ref=None):
+    """argv for deploying one function"""
+    argv = supabase_command() + ['functions', 'deploy', function]
+    if function in NO_VERIFY_JWT:
+        argv.append('--no-verify-jwt')
+    if project_ref:
+        argv += ['--project-ref', project_ref]
+    return argv
+
+class DeployRun:
+    """One batch of deploys; subscribers read events by sequence number"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, functions, concurrency=DEFAULT_CONCURRENCY, project_ref=None, command=deploy_command):
+        self.id = next(self._ids)
+        self.functions = list(functions)
+        self.concurrency = max(1, min(concurrency, len(self.functions) or 1))
+        self.project_ref = project_ref
+        self.command = command
+        self.events = []
+        self.condition = threading.Condition()
+        self.steps = {fn: {'status': 'queued', 'duration': None, 'returncode': None} for fn in self.functions}
+        self.started = None
+        self.wall_time = None
+        self.done = False
+
+    def emit(self, **event):
+        """Append an event and wake every subscriber"""
+        with self.condition:
+            event['seq'] = len(self.events)
+            self.events.append(event)
+            self.condition.notify_all()
+
+    def follow(self, after=0, timeout=15):
+        """Events from `after` on, waiting up to `timeout` seconds for new ones"""
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.events) > after or self.done, timeout)
+            return self.events[after:]
+
+    def deploy_one(self, function):
+        """Run one deploy, streaming its output line by line"""
+        step = self.steps[function]
+        step['status'] = 'running'
+        self.emit(kind='status', function=function, status='running')
+        started = time.perf_counter()
+        try:
+            process = subprocess.Popen(self.command(function, self.project_ref), cwd=PROJECT_ROOT,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                       text=True, encoding='utf-8', errors='replace', bufsize=1)
+        except OSError as e:
+            self.emit(kind='line', function=function, text=str(e))
+            returncode = -1
+        else:
+            for line in process.stdout:
+                self.emit(kind='line', function=function, text=line.rstrip('\n'))
+            returncode = process.wait()
+
+        step['duration'] = round(time.perf_counter() - started, 2)
+        step['returncode'] = returncode
+        step['status'] = 'ok' if returncode == 0 else 'failed'
+        self.emit(kind='status', function=function, status=step['status'], duration=step['duration'])
+
+    def run(self):
+        """Deploy every function, at most `concurrency` at a time, then record history"""
+        self.started = time.time()
+        began = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                list(pool.map(self.deploy_one, self.functions))
+            self.wall_time = round(time.perf_counter() - began, 2)
+            record_history(self)
+        finally:
+            # Even if a deploy or the history write raised, release the functions and end every stream
+            if self.wall_time is None:
+                self.wall_time = round(time.perf_counter() - began, 2)
+            self.emit(kind='done', wall_time=self.wall_time,
+                      step_total=round(sum(s['duration'] or 0 for s in self.steps.values()), 2),
+                      failed=[fn for fn, s in self.steps.items() if s['status'] != 'ok'])
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    def summary(self):
+        """Current state for the dashboards"""
+        return {'id': self.id, 'functions': self.functions, 'concurrency': self.concurrency,
+                'steps': self.steps, 'started': self.started, 'wall_time': self.wall_time,
+                'done': self.done, 'events': len(self.events)}
+
+_runs = {}
+_runs_lock = threading.Lock()
+
+def start_deploy(functions=None, concurrency=DEFAULT_CONCURRENCY, project_ref=None, command=deploy_command):
+    """Start a deploy run on a background thread and return it"""
+    known = list_functions()
+    functions = [fn for fn in (functions or known) if fn in known]
+    if not functions:
+        raise ValueError("No edge functions selected")
+
+    with _runs_lock:
+        busy = sorted({fn for active in _runs.values() if not active.done for fn in active.functions} & set(functions))
+        if busy:
+            raise DeployInProgress(f"Already deploying: {', '.join(busy)}")
+        run = DeployRun(functions, concurrency, project_ref, command)
+        _runs[run.id] = run
+        for old in sorted(_runs)[:-MAX_RUNS]:
+            if _runs[old].done:
+                del _runs[old]
+    threading.Thread(target=run.run, daemon=True).start()
+    return run
+
+def get_run(run_id):
+    """Look up a run started in this process"""
+    with _runs_lock:
+        return _runs.get(run_id)
+
+def record_history(run):
+    """Append one line per deploy step to the history file"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        for function, step in run.steps.items():
+            f.write(json.dumps({'run': f"{run.started:.0f}-{run.id}", 'time': run.started, 'function': function,
+                                'duration': step['duration'], 'returncode': step['returncode'],
+                                'concurrency': run.concurrency, 'wall_time': run.wall_time}) + '\n')
+
+def deploy_history(limit=200):
+    """Per-function duration stats and recent runs from the history file"""
+    records = []
+    try:
+        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    records = records[-limit:]
+
+    by_function = {}
+    for record in records:
+        by_function.setdefault(record['function'], []).append(record)
+    per_function = []
+    for function, steps in by_function.items():
+        durations = [s['duration'] for s in steps if s['returncode'] == 0]
+        per_function.append({
+            'function': function,
+            'deploys': len(steps),
+            'failures': sum(1 for s in steps if s['returncode'] != 0),
+            'last': steps[-1]['duration'],
+            'median': round(median(durations), 2) if durations else None,
+            'max': max(durations) if durations else None
+        })
+    per_function.sort(key=lambda f: -(f['median'] or 0))
+
+    runs = {}
+    for record in records:
+        run = runs.setdefault(record['run'], {'run': record['run'], 'time': record['time'], 'functions': 0,
+                                              'wall_time': record['wall_time'], 'step_total': 0.0, 'failures': 0})
+        run['functions'] += 1
+        run['step_total'] = round(run['step_total'] + record['duration'], 2)
+        run['failures'] += int(record['returncode'] != 0)
+    return {'steps': per_function, 'runs': sorted(runs.values(), key=lambda r: -r['time'])[:10]}
+
+def stream_to_terminal(run):
+    """Print a run's output with a function prefix per line; True when every deploy succeeded"""
+    from gembooth_dashboard import Colors
+
+    width = max(len(fn) for fn in run.functions)
+    seq = 0
+    while True:
+        for event in run.follow(seq):
+            seq = event['seq'] + 1
+            if event['kind'] == 'line':
+                print(f"{Colors.CYAN}{event['function']:<{width}}{Colors.ENDC} │ {event['text']}")
+            elif event['kind'] == 'status' and event['status'] != 'running':
+                color = Colors.GREEN if event['status'] == 'ok' else Colors.RED
+                print(f"{color}{event['function']:<{width}} │ {event['status']} in {event['duration']:.1f}s{Colors.ENDC}")
+            elif event['kind'] == 'done':
+                print(f"\n{Colors.BOLD}{len(run.functions)} functions in {event['wall_time']:.1f}s "
+                      f"(sequential would take ~{event['step_total']:.1f}s){Colors.ENDC}")
+                return not event['failed']
+
+def main():
+    """Command line entry point: deploy_runner.py [FUNCTION ...] [--concurrency N] [--project-ref REF]"""
+    args = sys.argv[1:]
+    concurrency = int(args[args.index('--concurrency') + 1]) if '--concurrency' in args else DEFAULT_CONCURRENCY
+    project_ref = args[args.index('--project-ref') + 1] if '--project-ref' in args else None
+    selected = [a for i, a in enumerate(args) if not a.startswith('--') and (i == 0 or args[i - 1] not in
+                                                                               ('--concurrency', '--project-ref'))]
+    try:
+        run = start_deploy(selected or None, concurrency, project_ref)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    sys.exit(0 if stream_to_terminal(run) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Near-Duplicate Code Detector
+Winnowing fingerprints across the tree and inside zip archives
+"""
+
+import json
+import os
+import re
+import sys
+import zipfile
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+FINGERPRINT_CACHE = CACHE_DIR / 'fingerprints.json'
+
+CODE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.css')
+BACKUP_SUFFIX = '.backup'
+SKIP_DIRS = {'node_modules', '.git', 'dist', '.cache', '__pycache__'}
+
+# k-gram length (tokens) and winnowing window: any shared run of
+# K + WINDOW - 1 tokens is guaranteed to produce a shared fingerprint
+K = 15
+WINDOW = 10
+
+# Fingerprints shared by more files than this are boilerplate (imports etc.)
+MAX_POSTINGS = 8
+
+MIN_SIMILARITY = 0.3
+MIN_SHARED = 5
+
+# Below this many changed files the process pool costs more than it saves
+PARALLEL_THRESHOLD = 16
+
+MOD = (1 << 61) - 1
+BASE = 1_000_003
+BASE_K = pow(BASE, K - 1, MOD)
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z_$][\w$]*|\d+|\S')
+
+def is_code_file(name):
+    """Code files, including editor backups like Whiteboard.jsx.backup"""
+    if name.endswith(BACKUP_SUFFIX):
+        name = name[:-len(BACKUP_SUFFIX)]
+    return name.endswith(CODE_EXTENSIONS)
+
+def tokenize(text):
+    """Return [(token_hash, line_number)] for a source text"""
+    tokens = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        for token in TOKEN_PATTERN.findall(line):
+            tokens.append((zlib.crc32(token.encode('utf-8')), line_no))
+    return tokens
+
+def winnow(tokens):
+    """Select winnowing fingerprints [(hash, line)] from a token stream"""
+    if len(tokens) < K:
+        return []
+
+    # Rabin-Karp rolling hash over k-grams
+    hashes = []
+    h = 0
+    for i, (token, _) in enumerate(tokens):
+        if i >= K:
+            h = (h - tokens[i - K][0] * BASE_K) % MOD
+        h = (h * BASE + token) % MOD
+        if i >= K - 1:
+            hashes.append((h, tokens[i - K + 1][1]))
+
+    # Keep the rightmost minimum of each window, recording each pick once
+    fingerprints = []
+    last_pick = -1
+    for start in range(max(1, len(hashes) - WINDOW + 1)):
+        window = hashes[start:start + WINDOW]
+        low = min(h for h, _ in window)
+        pick = start + max(i for i, (h, _) in enumerate(window) if h == low)
+        if pick != last_pick:
+            fingerprints.append(list(hashes[pick]))
+            last_pick = pick
+    return fingerprints
+
+def read_source(spec):
+    """Read a file or zip member described by (kind, path, member)"""
+    kind, path, member = spec
+    if kind == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            data = archive.read(member)
+    else:
+        with open(path, 'rb') as f:
+            data = f.read()
+    return data.decode('utf-8', errors='replace')
+
+def fingerprint_source(spec):
+    """Fingerprint one file or zip member (runs in a worker)"""
+    return winnow(tokenize(read_source(spec)))
+
+def discover_sources(root=PROJECT_ROOT):
+    """Return {key: (spec, stamp, size)} for every code file and zip member"""
+    sources = {}
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            full = os.path.join(dirpath, name)
+            relpath = os.path.relpath(full, root).replace(os.sep, '/')
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+
+            if is_code_file(name):
+                sources[relpath] = (('file', full, None), [st.st_mtime_ns, st.st_size], st.st_size)
+            elif name.endswith('.zip'):
+                try:
+                    with zipfile.ZipFile(full) as archive:
+                        for info in archive.infolist():
+                            if not info.is_dir() and is_code_file(info.filename):
+                                key = f"{relpath}!{info.filename}"
+                                sources[key] = (('zip', full, info.filename),
+                                                [info.CRC, info.file_size], info.file_size)
+                except zipfile.BadZipFile:
+                    continue
+    return sources
+
+def load_cache():
+    """Read cached fingerprints"""
+    try:
+        with open(FINGERPRINT_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def fingerprint_all(sources):
+    """Fingerprint every source, reusing cached results for unchanged ones"""
+    cache = load_cache()
+    results = {}
+    stale = []
+    for key, (spec, stamp, _) in sources.items():
+        cached = cache.get(key)
+        if cached and cached['stamp'] == stamp:
+            results[key] = cached['fingerprints']
+        else:
+            stale.append((key, spec, stamp))
+
+    specs = [spec for _, spec, _ in stale]
+    if len(specs) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as pool:
+            prints = list(pool.map(fingerprint_source, specs, chunksize=8))
+    else:
+        prints = [fingerprint_source(spec) for spec in specs]
+
+    for (key, _, stamp), fingerprints in zip(stale, prints):
+        results[key] = fingerprints
+        cache[key] = {'stamp': stamp, 'fingerprints': fingerprints}
+
+    if stale or len(cache) != len(results):
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(FINGERPRINT_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in cache.items() if k in results}, f, separators=(',', ':'))
+    return results
+
+def find_duplicates(root=PROJECT_ROOT, min_similarity=MIN_SIMILARITY, limit=50):
+    """Rank pairs of near-duplicate files by estimated byte savings"""
+    sources = discover_sources(root)
+    prints = fingerprint_all(sources)
+
+    keys = sorted(k for k, fp in prints.items() if fp)
+    postings = defaultdict(set)
+    for file_id, key in enumerate(keys):
+        for h, _ in prints[key]:
+            postings[h].add(file_id)
+
+    shared = defaultdict(set)
+    for h, files in postings.items():
+        if 1 < len(files) <= MAX_POSTINGS:
+            for a, b in combinations(sorted(files), 2):
+                shared[(a, b)].add(h)
+
+    distinct = [len({h for h, _ in prints[key]}) for key in keys]
+    pairs = []
+    for (a, b), hashes in shared.items():
+        if len(hashes) < MIN_SHARED:
+            continue
+        similarity = len(hashes) / min(distinct[a], distinct[b])
+        if similarity < min_similarity:
+            continue
+
+        key_a, key_b = keys[a], keys[b]
+        lines_a = [line for h, line in prints[key_a] if h in hashes]
+        lines_b = [line for h, line in prints[key_b] if h in hashes]
+        smaller = min(sources[key_a][2], sources[key_b][2])
+        pairs.append({
+            'a': key_a,
+            'b': key_b,
+            'similarity': round(min(similarity, 1.0), 3),
+            'shared': len(hashes),
+            'lines_a': [min(lines_a), max(lines_a)],
+            'lines_b': [min(lines_b), max(lines_b)],
+            'savings': int(smaller * min(similarity, 1.0))
+        })
+
+    pairs.sort(key=lambda p: (-p['savings'], p['a'], p['b']))
+    groups = duplicate_groups(pairs)
+    return {
+        'files': len(sources),
+        'archives': sorted({k.split('!', 1)[0] for k in sources if '!' in k}),
+        'pairs': pairs[:limit],
+        'total_pairs': len(pairs),
+        'groups': len(groups),
+        'estimated_savings': sum(group_savings(group, sources) for group in groups)
+    }
+
+def duplicate_groups(pairs):
+    """Cluster pairs into groups of mutually near-duplicate files (union-find over the pair edges)"""
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for pair in pairs:
+        parent[find(pair['a'])] = find(pair['b'])
+
+    groups = defaultdict(list)
+    for pair in pairs:
+        groups[find(pair['a'])].append(pair)
+    return list(groups.values())
+
+def group_savings(pairs, sources):
+    """Keeping one copy of a group saves every other copy: the smallest size times members - 1
+
+    Summing pairs instead would count N copies N(N-1)/2 times.
+    """
+    members = {p['a'] for p in pairs} | {p['b'] for p in pairs}
+    smallest = min(sources[key][2] for key in members)
+    similarity = min(p['similarity'] for p in pairs)
+    return int(smallest * similarity) * (len(members) - 1)
+
+if __name__ == '__main__':
+    json.dump(find_duplicates(), sys.stdout, indent=2)
+    print()
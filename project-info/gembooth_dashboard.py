@@ -6,10 +6,27 @@ A comprehensive cheatsheet for all project-related information
 
 import os
 import sys
+import webbrowser
 from pathlib import Path
 from datetime import datetime
 import json
 
+from command_palette import PaletteIndex, build_entries
+from dependency_analyzer import analyze_dependencies, format_size, install_size_label
+from bundle_analyzer import all_latest_reports
+from code_metrics import collect_metrics, sparkline
+from duplicate_detector import find_duplicates
+from archive_inspector import inspect_archives
+from gemini_proxy import cache_summary
+from table_mirror import mirror_summary
+from bucket_audit import load_report
+from profiler import profile_mode, profiling, span
+from project_registry import compare_projects
+from stripe_events import DEFAULT_EXPORT, billing_summary
+from alert_rules import RuleError, evaluate_alerts
+from timeseries import history
+from deploy_runner import DEFAULT_CONCURRENCY, deploy_history, list_functions, start_deploy, stream_to_terminal
+
 # ANSI color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -22,6 +39,94 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Shared section data (also indexed by the command palette)
+TABLES = [
+    ("profiles", "User profiles (username, avatar, bio)"),
+    ("photos", "Photo metadata (input_url, output_url, mode, prompt)"),
+    ("gifs", "Generated GIFs (gif_url, photo_ids array)"),
+    ("usage_stats", "User analytics (photos_created, gifs_created)"),
+    ("subscription_tiers", "Tier definitions (free, pro, premium)"),
+    ("subscriptions", "User subscriptions (stripe_subscription_id)"),
+    ("usage_limits", "Monthly limits and current usage"),
+    ("payments", "Payment history")
+]
+
+FUNCTIONS = [
+    ("process-image", "Transform photos with Gemini API"),
+    ("create-gif", "Server-side GIF generation"),
+    ("create-checkout-session", "Stripe checkout initialization"),
+    ("create-portal-session", "Stripe customer portal"),
+    ("stripe-webhook", "Handle Stripe webhook events")
+]
+
+COMMANDS = {
+    "Development": [
+        ("Start development server", "npm run dev"),
+        ("Build for production", "npm run build"),
+        ("Preview production build", "npm run preview"),
+        ("Start Gemini caching proxy", "python project-info/gemini_proxy.py --port 8787")
+    ],
+    "Supabase": [
+        ("Link to Supabase project", "supabase link --project-ref [YOUR_REF]"),
+        ("Apply database migrations", "supabase db push"),
+        ("Reset database (DANGER!)", "supabase db reset"),
+        ("Deploy all Edge Functions", "supabase functions deploy"),
+        ("Deploy specific function", "supabase functions deploy [function-name]"),
+        ("Deploy Edge Functions in parallel", "python project-info/deploy_runner.py --concurrency 5"),
+        ("View function logs", "supabase functions logs [function-name]"),
+        ("Set environment secret", "supabase secrets set KEY=value"),
+        ("List all secrets", "supabase secrets list"),
+        ("Start offline Supabase stand-in", "python project-info/local_supabase.py --port 54321"),
+        ("Sync local table mirror", "python project-info/table_mirror.py"),
+        ("Audit exported storage buckets", "python project-info/bucket_audit.py --root storage")
+    ],
+    "Deployment": [
+        ("Deploy to Vercel preview", "vercel"),
+        ("Deploy to production", "vercel --prod")
+    ],
+    "Stripe": [
+        ("Fetch Stripe product prices", "node get-stripe-prices.js"),
+        ("Test webhook locally", "stripe listen --forward-to localhost:54321/functions/v1/stripe-webhook"),
+        ("Stress-test webhook (self-test)", "python project-info/webhook_replayer.py"),
+        ("Replay signed events at an endpoint", "python project-info/webhook_replayer.py --url [WEBHOOK_URL]")
+    ]
+}
+
+LINKS = {
+    "Stripe Dashboards": [
+        ("Dashboard", "https://dashboard.stripe.com"),
+        ("Test Mode", "https://dashboard.stripe.com/test/dashboard"),
+        ("API Keys", "https://dashboard.stripe.com/test/apikeys"),
+        ("Webhooks", "https://dashboard.stripe.com/test/webhooks"),
+        ("Products", "https://dashboard.stripe.com/test/products"),
+        ("Customers", "https://dashboard.stripe.com/test/customers")
+    ],
+    "External Resources": [
+        ("Gemini API Console", "https://ai.google.dev"),
+        ("Vercel Dashboard", "https://vercel.com/dashboard"),
+        ("Supabase Docs", "https://supabase.com/docs"),
+        ("Stripe Docs", "https://stripe.com/docs"),
+        ("React Docs", "https://react.dev"),
+        ("Vite Docs", "https://vitejs.dev")
+    ]
+}
+
+MODES = [
+    ("🎨 Renaissance", "Classical renaissance painting style"),
+    ("🎭 Cartoon", "Fun cartoon/animated character"),
+    ("🗿 Statue", "Marble statue or sculpture"),
+    ("🍌 Banana", "Everything is made of bananas"),
+    ("🕺 80s", "Retro 1980s aesthetic"),
+    ("📸 19th Century", "Victorian-era photograph"),
+    ("⚡ Anime", "Japanese anime character"),
+    ("🌈 Psychedelic", "Trippy psychedelic art"),
+    ("🎮 8-bit", "Retro video game pixel art"),
+    ("🧔 Big Beard", "Epic legendary beard"),
+    ("💥 Comic Book", "Classic comic book style"),
+    ("👴 Old", "Aged 60+ years"),
+    ("✏️ Custom", "User-defined prompt")
+]
+
 def print_header(text):
     """Print a formatted header"""
     print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.ENDC}")
@@ -132,17 +237,7 @@ def show_supabase_info():
         print_info("Dashboard URL", f"https://supabase.com/dashboard/project/{project_ref}")
 
     print(f"\n{Colors.BOLD}Database Tables:{Colors.ENDC}")
-    tables = [
-        ("profiles", "User profiles (username, avatar, bio)"),
-        ("photos", "Photo metadata (input_url, output_url, mode, prompt)"),
-        ("gifs", "Generated GIFs (gif_url, photo_ids array)"),
-        ("usage_stats", "User analytics (photos_created, gifs_created)"),
-        ("subscription_tiers", "Tier definitions (free, pro, premium)"),
-        ("subscriptions", "User subscriptions (stripe_subscription_id)"),
-        ("usage_limits", "Monthly limits and current usage"),
-        ("payments", "Payment history")
-    ]
-    for table, desc in tables:
+    for table, desc in TABLES:
         print(f"  {Colors.GREEN}•{Colors.ENDC} {Colors.YELLOW}{table}{Colors.ENDC}: {desc}")
 
     print(f"\n{Colors.BOLD}Storage Buckets:{Colors.ENDC}")
@@ -150,14 +245,7 @@ def show_supabase_info():
     print_info("user-gifs", "Generated GIFs (50MB limit per file)", indent=1)
 
     print(f"\n{Colors.BOLD}Edge Functions:{Colors.ENDC}")
-    functions = [
-        ("process-image", "Transform photos with Gemini API"),
-        ("create-gif", "Server-side GIF generation"),
-        ("create-checkout-session", "Stripe checkout initialization"),
-        ("create-portal-session", "Stripe customer portal"),
-        ("stripe-webhook", "Handle Stripe webhook events")
-    ]
-    for func, desc in functions:
+    for func, desc in FUNCTIONS:
         print(f"  {Colors.GREEN}•{Colors.ENDC} {Colors.YELLOW}{func}{Colors.ENDC}: {desc}")
 
 def show_stripe_info():
@@ -183,32 +271,53 @@ def show_stripe_info():
     print_info("URL", "https://[project-ref].supabase.co/functions/v1/stripe-webhook", indent=1)
     print_info("Events", "customer.subscription.*, invoice.*, payment_intent.*", indent=1)
 
+    with span("Billing Activity", 'compute'):
+        billing = billing_summary()
+    print(f"\n{Colors.BOLD}Billing Activity:{Colors.ENDC}")
+    if not billing:
+        print(f"  {Colors.YELLOW}No event exports in {DEFAULT_EXPORT.name}/ (python project-info/stripe_events.py){Colors.ENDC}")
+        return
+    print_info("Events", f"{billing['events']:,} from {billing['files']} exports", indent=1)
+    for row in billing['mrr']:
+        print_info(f"MRR {row['tier'].title()}",
+                   f"{row['mrr'] / 100:,.2f} {row['currency'].upper()} ({row['subscribers']} subscribers)", indent=1)
+    print_info("Free customers", billing['free'], indent=1)
+    print_info("Trialing", billing['trialing'], indent=1)
+    churn, recovery, funnel = billing['churn'], billing['recovery'], billing['funnel']
+    if churn['rate'] is not None:
+        print_info(f"Churn ({churn['window_days']}d)", f"{churn['rate']:.1%} ({churn['canceled']} canceled)", indent=1)
+    if recovery['rate'] is not None:
+        print_info("Payment recovery",
+                   f"{recovery['rate']:.1%} ({recovery['recovered']} of {recovery['failed']} failed)", indent=1)
+    print_info("Funnel", f"{funnel['created']} created → {funnel['trials']} trials → "
+               f"{funnel['conversions']} converted, {funnel['upgrades']} upgrades, "
+               f"{funnel['downgrades']} downgrades", indent=1)
+
 def show_quick_commands():
     """Display essential commands"""
     print_section("Quick Commands Reference")
 
-    print(f"\n{Colors.BOLD}Development:{Colors.ENDC}")
-    print_command("Start development server", "npm run dev")
-    print_command("Build for production", "npm run build")
-    print_command("Preview production build", "npm run preview")
-
-    print(f"\n{Colors.BOLD}Supabase:{Colors.ENDC}")
-    print_command("Link to Supabase project", "supabase link --project-ref [YOUR_REF]")
-    print_command("Apply database migrations", "supabase db push")
-    print_command("Reset database (DANGER!)", "supabase db reset")
-    print_command("Deploy all Edge Functions", "supabase functions deploy")
-    print_command("Deploy specific function", "supabase functions deploy [function-name]")
-    print_command("View function logs", "supabase functions logs [function-name]")
-    print_command("Set environment secret", "supabase secrets set KEY=value")
-    print_command("List all secrets", "supabase secrets list")
-
-    print(f"\n{Colors.BOLD}Deployment:{Colors.ENDC}")
-    print_command("Deploy to Vercel preview", "vercel")
-    print_command("Deploy to production", "vercel --prod")
-
-    print(f"\n{Colors.BOLD}Stripe:{Colors.ENDC}")
-    print_command("Fetch Stripe product prices", "node get-stripe-prices.js")
-    print_command("Test webhook locally", "stripe listen --forward-to localhost:54321/functions/v1/stripe-webhook")
+    for group, commands in COMMANDS.items():
+        print(f"\n{Colors.BOLD}{group}:{Colors.ENDC}")
+        for description, command in commands:
+            print_command(description, command)
+
+def get_supabase_links(env_local):
+    """Supabase dashboard links for the configured project"""
+    supabase_url = env_local.get('VITE_SUPABASE_URL', '')
+    if not supabase_url:
+        return []
+
+    project_ref = supabase_url.replace('https://', '').replace('.supabase.co', '')
+    base = f"https://supabase.com/dashboard/project/{project_ref}"
+    return [
+        ("Main Dashboard", base),
+        ("Database", f"{base}/editor"),
+        ("Storage", f"{base}/storage/buckets"),
+        ("Edge Functions", f"{base}/functions"),
+        ("Authentication", f"{base}/auth/users"),
+        ("API Docs", f"{base}/api")
+    ]
 
 def show_quick_links():
     """Display important URLs and dashboards"""
@@ -217,33 +326,16 @@ def show_quick_links():
     project_root = Path(__file__).parent.parent
     env_local = read_env_file(project_root / '.env.local')
 
-    supabase_url = env_local.get('VITE_SUPABASE_URL', '')
-    if supabase_url:
-        project_ref = supabase_url.replace('https://', '').replace('.supabase.co', '')
-
+    supabase_links = get_supabase_links(env_local)
+    if supabase_links:
         print(f"\n{Colors.BOLD}Supabase Dashboards:{Colors.ENDC}")
-        print_link("Main Dashboard", f"https://supabase.com/dashboard/project/{project_ref}")
-        print_link("Database", f"https://supabase.com/dashboard/project/{project_ref}/editor")
-        print_link("Storage", f"https://supabase.com/dashboard/project/{project_ref}/storage/buckets")
-        print_link("Edge Functions", f"https://supabase.com/dashboard/project/{project_ref}/functions")
-        print_link("Authentication", f"https://supabase.com/dashboard/project/{project_ref}/auth/users")
-        print_link("API Docs", f"https://supabase.com/dashboard/project/{project_ref}/api")
-
-    print(f"\n{Colors.BOLD}Stripe Dashboards:{Colors.ENDC}")
-    print_link("Dashboard", "https://dashboard.stripe.com")
-    print_link("Test Mode", "https://dashboard.stripe.com/test/dashboard")
-    print_link("API Keys", "https://dashboard.stripe.com/test/apikeys")
-    print_link("Webhooks", "https://dashboard.stripe.com/test/webhooks")
-    print_link("Products", "https://dashboard.stripe.com/test/products")
-    print_link("Customers", "https://dashboard.stripe.com/test/customers")
-
-    print(f"\n{Colors.BOLD}External Resources:{Colors.ENDC}")
-    print_link("Gemini API Console", "https://ai.google.dev")
-    print_link("Vercel Dashboard", "https://vercel.com/dashboard")
-    print_link("Supabase Docs", "https://supabase.com/docs")
-    print_link("Stripe Docs", "https://stripe.com/docs")
-    print_link("React Docs", "https://react.dev")
-    print_link("Vite Docs", "https://vitejs.dev")
+        for label, url in supabase_links:
+            print_link(label, url)
+
+    for group, links in LINKS.items():
+        print(f"\n{Colors.BOLD}{group}:{Colors.ENDC}")
+        for label, url in links:
+            print_link(label, url)
 
 def show_project_structure():
     """Display project directory structure"""
@@ -289,25 +381,346 @@ def show_ai_modes():
     """Display available AI transformation modes"""
     print_section("AI Transformation Modes")
 
-    modes = [
-        ("🎨 Renaissance", "Classical renaissance painting style"),
-        ("🎭 Cartoon", "Fun cartoon/animated character"),
-        ("🗿 Statue", "Marble statue or sculpture"),
-        ("🍌 Banana", "Everything is made of bananas"),
-        ("🕺 80s", "Retro 1980s aesthetic"),
-        ("📸 19th Century", "Victorian-era photograph"),
-        ("⚡ Anime", "Japanese anime character"),
-        ("🌈 Psychedelic", "Trippy psychedelic art"),
-        ("🎮 8-bit", "Retro video game pixel art"),
-        ("🧔 Big Beard", "Epic legendary beard"),
-        ("💥 Comic Book", "Classic comic book style"),
-        ("👴 Old", "Aged 60+ years"),
-        ("✏️ Custom", "User-defined prompt")
-    ]
-
-    for mode, desc in modes:
+    for mode, desc in MODES:
         print(f"  {Colors.GREEN}{mode}{Colors.ENDC}: {desc}")
 
+def show_dependencies():
+    """Display the dependency graph computed from package-lock.json"""
+    print_section("Dependency Analysis")
+
+    with span("Dependency Analysis", 'compute'):
+        report = analyze_dependencies()
+    if 'error' in report:
+        print(f"{Colors.RED}  {report['error']}{Colors.ENDC}")
+        return
+
+    print_info("Lockfile", report['lockfile'])
+    print_info("Packages", f"{report['total_packages']} ({report['dev_packages']} dev-only)")
+    print_info("Install Size", install_size_label(report))
+
+    print(f"\n{Colors.BOLD}Apps:{Colors.ENDC}")
+    for app in report['apps']:
+        print(f"  {Colors.GREEN}•{Colors.ENDC} {Colors.YELLOW}{app['name']}{Colors.ENDC}: "
+              f"{app['direct']} direct, {app['transitive']} transitive, "
+              f"{len(app['exclusive'])} exclusive")
+        if app['unresolved']:
+            print(f"    {Colors.RED}Not in root lockfile: {', '.join(app['unresolved'])}{Colors.ENDC}")
+
+    print(f"\n{Colors.BOLD}Heaviest Direct Dependencies:{Colors.ENDC}")
+    for dep in report['top_level'][:10]:
+        dev = " (dev)" if dep['dev'] else ""
+        print_info(f"{dep['name']}@{dep['version']}{dev}", f"{dep['transitive']} transitive packages", indent=1)
+
+    if report['duplicates']:
+        print(f"\n{Colors.BOLD}Duplicate Versions:{Colors.ENDC}")
+        for dup in report['duplicates']:
+            print_info(dup['name'], ', '.join(dup['versions']), indent=1)
+
+    if report['largest']:
+        print(f"\n{Colors.BOLD}Largest Installed Packages:{Colors.ENDC}")
+        for pkg in report['largest'][:10]:
+            print_info(f"{pkg['name']}@{pkg['version']}", format_size(pkg['size']), indent=1)
+
+def show_bundle_report():
+    """Display chunk sizes from the most recent recorded builds"""
+    print_section("Build Output & Bundle Size")
+
+    with span("Build Output & Bundle Size", 'compute'):
+        reports = all_latest_reports()
+    if not reports:
+        print(f"{Colors.YELLOW}  No builds recorded yet.{Colors.ENDC}")
+        print_command("Build and record bundle sizes", "python project-info/bundle_analyzer.py --build")
+        return
+
+    for app, report in reports.items():
+        record = report['build']
+        duration = f", built in {record['duration']}s" if record['duration'] is not None else ""
+        print(f"\n{Colors.BOLD}{app}{Colors.ENDC} ({record['timestamp']}{duration})")
+        print_info("Total", f"{format_size(record['total_raw'])} raw / {format_size(record['total_gzip'])} gzip", indent=1)
+        for chunk in record['chunks'][:8]:
+            flag = f" {Colors.RED}⚠ oversized{Colors.ENDC}" if chunk['key'] in report['oversized'] else ""
+            print(f"    {Colors.YELLOW}{chunk['file']}{Colors.ENDC}: {format_size(chunk['raw'])} "
+                  f"({format_size(chunk['gzip'])} gzip){flag}")
+        for reg in report['regressions']:
+            print(f"    {Colors.RED}▲ {reg['key']} +{format_size(reg['growth'])} gzip vs recent builds{Colors.ENDC}")
+
+def show_code_metrics():
+    """Display measured code size per language and sub-app"""
+    print_section("Code Metrics")
+
+    with span("Code Metrics", 'compute'):
+        metrics = collect_metrics()
+    totals = metrics['totals']
+    trend = [value for _, value in metrics['trend']['total.lines']]
+
+    print_info("Files", f"{totals['files']:,}")
+    print_info("Lines", f"{totals['lines']:,}  {Colors.CYAN}{sparkline(trend)}{Colors.ENDC}")
+    print_info("Size", format_size(totals['bytes']))
+
+    print(f"\n{Colors.BOLD}Measured Project Stats:{Colors.ENDC}")
+    for key, value in metrics['stats'].items():
+        print_info(key.replace('_', ' ').title(), value, indent=1)
+
+    for title, rows in (("By Sub-App", metrics['apps']), ("By Language", metrics['languages'])):
+        print(f"\n{Colors.BOLD}{title}:{Colors.ENDC}")
+        for name, counts in rows.items():
+            print_info(name, f"{counts['lines']:,} lines, {counts['files']} files, "
+                             f"{format_size(counts['bytes'])}", indent=1)
+
+def show_duplicates():
+    """Display near-duplicate files ranked by estimated savings"""
+    print_section("Duplicate Code")
+
+    with span("Duplicate Code", 'compute'):
+        report = find_duplicates(limit=15)
+    print_info("Files Scanned", f"{report['files']} (incl. {', '.join(report['archives']) or 'no archives'})")
+    print_info("Near-Duplicate Pairs", report['total_pairs'])
+    print_info("Estimated Savings", format_size(report['estimated_savings']))
+
+    print(f"\n{Colors.BOLD}Top Dedupe Opportunities:{Colors.ENDC}")
+    for pair in report['pairs']:
+        print(f"  {Colors.YELLOW}{pair['similarity']:.0%}{Colors.ENDC} "
+              f"{pair['a']}:{pair['lines_a'][0]}-{pair['lines_a'][1]} ↔ "
+              f"{pair['b']}:{pair['lines_b'][0]}-{pair['lines_b'][1]} "
+              f"{Colors.GREEN}~{format_size(pair['savings'])}{Colors.ENDC}")
+
+def show_archives():
+    """Display zip archive contents and drift from their extracted directories"""
+    print_section("Archives")
+
+    with span("Zip Archives", 'compute'):
+        reports = inspect_archives()
+    for report in reports:
+        print(f"\n{Colors.BOLD}{report['archive']}:{Colors.ENDC}")
+        print_info("Members", f"{len(report['members'])} ({format_size(report['total_size'])} unpacked)", indent=1)
+        print_info("Extracted To", f"{report['directory']}/" if report['directory'] else "Not extracted", indent=1)
+
+        drift = report['drift']
+        if not drift:
+            continue
+        if not (drift['added'] or drift['removed'] or drift['modified']):
+            print(f"  {Colors.GREEN}✓ In sync ({drift['unchanged']} files){Colors.ENDC}")
+            continue
+        for name in drift['added']:
+            print(f"  {Colors.GREEN}+ {name}{Colors.ENDC} (only on disk)")
+        for name in drift['removed']:
+            print(f"  {Colors.RED}- {name}{Colors.ENDC} (only in archive)")
+        for change in drift['modified']:
+            print(f"  {Colors.YELLOW}~ {change['member']}{Colors.ENDC} "
+                  f"({format_size(change['zip_size'])} → {format_size(change['disk_size'])})")
+
+    print(f"\n  Preview a member: {Colors.CYAN}python project-info/archive_inspector.py ARCHIVE MEMBER{Colors.ENDC}")
+
+def show_gemini_cache():
+    """Display hit rate and savings of the Gemini caching proxy"""
+    print_section("Gemini Cache")
+
+    with span("Gemini Cache", 'compute'):
+        summary = cache_summary()
+    if not summary['hits'] + summary['misses']:
+        print(f"  {Colors.YELLOW}No cached calls yet.{Colors.ENDC} Start the proxy and set "
+              f"VITE_GEMINI_BASE_URL=http://127.0.0.1:{summary['port']}")
+        print(f"  {Colors.CYAN}python project-info/gemini_proxy.py{Colors.ENDC}")
+        return
+
+    print_info("Hit Rate", f"{summary['hit_rate']:.0%} ({summary['hits']} hits / {summary['misses']} misses)")
+    print_info("Bytes Saved", format_size(summary['bytes_saved']))
+    print_info("Cost Avoided", f"${summary['cost_avoided']:.2f}")
+    print_info("Time Saved", f"{summary['seconds_saved']:.0f}s")
+    print_info("Cached Responses", f"{summary['entries']} ({format_size(summary['cache_bytes'])})")
+    if summary['errors']:
+        print_info("Upstream Errors", summary['errors'])
+
+def show_mirror():
+    """Display production usage from the local table mirror"""
+    print_section("Production Mirror")
+
+    with span("Production Mirror", 'compute'):
+        summary = mirror_summary()
+    if not summary['synced']:
+        print(f"  {Colors.YELLOW}No mirror yet.{Colors.ENDC} Run: "
+              f"{Colors.CYAN}python project-info/table_mirror.py{Colors.ENDC}")
+        return
+
+    print(f"{Colors.BOLD}Tables:{Colors.ENDC}")
+    for table in summary['tables']:
+        synced = datetime.fromtimestamp(table['synced_at']).strftime('%Y-%m-%d %H:%M')
+        print_info(table['table'], f"{table['rows']} rows, {table['watermark_column']} ≤ "
+                                   f"{table['watermark'] or '-'} (synced {synced})", indent=1)
+
+    print(f"\n{Colors.BOLD}Photos by Mode:{Colors.ENDC}")
+    for row in summary['modes']:
+        print_info(row['mode'] or '(none)', row['photos'], indent=1)
+
+    print(f"\n{Colors.BOLD}Active Subscribers:{Colors.ENDC}")
+    for row in summary['tiers']:
+        print_info(row['tier_id'], row['subscribers'], indent=1)
+
+    for row in summary['revenue']:
+        print_info(f"Revenue ({row['currency']})", f"{row['total']:.2f} from {row['payments']} payments")
+
+    if summary['daily']:
+        photos = sum(row['photos'] for row in summary['daily'])
+        gifs = sum(row['gifs'] for row in summary['daily'])
+        print_info("Last 30 Days", f"{photos} photos, {gifs} GIFs")
+
+def show_storage_audit():
+    """Display the last storage bucket audit"""
+    print_section("Storage Audit")
+
+    with span("Storage Audit", 'compute'):
+        report = load_report()
+    if not report:
+        print(f"  {Colors.YELLOW}No audit yet.{Colors.ENDC} Export the buckets to storage/ and run: "
+              f"{Colors.CYAN}python project-info/bucket_audit.py{Colors.ENDC}")
+        return
+
+    for bucket in report['buckets']:
+        print(f"\n{Colors.BOLD}{bucket['bucket']}:{Colors.ENDC}")
+        print_info("Objects", f"{bucket['objects']} ({format_size(bucket['bytes'])})", indent=1)
+        limit = format_size(bucket['limit']) if bucket['limit'] else "none"
+        color = Colors.RED if bucket['over_limit_count'] else Colors.GREEN
+        print(f"  {color}{bucket['over_limit_count']} over the {limit} limit{Colors.ENDC}")
+        for obj in bucket['over_limit'][:5]:
+            print(f"    {obj['name']} ({format_size(obj['size'])})")
+        if bucket['disallowed_count']:
+            print(f"  {Colors.YELLOW}{bucket['disallowed_count']} with a type outside "
+                  f"{', '.join(bucket['allowed_types'])}{Colors.ENDC}")
+
+    print()
+    if report['orphans'] is None:
+        print_info("Orphans", "skipped (sync the table mirror first)")
+    else:
+        print_info("Orphans", f"{report['orphans']['count']} ({format_size(report['orphans']['bytes'])})")
+    print_info("Identical Copies", f"{report['identical_groups']} groups ({format_size(report['identical_bytes'])})")
+    if report['near_groups'] is None:
+        print_info("Near-Identical", "skipped (pip install Pillow)")
+    else:
+        print_info("Near-Identical", f"{report['near_groups']} groups ({format_size(report['near_bytes'])})")
+    print_info("Reclaimable", format_size(report['reclaimable_bytes']))
+    print_info("Audited", datetime.fromtimestamp(report['audited_at']).strftime('%Y-%m-%d %H:%M'))
+
+def show_deploys():
+    """Display edge function deploy times from the deploy history"""
+    print_section("Edge Function Deploys")
+
+    with span("Deploy Edge Functions", 'compute'):
+        history = deploy_history()
+    print_info("Functions", ", ".join(list_functions()) or "none")
+    if not history['runs']:
+        print(f"  {Colors.YELLOW}No deploys recorded yet.{Colors.ENDC} Run: "
+              f"{Colors.CYAN}python project-info/deploy_runner.py{Colors.ENDC}")
+        return
+
+    print(f"\n{Colors.BOLD}Step Durations:{Colors.ENDC}")
+    for fn in history['steps']:
+        median = f"{fn['median']:.1f}s median, {fn['max']:.1f}s max" if fn['median'] is not None else "never succeeded"
+        failures = f", {Colors.RED}{fn['failures']} failed{Colors.ENDC}" if fn['failures'] else ""
+        print_info(fn['function'], f"{median} ({fn['deploys']} deploys{failures})", indent=1)
+
+    print(f"\n{Colors.BOLD}Recent Runs:{Colors.ENDC}")
+    for run in history['runs'][:5]:
+        when = datetime.fromtimestamp(run['time']).strftime('%Y-%m-%d %H:%M')
+        print_info(when, f"{run['functions']} functions in {run['wall_time']:.1f}s "
+                         f"(steps total {run['step_total']:.1f}s)", indent=1)
+
+def show_projects():
+    """Compare every project registered in config.json"""
+    print_section("Projects & Environments")
+
+    with span("Projects & Environments", 'compute'):
+        report = compare_projects()
+    projects = report['projects']
+    width = max(12, *(len(p['name']) for p in projects))
+    label_width = max(len(k) for k in report['keys'] + report['functions'] + ['Migrations'])
+
+    def row(label, cells):
+        print(f"  {label:<{label_width}}  " + "  ".join(cells))
+
+    def mark(ok, text=None):
+        text = text or ("✓" if ok else "✗")
+        return f"{Colors.GREEN if ok else Colors.RED}{text:<{width}}{Colors.ENDC}"
+
+    row("", [f"{Colors.BOLD}{p['name']:<{width}}{Colors.ENDC}" for p in projects])
+
+    def probe(status):
+        text = f"{status['status']} {status['ms']:.0f}ms" if status['ms'] is not None else status['status']
+        color = {'up': Colors.GREEN, 'auth': Colors.YELLOW, 'skipped': Colors.ENDC}.get(status['status'], Colors.RED)
+        return f"{color}{text:<{width}}{Colors.ENDC}"
+
+    row("Probe", [probe(p['probe']) for p in projects])
+    row("Migrations", [mark(not p['missing_migrations'], f"{p['migration_count']} ({len(p['missing_migrations'])} behind)"
+                            if p['missing_migrations'] else f"{p['migration_count']} (latest)") for p in projects])
+
+    with span("Latency History", 'compute'):
+        latency = history('24h', [f"probe:{p['name']}" for p in projects], points=width)['series']
+
+    def trend(project):
+        points = latency.get(f"probe:{project['name']}", [])
+        return f"{sparkline([p[1] for p in points if p[1] is not None]) or '-':<{width}}"
+
+    row("Latency 24h", [trend(p) for p in projects])
+
+    print(f"\n{Colors.BOLD}Keys:{Colors.ENDC}")
+    for key in report['keys']:
+        row(key, [mark(p['keys'][key]) for p in projects])
+
+    print(f"\n{Colors.BOLD}Edge Functions:{Colors.ENDC}")
+    for function in report['functions']:
+        row(function, [mark(function in p['functions']) for p in projects])
+
+    for p in projects:
+        if not p['exists']:
+            print(f"\n  {Colors.RED}{p['name']}: {p['root']} does not exist{Colors.ENDC}")
+        elif not p['env_file']:
+            print(f"\n  {Colors.YELLOW}{p['name']}: no env file{Colors.ENDC}")
+        if p['probe']['error'] and p['probe']['status'] != 'skipped':
+            print(f"  {Colors.RED}{p['name']}: {p['probe']['error']}{Colors.ENDC}")
+    print(f"\n  {len(projects)} projects collected in {report['elapsed_ms']:.0f} ms "
+          f"(add more under \"projects\" in project-info/config.json)")
+
+def show_alerts():
+    """Evaluate the alert rules from config.json and list what is firing"""
+    print_section("Alerts")
+
+    with span("Alerts", 'compute'):
+        try:
+            report = evaluate_alerts()
+        except RuleError as e:
+            print(f"  {Colors.RED}{e}{Colors.ENDC}")
+            return
+
+    colors = {'critical': Colors.RED, 'warning': Colors.YELLOW, 'info': Colors.CYAN}
+    if not report['active']:
+        print(f"\n  {Colors.GREEN}✓ Nothing firing{Colors.ENDC}")
+    for alert in report['active']:
+        since = datetime.fromtimestamp(alert['since']).strftime('%Y-%m-%d %H:%M')
+        print(f"  {colors[alert['severity']]}● {alert['severity']:<8}{Colors.ENDC} {alert['message']} "
+              f"{Colors.CYAN}(since {since}){Colors.ENDC}")
+    for signal, error in report['errors'].items():
+        print(f"  {Colors.RED}{signal}: {error}{Colors.ENDC}")
+    print(f"\n  {report['rules']} rules, {report['signals_collected']} signals collected, "
+          f"{report['signals_skipped']} unchanged, {report['delivered']} sent to {', '.join(report['sinks'])} "
+          f"in {report['elapsed_ms']:.0f} ms (rules live under \"alerts\" in project-info/config.json)")
+
+def deploy_functions():
+    """Deploy selected edge functions in parallel, streaming their output"""
+    show_deploys()
+
+    names = input(f"\n{Colors.BOLD}Functions to deploy (space separated, 'all', empty to go back): "
+                  f"{Colors.ENDC}").split()
+    if not names:
+        return
+    concurrency = input(f"{Colors.BOLD}Parallel deploys [{DEFAULT_CONCURRENCY}]: {Colors.ENDC}").strip()
+    try:
+        run = start_deploy(None if names == ['all'] else names,
+                           int(concurrency) if concurrency.isdigit() else DEFAULT_CONCURRENCY)
+    except ValueError as e:
+        print(f"{Colors.RED}{e}{Colors.ENDC}")
+        return
+    print()
+    stream_to_terminal(run)
+
 def show_troubleshooting():
     """Display common issues and solutions"""
     print_section("Troubleshooting Guide")
@@ -335,22 +748,62 @@ def show_troubleshooting():
         for line in solution.split('\n'):
             print(f"  {Colors.YELLOW}• {line}{Colors.ENDC}")
 
+def build_palette_index():
+    """Index every command, link, mode, table and function"""
+    project_root = Path(__file__).parent.parent
+    env_local = read_env_file(project_root / '.env.local')
+
+    return PaletteIndex(build_entries(
+        commands=[cmd for group in COMMANDS.values() for cmd in group],
+        links=get_supabase_links(env_local) + [link for group in LINKS.values() for link in group],
+        modes=MODES,
+        tables=TABLES,
+        functions=FUNCTIONS,
+        sections=[(desc, key) for key, desc in MENU_SECTIONS]
+    ))
+
+def show_command_palette():
+    """Fuzzy search commands, links, modes, tables and functions"""
+    print_section("Command Palette")
+    index = build_palette_index()
+
+    while True:
+        query = input(f"\n{Colors.BOLD}Search (empty to go back): {Colors.ENDC}").strip()
+        if not query:
+            return
+
+        results = index.search(query, limit=9)
+        if not results:
+            print(f"{Colors.RED}  No matches{Colors.ENDC}")
+            continue
+
+        for i, entry in enumerate(results, 1):
+            detail = entry['subtitle'] if entry['action'] == 'navigate' else entry['value']
+            print(f"  {Colors.CYAN}{i}.{Colors.ENDC} {Colors.GREEN}[{entry['kind']}]{Colors.ENDC} "
+                  f"{entry['title']} {Colors.YELLOW}{detail}{Colors.ENDC}")
+
+        pick = input(f"{Colors.BOLD}Select 1-{len(results)} (Enter to search again): {Colors.ENDC}").strip()
+        if not pick.isdigit() or not 1 <= int(pick) <= len(results):
+            continue
+
+        entry = results[int(pick) - 1]
+        if entry['action'] == 'copy':
+            print(f"\n    {Colors.YELLOW}$ {entry['value']}{Colors.ENDC}")
+        elif entry['action'] == 'open':
+            print_link("Opening", entry['value'])
+            webbrowser.open(entry['value'])
+        else:
+            run_section(PALETTE_TARGETS.get(entry['target'], entry['target']))
+        return
+
 def show_menu():
     """Display interactive menu"""
     while True:
         print_header("📋 GEMBOOTH DASHBOARD MENU")
 
-        menu_options = [
-            ("1", "Project Overview"),
-            ("2", "Environment Variables & API Keys"),
-            ("3", "Supabase Configuration"),
-            ("4", "Stripe Integration"),
-            ("5", "Quick Commands"),
-            ("6", "Quick Links & Dashboards"),
-            ("7", "Project Structure"),
-            ("8", "AI Transformation Modes"),
-            ("9", "Troubleshooting Guide"),
+        menu_options = MENU_SECTIONS + [
             ("0", "Show All Information"),
+            ("p", "Command Palette (search everything)"),
             ("q", "Quit")
         ]
 
@@ -362,26 +815,12 @@ def show_menu():
 
         choice = input(f"\n{Colors.BOLD}Enter your choice: {Colors.ENDC}").strip().lower()
 
-        if choice == '1':
-            show_project_overview()
-        elif choice == '2':
-            show_environment_variables()
-        elif choice == '3':
-            show_supabase_info()
-        elif choice == '4':
-            show_stripe_info()
-        elif choice == '5':
-            show_quick_commands()
-        elif choice == '6':
-            show_quick_links()
-        elif choice == '7':
-            show_project_structure()
-        elif choice == '8':
-            show_ai_modes()
-        elif choice == '9':
-            show_troubleshooting()
+        if choice in SECTION_HANDLERS:
+            run_section(choice)
         elif choice == '0':
             show_all_information()
+        elif choice == 'p':
+            show_command_palette()
         elif choice == 'q':
             print(f"\n{Colors.GREEN}Thanks for using GemBooth Dashboard! 👋{Colors.ENDC}\n")
             sys.exit(0)
@@ -392,15 +831,14 @@ def show_menu():
 
 def show_all_information():
     """Display all information at once"""
-    show_project_overview()
-    show_environment_variables()
-    show_supabase_info()
-    show_stripe_info()
-    show_quick_commands()
-    show_quick_links()
-    show_project_structure()
-    show_ai_modes()
-    show_troubleshooting()
+    for title, show in ALL_SECTIONS:
+        with span(title, 'render'):
+            show()
+
+def run_section(key):
+    """Run one menu section, timed as a span when profiling"""
+    with span(dict(MENU_SECTIONS).get(key, key), 'render'):
+        SECTION_HANDLERS[key]()
 
 def main():
     """Main entry point"""
@@ -412,12 +850,13 @@ def main():
             print(f"Current location: {project_root}")
             sys.exit(1)
 
-        # If command line argument provided, show all info and exit
-        if len(sys.argv) > 1 and sys.argv[1] in ['--all', '-a']:
-            show_all_information()
-        else:
-            # Show interactive menu
-            show_menu()
+        with profiling('cli', profile_mode(sys.argv[1:])):
+            # If command line argument provided, show all info and exit
+            if '--all' in sys.argv[1:] or '-a' in sys.argv[1:]:
+                show_all_information()
+            else:
+                # Show interactive menu
+                show_menu()
 
     except KeyboardInterrupt:
         print(f"\n\n{Colors.GREEN}Thanks for using GemBooth Dashboard! 👋{Colors.ENDC}\n")
@@ -426,5 +865,66 @@ def main():
         print(f"\n{Colors.RED}Error: {e}{Colors.ENDC}\n")
         sys.exit(1)
 
+# Menu keys for each section, shared by the menu and the command palette
+MENU_SECTIONS = [
+    ("1", "Project Overview"),
+    ("2", "Environment Variables & API Keys"),
+    ("3", "Supabase Configuration"),
+    ("4", "Stripe Integration"),
+    ("5", "Quick Commands"),
+    ("6", "Quick Links & Dashboards"),
+    ("7", "Project Structure"),
+    ("8", "AI Transformation Modes"),
+    ("9", "Troubleshooting Guide"),
+    ("d", "Dependency Analysis"),
+    ("b", "Build Output & Bundle Size"),
+    ("m", "Code Metrics"),
+    ("u", "Duplicate Code"),
+    ("z", "Zip Archives"),
+    ("g", "Gemini Cache"),
+    ("r", "Production Mirror"),
+    ("s", "Storage Audit"),
+    ("f", "Deploy Edge Functions"),
+    ("x", "Projects & Environments"),
+    ("a", "Alerts")
+]
+
+SECTION_HANDLERS = {
+    "1": show_project_overview,
+    "2": show_environment_variables,
+    "3": show_supabase_info,
+    "4": show_stripe_info,
+    "5": show_quick_commands,
+    "6": show_quick_links,
+    "7": show_project_structure,
+    "8": show_ai_modes,
+    "9": show_troubleshooting,
+    "d": show_dependencies,
+    "b": show_bundle_report,
+    "m": show_code_metrics,
+    "u": show_duplicates,
+    "z": show_archives,
+    "g": show_gemini_cache,
+    "r": show_mirror,
+    "s": show_storage_audit,
+    "f": deploy_functions,
+    "x": show_projects,
+    "a": show_alerts
+}
+
+# Sections shown by --all, in order ("f" prompts, so only its history is shown)
+ALL_SECTIONS = [(title, SECTION_HANDLERS[key]) for key, title in MENU_SECTIONS if key not in ("9", "f")] + [
+    ("Deploy Edge Functions", show_deploys),
+    ("Troubleshooting Guide", show_troubleshooting)
+]
+
+# Palette navigation targets (shared with the web dashboard) to menu keys
+PALETTE_TARGETS = {
+    "supabase": "3",
+    "commands": "5",
+    "links": "6",
+    "ai-modes": "8"
+}
+
 if __name__ == "__main__":
     main()
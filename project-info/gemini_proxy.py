@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Gemini Caching Proxy
+Content-addressed reverse proxy that replays identical Gemini calls from disk
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+RESPONSE_DIR = CACHE_DIR / 'gemini'
+INDEX_FILE = RESPONSE_DIR / 'index.json'
+STATS_FILE = CACHE_DIR / 'gemini-proxy-stats.json'
+
+UPSTREAM = 'https://generativelanguage.googleapis.com'
+DEFAULT_PORT = 8787
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+UPSTREAM_TIMEOUT = 180
+
+# Only unary generateContent calls are cached; streaming and listing pass through
+CACHEABLE_PATH = re.compile(r'^/(v1[a-z0-9]*)/models/([^/:?]+):generateContent$')
+
+# Request headers forwarded upstream (hop-by-hop and browser headers are dropped)
+FORWARD_HEADERS = ('content-type', 'x-goog-api-key', 'x-goog-api-client', 'authorization', 'user-agent')
+
+# USD per million (input, output) tokens; image output is billed as output tokens
+PRICING = {
+    'gemini-2.5-flash-image': (0.30, 30.0),
+    'gemini-2.5-flash-image-preview': (0.30, 30.0),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-pro': (1.25, 10.0)
+}
+DEFAULT_PRICING = PRICING['gemini-2.5-flash-image']
+
+def load_json(path, default):
+    """Read a JSON cache file, falling back to a default"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    """Write a JSON file atomically so the dashboards never read half a file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def cache_key(model, body):
+    """Hash (model, prompt, image bytes, generation settings) of a generateContent body"""
+    request = json.loads(body)
+    digest = hashlib.sha256(model.encode('utf-8'))
+    for content in request.get('contents', []):
+        for part in content.get('parts', []):
+            if 'text' in part:
+                digest.update(b'\0text\0' + part['text'].encode('utf-8'))
+            inline = part.get('inlineData') or part.get('inline_data')
+            if inline:
+                # Hash the decoded bytes so base64 formatting differences still hit
+                digest.update(b'\0image\0' + (inline.get('mimeType') or inline.get('mime_type') or '').encode('utf-8'))
+                digest.update(base64.b64decode(inline.get('data', '')))
+    settings = {k: v for k, v in request.items() if k != 'contents'}
+    digest.update(b'\0settings\0' + json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def estimate_cost(model, response):
+    """Estimate the USD cost of a response from its usageMetadata"""
+    usage = response.get('usageMetadata', {})
+    input_price, output_price = PRICING.get(model, DEFAULT_PRICING)
+    return (usage.get('promptTokenCount', 0) * input_price
+            + usage.get('candidatesTokenCount', 0) * output_price) / 1_000_000
+
+class ResponseCache:
+    """Size-bounded on-disk response store with least-recently-used eviction"""
+
+    def __init__(self, directory=RESPONSE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.index_file = self.directory / INDEX_FILE.name
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.load()
+
+    def path(self, key):
+        """Response file for a key"""
+        return self.directory / f"{key}.json"
+
+    def load(self):
+        """Rebuild LRU order from file mtimes (touched on every hit)"""
+        index = load_json(self.index_file, {})
+        found = []
+        if self.directory.is_dir():
+            for entry in os.scandir(self.directory):
+                key = entry.name[:-5]
+                if entry.name.endswith('.json') and key in index:
+                    found.append((entry.stat().st_mtime_ns, key, entry.stat().st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = dict(index[key], size=size)
+            self.total_bytes += size
+
+    def save_index(self):
+        """Persist per-entry metadata (model, cost, upstream latency)"""
+        save_json(self.index_file, dict(self.entries))
+
+    def get(self, key):
+        """Return (body, metadata) and mark the entry recently used, or None"""
+        with self.lock:
+            meta = self.entries.get(key)
+            if meta is None:
+                return None
+            try:
+                with open(self.path(key), 'rb') as f:
+                    body = f.read()
+                os.utime(self.path(key))
+            except OSError:
+                self.total_bytes -= self.entries.pop(key)['size']
+                return None
+            self.entries.move_to_end(key)
+            return body, meta
+
+    def put(self, key, body, meta):
+        """Store a response and evict the least recently used entries over the limit"""
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.path(key).with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, self.path(key))
+
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)['size']
+            self.entries[key] = dict(meta, size=len(body))
+            self.total_bytes += len(body)
+
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, old = self.entries.popitem(last=False)
+                self.total_bytes -= old['size']
+                try:
+                    os.unlink(self.path(old_key))
+                except OSError:
+                    pass
+            self.save_index()
+
+class ProxyStats:
+    """Cumulative hit/miss counters, persisted for the dashboards"""
+
+    FIELDS = ('hits', 'misses', 'passthrough', 'errors', 'bytes_saved', 'cost_avoided', 'seconds_saved')
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        saved = load_json(path, {})
+        self.counters = {field: saved.get(field, 0) for field in self.FIELDS}
+
+    def record(self, **increments):
+        """Add to counters and write them out"""
+        with self.lock:
+            for field, amount in increments.items():
+                self.counters[field] += amount
+            save_json(self.path, dict(self.counters, updated=time.time()))
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Serves cached generateContent responses and forwards everything else"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    cache = None
+    stats = None
+    upstream = UPSTREAM
+    verbose = False
+
+    # Misses currently being fetched, so identical concurrent calls share one upstream request
+    inflight = {}
+    inflight_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        """Only log requests in verbose mode"""
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, cache_status):
+        """Send a JSON response with CORS headers for the browser SDK"""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Gemini-Cache', cache_status)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def forward(self, body):
+        """Send the request upstream and return (status, body, seconds)"""
+        headers = {k: v for k, v in self.headers.items() if k.lower() in FORWARD_HEADERS}
+        request = urllib.request.Request(self.upstream + self.path, data=body,
+                                         headers=headers, method=self.command)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as response:
+                status, data = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, data = e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            status, data = 502, json.dumps({'error': {'code': 502, 'message': str(e)}}).encode('utf-8')
+        return status, data, time.perf_counter() - started
+
+    def handle_generate(self, model, body):
+        """Serve from cache, or fetch once and store successful responses"""
+        try:
+            key = cache_key(model, body)
+        except (ValueError, TypeError, AttributeError):
+            status, data, _ = self.forward(body)
+            self.stats.record(passthrough=1)
+            return self.send_body(status, data, 'BYPASS')
+
+        hit = self.cache.get(key)
+        if hit is None:
+            with self.inflight_lock:
+                pending = self.inflight.get(key)
+                leader = pending is None
+                if leader:
+                    pending = self.inflight[key] = threading.Event()
+            if not leader:
+                pending.wait(UPSTREAM_TIMEOUT)
+                hit = self.cache.get(key)
+
+        if hit is not None:
+            data, meta = hit
+            self.stats.record(hits=1, bytes_saved=len(data), cost_avoided=meta['cost'],
+                              seconds_saved=meta['latency'])
+            return self.send_body(200, data, 'HIT')
+
+        try:
+            status, data, seconds = self.forward(body)
+            if status == 200:
+                response = json.loads(data)
+                if response.get('candidates'):
+                    self.cache.put(key, data, {'model': model, 'cost': estimate_cost(model, response),
+                                               'latency': round(seconds, 3), 'created': time.time()})
+            self.stats.record(misses=1, errors=int(status != 200))
+        finally:
+            if leader:
+                with self.inflight_lock:
+                    self.inflight.pop(key).set()
+        self.send_body(status, data, 'MISS')
+
+    def do_POST(self):
+        """Cache generateContent calls, forward other POSTs"""
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        match = CACHEABLE_PATH.match(self.path.split('?', 1)[0])
+        if match:
+            return self.handle_generate(match.group(2), body)
+        status, data, _ = self.forward(body)
+        self.stats.record(passthrough=1)
+        self.send_body(status, data, 'BYPASS')
+
+    def do_GET(self):
+        """Forward model listings and other reads unchanged"""
+        status, data, _ = self.forward(None)
+        self.stats.record(passthrough=1)
+        self.send_body(status, data, 'BYPASS')
+
+    def do_OPTIONS(self):
+        """CORS preflight for the browser SDK"""
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers',
+                         self.headers.get('Access-Control-Request-Headers', ', '.join(FORWARD_HEADERS)))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+class ProxyServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog sized for parallel generations"""
+    daemon_threads = True
+    request_queue_size = 64
+
+def create_server(host='127.0.0.1', port=DEFAULT_PORT, max_bytes=DEFAULT_MAX_BYTES,
+                  upstream=UPSTREAM, verbose=False, directory=RESPONSE_DIR, stats_file=STATS_FILE):
+    """Build a proxy server (port 0 picks a free port)"""
+    handler = type('Handler', (ProxyHandler,), {
+        'cache': ResponseCache(directory, max_bytes),
+        'stats': ProxyStats(stats_file),
+        'upstream': upstream.rstrip('/'),
+        'verbose': verbose,
+        'inflight': {}
+    })
+    return ProxyServer((host, port), handler)
+
+def cache_summary():
+    """Hit rate, bytes saved and cost avoided for the dashboards"""
+    stats = load_json(STATS_FILE, {})
+    index = load_json(INDEX_FILE, {})
+    hits = stats.get('hits', 0)
+    misses = stats.get('misses', 0)
+    return {
+        'entries': len(index),
+        'cache_bytes': sum(entry.get('size', 0) for entry in index.values()),
+        'hits': hits,
+        'misses': misses,
+        'passthrough': stats.get('passthrough', 0),
+        'errors': stats.get('errors', 0),
+        'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        'bytes_saved': stats.get('bytes_saved', 0),
+        'cost_avoided': round(stats.get('cost_avoided', 0.0), 4),
+        'seconds_saved': round(stats.get('seconds_saved', 0.0), 1),
+        'updated': stats.get('updated'),
+        'port': DEFAULT_PORT
+    }
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+    max_mb = int(args[args.index('--max-mb') + 1]) if '--max-mb' in args else DEFAULT_MAX_BYTES // (1024 * 1024)
+    upstream = args[args.index('--upstream') + 1] if '--upstream' in args else UPSTREAM
+
+    server = create_server(port=port, max_bytes=max_mb * 1024 * 1024, upstream=upstream,
+                           verbose='--verbose' in args)
+    cache = server.RequestHandlerClass.cache
+    print(f"Gemini cache: {len(cache.entries)} responses, "
+          f"{cache.total_bytes / (1024 * 1024):.1f} / {max_mb} MB in {RESPONSE_DIR.relative_to(PROJECT_ROOT)}")
+    print(f"Proxying {upstream} on http://127.0.0.1:{server.server_port}")
+    print("Set VITE_GEMINI_BASE_URL to http://127.0.0.1:%d to point the dev server at it" % server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - GUI Monitor
+Tk event-loop lag heartbeat, page/card build timings and a persisted stall log
+"""
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / '.cache'
+STALL_LOG = CACHE_DIR / 'gui-stalls.jsonl'
+
+HEARTBEAT_MS = 20
+STALL_MS = 50
+OVERLAY_MS = 500
+
+# Lag samples kept for the overlay percentiles (~10s at the heartbeat rate)
+WINDOW = 500
+RECENT_ACTIVITIES = 200
+MAX_LOG_LINES = 2000
+
+class LagMonitor:
+    """Measures how late root.after callbacks run and blames stalls on the work that caused them"""
+
+    def __init__(self, root, heartbeat_ms=HEARTBEAT_MS, stall_ms=STALL_MS, log_path=STALL_LOG):
+        self.root = root
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_ms = stall_ms
+        self.log_path = Path(log_path)
+        self.lags = deque(maxlen=WINDOW)
+        self.activities = deque(maxlen=RECENT_ACTIVITIES)
+        self.stack = []
+        self.timings = {}
+        self.stalls = 0
+        self.last_build = None
+        self.expected = None
+        self.overlay = None
+
+    def start(self):
+        """Start the heartbeat and trim the stall log"""
+        self.trim_log()
+        self.expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self.root.after(self.heartbeat_ms, self.beat)
+
+    def beat(self):
+        """Record how late this callback ran, then schedule the next one"""
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self.expected) * 1000)
+        self.lags.append(lag_ms)
+        if lag_ms >= self.stall_ms:
+            self.record_stall(self.expected, now, lag_ms)
+        self.expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self.root.after(self.heartbeat_ms, self.beat)
+
+    @contextmanager
+    def timed(self, label):
+        """Time a page build or card callback; nested labels form a path like 'Overview › 📊 Stats'"""
+        self.stack.append(label)
+        path = ' › '.join(self.stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            self.stack.pop()
+            elapsed_ms = (ended - started) * 1000
+            count, total, peak = self.timings.get(path, (0, 0.0, 0.0))
+            self.timings[path] = (count + 1, total + elapsed_ms, max(peak, elapsed_ms))
+            self.activities.append((path, started, ended))
+            if not self.stack:
+                self.last_build = (path, elapsed_ms)
+
+    def responsible(self, start, end):
+        """The timed work that overlapped a stall the most, preferring a card over its page on near ties"""
+        overlaps = [(min(end, ended) - max(start, began), path) for path, began, ended in self.activities]
+        overlaps = [(overlap, path) for overlap, path in overlaps if overlap > 0]
+        if not overlaps:
+            return None
+        longest = max(overlap for overlap, _ in overlaps)
+        return max((path for overlap, path in overlaps if overlap >= longest * 0.9),
+                   key=lambda path: path.count(' › '))
+
+    def record_stall(self, start, end, lag_ms):
+        """Append one stall to the log"""
+        self.stalls += 1
+        entry = {'time': time.time(), 'lag_ms': round(lag_ms, 1),
+                 'section': self.responsible(start, end) or 'unattributed (Tk or a callback)'}
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+
+    def trim_log(self):
+        """Keep only the newest MAX_LOG_LINES stalls"""
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        if len(lines) > MAX_LOG_LINES:
+            with open(self.log_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[-MAX_LOG_LINES:])
+
+    def lag_summary(self):
+        """p50, p95 and max lag (ms) over the recent window"""
+        if not self.lags:
+            return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(self.lags)
+        return {'p50': ordered[len(ordered) // 2], 'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                'max': ordered[-1]}
+
+    def slowest(self, limit=15):
+        """[(path, count, mean ms, max ms)] by max build time"""
+        rows = [(path, count, total / count, peak) for path, (count, total, peak) in self.timings.items()]
+        return sorted(rows, key=lambda r: -r[3])[:limit]
+
+    def attach_overlay(self, label):
+        """Refresh a Tk label with live lag figures every OVERLAY_MS"""
+        self.overlay = label
+        self.refresh_overlay()
+
+    def refresh_overlay(self):
+        """Write the current figures into the overlay label"""
+        if self.overlay is None or not self.overlay.winfo_exists():
+            return
+        lag = self.lag_summary()
+        text = f"lag p95 {lag['p95']:.0f}ms · max {lag['max']:.0f}ms · stalls {self.stalls}"
+        if self.last_build:
+            text += f" · {self.last_build[0]} {self.last_build[1]:.0f}ms"
+        self.overlay.config(text=text)
+        self.root.after(OVERLAY_MS, self.refresh_overlay)
+
+def load_stalls(limit=50, log_path=STALL_LOG):
+    """Newest stalls from the log, newest first"""
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return []
+    stalls = []
+    for line in reversed(lines):
+        try:
+            stalls.append(json.loads(line))
+        except ValueError:
+            continue
+    return stalls
@@ -0,0 +1,833 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Local Supabase Stand-in
+In-memory PostgREST subset built from supabase/migrations for offline development
+"""
+
+import calendar
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit, unquote
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MIGRATIONS_DIR = PROJECT_ROOT / 'supabase' / 'migrations'
+
+DEFAULT_PORT = 54321
+
+OBJECT_MIME = 'application/vnd.pgrst.object+json'
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+# Column type families; everything else compares as text
+TYPE_KINDS = [
+    (re.compile(r'\[\]$'), 'array'),
+    (re.compile(r'^(SMALLINT|INTEGER|INT|BIGINT|SERIAL|BIGSERIAL)\b'), 'int'),
+    (re.compile(r'^(DECIMAL|NUMERIC|REAL|DOUBLE|FLOAT)'), 'float'),
+    (re.compile(r'^BOOL'), 'bool'),
+    (re.compile(r'^JSONB?\b'), 'json'),
+    (re.compile(r'^TIMESTAMP'), 'timestamp')
+]
+
+COLUMN_PATTERN = re.compile(
+    r'^"?(\w+)"?\s+(TIMESTAMPTZ|TIMESTAMP(?:\s+WITH(?:OUT)?\s+TIME\s+ZONE)?|DOUBLE\s+PRECISION|'
+    r'\w+(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?)((?:\[\])?)(.*)$', re.IGNORECASE | re.DOTALL)
+DEFAULT_PATTERN = re.compile(
+    r'\bDEFAULT\s+(.+?)(?=\s+(?:NOT\s+NULL|NULL|UNIQUE|REFERENCES|CHECK|PRIMARY|CONSTRAINT)\b|$)',
+    re.IGNORECASE | re.DOTALL)
+REFERENCES_PATTERN = re.compile(r'\bREFERENCES\s+([\w."]+)', re.IGNORECASE)
+
+class PostgrestError(Exception):
+    """Error returned to clients in PostgREST's JSON shape"""
+
+    def __init__(self, status, code, message, details=None, hint=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'message': message, 'details': details, 'hint': hint}
+
+def utc_now():
+    """Current UTC time as an ISO timestamp, like TIMEZONE('utc', NOW())"""
+    return datetime.now(timezone.utc).isoformat()
+
+def parse_timestamp(value):
+    """Parse an ISO timestamp, treating naive values as UTC"""
+    parsed = datetime.fromisoformat(value.replace(' ', 'T', 1)) if isinstance(value, str) else value
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def add_month(moment):
+    """Same day next month, clamped to the month's length (like + INTERVAL '1 month')"""
+    year = moment.year + moment.month // 12
+    month = moment.month % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+def table_name(token):
+    """Strip quotes and the public schema from a table reference"""
+    token = token.replace('"', '')
+    return token[len('public.'):] if token.startswith('public.') else token
+
+def split_top_level(text, sep=','):
+    """Split on a separator outside parentheses, brackets and quotes"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '\'"':
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+def sql_statements(sql):
+    """Split a migration into statements, dropping comments and function bodies"""
+    sql = re.sub(r'\$(\w*)\$.*?\$\1\$', "''", sql, flags=re.DOTALL)
+    sql = re.sub(r'--[^\n]*', '', sql)
+    return split_top_level(sql, ';')
+
+def parse_literal(expr):
+    """Evaluate a SQL literal (with an optional ::cast) to a Python value"""
+    expr = expr.strip()
+    cast = ''
+    match = re.match(r"^(.*?)::(\w+)(\[\])?$", expr, re.DOTALL)
+    if match:
+        expr, cast = match.group(1).strip(), match.group(2).lower()
+
+    if expr.startswith("'") and expr.endswith("'"):
+        value = expr[1:-1].replace("''", "'")
+        return json.loads(value) if cast in ('json', 'jsonb') else value
+    upper = expr.upper()
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    if upper == 'NULL':
+        return None
+    try:
+        return int(expr)
+    except ValueError:
+        pass
+    try:
+        return float(expr)
+    except ValueError:
+        return expr
+
+def default_factory(expr):
+    """Turn a DEFAULT expression into a zero-argument callable"""
+    lowered = expr.lower()
+    if 'uuid_generate_v4' in lowered or 'gen_random_uuid' in lowered:
+        return lambda: str(uuid.uuid4())
+    if 'now()' in lowered or 'current_timestamp' in lowered:
+        return utc_now
+    value = parse_literal(expr)
+    return lambda: json.loads(json.dumps(value))
+
+def column_kind(sql_type):
+    """Map a SQL type to the family used for coercion and comparison"""
+    sql_type = sql_type.upper()
+    for pattern, kind in TYPE_KINDS:
+        if pattern.search(sql_type):
+            return kind
+    return 'text'
+
+class Table:
+    """Rows keyed by an internal id, with hash indexes and unique constraints"""
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}
+        self.primary_key = []
+        self.unique = []
+        self.references = {}
+        self.rows = {}
+        self.indexes = {}
+        self.unique_indexes = {}
+        self.next_id = 0
+
+    def add_column(self, definition):
+        """Parse one column definition from CREATE TABLE or ALTER TABLE"""
+        match = COLUMN_PATTERN.match(definition.strip())
+        if not match:
+            return
+        name, sql_type, array, rest = match.groups()
+        default = DEFAULT_PATTERN.search(rest)
+        column = self.columns[name] = {
+            'kind': 'array' if array else column_kind(sql_type),
+            'default': default_factory(default.group(1)) if default else None,
+            'not_null': bool(re.search(r'\bNOT\s+NULL\b|\bPRIMARY\s+KEY\b', rest, re.IGNORECASE))
+        }
+        for row in self.rows.values():
+            row[name] = column['default']() if column['default'] else None
+
+        if re.search(r'\bPRIMARY\s+KEY\b', rest, re.IGNORECASE):
+            self.primary_key = [name]
+            self.add_unique([name])
+        elif re.search(r'\bUNIQUE\b', rest, re.IGNORECASE):
+            self.add_unique([name])
+        reference = REFERENCES_PATTERN.search(rest)
+        if reference:
+            self.references[name] = table_name(reference.group(1).split('(')[0])
+            self.add_index(name)
+
+    def add_constraint(self, definition):
+        """Parse a table-level PRIMARY KEY or UNIQUE constraint"""
+        match = re.search(r'\b(PRIMARY\s+KEY|UNIQUE)\s*\(([^)]*)\)', definition, re.IGNORECASE)
+        if not match:
+            return
+        columns = [c.strip().strip('"') for c in match.group(2).split(',')]
+        if match.group(1).upper().startswith('PRIMARY'):
+            self.primary_key = columns
+        self.add_unique(columns)
+
+    def add_unique(self, columns):
+        """Enforce uniqueness over a column tuple"""
+        key = tuple(columns)
+        if key not in self.unique_indexes:
+            self.unique.append(key)
+            self.unique_indexes[key] = {}
+            if len(key) == 1:
+                self.add_index(key[0])
+
+    def add_index(self, column):
+        """Maintain a value -> row ids hash index on a column"""
+        if column in self.indexes:
+            return
+        index = defaultdict(set)
+        for row_id, row in self.rows.items():
+            index[hashable(row.get(column))].add(row_id)
+        self.indexes[column] = index
+
+    def unique_key(self, columns, row):
+        """Unique index key for a row, or None when any part is NULL"""
+        values = tuple(hashable(row.get(c)) for c in columns)
+        return None if None in values else values
+
+    def check(self, row, ignore_id=None):
+        """Validate NOT NULL and UNIQUE constraints for a candidate row"""
+        for name, column in self.columns.items():
+            if column['not_null'] and row.get(name) is None:
+                raise PostgrestError(400, '23502', f'null value in column "{name}" of relation '
+                                                   f'"{self.name}" violates not-null constraint')
+        for columns in self.unique:
+            key = self.unique_key(columns, row)
+            owner = self.unique_indexes[columns].get(key) if key else None
+            if owner is not None and owner != ignore_id:
+                raise PostgrestError(409, '23505', 'duplicate key value violates unique constraint',
+                                     f"Key ({', '.join(columns)}) already exists.")
+
+    def conflicting_row(self, row, columns):
+        """Id of an existing row sharing the given unique columns"""
+        key = self.unique_key(columns, row)
+        index = self.unique_indexes.get(tuple(columns))
+        return index.get(key) if key and index is not None else None
+
+    def _index_row(self, row_id, row, add=True):
+        """Add a row to (or remove it from) every index"""
+        for column, index in self.indexes.items():
+            value = hashable(row.get(column))
+            if add:
+                index[value].add(row_id)
+            else:
+                index[value].discard(row_id)
+                if not index[value]:
+                    del index[value]
+        for columns, index in self.unique_indexes.items():
+            key = self.unique_key(columns, row)
+            if key:
+                if add:
+                    index[key] = row_id
+                else:
+                    index.pop(key, None)
+
+    def insert(self, values):
+        """Insert one row, filling defaults, and return it"""
+        unknown = set(values) - set(self.columns)
+        if unknown:
+            raise PostgrestError(400, 'PGRST204', f"Could not find the '{sorted(unknown)[0]}' column "
+                                                  f"of '{self.name}' in the schema cache")
+        row = {}
+        for name, column in self.columns.items():
+            if name in values:
+                row[name] = values[name]
+            else:
+                row[name] = column['default']() if column['default'] else None
+        self.check(row)
+        row_id = self.next_id
+        self.next_id += 1
+        self.rows[row_id] = row
+        self._index_row(row_id, row)
+        return row
+
+    def update(self, row_id, changes):
+        """Apply changes to one row, keeping indexes in sync"""
+        unknown = set(changes) - set(self.columns)
+        if unknown:
+            raise PostgrestError(400, 'PGRST204', f"Could not find the '{sorted(unknown)[0]}' column "
+                                                  f"of '{self.name}' in the schema cache")
+        old = self.rows[row_id]
+        row = {**old, **changes}
+        # Mirrors the update_updated_at_column() triggers in the migrations
+        if 'updated_at' in self.columns and 'updated_at' not in changes:
+            row['updated_at'] = utc_now()
+        self.check(row, ignore_id=row_id)
+        self._index_row(row_id, old, add=False)
+        self.rows[row_id] = row
+        self._index_row(row_id, row)
+        return row
+
+    def delete(self, row_id):
+        """Remove one row and return it"""
+        row = self.rows.pop(row_id)
+        self._index_row(row_id, row, add=False)
+        return row
+
+def hashable(value):
+    """Index key for a value (JSON containers become their serialization)"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+class Database:
+    """All tables plus Python implementations of the RPC functions"""
+
+    def __init__(self):
+        self.tables = {}
+        self.lock = threading.RLock()
+        self.functions = dict(RPC_FUNCTIONS)
+
+    @classmethod
+    def from_migrations(cls, directory=MIGRATIONS_DIR):
+        """Build the schema (and seed rows) by replaying every migration in order"""
+        db = cls()
+        for path in sorted(Path(directory).glob('*.sql')):
+            for statement in sql_statements(path.read_text(encoding='utf-8')):
+                db.apply(statement)
+        return db
+
+    def apply(self, statement):
+        """Apply one DDL or seed statement; anything unsupported is ignored"""
+        match = re.match(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w."]+)\s*\((.*)\)\s*$',
+                         statement, re.IGNORECASE | re.DOTALL)
+        if match:
+            name = table_name(match.group(1))
+            if name in self.tables or '.' in name:
+                return
+            table = self.tables[name] = Table(name)
+            for item in split_top_level(match.group(2)):
+                if re.match(r'(CONSTRAINT|UNIQUE|PRIMARY\s+KEY|CHECK|FOREIGN\s+KEY)\b', item, re.IGNORECASE):
+                    table.add_constraint(item)
+                else:
+                    table.add_column(item)
+            return
+
+        match = re.match(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?([\w."]+)\s+(ADD\s+COLUMN.*)$',
+                         statement, re.IGNORECASE | re.DOTALL)
+        if match and table_name(match.group(1)) in self.tables:
+            table = self.tables[table_name(match.group(1))]
+            for item in split_top_level(match.group(2)):
+                definition = re.sub(r'^ADD\s+COLUMN\s+(IF\s+NOT\s+EXISTS\s+)?', '', item, flags=re.IGNORECASE)
+                if definition.split()[0].strip('"') not in table.columns:
+                    table.add_column(definition)
+            return
+
+        match = re.match(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?\w+\s+ON\s+([\w."]+)\s*\(\s*"?(\w+)',
+                         statement, re.IGNORECASE)
+        if match and table_name(match.group(1)) in self.tables:
+            self.tables[table_name(match.group(1))].add_index(match.group(2))
+            return
+
+        match = re.match(r'INSERT\s+INTO\s+([\w."]+)\s*\(([^)]*)\)\s*VALUES\s*(.*?)(?:\s+ON\s+CONFLICT.*)?$',
+                         statement, re.IGNORECASE | re.DOTALL)
+        if match and table_name(match.group(1)) in self.tables:
+            table = self.tables[table_name(match.group(1))]
+            columns = [c.strip().strip('"') for c in match.group(2).split(',')]
+            for values in split_top_level(match.group(3)):
+                literals = [parse_literal(v) for v in split_top_level(values.strip()[1:-1])]
+                table.insert(dict(zip(columns, literals)))
+            return
+
+        match = re.match(r'UPDATE\s+([\w."]+)\s+SET\s+(.*?)\s+WHERE\s+"?(\w+)"?\s*=\s*(.+)$',
+                         statement, re.IGNORECASE | re.DOTALL)
+        if match and table_name(match.group(1)) in self.tables:
+            table = self.tables[table_name(match.group(1))]
+            changes = {}
+            for assignment in split_top_level(match.group(2)):
+                column, _, expr = assignment.partition('=')
+                changes[column.strip().strip('"')] = parse_literal(expr)
+            target = parse_literal(match.group(4))
+            for row_id in [i for i, row in table.rows.items() if row.get(match.group(3)) == target]:
+                table.update(row_id, changes)
+            return
+
+        match = re.match(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?([\w."]+)', statement, re.IGNORECASE)
+        if match:
+            self.tables.pop(table_name(match.group(1)), None)
+
+    def table(self, name):
+        """Look up a table or raise PostgREST's missing-relation error"""
+        if name not in self.tables:
+            raise PostgrestError(404, '42P01', f'relation "public.{name}" does not exist')
+        return self.tables[name]
+
+    def create_user(self, user_id=None, **metadata):
+        """Replay the auth.users signup triggers: profile, free subscription, usage period"""
+        user_id = user_id or str(uuid.uuid4())
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        with self.lock:
+            self.table('profiles').insert({'id': user_id, **{k: metadata.get(k) for k in
+                                                            ('username', 'full_name', 'avatar_url')}})
+            self.table('subscriptions').insert({'user_id': user_id, 'tier_id': 'free'})
+            self.table('usage_limits').insert({
+                'user_id': user_id,
+                'period_start': now.isoformat(),
+                'period_end': add_month(now).isoformat()
+            })
+        return user_id
+
+    def load_seed(self, path):
+        """Insert rows from a {table: [rows]} JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            seed = json.load(f)
+        with self.lock:
+            for name, rows in seed.items():
+                for row in rows:
+                    self.table(name).insert(row)
+
+# ---------------------------------------------------------------- queries
+
+def coerce(kind, raw):
+    """Convert a filter value from the query string to a column's type"""
+    if raw is None:
+        return None
+    try:
+        if kind == 'int':
+            return int(raw)
+        if kind == 'float':
+            return float(raw)
+        if kind == 'bool':
+            return {'true': True, 'false': False}[raw.lower()]
+        if kind == 'timestamp':
+            return parse_timestamp(raw)
+    except (ValueError, KeyError):
+        raise PostgrestError(400, '22P02', f'invalid input syntax for type {kind}: "{raw}"')
+    return raw
+
+def comparable(kind, value):
+    """Normalize a stored value for comparison with a coerced filter value"""
+    if value is None:
+        return None
+    if kind == 'timestamp':
+        return parse_timestamp(value)
+    return value
+
+def like_pattern(pattern, flags=0):
+    """Compile a LIKE pattern (% and _, or PostgREST's * wildcard)"""
+    regex = ''.join('.*' if ch in '%*' else '.' if ch == '_' else re.escape(ch) for ch in pattern)
+    return re.compile(f'^{regex}$', flags | re.DOTALL)
+
+def parse_list(raw):
+    """Parse an in.(a,b) / cs.{a,b} list"""
+    inner = raw.strip()[1:-1]
+    return [item.strip().strip('"') for item in split_top_level(inner)] if inner.strip() else []
+
+def make_filter(table, column, expression):
+    """Build a row predicate from a `column=op.value` query parameter"""
+    if column not in table.columns:
+        raise PostgrestError(400, '42703', f'column {table.name}.{column} does not exist')
+    kind = table.columns[column]['kind']
+
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition('.')
+
+    if op == 'eq' or op == 'neq':
+        target = coerce(kind, raw)
+        test = lambda v: v is not None and comparable(kind, v) == target
+        if op == 'neq':
+            test = lambda v, eq=test: v is not None and not eq(v)
+    elif op in ('gt', 'gte', 'lt', 'lte'):
+        target = coerce(kind, raw)
+        compare = {'gt': lambda a: a > target, 'gte': lambda a: a >= target,
+                   'lt': lambda a: a < target, 'lte': lambda a: a <= target}[op]
+        test = lambda v: v is not None and compare(comparable(kind, v))
+    elif op in ('like', 'ilike'):
+        pattern = like_pattern(raw, re.IGNORECASE if op == 'ilike' else 0)
+        test = lambda v: v is not None and bool(pattern.match(str(v)))
+    elif op == 'is':
+        target = {'null': None, 'true': True, 'false': False}.get(raw.lower(), 'invalid')
+        if target == 'invalid':
+            raise PostgrestError(400, 'PGRST100', f'failed to parse filter (is.{raw})')
+        test = lambda v: v is target
+    elif op == 'in':
+        targets = {coerce(kind, item) for item in parse_list(raw)}
+        test = lambda v: v is not None and comparable(kind, v) in targets
+    elif op in ('cs', 'cd'):
+        items = json.loads(raw) if raw.startswith(('[', '{"')) and kind == 'json' else parse_list(raw)
+        if isinstance(items, dict):
+            test = lambda v: isinstance(v, dict) and all(v.get(k) == x for k, x in items.items())
+        elif op == 'cs':
+            test = lambda v: isinstance(v, list) and set(map(hashable, items)) <= set(map(hashable, v))
+        else:
+            test = lambda v: isinstance(v, list) and set(map(hashable, v)) <= set(map(hashable, items))
+    else:
+        raise PostgrestError(400, 'PGRST100', f'unsupported operator "{op}"')
+
+    # SQL three-valued logic: NOT of a NULL comparison is still not a match
+    predicate = (lambda row: row.get(column) is not None and not test(row.get(column))) if negate \
+        else (lambda row: test(row.get(column)))
+    plan = (column, coerce(kind, raw)) if op == 'eq' and not negate and column in table.indexes \
+        and kind in ('text', 'int', 'float', 'bool') else None
+    return predicate, plan
+
+def select_rows(table, params):
+    """Return matching (row_id, row) pairs, using hash indexes for eq filters"""
+    predicates = []
+    candidates = None
+    for column, expression in params:
+        if column in RESERVED_PARAMS or '.' in column:
+            continue
+        predicate, plan = make_filter(table, column, expression)
+        predicates.append(predicate)
+        if plan:
+            ids = table.indexes[plan[0]].get(hashable(plan[1]), set())
+            candidates = ids if candidates is None else candidates & ids
+
+    pool = ((i, table.rows[i]) for i in sorted(candidates)) if candidates is not None \
+        else table.rows.items()
+    return [(i, row) for i, row in pool if all(p(row) for p in predicates)]
+
+def order_rows(table, rows, order):
+    """Sort rows by PostgREST's order=col.desc.nullslast,... syntax"""
+    for term in reversed(split_top_level(order)):
+        parts = term.split('.')
+        column = parts[0]
+        if column not in table.columns:
+            raise PostgrestError(400, '42703', f'column {table.name}.{column} does not exist')
+        descending = 'desc' in parts[1:]
+        nulls_first = 'nullsfirst' in parts[1:] or (descending and 'nullslast' not in parts[1:])
+        kind = table.columns[column]['kind']
+
+        present = [r for r in rows if r[1].get(column) is not None]
+        missing = [r for r in rows if r[1].get(column) is None]
+        present.sort(key=lambda r: comparable(kind, hashable(r[1][column])), reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+def parse_select(select):
+    """Parse select=a,alias:b,rel(*),alias:rel!hint(c) into (columns, embeds)"""
+    columns, embeds = [], []
+    for item in split_top_level(select or '*'):
+        alias, _, rest = item.partition(':') if re.match(r'^\w+:', item) else ('', '', item)
+        match = re.match(r'^(\w+)(?:!\w+)?\((.*)\)$', rest.strip(), re.DOTALL)
+        if match:
+            embeds.append((alias or match.group(1), match.group(1), match.group(2)))
+        else:
+            columns.append((alias or rest.strip(), rest.strip()))
+    return columns, embeds
+
+def project(db, table, row, select):
+    """Shape one row for output, resolving embedded resources through foreign keys"""
+    columns, embeds = parse_select(select)
+    out = {}
+    for alias, column in columns:
+        if column == '*':
+            out.update(row)
+        elif column in table.columns:
+            out[alias] = row.get(column)
+        else:
+            raise PostgrestError(400, '42703', f'column {table.name}.{column} does not exist')
+
+    for alias, name, sub_select in embeds:
+        other = db.table(name)
+        forward = next((c for c, ref in table.references.items() if ref == name), None)
+        if forward:
+            # Many-to-one: this row's foreign key points at the other table
+            key = other.primary_key[0] if other.primary_key else 'id'
+            ids = other.indexes.get(key, {}).get(hashable(row.get(forward)), set())
+            out[alias] = project(db, other, other.rows[next(iter(ids))], sub_select) if ids else None
+            continue
+        backward = next((c for c, ref in other.references.items() if ref == table.name), None)
+        if not backward:
+            raise PostgrestError(400, 'PGRST200', f"Could not find a relationship between "
+                                                  f"'{table.name}' and '{name}' in the schema cache")
+        key = table.primary_key[0] if table.primary_key else 'id'
+        ids = other.indexes[backward].get(hashable(row.get(key)), set())
+        out[alias] = [project(db, other, other.rows[i], sub_select) for i in sorted(ids)]
+    return out
+
+# ---------------------------------------------------------------- rpc
+
+# action type -> (subscription_tiers limit column, usage_limits counter column)
+USAGE_COLUMNS = {
+    'photo': ('photos_per_month', 'photos_used'),
+    'gif': ('gifs_per_month', 'gifs_used'),
+    'fitcheck': ('fitcheck_per_month', 'fitcheck_used'),
+    'codrawing': ('codrawing_per_month', 'codrawing_used'),
+    'pastforward': ('pastforward_per_month', 'pastforward_used'),
+    'generated_image': ('generated_images_per_month', 'generated_images_used'),
+    'pixshop': ('pixshop_per_month', 'pixshop_used')
+}
+
+def current_usage_ids(db, user_id):
+    """Ids of usage_limits rows whose period contains now"""
+    now = datetime.now(timezone.utc)
+    table = db.table('usage_limits')
+    return [i for i in sorted(table.indexes['user_id'].get(user_id, ()))
+            if parse_timestamp(table.rows[i]['period_start']) <= now <= parse_timestamp(table.rows[i]['period_end'])]
+
+def rpc_check_usage_limit(db, p_user_id, p_action_type):
+    """Port of public.check_usage_limit (20250124000000_fix_usage_check_nulls.sql)"""
+    subscriptions = db.table('subscriptions')
+    active = [subscriptions.rows[i] for i in subscriptions.indexes['user_id'].get(p_user_id, ())
+              if subscriptions.rows[i]['status'] == 'active']
+    if not active:
+        return False
+    if p_action_type not in USAGE_COLUMNS:
+        return True
+
+    limit_column, used_column = USAGE_COLUMNS[p_action_type]
+    tiers = db.table('subscription_tiers')
+    tier_ids = tiers.indexes['id'].get(active[0]['tier_id'], ())
+    limit = tiers.rows[next(iter(tier_ids))].get(limit_column) if tier_ids else None
+    usage = current_usage_ids(db, p_user_id)
+    used = (db.table('usage_limits').rows[usage[0]].get(used_column) or 0) if usage else 0
+    if limit is None:
+        return None
+    return limit == -1 or used < limit
+
+def rpc_increment_usage(db, p_user_id, p_action_type):
+    """Port of public.increment_usage (20250123000000_add_feature_usage_limits.sql)"""
+    if p_action_type not in USAGE_COLUMNS:
+        return None
+    column = USAGE_COLUMNS[p_action_type][1]
+    table = db.table('usage_limits')
+    for row_id in current_usage_ids(db, p_user_id):
+        # NULL + 1 stays NULL in SQL
+        value = table.rows[row_id].get(column)
+        table.update(row_id, {column: None if value is None else value + 1})
+    return None
+
+RPC_FUNCTIONS = {
+    'check_usage_limit': rpc_check_usage_limit,
+    'increment_usage': rpc_increment_usage
+}
+
+# ---------------------------------------------------------------- http
+
+def parse_prefer(header):
+    """Parse a Prefer header into a dict"""
+    prefer = {}
+    for part in (header or '').split(','):
+        key, _, value = part.strip().partition('=')
+        if key:
+            prefer[key] = value
+    return prefer
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """PostgREST-shaped handler for /rest/v1/<table> and /rest/v1/rpc/<function>
+
+    Row level security is not enforced: every request sees every row, the
+    same as using the service role key against the real project.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without this keep-alive
+    # clients stall ~40 ms per request on delayed ACKs
+    disable_nagle_algorithm = True
+    server_version = 'GemBoothLocalSupabase/1.0'
+    db = None
+    verbose = False
+
+    def log_message(self, format, *args):
+        """Only log requests in verbose mode"""
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body, headers=None):
+        """Write a JSON response (no body for 204 or HEAD)"""
+        payload = b'' if status == 204 or body is None else json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'Content-Range')
+        if payload:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(0 if self.command == 'HEAD' else len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def read_body(self):
+        """Parse the JSON request body"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise PostgrestError(400, 'PGRST102', 'Empty or invalid json')
+
+    def route(self):
+        """Split the path into (kind, name, params)"""
+        parts = urlsplit(self.path)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        path = unquote(parts.path).rstrip('/')
+        if path.startswith('/rest/v1/rpc/'):
+            return 'rpc', path[len('/rest/v1/rpc/'):], params
+        if path.startswith('/rest/v1/'):
+            return 'table', path[len('/rest/v1/'):], params
+        if path in ('', '/rest/v1'):
+            return 'root', path, params
+        raise PostgrestError(404, 'PGRST125', 'Invalid path specified in request URL')
+
+    def handle_request(self):
+        """Dispatch one request and translate errors"""
+        try:
+            kind, name, params = self.route()
+            with self.db.lock:
+                if kind == 'root':
+                    status, body, headers = 200, {'tables': {n: len(t.rows) for n, t in self.db.tables.items()},
+                                                  'functions': sorted(self.db.functions)}, {}
+                elif kind == 'rpc':
+                    status, body, headers = self.handle_rpc(name, params)
+                else:
+                    status, body, headers = self.handle_table(self.db.table(name), params)
+            self.send_json(status, body, headers)
+        except PostgrestError as e:
+            self.send_json(e.status, e.body)
+        except ValueError as e:
+            self.send_json(400, {'code': 'PGRST100', 'message': str(e), 'details': None, 'hint': None})
+        except Exception as e:
+            # Keep the connection and answer like a database error instead of dropping the client
+            self.log_error('%s %s failed: %r', self.command, self.path, e)
+            self.send_json(500, {'code': 'XX000', 'message': str(e) or type(e).__name__, 'details': None,
+                                 'hint': None})
+
+    def handle_rpc(self, name, params):
+        """Call a registered function with JSON (POST) or query (GET) arguments"""
+        if name not in self.db.functions:
+            raise PostgrestError(404, 'PGRST202', f'Could not find the function public.{name} in the schema cache')
+        args = self.read_body() if self.command == 'POST' else dict(params)
+        try:
+            return 200, self.db.functions[name](self.db, **args), {}
+        except TypeError as e:
+            raise PostgrestError(400, 'PGRST202', str(e))
+
+    def handle_table(self, table, params):
+        """Run a read, insert/upsert, update or delete against one table"""
+        query = dict(params)
+        prefer = parse_prefer(self.headers.get('Prefer'))
+        representation = prefer.get('return') == 'representation'
+        select = query.get('select', '*')
+
+        if self.command in ('GET', 'HEAD'):
+            rows = select_rows(table, params)
+            if 'order' in query:
+                rows = order_rows(table, rows, query['order'])
+            total = len(rows)
+
+            offset = int(query.get('offset') or 0)
+            limit = int(query['limit']) if query.get('limit') else None
+            range_header = re.match(r'^(\d+)-(\d*)$', self.headers.get('Range') or '')
+            if range_header:
+                offset = int(range_header.group(1))
+                if range_header.group(2):
+                    limit = int(range_header.group(2)) - offset + 1
+            rows = rows[offset:offset + limit if limit is not None else None]
+            body = [project(self.db, table, row, select) for _, row in rows]
+
+            end = f"{offset}-{offset + len(body) - 1}" if body else '*'
+            headers = {'Content-Range': f"{end}/{total if prefer.get('count') else '*'}"}
+            if OBJECT_MIME in (self.headers.get('Accept') or ''):
+                if len(body) != 1:
+                    raise PostgrestError(406, 'PGRST116', 'JSON object requested, multiple (or no) rows returned',
+                                         f'The result contains {len(body)} rows')
+                return 200, body[0], headers
+            return (206 if range_header and len(body) < total else 200), body, headers
+
+        if self.command == 'POST':
+            payload = self.read_body()
+            rows = payload if isinstance(payload, list) else [payload]
+            conflict = query['on_conflict'].split(',') if query.get('on_conflict') else table.primary_key
+            resolution = prefer.get('resolution')
+            written = []
+            for values in rows:
+                existing = table.conflicting_row(values, conflict) if resolution else None
+                if existing is None:
+                    written.append(table.insert(values))
+                elif resolution == 'merge-duplicates':
+                    written.append(table.update(existing, values))
+            body = [project(self.db, table, row, select) for row in written]
+            return 201, (body if representation else None), {}
+
+        matched = select_rows(table, params)
+        if self.command == 'PATCH':
+            changes = self.read_body()
+            written = [table.update(row_id, changes) for row_id, _ in matched]
+        else:
+            written = [table.delete(row_id) for row_id, _ in matched]
+        body = [project(self.db, table, row, select) for row in written]
+        return (200, body, {}) if representation else (204, None, {})
+
+    def do_OPTIONS(self):
+        """CORS preflight for browser clients"""
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, HEAD, POST, PATCH, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', self.headers.get('Access-Control-Request-Headers') or '*')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = handle_request
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog sized for bursts of test clients"""
+
+    request_queue_size = 128
+
+def create_server(host='127.0.0.1', port=DEFAULT_PORT, db=None, verbose=False):
+    """Build a server bound to an in-memory database (port 0 picks a free port)"""
+    handler = type('Handler', (StandinHandler,), {'db': db or Database.from_migrations(), 'verbose': verbose})
+    return StandinServer((host, port), handler)
+
+def start_background(port=0, db=None):
+    """Start a server on a daemon thread and return it (for tests and the dashboards)"""
+    server = create_server(port=port, db=db)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+
+    started = time.perf_counter()
+    db = Database.from_migrations()
+    if '--seed' in args:
+        db.load_seed(args[args.index('--seed') + 1])
+    server = create_server(port=port, db=db, verbose='--verbose' in args)
+
+    print(f"Loaded {len(db.tables)} tables from {MIGRATIONS_DIR.relative_to(PROJECT_ROOT)} "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    print(f"Local Supabase REST API: http://127.0.0.1:{server.server_port}/rest/v1/")
+    print("Set VITE_SUPABASE_URL to http://127.0.0.1:%d to point the app at it" % server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Profiler
+Deterministic (cProfile) or sampling CPU profiles with section spans, written as collapsed stacks
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+PROFILE_DIR = CACHE_DIR / 'profiles'
+
+MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL = 0.005
+
+# Stacks deeper than this are cut when unfolding the cProfile call graph
+MAX_DEPTH = 64
+
+_active = None
+_local = threading.local()
+
+def profile_mode(args):
+    """Mode from `--profile [cprofile|sample]`, or None when profiling is off"""
+    if '--profile' not in args:
+        return None
+    i = args.index('--profile')
+    return args[i + 1] if i + 1 < len(args) and args[i + 1] in MODES else 'cprofile'
+
+def frame_label(filename, lineno, name):
+    """Flamegraph frame name: function (file:line)"""
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+def current_profiler():
+    """The profiler for this thread (a per-request one wins over the process-wide one)"""
+    return getattr(_local, 'profiler', None) or _active
+
+def profiling_active():
+    """Whether anything is recording spans on this thread"""
+    return current_profiler() is not None
+
+@contextmanager
+def span(section, phase):
+    """Time one phase (compute, render, ...) of a section; free when not profiling"""
+    profiler = current_profiler()
+    if profiler is None:
+        yield
+        return
+    stack = profiler.span_stacks.setdefault(threading.get_ident(), [])
+    stack.append(f"[{section}:{phase}]")
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with profiler.lock:
+            profiler.spans.append((tuple(stack), elapsed))
+        stack.pop()
+
+class Profiler:
+    """One profiling session: cProfile or a sampler thread, plus recorded spans"""
+
+    def __init__(self, mode='cprofile', threads=None, interval=SAMPLE_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (use {' or '.join(MODES)})")
+        self.mode = mode
+        self.threads = threads
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.spans = []
+        self.span_stacks = {}
+        self.samples = {}
+        self.profile = None
+        self.sampler = None
+        self.running = False
+        self.elapsed = 0.0
+
+    def start(self):
+        """Start recording"""
+        self.running = True
+        self.started = time.perf_counter()
+        if self.mode == 'cprofile':
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = threading.Thread(target=self.sample_loop, daemon=True)
+            self.sampler.start()
+
+    def stop(self):
+        """Stop recording"""
+        self.running = False
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def sample_loop(self):
+        """Record every watched thread's stack, weighted by the time since the last sample"""
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while self.running:
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            weight, last = now - last, now
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.threads is not None and ident not in self.threads):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                key = tuple(self.span_stacks.get(ident, ())) + tuple(stack)
+                self.samples[key] = self.samples.get(key, 0) + weight
+
+    def folded(self):
+        """Collapsed stacks ('frame;frame;frame microseconds' per line) for flamegraph tools"""
+        if self.mode == 'sample':
+            weights = self.samples
+        else:
+            weights = unfold_stats(pstats.Stats(self.profile).stats)
+        lines = [f"{';'.join(stack)} {round(value * 1e6)}" for stack, value in weights.items()
+                 if stack and value >= 1e-6]
+        return '\n'.join(sorted(lines)) + '\n'
+
+    def span_summary(self):
+        """[(span path, count, total seconds, max seconds)] slowest first"""
+        totals = {}
+        with self.lock:
+            for path, elapsed in self.spans:
+                count, total, peak = totals.get(path, (0, 0.0, 0.0))
+                totals[path] = (count + 1, total + elapsed, max(peak, elapsed))
+        return sorted(((path, *values) for path, values in totals.items()), key=lambda s: -s[2])
+
+    def folded_spans(self):
+        """Spans as collapsed stacks of their own, in microseconds of self time"""
+        totals = {path: total for path, _, total, _ in self.span_summary()}
+        own = dict(totals)
+        for path, total in totals.items():
+            if path[:-1] in own:
+                own[path[:-1]] -= total
+        return ''.join(f"{';'.join(path)} {max(0, round(value * 1e6))}\n" for path, value in own.items())
+
+    def server_timing(self):
+        """Spans as a Server-Timing header value"""
+        entries = []
+        for path, count, total, _ in self.span_summary():
+            name = path[-1].strip('[]').replace(':', '-').replace(' ', '-')
+            entries.append(f'{name};dur={total * 1000:.2f};desc="{count}x"')
+        return ', '.join(entries)
+
+    def write(self, name):
+        """Write .folded (and .prof for cProfile) files; returns the paths"""
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        base = PROFILE_DIR / f"{name}-{self.mode}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        paths = [base.with_suffix('.folded'), Path(f"{base}-spans.folded")]
+        paths[0].write_text(self.folded(), encoding='utf-8')
+        paths[1].write_text(self.folded_spans(), encoding='utf-8')
+        if self.profile is not None:
+            paths.append(base.with_suffix('.prof'))
+            self.profile.dump_stats(str(paths[-1]))
+        return paths
+
+def unfold_stats(stats):
+    """Approximate full stacks from cProfile's caller/callee edges
+
+    cProfile only keeps one level of callers, so each function's own time is
+    split across the paths that reach it in proportion to the cumulative time
+    each caller spent in it.
+    """
+    children = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    weights = {}
+
+    def walk(func, path, inclusive):
+        _, _, own, cumulative, _ = stats[func]
+        if not cumulative or inclusive < 1e-6:
+            return
+        scale = inclusive / cumulative
+        path = path + (frame_label(*func),)
+        weights[path] = weights.get(path, 0) + own * scale
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge_time in children.get(func, ()):
+            if frame_label(*callee) not in path:
+                walk(callee, path, edge_time * scale)
+
+    for func, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(func, (), cumulative)
+    return weights
+
+@contextmanager
+def profiling(name, mode):
+    """Profile the enclosed block process-wide and report where the output went"""
+    global _active
+    if mode is None:
+        yield None
+        return
+
+    profiler = Profiler(mode)
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = None
+        paths = profiler.write(name)
+        print(f"\nProfile ({mode}, {profiler.elapsed:.1f}s):")
+        for path, count, total, peak in profiler.span_summary()[:15]:
+            print(f"  {' > '.join(path):<48} {count:>4}x {total * 1000:>9.1f} ms (max {peak * 1000:.1f} ms)")
+        for path in paths:
+            print(f"  {path.relative_to(PROJECT_ROOT)}")
+        print("  Flamegraph: flamegraph.pl FILE.folded > profile.svg (or drop it on speedscope.app)")
+
+def start_thread_profile(mode):
+    """Profile only the calling thread (e.g. one web request) until stop_thread_profile()"""
+    profiler = Profiler(mode, threads={threading.get_ident()})
+    _local.profiler = profiler
+    profiler.start()
+    return profiler
+
+def stop_thread_profile():
+    """Stop the calling thread's profiler and return it (None if there was none)"""
+    profiler = getattr(_local, 'profiler', None)
+    _local.profiler = None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
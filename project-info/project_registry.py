@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Project Registry
+Several GemBooth checkouts and environments from config.json, scanned concurrently and compared
+"""
+
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from timeseries import record as record_sample
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+PROJECTS_CACHE = CACHE_DIR / 'projects'
+CONFIG_FILE = Path(__file__).parent / 'config.json'
+
+DEFAULT_PROJECTS = [{'name': 'local', 'root': '.', 'env_file': '.env.local'}]
+
+# Keys compared across projects (presence only; values never leave the env file)
+TRACKED_KEYS = [
+    'VITE_GEMINI_API_KEY',
+    'VITE_SUPABASE_URL',
+    'VITE_SUPABASE_ANON_KEY',
+    'SUPABASE_SERVICE_ROLE_KEY',
+    'VITE_STRIPE_PUBLISHABLE_KEY',
+    'STRIPE_SECRET_KEY',
+    'STRIPE_WEBHOOK_SECRET'
+]
+
+MAX_WORKERS = 16
+PROBE_TIMEOUT = 3
+PROBE_TTL = 60
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+def slugify(name):
+    """Directory-safe project name"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'project'
+
+def load_projects(config_file=CONFIG_FILE):
+    """Registered projects from config.json's "projects" list, or just this checkout
+
+    Each entry has a name, a root (relative to this checkout's root) and an
+    env_file (relative to its root); "probe": false skips the Supabase check.
+    """
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('projects') or DEFAULT_PROJECTS
+    except (OSError, ValueError):
+        entries = DEFAULT_PROJECTS
+
+    projects = []
+    for entry in entries:
+        root = (PROJECT_ROOT / os.path.expanduser(entry.get('root', '.'))).resolve()
+        projects.append({
+            'name': entry['name'],
+            'slug': slugify(entry['name']),
+            'root': root,
+            'env_file': root / entry.get('env_file', '.env.local'),
+            'probe': entry.get('probe', True)
+        })
+    return projects
+
+def project_lock(slug):
+    """One lock per project, so two requests never rescan the same project at once"""
+    with _locks_guard:
+        return _locks.setdefault(slug, threading.Lock())
+
+def mtime(path):
+    """Modification time, or None when the path is missing"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def fingerprint(project):
+    """Changes whenever the env file, migrations or function directories change"""
+    supabase = project['root'] / 'supabase'
+    return [mtime(project['env_file']), mtime(supabase / 'migrations'), mtime(supabase / 'functions')]
+
+def scan_project(project):
+    """Key presence, migrations and edge functions of one project (no network)"""
+    from gembooth_dashboard import read_env_file
+
+    env = read_env_file(project['env_file'])
+    migrations_dir = project['root'] / 'supabase' / 'migrations'
+    functions_dir = project['root'] / 'supabase' / 'functions'
+    migrations = sorted(p.name for p in migrations_dir.glob('*.sql')) if migrations_dir.is_dir() else []
+    functions = sorted(p.name for p in functions_dir.iterdir()
+                       if p.is_dir() and not p.name.startswith(('_', '.'))) if functions_dir.is_dir() else []
+    return {
+        'exists': project['root'].is_dir(),
+        'env_file': project['env_file'].is_file(),
+        'keys': {key: bool(env.get(key)) for key in TRACKED_KEYS},
+        'supabase_url': env.get('VITE_SUPABASE_URL'),
+        'migrations': migrations,
+        'functions': functions
+    }
+
+def probe_supabase(url, anon_key, timeout=PROBE_TIMEOUT):
+    """Reachability of a project's REST API: up, auth (reachable, key rejected), down or error"""
+    parts = urlsplit(url)
+    factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    started = time.perf_counter()
+    conn = factory(parts.netloc, timeout=timeout)
+    try:
+        conn.request('GET', parts.path.rstrip('/') + '/rest/v1/',
+                     headers={'apikey': anon_key or '', 'Authorization': f"Bearer {anon_key or ''}"})
+        code = conn.getresponse().status
+    except (http.client.HTTPException, OSError) as e:
+        return {'status': 'down', 'code': None, 'ms': None, 'error': str(e) or type(e).__name__}
+    finally:
+        conn.close()
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    status = 'up' if code < 400 else 'auth' if code in (401, 403) else 'error'
+    return {'status': status, 'code': code, 'ms': elapsed, 'error': None}
+
+def read_cache(path):
+    """A cached JSON document, or None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_cache(path, data):
+    """Write a cached JSON document"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def collect_project(project, probe=True):
+    """One project's scan and probe, each reused from its own cache directory while still valid"""
+    cache_dir = PROJECTS_CACHE / project['slug']
+    with project_lock(project['slug']):
+        current = fingerprint(project)
+        cached = read_cache(cache_dir / 'scan.json')
+        if cached and cached['fingerprint'] == current and cached['root'] == str(project['root']):
+            scan = cached['scan']
+        else:
+            scan = scan_project(project)
+            write_cache(cache_dir / 'scan.json', {'fingerprint': current, 'root': str(project['root']), 'scan': scan})
+
+        if not (probe and project['probe']):
+            status = {'status': 'skipped', 'code': None, 'ms': None, 'error': None}
+        elif not scan['supabase_url']:
+            status = {'status': 'skipped', 'code': None, 'ms': None, 'error': 'VITE_SUPABASE_URL is not set'}
+        else:
+            cached = read_cache(cache_dir / 'probe.json')
+            if cached and cached['url'] == scan['supabase_url'] and time.time() - cached['checked_at'] < PROBE_TTL:
+                status = cached['probe']
+            else:
+                # The key is read again here rather than cached: nothing secret is written to .cache/
+                from gembooth_dashboard import read_env_file
+                anon_key = read_env_file(project['env_file']).get('VITE_SUPABASE_ANON_KEY')
+                status = probe_supabase(scan['supabase_url'], anon_key)
+                record_sample(f"probe:{project['name']}", status['ms'], status['code'] or 0)
+                write_cache(cache_dir / 'probe.json', {'url': scan['supabase_url'], 'checked_at': time.time(),
+                                                       'probe': status})
+
+    return dict(scan, name=project['name'], root=str(project['root']), probe=status)
+
+def compare_projects(projects=None, probe=True):
+    """Every project side by side; projects are collected concurrently, so the slowest one sets the pace"""
+    projects = load_projects() if projects is None else projects
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(projects)))) as pool:
+        results = list(pool.map(lambda p: collect_project(p, probe), projects))
+
+    all_migrations = sorted({m for r in results for m in r['migrations']})
+    all_functions = sorted({f for r in results for f in r['functions']})
+    for r in results:
+        applied = set(r.pop('migrations'))
+        r['migration_count'] = len(applied)
+        r['latest_migration'] = max(applied) if applied else None
+        r['missing_migrations'] = [m for m in all_migrations if m not in applied]
+        r['missing_functions'] = [f for f in all_functions if f not in r['functions']]
+        r['missing_keys'] = [k for k in TRACKED_KEYS if not r['keys'][k]]
+
+    return {
+        'projects': results,
+        'keys': TRACKED_KEYS,
+        'functions': all_functions,
+        'latest_migration': all_migrations[-1] if all_migrations else None,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
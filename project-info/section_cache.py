@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Section Cache
+Coalesced, stale-while-revalidate cache for expensive dashboard sections
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+# Stale values are served (and refreshed in the background) for this many TTLs after expiry
+STALE_FACTOR = 10
+
+class Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class SectionCache:
+    """Byte-budgeted LRU of computed sections with per-key single-flight"""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, observer=None):
+        self.max_bytes = max_bytes
+        self.observer = observer
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.inflight = {}
+        self.stats = {}
+
+    def counters(self, key):
+        """Counters for one key (callers hold the lock)"""
+        if key not in self.stats:
+            self.stats[key] = {'hits': 0, 'stale': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0,
+                               'errors': 0, 'evictions': 0, 'compute_ms': None}
+        return self.stats[key]
+
+    def get(self, key, compute, ttl, stale_ttl=None):
+        """Return (value, outcome); compute() must return bytes
+
+        Outcome is HIT (fresh), STALE (expired, refresh started in the
+        background), MISS (computed by this caller) or COALESCED (waited for
+        another caller's computation of the same key).
+        """
+        stale_ttl = ttl * STALE_FACTOR if stale_ttl is None else stale_ttl
+        now = time.monotonic()
+        with self.lock:
+            stats = self.counters(key)
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, computed_at = entry
+                age = now - computed_at
+                if age < ttl + stale_ttl:
+                    self.entries.move_to_end(key)
+                    if age < ttl:
+                        stats['hits'] += 1
+                        return value, 'HIT'
+                    stats['stale'] += 1
+                    if key not in self.inflight:
+                        stats['refreshes'] += 1
+                        self.inflight[key] = Flight()
+                        threading.Thread(target=self.run, args=(key, compute), daemon=True).start()
+                    return value, 'STALE'
+
+            flight = self.inflight.get(key)
+            if flight is None:
+                stats['misses'] += 1
+                flight = self.inflight[key] = Flight()
+                leader = True
+            else:
+                stats['coalesced'] += 1
+                leader = False
+
+        if leader:
+            self.run(key, compute)
+        else:
+            flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value, 'MISS' if leader else 'COALESCED'
+
+    def run(self, key, compute):
+        """Compute a key, store the result and wake everyone waiting on it"""
+        with self.lock:
+            flight = self.inflight[key]
+        started = time.perf_counter()
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+        elapsed = time.perf_counter() - started
+
+        with self.lock:
+            stats = self.counters(key)
+            if flight.error is None:
+                stats['compute_ms'] = round(elapsed * 1000, 1)
+                self.store(key, flight.value)
+            else:
+                stats['errors'] += 1
+            del self.inflight[key]
+        flight.event.set()
+        if self.observer is not None and flight.error is None:
+            self.observer(key, elapsed)
+
+    def store(self, key, value):
+        """Insert a value and evict least recently used keys over the budget (callers hold the lock)"""
+        if key in self.entries:
+            self.total_bytes -= len(self.entries.pop(key)[0])
+        if len(value) > self.max_bytes:
+            return
+        self.entries[key] = (value, time.monotonic())
+        self.total_bytes += len(value)
+        while self.total_bytes > self.max_bytes:
+            old, (old_value, _) = self.entries.popitem(last=False)
+            self.total_bytes -= len(old_value)
+            self.counters(old)['evictions'] += 1
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything"""
+        with self.lock:
+            for name in ([key] if key is not None else list(self.entries)):
+                if name in self.entries:
+                    self.total_bytes -= len(self.entries.pop(name)[0])
+
+    def summary(self):
+        """Per-key counters, sizes and ages for the dashboards"""
+        now = time.monotonic()
+        with self.lock:
+            sections = []
+            for key, stats in sorted(self.stats.items()):
+                entry = self.entries.get(key)
+                sections.append(dict(stats, section=key,
+                                     bytes=len(entry[0]) if entry else 0,
+                                     age=round(now - entry[1], 1) if entry else None))
+            return {'sections': sections, 'bytes': self.total_bytes, 'max_bytes': self.max_bytes,
+                    'entries': len(self.entries)}
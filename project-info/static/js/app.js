@@ -2,11 +2,31 @@
 
 // State
 let currentSection = 'overview';
+let paletteResults = [];
+let paletteSelected = 0;
+let paletteRequest = null;
+
+// Sections kept in localStorage and shown instantly, then revalidated; live pages always hit the server
+const SECTION_CACHE_PREFIX = 'gembooth:section:';
+const NAV_HISTORY_KEY = 'gembooth:nav-history';
+const LIVE_SECTIONS = new Set(['gallery', 'deploy', 'history']);
+const PREFETCH_COUNT = 2;
+const PREFETCH_MIN_AGE = 60 * 1000;
+let sectionRequest = 0;
+
+// Set by `dashboard_web.py export`: one page per section with its data inlined, and no server behind it
+const STATIC_EXPORT = window.GEMBOOTH_STATIC || null;
 
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', () => {
     setupNavigation();
-    loadSection('overview');
+    setupPalette();
+    if (STATIC_EXPORT) {
+        showStaticPage();
+    } else {
+        setupOffline();
+        loadSection('overview');
+    }
 });
 
 // Setup navigation click handlers
@@ -16,6 +36,10 @@ function setupNavigation() {
     navButtons.forEach(button => {
         button.addEventListener('click', () => {
             const section = button.dataset.section;
+            if (STATIC_EXPORT) {
+                window.location.href = STATIC_EXPORT.pages[section];
+                return;
+            }
 
             // Update active state
             navButtons.forEach(btn => btn.classList.remove('active'));
@@ -27,29 +51,342 @@ function setupNavigation() {
     });
 }
 
-// Load section content
+// Render the section inlined into a static export page
+function showStaticPage() {
+    currentSection = STATIC_EXPORT.section;
+    document.querySelectorAll('.nav-btn').forEach(btn => {
+        btn.classList.toggle('active', btn.dataset.section === STATIC_EXPORT.section);
+    });
+    renderSection(STATIC_EXPORT.section, STATIC_EXPORT.data);
+}
+
+// Switch to a section as if its nav button was clicked
+function navigateTo(section) {
+    const button = document.querySelector(`.nav-btn[data-section="${section}"]`);
+    if (button) {
+        button.click();
+    }
+}
+
+// Setup command palette (Ctrl+K)
+function setupPalette() {
+    const overlay = document.getElementById('palette');
+    const input = document.getElementById('palette-input');
+
+    document.addEventListener('keydown', (e) => {
+        if ((e.ctrlKey || e.metaKey) && e.key.toLowerCase() === 'k') {
+            e.preventDefault();
+            overlay.classList.contains('show') ? closePalette() : openPalette();
+        } else if (e.key === 'Escape' && overlay.classList.contains('show')) {
+            closePalette();
+        }
+    });
+
+    overlay.addEventListener('click', (e) => {
+        if (e.target === overlay) {
+            closePalette();
+        }
+    });
+
+    input.addEventListener('input', () => searchPalette(input.value));
+
+    input.addEventListener('keydown', (e) => {
+        if (e.key === 'ArrowDown') {
+            e.preventDefault();
+            selectPaletteItem(paletteSelected + 1);
+        } else if (e.key === 'ArrowUp') {
+            e.preventDefault();
+            selectPaletteItem(paletteSelected - 1);
+        } else if (e.key === 'Enter' && paletteResults[paletteSelected]) {
+            e.preventDefault();
+            runPaletteAction(paletteResults[paletteSelected]);
+        }
+    });
+}
+
+function openPalette() {
+    const input = document.getElementById('palette-input');
+    document.getElementById('palette').classList.add('show');
+    input.value = '';
+    input.focus();
+    searchPalette('');
+}
+
+function closePalette() {
+    document.getElementById('palette').classList.remove('show');
+}
+
+// Query the palette index; stale in-flight requests are aborted
+async function searchPalette(query) {
+    if (STATIC_EXPORT) {
+        paletteResults = searchStaticPalette(query);
+        paletteSelected = 0;
+        renderPalette();
+        return;
+    }
+    if (paletteRequest) {
+        paletteRequest.abort();
+    }
+    paletteRequest = new AbortController();
+
+    try {
+        const response = await fetch(`/api/palette?q=${encodeURIComponent(query)}`, {
+            signal: paletteRequest.signal
+        });
+        const data = await response.json();
+        paletteResults = data.results;
+        paletteSelected = 0;
+        renderPalette();
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.error('Palette search failed:', error);
+        }
+    }
+}
+
+// Without a server to ask, match every word of the query against the exported entries
+function searchStaticPalette(query) {
+    const words = query.toLowerCase().split(/\s+/).filter(Boolean);
+    return STATIC_EXPORT.palette
+        .filter(entry => {
+            const text = `${entry.title} ${entry.subtitle} ${entry.value} ${entry.kind}`.toLowerCase();
+            return words.every(word => text.includes(word));
+        })
+        .slice(0, 10);
+}
+
+function renderPalette() {
+    const list = document.getElementById('palette-results');
+    list.innerHTML = '';
+
+    paletteResults.forEach((entry, i) => {
+        const item = document.createElement('li');
+        item.className = 'palette-item' + (i === paletteSelected ? ' selected' : '');
+        item.innerHTML = `
+            <span class="palette-kind">${entry.kind}</span>
+            <span class="palette-title">${entry.title}</span>
+            <span class="palette-detail">${entry.action === 'navigate' ? entry.subtitle : entry.value}</span>
+        `;
+        item.addEventListener('mouseenter', () => selectPaletteItem(i));
+        item.addEventListener('click', () => runPaletteAction(entry));
+        list.appendChild(item);
+    });
+}
+
+function selectPaletteItem(index) {
+    if (paletteResults.length === 0) {
+        return;
+    }
+    paletteSelected = (index + paletteResults.length) % paletteResults.length;
+    const items = document.querySelectorAll('.palette-item');
+    items.forEach((item, i) => item.classList.toggle('selected', i === paletteSelected));
+    items[paletteSelected].scrollIntoView({ block: 'nearest' });
+}
+
+// Run the selected entry's action: copy, open or navigate
+function runPaletteAction(entry) {
+    closePalette();
+
+    if (entry.action === 'copy') {
+        navigator.clipboard.writeText(entry.value).catch(err => {
+            console.error('Failed to copy:', err);
+            alert('Failed to copy to clipboard');
+        });
+    } else if (entry.action === 'open') {
+        window.open(entry.value, '_blank');
+    } else {
+        navigateTo(entry.target);
+    }
+}
+
+// Load section content: cached copy first (if any), then the server
 async function loadSection(section) {
+    const previous = currentSection;
+    const request = ++sectionRequest;
     currentSection = section;
-    showLoading();
+    recordNavigation(previous, section);
+
+    let cached = readCachedSection(section);
+    let updating = null;
+    try {
+        if (cached) {
+            renderSection(section, cached.data);
+        }
+    } catch (error) {
+        // Saved by an older version of this page; fall back to the network
+        cached = null;
+    }
+    if (cached) {
+        showCacheStatus(null);
+        // Only mention the check when it is slow enough to notice
+        updating = setTimeout(() => showCacheStatus('updating', cached), 400);
+    } else {
+        showCacheStatus(null);
+        showLoading();
+    }
 
     try {
-        const content = await fetchSectionContent(section);
-        renderSection(section, content);
+        const result = await fetchSectionContent(section, cached);
+        if (request !== sectionRequest) {
+            return;
+        }
+        if (result.changed || !cached) {
+            renderSection(section, result.data);
+        }
+        showCacheStatus(null);
+        schedulePrefetch(section);
     } catch (error) {
+        if (request !== sectionRequest) {
+            return;
+        }
         console.error('Error loading section:', error);
-        showError('Failed to load section. Please try again.');
+        if (cached) {
+            showCacheStatus('offline', cached);
+        } else {
+            showError('Failed to load section. Please try again.');
+        }
     } finally {
-        hideLoading();
+        clearTimeout(updating);
+        if (request === sectionRequest) {
+            hideLoading();
+        }
     }
 }
 
-// Fetch section content from API
-async function fetchSectionContent(section) {
-    const response = await fetch(`/api/${section}`);
+// Fetch section content from API, revalidating a cached copy with its ETag
+async function fetchSectionContent(section, cached = null) {
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    const response = await fetch(`/api/${section}`, { headers });
+    if (response.status === 304 && cached) {
+        writeCachedSection(section, cached.etag, cached.data);
+        return { data: cached.data, changed: false };
+    }
     if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
     }
-    return await response.json();
+    const data = await response.json();
+    writeCachedSection(section, response.headers.get('ETag'), data);
+    return { data, changed: true };
+}
+
+// Cached section payload: { etag, data, savedAt } or null
+function readCachedSection(section) {
+    if (LIVE_SECTIONS.has(section)) {
+        return null;
+    }
+    try {
+        return JSON.parse(localStorage.getItem(SECTION_CACHE_PREFIX + section));
+    } catch (error) {
+        return null;
+    }
+}
+
+function writeCachedSection(section, etag, data) {
+    if (LIVE_SECTIONS.has(section)) {
+        return;
+    }
+    try {
+        localStorage.setItem(SECTION_CACHE_PREFIX + section, JSON.stringify({ etag, data, savedAt: Date.now() }));
+    } catch (error) {
+        // Quota exceeded or storage disabled: the section just isn't cached
+        console.warn('Could not cache section:', section, error);
+    }
+}
+
+// Count which section follows which, to guess what to prefetch
+function recordNavigation(from, to) {
+    if (from === to) {
+        return;
+    }
+    try {
+        const history = JSON.parse(localStorage.getItem(NAV_HISTORY_KEY)) || {};
+        history[from] = history[from] || {};
+        history[from][to] = (history[from][to] || 0) + 1;
+        localStorage.setItem(NAV_HISTORY_KEY, JSON.stringify(history));
+    } catch (error) {
+        // Navigation history is only a prefetch hint
+    }
+}
+
+// Most likely next sections: past navigation from here, then the following nav buttons
+function likelyNextSections(section) {
+    let history = {};
+    try {
+        history = JSON.parse(localStorage.getItem(NAV_HISTORY_KEY)) || {};
+    } catch (error) {
+        history = {};
+    }
+    const counts = history[section] || {};
+    const order = Array.from(document.querySelectorAll('.nav-btn')).map(btn => btn.dataset.section);
+    const index = order.indexOf(section);
+    const following = order.slice(index + 1).concat(order.slice(0, index));
+    const ranked = Object.keys(counts).sort((a, b) => counts[b] - counts[a]);
+    return [...new Set(ranked.concat(following))]
+        .filter(next => next !== section && !LIVE_SECTIONS.has(next))
+        .slice(0, PREFETCH_COUNT);
+}
+
+// Revalidate likely next sections while the browser is idle
+function schedulePrefetch(section) {
+    if (navigator.connection && navigator.connection.saveData) {
+        return;
+    }
+    const idle = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+    idle(async () => {
+        for (const next of likelyNextSections(section)) {
+            const cached = readCachedSection(next);
+            if (cached && Date.now() - cached.savedAt < PREFETCH_MIN_AGE) {
+                continue;
+            }
+            try {
+                await fetchSectionContent(next, cached);
+            } catch (error) {
+                return;
+            }
+        }
+    });
+}
+
+// Register the service worker and refresh the open section when the server is back
+function setupOffline() {
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register('/sw.js').catch(error => {
+            console.warn('Service worker not registered:', error);
+        });
+    }
+    window.addEventListener('online', () => {
+        if (document.getElementById('cache-status').classList.contains('offline')) {
+            loadSection(currentSection);
+        }
+    });
+}
+
+// Banner saying a cached copy is shown ('updating' or 'offline'), or hide it (null)
+function showCacheStatus(state, cached) {
+    const status = document.getElementById('cache-status');
+    status.className = 'cache-status';
+    if (!state) {
+        return;
+    }
+    const age = formatAge(Date.now() - cached.savedAt);
+    status.textContent = state === 'offline'
+        ? `⚠️ Server unreachable, showing the copy from ${age} ago`
+        : `🔄 Showing the copy from ${age} ago, checking for changes…`;
+    status.classList.add('show', state);
+}
+
+function formatAge(ms) {
+    const seconds = Math.round(ms / 1000);
+    if (seconds < 60) {
+        return `${seconds}s`;
+    }
+    if (seconds < 3600) {
+        return `${Math.round(seconds / 60)} min`;
+    }
+    if (seconds < 86400) {
+        return `${Math.round(seconds / 3600)} h`;
+    }
+    return `${Math.round(seconds / 86400)} days`;
 }
 
 // Render section based on type
@@ -80,6 +417,45 @@ function renderSection(section, data) {
         case 'ai-modes':
             renderAiModes(wrapper, data);
             break;
+        case 'dependencies':
+            renderDependencies(wrapper, data);
+            break;
+        case 'bundle':
+            renderBundle(wrapper, data);
+            break;
+        case 'metrics':
+            renderMetrics(wrapper, data);
+            break;
+        case 'duplicates':
+            renderDuplicates(wrapper, data);
+            break;
+        case 'archives':
+            renderArchives(wrapper, data);
+            break;
+        case 'gemini-cache':
+            renderGeminiCache(wrapper, data);
+            break;
+        case 'mirror':
+            renderMirror(wrapper, data);
+            break;
+        case 'storage-audit':
+            renderStorageAudit(wrapper, data);
+            break;
+        case 'gallery':
+            renderGallery(wrapper, data);
+            break;
+        case 'deploy':
+            renderDeploy(wrapper, data);
+            break;
+        case 'projects':
+            renderProjects(wrapper, data);
+            break;
+        case 'alerts':
+            renderAlerts(wrapper, data);
+            break;
+        case 'history':
+            renderHistory(wrapper, data);
+            break;
         case 'troubleshooting':
             renderTroubleshooting(wrapper, data);
             break;
@@ -139,6 +515,10 @@ function renderOverview(wrapper, data) {
                         <span class="info-label">AI Modes</span>
                         <span class="info-value success">${data.stats.ai_modes} modes</span>
                     </div>
+                    <div class="info-row">
+                        <span class="info-label">Source Lines</span>
+                        <span class="info-value info">${data.stats.source_lines.toLocaleString()} <span class="sparkline">${sparkline(data.trend)}</span></span>
+                    </div>
                 </div>
             </div>
 
@@ -354,7 +734,92 @@ function renderStripe(wrapper, data) {
         </div>
     `;
 
-    wrapper.innerHTML = html;
+    wrapper.innerHTML = html + renderBilling(data.billing);
+}
+
+// Billing activity from exported Stripe events (project-info/stripe_events.py)
+function renderBilling(billing) {
+    if (!billing) {
+        return `
+            <div class="alert info">
+                No Stripe event exports yet. Save <code>stripe events list</code> output (JSON or NDJSON)
+                under <code>stripe-events/</code> to see MRR, churn and funnels here.
+            </div>
+        `;
+    }
+    const pct = rate => rate === null ? '-' : `${(rate * 100).toFixed(1)}%`;
+    const money = (cents, currency) => `${(cents / 100).toLocaleString(undefined, { minimumFractionDigits: 2 })} ${currency.toUpperCase()}`;
+    const row = (label, value, cls = '') => `
+        <div class="info-row">
+            <span class="info-label">${label}</span>
+            <span class="info-value ${cls}">${value}</span>
+        </div>`;
+    const { churn, recovery, funnel } = billing;
+
+    return `
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">📈</span>
+                    <h2 class="card-title">Recurring Revenue</h2>
+                </div>
+                <div class="card-content">
+                    ${billing.mrr.map(r => row(`${r.tier[0].toUpperCase()}${r.tier.slice(1)} (${r.subscribers})`, money(r.mrr, r.currency), 'success')).join('')
+                        || row('MRR', 'no paying subscriptions')}
+                    ${row('Free customers', billing.free)}
+                    ${row('Trialing', billing.trialing)}
+                    ${row('Past due', billing.past_due, billing.past_due ? 'warning' : '')}
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🔁</span>
+                    <h2 class="card-title">Churn & Recovery</h2>
+                </div>
+                <div class="card-content">
+                    ${row(`Churn (${churn.window_days}d)`, `${pct(churn.rate)} · ${churn.canceled} canceled`,
+                        churn.rate > 0.05 ? 'warning' : 'success')}
+                    ${row('Failed payments', recovery.failed)}
+                    ${row('Recovered', `${recovery.recovered} · ${pct(recovery.rate)}`)}
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🪜</span>
+                    <h2 class="card-title">Funnel</h2>
+                </div>
+                <div class="card-content">
+                    ${row('Subscriptions created', funnel.created)}
+                    ${row('Trials', funnel.trials)}
+                    ${row('Trials converted', funnel.conversions)}
+                    ${row('Upgrades / downgrades', `${funnel.upgrades} / ${funnel.downgrades}`)}
+                    ${Object.entries(funnel.transitions).map(([t, n]) => row(t, n)).join('')}
+                </div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">🗓️ By Month</h2>
+            </div>
+            ${billing.months.map(m => `
+                <div class="table-row">
+                    <div class="table-cell name">${m.month}</div>
+                    <div class="table-cell description">
+                        ${m.new} new · ${m.upgrades} upgrades · ${m.canceled} canceled ·
+                        ${m.failed} failed payments · ${m.recovered} recovered
+                    </div>
+                </div>
+            `).join('')}
+        </div>
+        <p class="gallery-summary">
+            ${billing.events.toLocaleString()} events from ${billing.files} exports ·
+            ${billing.duplicates.toLocaleString()} duplicates skipped
+            ${billing.stats ? ` · ${billing.stats.read.toLocaleString()} new in ${billing.stats.seconds}s` : ''}
+        </p>
+    `;
 }
 
 // Render Commands
@@ -467,6 +932,1089 @@ function renderAiModes(wrapper, data) {
     wrapper.innerHTML = html;
 }
 
+// Format a byte count for display
+function formatBytes(bytes) {
+    if (bytes === null || bytes === undefined) {
+        return 'unknown';
+    }
+    const units = ['B', 'KB', 'MB', 'GB'];
+    let i = 0;
+    while (bytes >= 1024 && i < units.length - 1) {
+        bytes /= 1024;
+        i++;
+    }
+    return i === 0 ? `${bytes} B` : `${bytes.toFixed(1)} ${units[i]}`;
+}
+
+function installSizeLabel(data) {
+    if (data.install_size === null || data.install_size === undefined) {
+        return 'unavailable (no node_modules, run npm install)';
+    }
+    return formatBytes(data.install_size);
+}
+
+// Render Dependencies
+function renderDependencies(wrapper, data) {
+    if (data.error) {
+        wrapper.innerHTML = `<h1 class="page-title">📦 Dependencies</h1><div class="alert error">❌ ${data.error}</div>`;
+        return;
+    }
+
+    let html = `
+        <h1 class="page-title">📦 Dependencies</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🔒</span>
+                    <h2 class="card-title">${data.lockfile}</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Packages</span>
+                        <span class="info-value success">${data.total_packages}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Dev-only</span>
+                        <span class="info-value">${data.dev_packages}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Install Size</span>
+                        <span class="info-value ${data.install_size === null ? 'warning' : 'info'}">${installSizeLabel(data)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Duplicates</span>
+                        <span class="info-value ${data.duplicates.length ? 'warning' : 'success'}">${data.duplicates.length}</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">🧩 Apps</h2>
+            </div>
+    `;
+
+    data.apps.forEach(app => {
+        const unresolved = app.unresolved.length ? ` · ⚠️ not in lockfile: ${app.unresolved.join(', ')}` : '';
+        const exclusive = app.exclusive.slice(0, 8).join(', ') + (app.exclusive.length > 8 ? ', …' : '');
+        html += `
+            <div class="table-row">
+                <div class="table-cell name">${app.name}</div>
+                <div class="table-cell description">
+                    ${app.direct} direct · ${app.transitive} transitive · ${app.exclusive.length} only here${unresolved}
+                    ${exclusive ? `<br><small>${exclusive}</small>` : ''}
+                </div>
+            </div>
+        `;
+    });
+
+    html += `</div>
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">🏋️ Heaviest Direct Dependencies</h2>
+            </div>
+    `;
+
+    data.top_level.slice(0, 12).forEach(dep => {
+        html += `
+            <div class="table-row">
+                <div class="table-cell name">${dep.name}@${dep.version}${dep.dev ? ' (dev)' : ''}</div>
+                <div class="table-cell description">${dep.transitive} transitive packages</div>
+            </div>
+        `;
+    });
+
+    html += `</div>`;
+
+    if (data.duplicates.length) {
+        html += `
+            <div class="table-container">
+                <div class="table-header">
+                    <h2 class="table-title">♊ Duplicate Versions</h2>
+                </div>
+        `;
+        data.duplicates.forEach(dup => {
+            html += `
+                <div class="table-row">
+                    <div class="table-cell name">${dup.name}</div>
+                    <div class="table-cell description">${dup.versions.join(', ')}</div>
+                </div>
+            `;
+        });
+        html += `</div>`;
+    }
+
+    wrapper.innerHTML = html;
+}
+
+// Render Bundle Size
+function renderBundle(wrapper, data) {
+    let html = `<h1 class="page-title">🏗️ Build Output & Bundle Size</h1>`;
+    const apps = Object.keys(data.apps);
+
+    if (apps.length === 0) {
+        html += `
+            <div class="alert info">
+                No builds recorded yet. Run <code>python project-info/bundle_analyzer.py --build</code>
+            </div>
+        `;
+        wrapper.innerHTML = html;
+        return;
+    }
+
+    apps.forEach(app => {
+        const report = data.apps[app];
+        const build = report.build;
+        const trend = report.trend.map(t => formatBytes(t.total_gzip)).join(' → ');
+
+        html += `
+            <div class="table-container">
+                <div class="table-header">
+                    <h2 class="table-title">📦 ${app} · ${formatBytes(build.total_gzip)} gzip</h2>
+                </div>
+                <div class="table-row">
+                    <div class="table-cell name">Built</div>
+                    <div class="table-cell description">${build.timestamp}${build.duration !== null ? ` in ${build.duration}s` : ''}</div>
+                </div>
+                <div class="table-row">
+                    <div class="table-cell name">Trend (gzip)</div>
+                    <div class="table-cell description">${trend}</div>
+                </div>
+        `;
+
+        report.regressions.forEach(reg => {
+            html += `
+                <div class="alert error">
+                    ▲ ${reg.key} grew ${formatBytes(reg.growth)} gzip (median of recent builds: ${formatBytes(reg.baseline)})
+                </div>
+            `;
+        });
+
+        build.chunks.forEach(chunk => {
+            const oversized = report.oversized.includes(chunk.key);
+            const sources = (chunk.sources || []).slice(0, 3)
+                .map(s => `${s.source} (${formatBytes(s.bytes)})`).join(', ');
+            html += `
+                <div class="table-row">
+                    <div class="table-cell name">${oversized ? '⚠️ ' : ''}${chunk.file}</div>
+                    <div class="table-cell description">
+                        ${formatBytes(chunk.raw)} raw · ${formatBytes(chunk.gzip)} gzip · ${formatBytes(chunk.brotli)} brotli
+                        ${sources ? `<br><small>${sources}</small>` : ''}
+                    </div>
+                </div>
+            `;
+        });
+
+        html += `</div>`;
+    });
+
+    wrapper.innerHTML = html;
+}
+
+// Render a list of numbers as a unicode sparkline
+function sparkline(values) {
+    if (!values || values.length < 2) {
+        return '';
+    }
+    const ticks = '▁▂▃▄▅▆▇█';
+    const low = Math.min(...values);
+    const span = (Math.max(...values) - low) || 1;
+    return values.map(v => ticks[Math.floor((v - low) / span * (ticks.length - 1))]).join('');
+}
+
+// Render Code Metrics
+function renderMetrics(wrapper, data) {
+    const lines = data.trend['total.lines'].map(point => point[1]);
+    const first = data.trend['total.lines'][0];
+
+    let html = `
+        <h1 class="page-title">📈 Code Metrics</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">📊</span>
+                    <h2 class="card-title">Totals</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Files</span>
+                        <span class="info-value success">${data.totals.files.toLocaleString()}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Lines</span>
+                        <span class="info-value success">${data.totals.lines.toLocaleString()}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Size</span>
+                        <span class="info-value">${formatBytes(data.totals.bytes)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Trend</span>
+                        <span class="info-value info"><span class="sparkline">${sparkline(lines)}</span> ${first ? `since ${first[0]}` : ''}</span>
+                    </div>
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🗄️</span>
+                    <h2 class="card-title">Measured Project Stats</h2>
+                </div>
+                <div class="card-content">
+    `;
+
+    Object.entries(data.stats).forEach(([key, value]) => {
+        html += `
+                    <div class="info-row">
+                        <span class="info-label">${key.replace(/_/g, ' ')}</span>
+                        <span class="info-value success">${value}</span>
+                    </div>
+        `;
+    });
+
+    html += `
+                </div>
+            </div>
+        </div>
+    `;
+
+    [['🧩 By Sub-App', data.apps], ['🔤 By Language', data.languages]].forEach(([title, rows]) => {
+        html += `
+            <div class="table-container">
+                <div class="table-header">
+                    <h2 class="table-title">${title}</h2>
+                </div>
+        `;
+        Object.entries(rows).forEach(([name, counts]) => {
+            html += `
+                <div class="table-row">
+                    <div class="table-cell name">${name}</div>
+                    <div class="table-cell description">
+                        ${counts.lines.toLocaleString()} lines · ${counts.files} files · ${formatBytes(counts.bytes)}
+                    </div>
+                </div>
+            `;
+        });
+        html += `</div>`;
+    });
+
+    wrapper.innerHTML = html;
+}
+
+// Render Duplicates
+function renderDuplicates(wrapper, data) {
+    let html = `
+        <h1 class="page-title">🧬 Duplicate Code</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">📊</span>
+                    <h2 class="card-title">Summary</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Files Scanned</span>
+                        <span class="info-value">${data.files}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Archives</span>
+                        <span class="info-value">${data.archives.join(', ') || 'None'}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Near-Duplicate Pairs</span>
+                        <span class="info-value warning">${data.total_pairs}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Estimated Savings</span>
+                        <span class="info-value success">${formatBytes(data.estimated_savings)}</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">✂️ Dedupe Opportunities</h2>
+            </div>
+    `;
+
+    data.pairs.forEach(pair => {
+        html += `
+            <div class="table-row">
+                <div class="table-cell name">${Math.round(pair.similarity * 100)}% · ~${formatBytes(pair.savings)}</div>
+                <div class="table-cell description">
+                    ${pair.a}:${pair.lines_a[0]}-${pair.lines_a[1]}<br>
+                    ${pair.b}:${pair.lines_b[0]}-${pair.lines_b[1]}
+                </div>
+            </div>
+        `;
+    });
+
+    html += `</div>`;
+    wrapper.innerHTML = html;
+}
+
+// Render Archives
+function renderArchives(wrapper, data) {
+    let html = `
+        <h1 class="page-title">🗜️ Archives</h1>
+
+        <div class="cards-container">
+    `;
+
+    data.archives.forEach(archive => {
+        const drift = archive.drift;
+        const inSync = drift && !drift.added.length && !drift.removed.length && !drift.modified.length;
+        html += `
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">📦</span>
+                    <h2 class="card-title">${archive.archive}</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Members</span>
+                        <span class="info-value">${archive.members.length} (${formatBytes(archive.total_size)} unpacked)</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Extracted To</span>
+                        <span class="info-value">${archive.directory ? archive.directory + '/' : 'Not extracted'}</span>
+                    </div>
+        `;
+        if (drift) {
+            html += `
+                    <div class="info-row">
+                        <span class="info-label">Status</span>
+                        <span class="info-value ${inSync ? 'success' : 'warning'}">${inSync ? 'In sync' : 'Drifted'} · ${drift.unchanged} unchanged</span>
+                    </div>
+            `;
+            [['Added on disk', drift.added], ['Missing on disk', drift.removed],
+             ['Modified', drift.modified.map(m => `${m.member} (${formatBytes(m.zip_size)} → ${formatBytes(m.disk_size)})`)]
+            ].forEach(([label, items]) => {
+                if (items.length) {
+                    html += `
+                    <div class="info-row">
+                        <span class="info-label">${label}</span>
+                        <span class="info-value warning">${items.join('<br>')}</span>
+                    </div>
+                    `;
+                }
+            });
+        }
+        html += `
+                </div>
+            </div>
+        `;
+    });
+
+    html += `
+        </div>
+
+        <div id="archive-preview"></div>
+    `;
+
+    data.archives.forEach(archive => {
+        html += `
+            <div class="table-container">
+                <div class="table-header">
+                    <h2 class="table-title">📄 ${archive.archive}</h2>
+                </div>
+        `;
+        archive.members.forEach(member => {
+            html += `
+                <div class="table-row">
+                    <div class="table-cell name">${member.name}</div>
+                    <div class="table-cell description">
+                        ${formatBytes(member.size)} · crc ${member.crc}
+                        <button class="copy-btn" onclick="previewArchiveMember('${archive.archive}', '${member.name}')">👁️ Preview</button>
+                    </div>
+                </div>
+            `;
+        });
+        html += `</div>`;
+    });
+
+    wrapper.innerHTML = html;
+}
+
+// Stream one archive member into the preview panel
+async function previewArchiveMember(archive, member) {
+    const panel = document.getElementById('archive-preview');
+    if (STATIC_EXPORT) {
+        panel.innerHTML = '<div class="alert info">ℹ️ Member previews need the live dashboard</div>';
+        return;
+    }
+    const params = new URLSearchParams({ archive, member });
+    const response = await fetch(`/api/archives/preview?${params}`);
+    const data = await response.json();
+
+    panel.innerHTML = `
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">👁️ ${archive} → ${member}</h2>
+            </div>
+            <pre class="preview-code"></pre>
+        </div>
+    `;
+    const pre = panel.querySelector('pre');
+    if (data.error) {
+        pre.textContent = data.error;
+    } else if (data.binary) {
+        pre.textContent = `Binary file (${formatBytes(data.size)})`;
+    } else {
+        pre.textContent = data.content + (data.truncated ? `\n… truncated, ${formatBytes(data.size)} total` : '');
+    }
+    panel.scrollIntoView({ behavior: 'smooth' });
+}
+
+// Render Gemini Cache
+function renderGeminiCache(wrapper, data) {
+    wrapper.innerHTML = `
+        <h1 class="page-title">♻️ Gemini Cache</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">💰</span>
+                    <h2 class="card-title">Savings</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Hit Rate</span>
+                        <span class="info-value success">${Math.round(data.hit_rate * 100)}% (${data.hits} hits / ${data.misses} misses)</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Bytes Saved</span>
+                        <span class="info-value">${formatBytes(data.bytes_saved)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Cost Avoided</span>
+                        <span class="info-value success">$${data.cost_avoided.toFixed(2)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Time Saved</span>
+                        <span class="info-value">${Math.round(data.seconds_saved)}s</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Upstream Errors</span>
+                        <span class="info-value ${data.errors ? 'warning' : ''}">${data.errors}</span>
+                    </div>
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">♻️</span>
+                    <h2 class="card-title">Cache</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Cached Responses</span>
+                        <span class="info-value">${data.entries} (${formatBytes(data.cache_bytes)})</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Start Proxy</span>
+                        <span class="info-value">python project-info/gemini_proxy.py</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Point Dev Server</span>
+                        <span class="info-value">VITE_GEMINI_BASE_URL=http://127.0.0.1:${data.port}</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+// Render Production Mirror
+function renderMirror(wrapper, data) {
+    if (!data.synced) {
+        wrapper.innerHTML = `
+            <h1 class="page-title">🪞 Production Mirror</h1>
+            <div class="card">
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">No mirror yet</span>
+                        <span class="info-value warning">python project-info/table_mirror.py</span>
+                    </div>
+                </div>
+            </div>
+        `;
+        return;
+    }
+
+    let html = `
+        <h1 class="page-title">🪞 Production Mirror</h1>
+
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">🗃️ Tables</h2>
+            </div>
+    `;
+
+    data.tables.forEach(table => {
+        html += `
+            <div class="table-row">
+                <div class="table-cell name">${table.table}</div>
+                <div class="table-cell description">
+                    ${table.rows} rows · ${table.watermark_column} ≤ ${table.watermark || '-'} ·
+                    synced ${new Date(table.synced_at * 1000).toLocaleString()}
+                </div>
+            </div>
+        `;
+    });
+
+    html += `
+        </div>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🎨</span>
+                    <h2 class="card-title">Photos by Mode</h2>
+                </div>
+                <div class="card-content">
+                    ${data.modes.map(row => `
+                        <div class="info-row">
+                            <span class="info-label">${row.mode || '(none)'}</span>
+                            <span class="info-value">${row.photos}</span>
+                        </div>
+                    `).join('')}
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">💳</span>
+                    <h2 class="card-title">Subscribers & Revenue</h2>
+                </div>
+                <div class="card-content">
+                    ${data.tiers.map(row => `
+                        <div class="info-row">
+                            <span class="info-label">${row.tier_id}</span>
+                            <span class="info-value success">${row.subscribers}</span>
+                        </div>
+                    `).join('')}
+                    ${data.revenue.map(row => `
+                        <div class="info-row">
+                            <span class="info-label">Revenue (${row.currency})</span>
+                            <span class="info-value success">${row.total.toFixed(2)} from ${row.payments} payments</span>
+                        </div>
+                    `).join('')}
+                </div>
+            </div>
+        </div>
+    `;
+
+    wrapper.innerHTML = html;
+}
+
+// Render Storage Audit
+function renderStorageAudit(wrapper, data) {
+    const report = data.report;
+    if (!report) {
+        wrapper.innerHTML = `
+            <h1 class="page-title">🪣 Storage Audit</h1>
+            <div class="card">
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">No audit yet</span>
+                        <span class="info-value warning">python project-info/bucket_audit.py</span>
+                    </div>
+                </div>
+            </div>
+        `;
+        return;
+    }
+
+    const orphans = report.orphans
+        ? `${report.orphans.count} (${formatBytes(report.orphans.bytes)})`
+        : 'Sync the table mirror first';
+    const near = report.near_groups === null
+        ? 'pip install Pillow'
+        : `${report.near_groups} groups (${formatBytes(report.near_bytes)})`;
+
+    let html = `
+        <h1 class="page-title">🪣 Storage Audit</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">♻️</span>
+                    <h2 class="card-title">Reclaimable Space</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Reclaimable</span>
+                        <span class="info-value success">${formatBytes(report.reclaimable_bytes)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Orphans</span>
+                        <span class="info-value">${orphans}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Identical Copies</span>
+                        <span class="info-value">${report.identical_groups} groups (${formatBytes(report.identical_bytes)})</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Near-Identical</span>
+                        <span class="info-value">${near}</span>
+                    </div>
+                </div>
+            </div>
+    `;
+
+    report.buckets.forEach(bucket => {
+        html += `
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">🪣</span>
+                    <h2 class="card-title">${bucket.bucket}</h2>
+                </div>
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">Objects</span>
+                        <span class="info-value">${bucket.objects} (${formatBytes(bucket.bytes)})</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Over ${bucket.limit ? formatBytes(bucket.limit) : 'Limit'}</span>
+                        <span class="info-value ${bucket.over_limit_count ? 'warning' : 'success'}">${bucket.over_limit_count}</span>
+                    </div>
+                    ${bucket.over_limit.slice(0, 5).map(obj => `
+                        <div class="info-row">
+                            <span class="info-label">${obj.name}</span>
+                            <span class="info-value warning">${formatBytes(obj.size)}</span>
+                        </div>
+                    `).join('')}
+                    <div class="info-row">
+                        <span class="info-label">Disallowed Types</span>
+                        <span class="info-value">${bucket.disallowed_count}</span>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    html += `</div>`;
+    wrapper.innerHTML = html;
+}
+
+// Render Gallery (virtualized: only tiles in or near the viewport exist in the DOM)
+const GALLERY_TILE = 180;
+const GALLERY_PAGE = 200;
+const GALLERY_OVERSCAN_ROWS = 2;
+
+function renderGallery(wrapper, data) {
+    if (!data.synced || !data.total) {
+        wrapper.innerHTML = `
+            <h1 class="page-title">🖼️ Gallery</h1>
+            <div class="card">
+                <div class="card-content">
+                    <div class="info-row">
+                        <span class="info-label">${data.synced ? 'No photos or GIFs in the mirror' : 'No mirror yet'}</span>
+                        <span class="info-value warning">python project-info/table_mirror.py</span>
+                    </div>
+                </div>
+            </div>
+        `;
+        return;
+    }
+
+    wrapper.innerHTML = `
+        <h1 class="page-title">🖼️ Gallery</h1>
+        <p class="gallery-summary">${data.total.toLocaleString()} images${data.available ? '' : ' · install Pillow to render thumbnails'}</p>
+        <div class="gallery-viewport">
+            <div class="gallery-spacer"></div>
+        </div>
+    `;
+
+    const viewport = wrapper.querySelector('.gallery-viewport');
+    const spacer = wrapper.querySelector('.gallery-spacer');
+    const pages = new Map();
+    for (let start = 0; start < data.items.length; start += GALLERY_PAGE) {
+        pages.set(start / GALLERY_PAGE, data.items.slice(start, start + GALLERY_PAGE));
+    }
+    const pending = new Set();
+    const tiles = new Map();
+    let frame = null;
+
+    const columns = () => Math.max(1, Math.floor(viewport.clientWidth / GALLERY_TILE));
+
+    function itemAt(index) {
+        const page = pages.get(Math.floor(index / GALLERY_PAGE));
+        return page ? page[index % GALLERY_PAGE] : undefined;
+    }
+
+    async function loadPage(pageIndex) {
+        if (pages.has(pageIndex) || pending.has(pageIndex)) return;
+        pending.add(pageIndex);
+        try {
+            const response = await fetch(`/api/gallery?offset=${pageIndex * GALLERY_PAGE}&limit=${GALLERY_PAGE}`);
+            pages.set(pageIndex, (await response.json()).items);
+            schedule();
+        } catch (error) {
+            console.error('Error loading gallery page:', error);
+        } finally {
+            pending.delete(pageIndex);
+        }
+    }
+
+    function createTile(item) {
+        const tile = document.createElement('div');
+        tile.className = 'gallery-tile';
+        tile.title = `${item.kind} · ${item.mode || ''} · ${item.created_at || ''}`;
+        tile.innerHTML = item.thumb
+            ? `<img src="${item.thumb}" alt="${item.mode || item.kind}" decoding="async">`
+            : `<span class="gallery-missing">${item.version ? '' : 'not exported'}</span>`;
+        const label = document.createElement('span');
+        label.className = 'gallery-label';
+        label.textContent = item.kind === 'gif' ? 'GIF' : (item.mode || '');
+        tile.appendChild(label);
+        return tile;
+    }
+
+    function draw() {
+        frame = null;
+        if (!viewport.isConnected) return;
+
+        const cols = columns();
+        spacer.style.height = `${Math.ceil(data.total / cols) * GALLERY_TILE}px`;
+        const firstRow = Math.max(0, Math.floor(viewport.scrollTop / GALLERY_TILE) - GALLERY_OVERSCAN_ROWS);
+        const lastRow = Math.ceil((viewport.scrollTop + viewport.clientHeight) / GALLERY_TILE) + GALLERY_OVERSCAN_ROWS;
+        const first = firstRow * cols;
+        const last = Math.min(data.total, lastRow * cols);
+
+        for (const [index, tile] of tiles) {
+            if (index < first || index >= last || tile.dataset.cols !== String(cols)) {
+                tile.remove();
+                tiles.delete(index);
+            }
+        }
+
+        for (let index = first; index < last; index++) {
+            if (tiles.has(index)) continue;
+            const item = itemAt(index);
+            if (!item) {
+                loadPage(Math.floor(index / GALLERY_PAGE));
+                continue;
+            }
+            const tile = createTile(item);
+            tile.dataset.cols = cols;
+            tile.style.transform = `translate(${(index % cols) * GALLERY_TILE}px, ${Math.floor(index / cols) * GALLERY_TILE}px)`;
+            spacer.appendChild(tile);
+            tiles.set(index, tile);
+        }
+    }
+
+    function schedule() {
+        if (frame === null) {
+            frame = requestAnimationFrame(draw);
+        }
+    }
+
+    viewport.addEventListener('scroll', schedule, { passive: true });
+    new ResizeObserver(schedule).observe(viewport);
+    schedule();
+}
+
+// Render Deploy
+function renderDeploy(wrapper, data) {
+    const history = {};
+    data.steps.forEach(step => { history[step.function] = step; });
+
+    wrapper.innerHTML = `
+        <h1 class="page-title">🚀 Deploy Edge Functions</h1>
+
+        <div class="cards-container">
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">⚡</span>
+                    <h2 class="card-title">Functions</h2>
+                </div>
+                <div class="card-content">
+                    ${data.functions.map(fn => `
+                        <label class="info-row deploy-option">
+                            <span class="info-label"><input type="checkbox" value="${fn}" checked> ${fn}</span>
+                            <span class="info-value deploy-status" data-function="${fn}">${history[fn] && history[fn].median !== null ? `~${history[fn].median.toFixed(1)}s` : ''}</span>
+                        </label>
+                    `).join('')}
+                    <div class="info-row">
+                        <span class="info-label">Parallel deploys</span>
+                        <span class="info-value"><input type="number" id="deploy-concurrency" min="1" max="${data.functions.length}" value="${data.concurrency}"></span>
+                    </div>
+                    <button class="copy-btn" id="deploy-start">🚀 Deploy</button>
+                </div>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <span class="card-icon">⏱️</span>
+                    <h2 class="card-title">Recent Runs</h2>
+                </div>
+                <div class="card-content">
+                    ${data.runs.length ? data.runs.map(run => `
+                        <div class="info-row">
+                            <span class="info-label">${new Date(run.time * 1000).toLocaleString()}</span>
+                            <span class="info-value ${run.failures ? 'warning' : 'success'}">${run.functions} in ${run.wall_time.toFixed(1)}s (steps ${run.step_total.toFixed(1)}s)</span>
+                        </div>
+                    `).join('') : '<div class="info-row"><span class="info-label">No deploys recorded yet</span></div>'}
+                </div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <div class="table-header">
+                <h2 class="table-title">📜 Output</h2>
+            </div>
+            <pre class="preview-code deploy-log"></pre>
+        </div>
+    `;
+
+    const button = wrapper.querySelector('#deploy-start');
+    const log = wrapper.querySelector('.deploy-log');
+    if (STATIC_EXPORT) {
+        button.remove();
+        log.textContent = 'Deploys can only be started from the live dashboard (python project-info/dashboard_web.py)';
+        return;
+    }
+    const statusCell = fn => wrapper.querySelector(`.deploy-status[data-function="${fn}"]`);
+    let buffered = [];
+    let frame = null;
+
+    // Lines arrive in bursts from parallel deploys; append them once per frame
+    function flush() {
+        frame = null;
+        log.appendChild(document.createTextNode(buffered.join('')));
+        buffered = [];
+        log.scrollTop = log.scrollHeight;
+    }
+
+    function append(text) {
+        buffered.push(text + '\n');
+        if (frame === null) {
+            frame = requestAnimationFrame(flush);
+        }
+    }
+
+    button.addEventListener('click', async () => {
+        const functions = [...wrapper.querySelectorAll('.deploy-option input:checked')].map(input => input.value);
+        const concurrency = parseInt(wrapper.querySelector('#deploy-concurrency').value, 10);
+        const response = await fetch('/api/deploy', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ functions, concurrency })
+        });
+        const run = await response.json();
+        if (!response.ok) {
+            log.textContent = run.error;
+            return;
+        }
+
+        button.disabled = true;
+        log.textContent = '';
+        run.functions.forEach(fn => { statusCell(fn).textContent = 'queued'; });
+
+        const width = Math.max(...run.functions.map(fn => fn.length));
+        const source = new EventSource(`/api/deploy/${run.id}/stream`);
+        source.onmessage = message => {
+            const event = JSON.parse(message.data);
+            if (event.kind === 'line') {
+                append(`${event.function.padEnd(width)} │ ${event.text}`);
+            } else if (event.kind === 'status') {
+                const cell = statusCell(event.function);
+                cell.textContent = event.duration === undefined ? event.status : `${event.status} ${event.duration.toFixed(1)}s`;
+                cell.className = `info-value deploy-status ${event.status === 'ok' ? 'success' : event.status === 'failed' ? 'warning' : ''}`;
+            } else if (event.kind === 'done') {
+                append(`\n${run.functions.length} functions in ${event.wall_time.toFixed(1)}s (sequential would take ~${event.step_total.toFixed(1)}s)`);
+                source.close();
+                button.disabled = false;
+            }
+        };
+    });
+}
+
+// Render Projects: one column per registered project
+function renderProjects(wrapper, data) {
+    const mark = ok => `<td class="compare-cell ${ok ? 'success' : 'error'}">${ok ? '✓' : '✗'}</td>`;
+    const probeClass = { up: 'success', auth: 'warning', skipped: '' };
+    const probe = p => `
+        <td class="compare-cell ${probeClass[p.probe.status] ?? 'error'}" title="${p.probe.error || ''}">
+            ${p.probe.status}${p.probe.ms !== null ? ` ${Math.round(p.probe.ms)}ms` : ''}
+        </td>`;
+    const migrations = p => `
+        <td class="compare-cell ${p.missing_migrations.length ? 'warning' : 'success'}"
+            title="${p.missing_migrations.join('\n')}">
+            ${p.migration_count}${p.missing_migrations.length ? ` (${p.missing_migrations.length} behind)` : ''}
+        </td>`;
+    const section = title => `<tr class="compare-group"><th colspan="${data.projects.length + 1}">${title}</th></tr>`;
+
+    const problems = data.projects.flatMap(p => [
+        !p.exists ? `<div class="alert error">❌ ${p.name}: ${p.root} does not exist</div>` : '',
+        p.exists && !p.env_file ? `<div class="alert warning">⚠️ ${p.name}: no env file</div>` : ''
+    ]).join('');
+
+    wrapper.innerHTML = `
+        <h1 class="page-title">🌐 Projects & Environments</h1>
+        ${problems}
+        <div class="table-container compare-container">
+            <table class="compare-table">
+                <thead>
+                    <tr><th></th>${data.projects.map(p => `<th title="${p.root}">${p.name}</th>`).join('')}</tr>
+                </thead>
+                <tbody>
+                    <tr><th>Probe</th>${data.projects.map(probe).join('')}</tr>
+                    <tr><th>Migrations</th>${data.projects.map(migrations).join('')}</tr>
+                    ${section('🔑 Keys')}
+                    ${data.keys.map(key => `
+                        <tr><th>${key}</th>${data.projects.map(p => mark(p.keys[key])).join('')}</tr>
+                    `).join('')}
+                    ${section('⚡ Edge Functions')}
+                    ${data.functions.map(fn => `
+                        <tr><th>${fn}</th>${data.projects.map(p => mark(p.functions.includes(fn))).join('')}</tr>
+                    `).join('')}
+                </tbody>
+            </table>
+        </div>
+        <p class="gallery-summary">
+            ${data.projects.length} projects collected in ${Math.round(data.elapsed_ms)} ms ·
+            latest migration ${data.latest_migration || '-'} · add projects under "projects" in project-info/config.json
+        </p>
+    `;
+}
+
+// Render Alerts
+function renderAlerts(wrapper, data) {
+    if (data.error) {
+        wrapper.innerHTML = `
+            <h1 class="page-title">🚨 Alerts</h1>
+            <div class="alert error">❌ ${data.error}</div>
+        `;
+        return;
+    }
+    const icons = { critical: '🔴', warning: '🟠', info: '🔵' };
+    const errors = Object.entries(data.errors)
+        .map(([signal, error]) => `<div class="alert warning">⚠️ ${signal}: ${error}</div>`).join('');
+
+    wrapper.innerHTML = `
+        <h1 class="page-title">🚨 Alerts</h1>
+        ${errors}
+        ${data.active.length ? '' : '<div class="alert success">✓ Nothing firing</div>'}
+        <div class="table-container">
+            ${data.active.map(alert => `
+                <div class="table-row alert-row ${alert.severity}">
+                    <div class="table-cell name">${icons[alert.severity]} ${alert.rule}</div>
+                    <div class="table-cell description">
+                        ${alert.message}
+                        <br><small>since ${new Date(alert.since * 1000).toLocaleString()}</small>
+                    </div>
+                </div>
+            `).join('')}
+        </div>
+        <p class="gallery-summary">
+            ${data.rules} rules · ${data.signals_collected} signals collected, ${data.signals_skipped} unchanged ·
+            ${data.delivered} sent to ${data.sinks.join(', ')} in ${Math.round(data.elapsed_ms)} ms ·
+            edit rules under "alerts" in project-info/config.json
+        </p>
+    `;
+}
+
+// Render History
+function renderHistory(wrapper, data) {
+    const width = 640;
+    const height = 160;
+    const x = t => ((t - data.start) / (data.end - data.start)) * width;
+
+    function chart(points) {
+        const measured = points.filter(p => p[1] !== null);
+        const top = Math.max(1, ...measured.map(p => p[3]));
+        const y = ms => height - (ms / top) * (height - 10);
+        const line = key => measured.map(p => `${x(p[0]).toFixed(1)},${y(p[key]).toFixed(1)}`).join(' ');
+        const errors = points.filter(p => p[5]).map(p => `
+            <rect class="history-error" x="${x(p[0]).toFixed(1)}" y="0" width="3" height="${height}">
+                <title>${p[5]} of ${p[4]} failed at ${new Date(p[0]).toLocaleString()}</title>
+            </rect>`).join('');
+        return `
+            <svg class="history-chart" viewBox="0 0 ${width} ${height}" preserveAspectRatio="none">
+                ${errors}
+                <polyline class="history-max" points="${line(3)}"/>
+                <polyline class="history-avg" points="${line(1)}"/>
+            </svg>
+            <div class="history-axis">
+                <span>${new Date(data.start).toLocaleString()}</span>
+                <span>peak ${Math.round(top)} ms</span>
+                <span>${new Date(data.end).toLocaleString()}</span>
+            </div>`;
+    }
+
+    function card(target, points) {
+        const samples = points.reduce((sum, p) => sum + p[4], 0);
+        const failed = points.reduce((sum, p) => sum + p[5], 0);
+        const latest = data.latest[target] || {};
+        const statusClass = latest.status && latest.status < 500 ? 'success' : 'error';
+        return `
+            <div class="card history-card">
+                <div class="card-header">
+                    <span class="card-icon">${target.startsWith('probe:') ? '🌐' : '⚡'}</span>
+                    <h2 class="card-title">${target}</h2>
+                </div>
+                <div class="card-content">
+                    ${chart(points)}
+                    <div class="info-row">
+                        <span class="info-label">Latest</span>
+                        <span class="info-value ${statusClass}">
+                            ${latest.latency ?? '-'} ms · ${latest.status || 'unreachable'}
+                        </span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Errors</span>
+                        <span class="info-value ${failed ? 'error' : 'success'}">${failed} of ${samples}</span>
+                    </div>
+                </div>
+            </div>`;
+    }
+
+    const series = Object.entries(data.series).sort(([a], [b]) => a.localeCompare(b));
+    const disk = Object.entries(data.disk)
+        .map(([tier, d]) => `${tier} ${d.segments} segments / ${Math.round(d.bytes / 1024)} KB`).join(' · ');
+
+    wrapper.innerHTML = `
+        <h1 class="page-title">📉 Latency History</h1>
+        <div class="history-ranges">
+            ${data.ranges.map(range => `
+                <button class="copy-btn ${range === data.range ? 'active' : ''}" data-range="${range}">${range}</button>
+            `).join('')}
+        </div>
+        ${series.length ? '' : `<div class="alert info">ℹ️ No samples yet: open the Projects page or run
+            <code>python timeseries.py --sample 30</code></div>`}
+        <div class="cards-container">
+            ${series.map(([target, points]) => card(target, points)).join('')}
+        </div>
+        <p class="gallery-summary">
+            ${data.resolution} data in ${Math.round(data.bucket_ms / 1000)}s buckets, queried in ${data.elapsed_ms} ms ·
+            ${disk}
+        </p>
+    `;
+
+    wrapper.querySelectorAll('.history-ranges button').forEach(button => {
+        button.addEventListener('click', async () => {
+            if (STATIC_EXPORT) {
+                window.location.href = STATIC_EXPORT.pages[`history-${button.dataset.range}`];
+                return;
+            }
+            try {
+                const response = await fetch(`/api/history?range=${button.dataset.range}`);
+                renderHistory(wrapper, await response.json());
+            } catch (error) {
+                console.error('Error loading history:', error);
+            }
+        });
+    });
+}
+
 // Render Troubleshooting
 function renderTroubleshooting(wrapper, data) {
     let html = `<h1 class="page-title">🔧 Troubleshooting Guide</h1>`;
@@ -0,0 +1,82 @@
+// GemBooth Dashboard - Service Worker
+// Keeps the dashboard page and its fingerprinted assets available offline or while Flask restarts.
+// Section data is cached by app.js itself (localStorage + ETag revalidation).
+
+const CACHE = 'gembooth-shell-v1';
+
+// Cache the page and the assets it links to, so the first visit already works offline
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE);
+        const response = await fetch('/');
+        if (response.ok) {
+            const html = await response.clone().text();
+            await cache.put('/', response);
+            await cache.addAll([...new Set(html.match(/\/assets\/[^"']+/g) || [])]);
+        }
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const keys = await caches.keys();
+        await Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key)));
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.origin !== location.origin) {
+        return;
+    }
+    if (event.request.mode === 'navigate' && url.pathname === '/') {
+        event.respondWith(networkFirst(event.request));
+    } else if (url.pathname.startsWith('/assets/')) {
+        event.respondWith(cacheFirst(event.request));
+    }
+});
+
+// The page: fresh when the server answers, the last copy when it doesn't
+async function networkFirst(request) {
+    const cache = await caches.open(CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await cache.put('/', response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match('/');
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+// Fingerprinted assets never change under the same name, so a cached copy is always right
+async function cacheFirst(request) {
+    const cache = await caches.open(CACHE);
+    const cached = await cache.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        await pruneOlderBuilds(cache, request.url);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Drop earlier builds of the same file (style.<hash>.css) when a new one arrives
+async function pruneOlderBuilds(cache, url) {
+    const stem = new URL(url).pathname.split('.')[0];
+    for (const key of await cache.keys()) {
+        if (key.url !== url && new URL(key.url).pathname.split('.')[0] === stem) {
+            await cache.delete(key);
+        }
+    }
+}
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Static Export
+Pre-rendered, self-contained copy of the web dashboard for any static host
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from asset_pipeline import ASSET_DIR, compress, get_manifest
+from project_registry import load_projects
+from thumbnail_cache import PAGE_LIMIT, default_format, get_cache, resolve_object, thumbnails_available
+from timeseries import RANGES
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_OUT = PROJECT_ROOT / 'dashboard-export'
+MANIFEST_NAME = 'export-manifest.json'
+
+MAX_WORKERS = 8
+
+# Env keys whose values never leave this machine unmasked
+SECRET_NAMES = re.compile(r'KEY|SECRET|TOKEN|PASSWORD', re.IGNORECASE)
+MIN_SECRET_LENGTH = 8
+
+# Fields that differ on every computation; a section whose data differs only here is not rewritten
+VOLATILE_KEYS = {'elapsed_ms', 'last_updated', 'start', 'end'}
+
+# Sections whose default request is not the whole picture
+SECTION_URLS = {'gallery': f"/api/gallery?limit={PAGE_LIMIT}"}
+
+DEFAULT_RANGE = '24h'
+
+def page_list(sections):
+    """(page key, section slug, API URL, file name) for every page of the export"""
+    pages = []
+    for _, slug in sections:
+        filename = 'index.html' if slug == 'overview' else f"{slug}.html"
+        pages.append((slug, slug, SECTION_URLS.get(slug, f"/api/{slug}"), filename))
+    # The history page switches ranges by asking the server; here every range is its own page
+    for name in RANGES:
+        if name != DEFAULT_RANGE:
+            pages.append((f"history-{name}", 'history', f"/api/history?range={name}", f"history-{name}.html"))
+    return pages
+
+def secret_values():
+    """Values of secret-looking keys in this checkout's and every registered project's env file"""
+    from gembooth_dashboard import read_env_file
+
+    files = {PROJECT_ROOT / '.env.local'} | {project['env_file'] for project in load_projects()}
+    secrets = set()
+    for path in files:
+        for key, value in read_env_file(path).items():
+            if SECRET_NAMES.search(key) and len(value) >= MIN_SECRET_LENGTH:
+                secrets.add(value)
+    return sorted(secrets, key=len, reverse=True)
+
+def redact(value, secrets, mask):
+    """Replace every secret inside strings (keys included) with its masked form"""
+    if isinstance(value, str):
+        for secret in secrets:
+            if secret in value:
+                value = value.replace(secret, mask(secret))
+        return value
+    if isinstance(value, dict):
+        return {redact(k, secrets, mask): redact(v, secrets, mask) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v, secrets, mask) for v in value]
+    return value
+
+def stable(value):
+    """Data with volatile fields dropped, for change detection"""
+    if isinstance(value, dict):
+        return {k: stable(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [stable(v) for v in value]
+    return value
+
+def digest(data):
+    """Content digest of JSON-serializable data"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def fetch_section(web, url):
+    """(status, JSON) of one API endpoint, called in-process without HTTP or request hooks"""
+    with web.app.test_request_context(url) as ctx:
+        response = web.app.make_response(web.app.view_functions[ctx.request.url_rule.endpoint](
+            **ctx.request.view_args))
+        return response.status_code, json.loads(response.get_data())
+
+def export_thumbnails(items, out_dir):
+    """Copy gallery thumbnails into thumbs/, named by source digest; returns how many were written"""
+    if not thumbnails_available():
+        for item in items:
+            item['thumb'] = None
+        return 0
+    cache = get_cache()
+    fmt = default_format()
+    written = 0
+    for item in items:
+        if not item.get('thumb'):
+            continue
+        try:
+            data, source = cache.get(resolve_object(item['bucket'], item['name']), fmt)
+        except (OSError, ValueError):
+            item['thumb'] = None
+            continue
+        name = f"thumbs/{source}.{fmt}"
+        if not (out_dir / name).exists():
+            (out_dir / 'thumbs').mkdir(parents=True, exist_ok=True)
+            (out_dir / name).write_bytes(data)
+            written += 1
+        item['thumb'] = name
+    return written
+
+def inline_assets():
+    """Minified CSS and JS, safe to embed in <style> and <script>"""
+    assets = get_manifest()['assets']
+    css = (ASSET_DIR / assets['css/style.css']['file']).read_text(encoding='utf-8')
+    js = (ASSET_DIR / assets['js/app.js']['file']).read_text(encoding='utf-8')
+    return css.replace('</style', '<\\/style'), js.replace('</script', '<\\/script')
+
+def write_page(path, html):
+    """Write a page plus precompressed copies, so the host only sends bytes"""
+    data = html.encode('utf-8')
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    for encoding, variant in compress(data).items():
+        path.with_name(path.name + ('.br' if encoding == 'br' else '.gz')).write_bytes(variant)
+    return len(data)
+
+def export_site(web, out_dir=DEFAULT_OUT, force=False, workers=MAX_WORKERS):
+    """Render every section of the web dashboard into out_dir; only pages whose data changed are rewritten"""
+    from flask import render_template
+
+    started = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        previous = {}
+
+    pages = page_list(web.SECTIONS)
+    secrets = secret_values()
+    with web.app.app_context():
+        palette = redact(web.get_palette_index().entries, secrets, web.mask_key)
+    css, js = inline_assets()
+    template = Path(web.app.root_path) / web.app.template_folder / 'index.html'
+    page_files = {key: filename for key, _, _, filename in pages}
+    page_files[f"history-{DEFAULT_RANGE}"] = page_files['history']
+    shell = digest([css, js, template.read_text(encoding='utf-8'), palette, page_files])
+    rebuild = force or previous.get('shell') != shell
+
+    def build(page):
+        key, section, url, filename = page
+        section_started = time.perf_counter()
+        status, data = fetch_section(web, url)
+        data = redact(data, secrets, web.mask_key)
+        if section == 'gallery':
+            export_thumbnails(data.get('items', []), out_dir)
+            data['total'] = min(data['total'], len(data['items']))
+        data_digest = digest(stable(data))
+        path = out_dir / filename
+        result = {'page': key, 'file': filename, 'status': status, 'digest': data_digest, 'written': False,
+                  'bytes': 0, 'ms': 0}
+        if rebuild or previous.get('pages', {}).get(key) != data_digest or not path.exists():
+            with web.app.app_context():
+                html = render_template('index.html', asset_url=web.asset_url, inline_css=css, inline_js=js,
+                                       static_export={'section': section, 'page': key, 'data': data,
+                                                      'pages': page_files, 'palette': palette,
+                                                      'exported_at': datetime.now().strftime('%Y-%m-%d %H:%M')})
+            result['bytes'] = write_page(path, html)
+            result['written'] = True
+        result['ms'] = round((time.perf_counter() - section_started) * 1000, 1)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(build, pages))
+
+    # Pages of sections that no longer exist
+    current = {r['file'] for r in results}
+    for old in previous.get('files', []):
+        if old not in current:
+            for suffix in ('', '.gz', '.br'):
+                try:
+                    os.remove(out_dir / (old + suffix))
+                except OSError:
+                    pass
+
+    manifest = {'shell': shell, 'pages': {r['page']: r['digest'] for r in results}, 'files': sorted(current)}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return {'out_dir': str(out_dir), 'pages': results, 'rebuilt_shell': rebuild,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)}
+
+def main(args=None, web=None):
+    """Command line entry point: [out_dir] [--force] [--workers N]"""
+    from gembooth_dashboard import Colors
+
+    args = sys.argv[1:] if args is None else args
+    if web is None:
+        import dashboard_web as web
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else MAX_WORKERS
+    positional = [a for i, a in enumerate(args)
+                  if not a.startswith('--') and (i == 0 or args[i - 1] != '--workers')]
+    out_dir = Path(positional[0]).resolve() if positional else DEFAULT_OUT
+
+    print(f"📦 Exporting the dashboard to {out_dir}")
+    report = export_site(web, out_dir, force='--force' in args, workers=workers)
+    for page in report['pages']:
+        color = Colors.GREEN if page['written'] else Colors.CYAN
+        state = f"written {page['bytes'] / 1024:.0f} KB" if page['written'] else "unchanged"
+        warning = f" {Colors.YELLOW}(HTTP {page['status']}){Colors.ENDC}" if page['status'] >= 400 else ""
+        print(f"  {page['file']:<28} {color}{state:<18}{Colors.ENDC} {page['ms']:>8.0f} ms{warning}")
+    written = sum(page['written'] for page in report['pages'])
+    print(f"\n{written} of {len(report['pages'])} pages written in {report['elapsed_ms'] / 1000:.1f}s"
+          f"{' (assets or template changed)' if report['rebuilt_shell'] and written else ''}")
+    print(f"Serve with any static host, e.g. python -m http.server -d {out_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Stripe Events
+Streams exported Stripe events into MRR by tier, churn, payment recovery and upgrade funnels
+"""
+
+import gc
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+STATE_FILE = CACHE_DIR / 'stripe-events.pickle'
+DEFAULT_EXPORT = PROJECT_ROOT / 'stripe-events'
+
+STATE_VERSION = 1
+EXTENSIONS = ('.json', '.jsonl', '.ndjson')
+
+# NDJSON files are split into byte ranges of about this size, one per worker task
+CHUNK_BYTES = 8 * 1024 * 1024
+READ_BYTES = 1024 * 1024
+
+TIERS = ['free', 'pro', 'premium']
+TIER_RANK = {tier: rank for rank, tier in enumerate(TIERS)}
+
+# Prices (cents) from the subscription_tiers seed, for events without tier_id metadata
+TIER_PRICES = {999: 'pro', 9999: 'pro', 1999: 'premium', 19999: 'premium'}
+MONTHLY_PRICE = {'pro': 999, 'premium': 1999}
+INTERVAL_MONTHS = {'day': 12 / 365, 'week': 12 / 52, 'month': 1, 'year': 12}
+
+# Statuses that bring in recurring revenue (trials are counted separately)
+PAYING = ('active', 'past_due')
+LIVE = ('active', 'past_due', 'trialing')
+
+CHURN_WINDOW_DAYS = 30
+
+def event_hash(event_id):
+    """Stable 64-bit id for de-duplicating events across overlapping exports"""
+    return int.from_bytes(hashlib.blake2b(event_id.encode(), digest_size=8).digest(), 'little')
+
+def subscription_price(obj):
+    """(unit amount, interval, quantity, currency) of a subscription's first item"""
+    items = (obj.get('items') or {}).get('data') or []
+    if items:
+        item = items[0]
+        price = item.get('price') or item.get('plan') or {}
+        recurring = price.get('recurring') or {}
+        return (price.get('unit_amount', price.get('amount')), recurring.get('interval', price.get('interval')),
+                item.get('quantity') or 1, price.get('currency'))
+    plan = obj.get('plan') or {}
+    return plan.get('amount'), plan.get('interval'), obj.get('quantity') or 1, plan.get('currency')
+
+def subscription_tier(obj, amount):
+    """Tier from tier_id metadata (set by create-checkout-session), else from the price"""
+    return (obj.get('metadata') or {}).get('tier_id') or TIER_PRICES.get(amount)
+
+def monthly_cents(tier, amount, interval, quantity):
+    """Recurring revenue per month in cents"""
+    if amount is None:
+        return MONTHLY_PRICE.get(tier, 0)
+    return round(amount * quantity * INTERVAL_MONTHS.get(interval or 'month', 1))
+
+def previous_tier(previous):
+    """Tier before an update, when the update changed the plan"""
+    if 'metadata' in previous and (previous['metadata'] or {}).get('tier_id'):
+        return previous['metadata']['tier_id']
+    if 'items' in previous or 'plan' in previous:
+        return subscription_tier(previous, subscription_price(previous)[0])
+    return None
+
+def compact(event):
+    """Reduce an event to the fields the aggregates need (runs in a worker)"""
+    event_type = event.get('type') or ''
+    data = event.get('data') or {}
+    obj = data.get('object') or {}
+    key = event_hash(event.get('id') or json.dumps(event, sort_keys=True))
+    created = event.get('created') or 0
+
+    if event_type.startswith('customer.subscription.'):
+        amount, interval, quantity, currency = subscription_price(obj)
+        tier = subscription_tier(obj, amount) or 'unknown'
+        previous = data.get('previous_attributes') or {}
+        return ('sub', key, created, event_type[22:], obj.get('id'), obj.get('customer'), obj.get('status'),
+                tier, monthly_cents(tier, amount, interval, quantity), obj.get('currency') or currency or 'usd',
+                previous_tier(previous), previous.get('status'))
+    if event_type.startswith('invoice.'):
+        return ('invoice', key, created, event_type[8:], event_hash(obj.get('id') or ''),
+                obj.get('attempt_count') or 1, obj.get('amount_paid') or 0, obj.get('currency') or 'usd')
+    if event_type.startswith('payment_intent.'):
+        return ('payment', key, created, event_type[15:], obj.get('amount') or 0, obj.get('currency') or 'usd')
+    return ('other', key, created, event_type)
+
+def read_ndjson(path, start, end):
+    """Compact records for the lines in [start, end) of an NDJSON file"""
+    records, bad = [], 0
+    if start >= end:
+        return records, bad
+    decode = json.JSONDecoder().decode
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        for line in f:
+            position += len(line)
+            if line.strip():
+                try:
+                    records.append(compact(decode(line.decode('utf-8'))))
+                except (ValueError, AttributeError, TypeError):
+                    bad += 1
+            if position >= end:
+                break
+    return records, bad
+
+def iter_json_events(f):
+    """Events from a JSON list or a Stripe list response, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(READ_BYTES)
+    start = buffer.find('"data"') if buffer.lstrip().startswith('{') else 0
+    index = buffer.find('[', max(start, 0)) + 1
+    if index == 0:
+        return
+    while True:
+        while index < len(buffer) and buffer[index] in ' \t\r\n,':
+            index += 1
+        if index < len(buffer) and buffer[index] == ']':
+            return
+        try:
+            event, index = decoder.raw_decode(buffer, index)
+        except ValueError:
+            more = f.read(READ_BYTES)
+            if not more:
+                return
+            buffer = buffer[index:] + more
+            index = 0
+            continue
+        yield event
+        if index > READ_BYTES:
+            buffer, index = buffer[index:], 0
+
+def read_json(path):
+    """Compact records for every event in a JSON list file"""
+    records, bad = [], 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for event in iter_json_events(f):
+            try:
+                records.append(compact(event))
+            except (AttributeError, TypeError):
+                bad += 1
+    return records, bad
+
+@contextmanager
+def gc_paused():
+    """Skip cyclic garbage collection while building millions of small acyclic tuples"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def read_task(task):
+    """Worker entry point: (kind, path, start, end) -> (records, bad lines)"""
+    kind, path, start, end = task
+    with gc_paused():
+        return read_ndjson(path, start, end) if kind == 'ndjson' else read_json(path)
+
+def is_ndjson(path):
+    """One event per line, as opposed to a JSON list or a (possibly pretty-printed) Stripe list response"""
+    with open(path, 'rb') as f:
+        first = f.readline(READ_BYTES).strip()
+        while not first:
+            line = f.readline(READ_BYTES)
+            if not line:
+                return True
+            first = line.strip()
+    if first.startswith(b'['):
+        return False
+    try:
+        return json.loads(first).get('object') != 'list'
+    except (ValueError, AttributeError):
+        return False
+
+def complete_end(path, size):
+    """Offset just after the last newline, so a line still being written is left for next time"""
+    with open(path, 'rb') as f:
+        position = size
+        while position > 0:
+            step = min(READ_BYTES, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                return position - step + newline + 1
+            position -= step
+    return 0
+
+def new_state():
+    """Empty aggregates"""
+    return {
+        'version': STATE_VERSION,
+        'files': {},
+        'seen': array('Q'),
+        'subscriptions': {},
+        'daily': {},
+        'transitions': Counter(),
+        'types': Counter(),
+        'revenue': {'paid': Counter(), 'payment_succeeded': Counter()},
+        'failed_invoices': {},
+        'retried_invoices': {},
+        'latest': 0,
+        'events': 0,
+        'duplicates': 0,
+        'bad_lines': 0
+    }
+
+def load_state(path=STATE_FILE):
+    """Aggregates from the last run, or empty ones"""
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        pass
+    return new_state()
+
+def save_state(state, path=STATE_FILE):
+    """Persist aggregates atomically"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+def export_files(paths):
+    """Event files under the given files or directories"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix in EXTENSIONS and p.is_file()))
+        elif path.is_file():
+            files.append(path)
+    return [p.resolve() for p in files]
+
+def head_digest(path, length):
+    """Digest of a file's first few KB (up to length), to tell an append from a rewrite"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(min(length, 4096)), digest_size=8).hexdigest()
+
+def plan_tasks(state, files):
+    """Worker tasks for what is new since the last run; None when a file changed other than by appending"""
+    tasks, updates = [], {}
+    for path in files:
+        stat = path.stat()
+        known = state['files'].get(str(path))
+        kind = 'ndjson' if is_ndjson(path) else 'json'
+        head = head_digest(path, known['offset'] if known else stat.st_size)
+        if known and (known['kind'] != kind or stat.st_size < known['offset'] or head != known['head']
+                      or (kind == 'json' and (stat.st_size, stat.st_mtime_ns) != (known['size'], known['mtime']))):
+            return None, None
+        start = known['offset'] if known else 0
+        if kind == 'json':
+            if not known:
+                tasks.append(('json', str(path), 0, stat.st_size))
+            updates[str(path)] = {'kind': kind, 'offset': stat.st_size, 'size': stat.st_size,
+                                  'mtime': stat.st_mtime_ns, 'head': head}
+            continue
+        end = complete_end(path, stat.st_size)
+        for chunk_start in range(start, end, CHUNK_BYTES):
+            tasks.append(('ndjson', str(path), chunk_start, min(end, chunk_start + CHUNK_BYTES)))
+        offset = max(start, end)
+        updates[str(path)] = {'kind': kind, 'offset': offset, 'size': stat.st_size,
+                              'mtime': stat.st_mtime_ns, 'head': head_digest(path, offset)}
+    # Byte ranges rarely start on a line; shift each to the next line start except at a file's offset
+    return [align(task, state) for task in tasks], updates
+
+def align(task, state):
+    """Move a chunk's start to the beginning of the next line (the previous chunk reads through it)"""
+    kind, path, start, end = task
+    known = state['files'].get(path)
+    if kind != 'ndjson' or start == 0 or (known and start == known['offset']):
+        return task
+    with open(path, 'rb') as f:
+        f.seek(start - 1)
+        if f.read(1) != b'\n':
+            f.readline()
+        return kind, path, f.tell(), end
+
+def day_of(timestamp):
+    """UTC date string (aggregates are bucketed by day number, timestamp // 86400)"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%d')
+
+def apply_records(state, records, fresh):
+    """Fold compact records into the aggregates, skipping events already counted"""
+    seen = state['seen']
+    subscriptions = state['subscriptions']
+    daily = state['daily']
+    types = state['types']
+    revenue = state['revenue']
+    transitions = state['transitions']
+    failed = state['failed_invoices']
+    retried = state['retried_invoices']
+
+    for record in records:
+        key = record[1]
+        if key in fresh:
+            state['duplicates'] += 1
+            continue
+        i = bisect_left(seen, key)
+        if i < len(seen) and seen[i] == key:
+            state['duplicates'] += 1
+            continue
+        fresh.add(key)
+        state['events'] += 1
+        created = record[2]
+        if created > state['latest']:
+            state['latest'] = created
+        kind = record[0]
+        day = daily.get(created // 86400)
+        if day is None:
+            day = daily[created // 86400] = Counter()
+
+        if kind == 'sub':
+            _, _, _, action, sub_id, customer, status, tier, mrr, currency, prev_tier, prev_status = record
+            types['customer.subscription.' + action] += 1
+            current = subscriptions.get(sub_id)
+            if current is None or created >= current[0]:
+                subscriptions[sub_id] = (created, customer, status, tier, mrr, currency)
+            if action == 'created':
+                day['new'] += 1
+                day['new_' + tier] += 1
+                if status == 'trialing':
+                    day['trials'] += 1
+            elif action == 'deleted':
+                day['canceled'] += 1
+                day['canceled_' + tier] += 1
+            elif action == 'updated':
+                if prev_status == 'trialing' and status == 'active':
+                    day['conversions'] += 1
+                if prev_tier and prev_tier != tier:
+                    transitions[f"{prev_tier}→{tier}"] += 1
+                    up = TIER_RANK.get(tier, -1) > TIER_RANK.get(prev_tier, -1)
+                    day['upgrades' if up else 'downgrades'] += 1
+        elif kind == 'invoice':
+            _, _, _, action, invoice, attempts, amount, currency = record
+            types['invoice.' + action] += 1
+            # Matched by invoice rather than by order, since exports usually run newest first
+            if action == 'payment_failed':
+                failed[invoice] = min(failed.get(invoice, created), created)
+            elif action in revenue:
+                revenue[action][currency] += amount
+                if attempts > 1:
+                    retried[invoice] = created
+        elif kind == 'payment':
+            _, _, _, action, amount, currency = record
+            types['payment_intent.' + action] += 1
+            day['payments_' + action] += 1
+        else:
+            types[record[3]] += 1
+
+def run_tasks(tasks, workers=None):
+    """Results of the worker tasks in order, with only a few chunks in flight so memory stays flat"""
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        yield from map(read_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(read_task, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def ingest(paths=(DEFAULT_EXPORT,), rebuild=False, workers=None):
+    """Bring the cached aggregates up to date with the export files; returns (state, stats)
+
+    Appended NDJSON lines are read from the stored offset; any other change to a
+    known file rebuilds everything. Events from files since removed stay counted
+    until the next rebuild.
+    """
+    started = time.perf_counter()
+    files = export_files(paths)
+    state = new_state() if rebuild else load_state()
+    tasks, updates = plan_tasks(state, files)
+    if tasks is None:
+        state = new_state()
+        tasks, updates = plan_tasks(state, files)
+
+    read = 0
+    fresh = set()
+    for records, bad in run_tasks(tasks, workers):
+        with gc_paused():
+            apply_records(state, records, fresh)
+        state['bad_lines'] += bad
+        read += len(records)
+    if fresh:
+        state['seen'] = array('Q', sorted(state['seen'].tolist() + list(fresh)))
+    if tasks or any(state['files'].get(path) != info for path, info in updates.items()):
+        state['files'].update(updates)
+        save_state(state)
+    return state, {'files': len(files), 'tasks': len(tasks), 'read': read,
+                   'seconds': round(time.perf_counter() - started, 3)}
+
+def summarize(state, stats=None):
+    """Dashboard figures from the aggregates"""
+    latest = state['latest']
+    mrr = {}
+    customers = {}
+    for created, customer, status, tier, cents, currency in state['subscriptions'].values():
+        live = customers.setdefault(customer, False)
+        customers[customer] = live or status in LIVE
+        if status in PAYING:
+            row = mrr.setdefault((tier, currency), {'tier': tier, 'currency': currency, 'subscribers': 0, 'mrr': 0})
+            row['subscribers'] += 1
+            row['mrr'] += cents
+    trialing = sum(1 for s in state['subscriptions'].values() if s[2] == 'trialing')
+    past_due = sum(1 for s in state['subscriptions'].values() if s[2] == 'past_due')
+    paying = sum(row['subscribers'] for row in mrr.values())
+
+    totals = Counter()
+    months = {}
+    window_start = latest // 86400 - CHURN_WINDOW_DAYS
+    window = Counter()
+    for day, counts in state['daily'].items():
+        totals.update(counts)
+        months.setdefault(day_of(day * 86400)[:7], Counter()).update(counts)
+        if day > window_start:
+            window.update(counts)
+
+    # A failed invoice is recovered once a later attempt pays it
+    failed = state['failed_invoices']
+    recovered = [created for invoice, created in state['retried_invoices'].items() if invoice in failed]
+    for created in failed.values():
+        months.setdefault(day_of(created)[:7], Counter())['failed'] += 1
+    for created in recovered:
+        months.setdefault(day_of(created)[:7], Counter())['recovered'] += 1
+
+    # invoice.paid and invoice.payment_succeeded describe the same payments; use whichever the export has
+    source = 'paid' if state['types'].get('invoice.paid') else 'payment_succeeded'
+    churn_base = paying + window['canceled']
+
+    return {
+        'events': state['events'],
+        'duplicates': state['duplicates'],
+        'bad_lines': state['bad_lines'],
+        'files': len(state['files']),
+        'latest': latest or None,
+        'customers': len(customers),
+        'free': sum(1 for live in customers.values() if not live),
+        'paying': paying,
+        'trialing': trialing,
+        'past_due': past_due,
+        'mrr': sorted(mrr.values(), key=lambda r: (TIER_RANK.get(r['tier'], 99), r['currency'])),
+        'churn': {
+            'window_days': CHURN_WINDOW_DAYS,
+            'canceled': window['canceled'],
+            'rate': round(window['canceled'] / churn_base, 4) if churn_base else None
+        },
+        'recovery': {
+            'failed': len(failed),
+            'recovered': len(recovered),
+            'rate': round(len(recovered) / len(failed), 4) if failed else None
+        },
+        'funnel': {
+            'created': totals['new'],
+            'trials': totals['trials'],
+            'conversions': totals['conversions'],
+            'upgrades': totals['upgrades'],
+            'downgrades': totals['downgrades'],
+            'canceled': totals['canceled'],
+            'created_by_tier': {t: totals['new_' + t] for t in TIERS[1:]},
+            'transitions': dict(state['transitions'].most_common())
+        },
+        'revenue': dict(state['revenue'][source]),
+        'months': [{'month': month, 'new': c['new'], 'canceled': c['canceled'], 'upgrades': c['upgrades'],
+                    'failed': c['failed'], 'recovered': c['recovered']}
+                   for month, c in sorted(months.items())[-12:]],
+        'stats': stats
+    }
+
+def billing_summary(paths=(DEFAULT_EXPORT,)):
+    """Ingest anything new and summarize; None when there are no exports"""
+    if not export_files(paths):
+        return None
+    state, stats = ingest(paths)
+    return summarize(state, stats)
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import Colors
+
+    args = sys.argv[1:]
+    paths = [a for a in args if not a.startswith('--')] or [DEFAULT_EXPORT]
+    if not export_files(paths):
+        print(f"No {', '.join(EXTENSIONS)} files in {', '.join(map(str, paths))}")
+        print("Export with: stripe events list --limit 100 > stripe-events/events.json")
+        sys.exit(1)
+
+    state, stats = ingest(paths, rebuild='--rebuild' in args)
+    summary = summarize(state, stats)
+    print(f"{Colors.BOLD}{summary['events']:,} events{Colors.ENDC} from {summary['files']} files "
+          f"({stats['read']:,} read in {stats['seconds']:.2f}s, {summary['duplicates']:,} duplicates, "
+          f"{summary['bad_lines']} unreadable)")
+    for row in summary['mrr']:
+        print(f"  MRR {row['tier']:<8} {row['mrr'] / 100:>12,.2f} {row['currency'].upper()} "
+              f"({row['subscribers']} subscribers)")
+    churn, recovery = summary['churn'], summary['recovery']
+    if churn['rate'] is not None:
+        print(f"  Churn ({churn['window_days']}d): {churn['rate']:.1%} ({churn['canceled']} canceled)")
+    if recovery['rate'] is not None:
+        print(f"  Failed payments recovered: {recovery['recovered']}/{recovery['failed']} ({recovery['rate']:.1%})")
+    for transition, count in summary['funnel']['transitions'].items():
+        print(f"  {transition}: {count}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Table Mirror
+Incremental SQLite mirror of production tables using created_at/updated_at watermarks
+"""
+
+import http.client
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from local_supabase import Database
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+MIRROR_DB = CACHE_DIR / 'mirror.sqlite3'
+
+MIRRORED_TABLES = ['photos', 'gifs', 'usage_stats', 'usage_limits', 'subscriptions', 'payments']
+
+PAGE_SIZE = 1000
+MAX_CONCURRENCY = 3
+REQUEST_TIMEOUT = 30
+
+SQLITE_TYPES = {'int': 'INTEGER', 'float': 'REAL', 'bool': 'INTEGER'}
+
+class SyncError(Exception):
+    """A REST request failed while syncing"""
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused across pages and tables"""
+
+    def __init__(self, base_url, size=MAX_CONCURRENCY):
+        parts = urlsplit(base_url)
+        self.factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.idle = queue.LifoQueue(size)
+
+    def request(self, path, headers):
+        """GET a path, retrying once on a connection the server closed while idle"""
+        for attempt in range(2):
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = self.factory(self.netloc, timeout=REQUEST_TIMEOUT)
+            try:
+                conn.request('GET', self.prefix + path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            try:
+                self.idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+            return response.status, body
+
+    def close(self):
+        """Close every idle connection"""
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+def watermark_column(columns):
+    """Prefer updated_at (catches edits), fall back to created_at (append-only tables)"""
+    return 'updated_at' if 'updated_at' in columns else 'created_at'
+
+def table_schemas(names=MIRRORED_TABLES):
+    """Column kinds per table, taken from the migrations"""
+    db = Database.from_migrations()
+    return {name: {col: spec['kind'] for col, spec in db.tables[name].columns.items()}
+            for name in names if name in db.tables}
+
+def to_sqlite(kind, value):
+    """Store arrays and JSON as text, booleans as 0/1"""
+    if value is None:
+        return None
+    if kind in ('array', 'json') or isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if kind == 'bool':
+        return int(value)
+    return value
+
+class Mirror:
+    """SQLite store for mirrored rows plus one watermark per table"""
+
+    def __init__(self, path=MIRROR_DB, schemas=None):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.lock = threading.Lock()
+        self.schemas = schemas if schemas is not None else table_schemas()
+        with self.conn:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS _sync_state (table_name TEXT PRIMARY KEY, '
+                              'watermark_column TEXT, watermark TEXT, rows INTEGER, '
+                              'synced_at REAL, duration_ms REAL, fetched INTEGER, requests INTEGER)')
+            for name, columns in self.schemas.items():
+                self.create_table(name, columns)
+
+    def create_table(self, name, columns):
+        """Create a mirror table and index its watermark column"""
+        definitions = ', '.join(f'"{col}" {SQLITE_TYPES.get(kind, "TEXT")}' +
+                                (' PRIMARY KEY' if col == 'id' else '')
+                                for col, kind in columns.items())
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{name}" ({definitions})')
+        existing = {row[1] for row in self.conn.execute(f'PRAGMA table_info("{name}")')}
+        for col, kind in columns.items():
+            if col not in existing:
+                self.conn.execute(f'ALTER TABLE "{name}" ADD COLUMN "{col}" {SQLITE_TYPES.get(kind, "TEXT")}')
+        column = watermark_column(columns)
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}_{column}" ON "{name}" ("{column}")')
+
+    def watermark(self, name):
+        """Newest watermark value mirrored for a table, or None before the first sync"""
+        row = self.conn.execute('SELECT watermark FROM _sync_state WHERE table_name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, name, rows):
+        """Insert or replace a page of rows"""
+        columns = self.schemas[name]
+        names = list(columns)
+        quoted = ', '.join('"%s"' % c for c in names)
+        placeholders = ', '.join('?' for _ in names)
+        sql = f'INSERT OR REPLACE INTO "{name}" ({quoted}) VALUES ({placeholders})'
+        with self.lock, self.conn:
+            self.conn.executemany(sql, [[to_sqlite(columns[c], row.get(c)) for c in names] for row in rows])
+
+    def save_state(self, name, watermark, stats):
+        """Record the new watermark and sync statistics for a table"""
+        with self.lock, self.conn:
+            count = self.conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            self.conn.execute('INSERT OR REPLACE INTO _sync_state VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                              (name, watermark_column(self.schemas[name]), watermark, count, time.time(),
+                               stats['duration_ms'], stats['fetched'], stats['requests']))
+
+    def reset(self, names):
+        """Drop mirrored rows and watermarks so the next sync is a full pull"""
+        with self.lock, self.conn:
+            for name in names:
+                self.conn.execute(f'DELETE FROM "{name}"')
+                self.conn.execute('DELETE FROM _sync_state WHERE table_name = ?', (name,))
+
+    def query(self, sql, params=()):
+        """Run a read-only query and return rows as dicts"""
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        """Close the database"""
+        self.conn.close()
+
+def sync_table(pool, mirror, name, headers):
+    """Page through rows at or after the watermark, ordered by (watermark, id)
+
+    Each page restarts from the newest watermark seen so far and skips only
+    the rows already fetched at exactly that timestamp, so rows updated
+    mid-sync cannot shift a later page past unseen rows. The rows at the
+    stored watermark are re-read once per sync, which keeps it idempotent.
+    Rows without a watermark cannot be tracked that way; they are paged
+    separately by id and re-read on every sync.
+    """
+    column = watermark_column(mirror.schemas[name])
+    watermark = mirror.watermark(name)
+    tie_ids = set()
+    stats = {'fetched': 0, 'requests': 0}
+    started = time.perf_counter()
+
+    def fetch(path, offset):
+        status, body = pool.request(path, dict(headers, Range=f"{offset}-{offset + PAGE_SIZE - 1}"))
+        stats['requests'] += 1
+        if status not in (200, 206):
+            raise SyncError(f"{name}: HTTP {status} {body[:200].decode('utf-8', 'replace')}")
+        rows = json.loads(body)
+        if rows:
+            mirror.upsert(name, rows)
+            stats['fetched'] += len(rows)
+        return rows
+
+    while True:
+        path = f"/rest/v1/{name}?select=*&order={column}.asc,id.asc"
+        path += f"&{column}=gte.{quote(watermark, safe='')}" if watermark else f"&{column}=not.is.null"
+        rows = fetch(path, len(tie_ids))
+        for row in rows:
+            if row[column] != watermark:
+                watermark, tie_ids = row[column], set()
+            tie_ids.add(row['id'])
+        if len(rows) < PAGE_SIZE:
+            break
+
+    offset = 0
+    while True:
+        rows = fetch(f"/rest/v1/{name}?select=*&order=id.asc&{column}=is.null", offset)
+        offset += len(rows)
+        if len(rows) < PAGE_SIZE:
+            break
+
+    stats['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    mirror.save_state(name, watermark, stats)
+    return dict(stats, table=name, watermark=watermark)
+
+def sync(base_url, api_key, tables=MIRRORED_TABLES, mirror=None, full=False, concurrency=MAX_CONCURRENCY):
+    """Pull deltas for every table, at most `concurrency` tables at a time"""
+    own_mirror = mirror is None
+    mirror = mirror or Mirror()
+    tables = [t for t in tables if t in mirror.schemas]
+    if full:
+        mirror.reset(tables)
+
+    headers = {'apikey': api_key, 'Authorization': f'Bearer {api_key}',
+               'Accept': 'application/json', 'Range-Unit': 'items'}
+    pool = ConnectionPool(base_url, concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(lambda name: sync_table(pool, mirror, name, headers), tables))
+    finally:
+        pool.close()
+        if own_mirror:
+            mirror.close()
+
+def mirror_summary(path=MIRROR_DB):
+    """Per-table sync state and usage analytics, served entirely from the mirror"""
+    if not Path(path).exists():
+        return {'synced': False, 'tables': [], 'modes': [], 'daily': [], 'tiers': [], 'revenue': []}
+
+    mirror = Mirror(path)
+    try:
+        return {
+            'synced': True,
+            'tables': mirror.query('SELECT table_name AS "table", rows, watermark_column, watermark, '
+                                   'synced_at, duration_ms, fetched, requests FROM _sync_state ORDER BY table_name'),
+            'modes': mirror.query('SELECT mode, COUNT(*) AS photos FROM photos GROUP BY mode '
+                                  'ORDER BY photos DESC LIMIT 10'),
+            'daily': mirror.query("SELECT substr(created_at, 1, 10) AS day, "
+                                  "SUM(action_type = 'photo') AS photos, SUM(action_type = 'gif') AS gifs "
+                                  "FROM usage_stats WHERE created_at >= date('now', '-30 days') "
+                                  "GROUP BY day ORDER BY day"),
+            'tiers': mirror.query("SELECT tier_id, COUNT(*) AS subscribers FROM subscriptions "
+                                  "WHERE status IN ('active', 'trialing') GROUP BY tier_id ORDER BY subscribers DESC"),
+            'revenue': mirror.query("SELECT currency, ROUND(SUM(amount), 2) AS total, COUNT(*) AS payments "
+                                    "FROM payments WHERE status = 'succeeded' GROUP BY currency")
+        }
+    finally:
+        mirror.close()
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import read_env_file
+
+    args = sys.argv[1:]
+    env = read_env_file(PROJECT_ROOT / '.env.local')
+    url = args[args.index('--url') + 1] if '--url' in args else env.get('VITE_SUPABASE_URL')
+    key = env.get('SUPABASE_SERVICE_ROLE_KEY') or env.get('VITE_SUPABASE_ANON_KEY', '')
+    tables = args[args.index('--tables') + 1].split(',') if '--tables' in args else MIRRORED_TABLES
+    if not url:
+        print("Set VITE_SUPABASE_URL in .env.local or pass --url")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        results = sync(url, key, tables, full='--full' in args)
+    except (SyncError, OSError) as e:
+        print(f"Sync failed: {e}")
+        sys.exit(1)
+
+    for result in results:
+        print(f"{result['table']:<14} +{result['fetched']:<6} rows in {result['requests']} requests "
+              f"({result['duration_ms']:.0f} ms), watermark {result['watermark'] or '-'}")
+    print(f"Mirror: {MIRROR_DB.relative_to(PROJECT_ROOT)} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+if __name__ == '__main__':
+    main()
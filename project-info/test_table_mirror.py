@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Table Mirror tests
+Syncs against the local Supabase stand-in with a small page size
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import table_mirror
+from local_supabase import Database, start_background
+from table_mirror import ConnectionPool, Mirror, sync, table_schemas
+
+PAGE_SIZE = 4
+TABLES = ['photos', 'gifs', 'subscriptions', 'payments']
+
+def stamp(minutes):
+    """A fixed past timestamp, `minutes` after the base"""
+    return (datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minutes)).isoformat()
+
+class SyncTest(unittest.TestCase):
+    """sync() against a stand-in server seeded per test"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schemas = table_schemas(TABLES)
+
+    def setUp(self):
+        self.db = Database.from_migrations()
+        self.server = start_background(db=self.db)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mirror = Mirror(Path(self.tmp.name) / 'mirror.sqlite3', schemas=self.schemas)
+        self.user = self.db.create_user()
+        page_size = mock.patch.object(table_mirror, 'PAGE_SIZE', PAGE_SIZE)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.mirror.close()
+        self.tmp.cleanup()
+
+    def add_photos(self, created):
+        """Insert one photo per created_at value; returns their ids"""
+        with self.db.lock:
+            return [self.db.table('photos').insert({
+                'user_id': self.user, 'input_image_url': f"in/{i}.png", 'output_image_url': f"out/{i}.png",
+                'mode': 'test', 'created_at': value})['id'] for i, value in enumerate(created)]
+
+    def mirrored_ids(self, name):
+        return {row['id'] for row in self.mirror.query(f'SELECT id FROM "{name}"')}
+
+    def sync(self, tables=('photos',), concurrency=1):
+        return {r['table']: r for r in sync(self.base_url, 'test-key', list(tables), self.mirror,
+                                            concurrency=concurrency)}
+
+    def test_ties_across_page_boundaries(self):
+        tied = stamp(0)
+        ids = self.add_photos([tied] * (PAGE_SIZE * 2 + 1) + [stamp(1), stamp(2)])
+        report = self.sync()['photos']
+        self.assertEqual(self.mirrored_ids('photos'), set(ids))
+        self.assertEqual(report['watermark'], stamp(2))
+
+        # A re-sync only re-reads the rows at the stored watermark
+        report = self.sync()['photos']
+        self.assertEqual(report['fetched'], 1)
+
+    def test_null_watermarks(self):
+        # Rows from before created_at had a default
+        self.db.table('photos').columns['created_at']['not_null'] = False
+        ids = self.add_photos([stamp(0), None, stamp(1)] + [None] * (PAGE_SIZE * 2))
+        report = self.sync()['photos']
+        self.assertEqual(self.mirrored_ids('photos'), set(ids))
+        self.assertEqual(report['watermark'], stamp(1))
+
+        ids += self.add_photos([None])
+        self.sync()
+        self.assertEqual(self.mirrored_ids('photos'), set(ids))
+
+    def test_null_watermarks_only(self):
+        self.db.table('photos').columns['created_at']['not_null'] = False
+        ids = self.add_photos([None] * (PAGE_SIZE * 2 + 1))
+        report = self.sync()['photos']
+        self.assertEqual(self.mirrored_ids('photos'), set(ids))
+        self.assertIsNone(report['watermark'])
+
+    def test_incremental_resync_picks_up_updates(self):
+        users = [self.user] + [self.db.create_user() for _ in range(PAGE_SIZE + 1)]
+        subscriptions = self.db.table('subscriptions')
+        with self.db.lock:
+            for row_id, row in list(subscriptions.rows.items()):
+                subscriptions.rows[row_id] = dict(row, updated_at=stamp(0))
+        self.sync(['subscriptions'])
+        self.assertEqual(len(self.mirrored_ids('subscriptions')), len(users))
+
+        with self.db.lock:
+            row_id = subscriptions.indexes['user_id'][users[1]].copy().pop()
+            subscriptions.update(row_id, {'tier_id': 'pro'})
+        report = self.sync(['subscriptions'])['subscriptions']
+        tiers = {row['user_id']: row['tier_id']
+                 for row in self.mirror.query('SELECT user_id, tier_id FROM subscriptions')}
+        self.assertEqual(tiers[users[1]], 'pro')
+        self.assertEqual(report['watermark'], subscriptions.rows[row_id]['updated_at'])
+        # The rows tied at the old watermark plus the updated one, not the whole table
+        self.assertLess(report['fetched'], len(users) + 1)
+
+    def test_concurrency_is_bounded(self):
+        self.add_photos([stamp(i) for i in range(PAGE_SIZE * 2)])
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+        request = ConnectionPool.request
+
+        def counting(pool, path, headers):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            try:
+                time.sleep(0.02)
+                return request(pool, path, headers)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        with mock.patch.object(ConnectionPool, 'request', counting):
+            reports = self.sync(TABLES, concurrency=2)
+        self.assertEqual(set(reports), set(TABLES))
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(len(self.mirrored_ids('photos')), PAGE_SIZE * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Thumbnail Cache
+Content-addressed thumbnails of generated photos and GIFs for the gallery views
+"""
+
+import io
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+from bucket_audit import BUCKETS, DEFAULT_EXPORT, content_digest, object_key
+from table_mirror import MIRROR_DB
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / '.cache'
+THUMB_DIR = CACHE_DIR / 'thumbs'
+
+THUMB_SIZE = 256
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Evict down to this fraction of the limit so a full cache does not evict on every write
+EVICT_TO = 0.9
+
+PAGE_LIMIT = 500
+
+MIME_TYPES = {'webp': 'image/webp', 'png': 'image/png'}
+
+def thumbnails_available():
+    """Whether Pillow is installed to decode images"""
+    return Image is not None
+
+def default_format():
+    """WebP when Pillow was built with it, PNG otherwise"""
+    return 'webp' if Image is not None and features.check('webp') else 'png'
+
+def render_thumbnail(path, fmt, size=THUMB_SIZE):
+    """Decode an image (first frame for GIFs) and encode a downscaled copy (runs in a worker)"""
+    with Image.open(path) as img:
+        img.seek(0)
+        img.draft('RGB', (size, size))
+        frame = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    frame.thumbnail((size, size), Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == 'webp':
+        frame.save(out, 'WEBP', quality=80, method=4)
+    else:
+        frame.save(out, 'PNG', optimize=True)
+    return out.getvalue()
+
+class ThumbnailCache:
+    """Thumbnails keyed by source content digest, evicted least recently used first"""
+
+    def __init__(self, directory=THUMB_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.digests = {}
+        self.inflight = {}
+        self.pool = None
+
+        if self.directory.is_dir():
+            found = sorted((entry.stat().st_mtime_ns, entry.name, entry.stat().st_size)
+                           for entry in os.scandir(self.directory)
+                           if entry.is_file() and not entry.name.startswith('.'))
+            for _, name, size in found:
+                self.entries[name] = size
+                self.total_bytes += size
+
+    def source_digest(self, path):
+        """Content digest of a source image, memoized by (path, size, mtime)"""
+        st = os.stat(path)
+        stamp = (str(path), st.st_size, st.st_mtime_ns)
+        digest = self.digests.get(stamp)
+        if digest is None:
+            digest = self.digests[stamp] = content_digest(path, st.st_size)
+        return digest
+
+    def get(self, path, fmt=None):
+        """Return (thumbnail bytes, digest), rendering it in the process pool on a miss"""
+        fmt = fmt or default_format()
+        digest = self.source_digest(path)
+        name = f"{digest}-{THUMB_SIZE}.{fmt}"
+
+        with self.lock:
+            if name in self.entries:
+                try:
+                    with open(self.directory / name, 'rb') as f:
+                        data = f.read()
+                    os.utime(self.directory / name)
+                    self.entries.move_to_end(name)
+                    return data, digest
+                except OSError:
+                    self.total_bytes -= self.entries.pop(name)
+            future = self.inflight.get(name)
+            if future is None:
+                if self.pool is None:
+                    self.pool = ProcessPoolExecutor()
+                future = self.inflight[name] = self.pool.submit(render_thumbnail, str(path), fmt)
+
+        try:
+            data = future.result()
+        finally:
+            with self.lock:
+                self.inflight.pop(name, None)
+        self.store(name, data)
+        return data, digest
+
+    def store(self, name, data):
+        """Write a thumbnail and evict the least recently used ones over the limit"""
+        with self.lock:
+            if name in self.entries:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{name}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self.directory / name)
+            self.entries[name] = len(data)
+            self.total_bytes += len(data)
+
+            if self.total_bytes > self.max_bytes:
+                while self.entries and self.total_bytes > self.max_bytes * EVICT_TO:
+                    old, size = self.entries.popitem(last=False)
+                    self.total_bytes -= size
+                    try:
+                        os.unlink(self.directory / old)
+                    except OSError:
+                        pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Shared cache for the dashboards (one process pool per process)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache()
+        return _cache
+
+def resolve_object(bucket, name, root=DEFAULT_EXPORT):
+    """Path of an exported object, refusing anything outside the bucket directory"""
+    if bucket not in BUCKETS:
+        raise FileNotFoundError(f"Unknown bucket: {bucket}")
+    base = (Path(root) / bucket).resolve()
+    path = (base / name).resolve()
+    if base not in path.parents or not path.is_file():
+        raise FileNotFoundError(f"{bucket}/{name} not found in {root}")
+    return path
+
+# Newest-first (kind, rowid) list, rebuilt only after a mirror sync
+_order_cache = {}
+
+def gallery_order(conn):
+    """Every gallery item's (kind, rowid), newest first, cached per mirror sync"""
+    try:
+        stamp = conn.execute('SELECT MAX(synced_at) FROM _sync_state').fetchone()[0]
+    except sqlite3.Error:
+        stamp = None
+    if stamp is not None and _order_cache.get('stamp') == stamp:
+        return _order_cache['keys']
+
+    keys = [(kind, rowid) for kind, rowid, _, _ in conn.execute(
+        "SELECT 'photo', rowid, created_at, id FROM photos WHERE output_image_url IS NOT NULL "
+        "UNION ALL SELECT 'gif', rowid, created_at, id FROM gifs WHERE gif_url IS NOT NULL "
+        "ORDER BY 3 DESC, 4")]
+    if stamp is not None:
+        _order_cache.update(stamp=stamp, keys=keys)
+    return keys
+
+def gallery_page(offset=0, limit=200, root=DEFAULT_EXPORT, mirror_path=MIRROR_DB):
+    """One page of generated photos and GIFs, newest first, from the table mirror"""
+    page = {'available': thumbnails_available(), 'synced': Path(mirror_path).exists(),
+            'total': 0, 'offset': offset, 'items': []}
+    if not page['synced']:
+        return page
+
+    limit = max(0, min(limit, PAGE_LIMIT))
+    conn = sqlite3.connect(str(mirror_path))
+    try:
+        keys = gallery_order(conn)
+        window = keys[offset:offset + limit]
+        rows = {}
+        for kind, sql in (('photo', 'SELECT rowid, id, mode, created_at, output_image_url FROM photos'),
+                          ('gif', 'SELECT rowid, id, NULL, created_at, gif_url FROM gifs')):
+            rowids = [rowid for k, rowid in window if k == kind]
+            if rowids:
+                placeholders = ', '.join('?' for _ in rowids)
+                for rowid, *row in conn.execute(f'{sql} WHERE rowid IN ({placeholders})', rowids):
+                    rows[(kind, rowid)] = row
+    finally:
+        conn.close()
+
+    page['total'] = len(keys)
+    for kind, rowid in window:
+        if (kind, rowid) not in rows:
+            continue
+        item_id, mode, created_at, url = rows[(kind, rowid)]
+        key = object_key(url)
+        item = {'id': item_id, 'kind': kind, 'mode': mode, 'created_at': created_at,
+                'bucket': key and key[0], 'name': key and key[1], 'version': None}
+        if key:
+            try:
+                st = os.stat(Path(root) / key[0] / key[1])
+                # Changes whenever the export does, so thumbnail URLs can be cached forever
+                item['version'] = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+            except OSError:
+                pass
+        page['items'].append(item)
+    return page
+
+def warm(root=DEFAULT_EXPORT, fmt=None):
+    """Render thumbnails for every exported image in the process pool; returns (count, bytes, failures)"""
+    cache = get_cache()
+    paths = [Path(dirpath) / name
+             for bucket in BUCKETS
+             for dirpath, _, files in os.walk(Path(root) / bucket)
+             for name in files if name.lower().endswith(('.png', '.jpg', '.jpeg', '.webp', '.gif'))]
+
+    def render(path):
+        # One unreadable image must not abort the whole pass
+        try:
+            return cache.get(path, fmt)[0]
+        except (OSError, ValueError) as e:
+            return path, e
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as threads:
+        results = list(threads.map(render, paths))
+    failures = [r for r in results if isinstance(r, tuple)]
+    rendered = [r for r in results if not isinstance(r, tuple)]
+    return len(rendered), sum(len(r) for r in rendered), failures
+
+def main():
+    """Command line entry point: pre-render thumbnails for the whole export"""
+    if not thumbnails_available():
+        print("Thumbnails need Pillow: pip install Pillow")
+        sys.exit(1)
+    args = sys.argv[1:]
+    root = Path(args[args.index('--root') + 1]) if '--root' in args else DEFAULT_EXPORT
+    count, size, failures = warm(root)
+    cache = get_cache()
+    print(f"{count} thumbnails ({size} bytes); cache holds {len(cache.entries)} files, "
+          f"{cache.total_bytes} bytes in {THUMB_DIR.relative_to(PROJECT_ROOT)}")
+    if failures:
+        print(f"{len(failures)} images could not be rendered:")
+        for path, error in failures[:20]:
+            print(f"  {path}: {error}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Time Series
+Append-only, memory-mapped latency and status history with automatic downsampling
+"""
+
+import atexit
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CACHE_DIR = Path(__file__).parent / '.cache'
+STORE_DIR = CACHE_DIR / 'timeseries'
+
+MAGIC = b'GBTS'
+HEADER = struct.Struct('<4sHHIIqq')
+HEADER_SIZE = 64
+
+# Columns per record kind; every segment stores each column as one contiguous array
+RAW_COLUMNS = [('ts', 'q'), ('target', 'I'), ('latency', 'f'), ('status', 'H')]
+AGG_COLUMNS = [('ts', 'q'), ('target', 'I'), ('count', 'I'), ('errors', 'I'), ('measured', 'I'),
+               ('sum', 'd'), ('min', 'f'), ('max', 'f')]
+
+# (name, bucket ms, columns, records per segment, retention ms or None, max segments)
+# At most about 5 + 16 + 2.5 MB on disk; only the pages being read or written are resident
+TIERS = [
+    ('raw', 0, RAW_COLUMNS, 16384, 24 * 3600 * 1000, 18),
+    ('1m', 60 * 1000, AGG_COLUMNS, 16384, 30 * 24 * 3600 * 1000, 24),
+    ('1h', 3600 * 1000, AGG_COLUMNS, 4096, None, 16)
+]
+
+DEFAULT_POINTS = 240
+SAMPLE_INTERVAL = 30
+
+# Request samples are queued in memory and written in batches this often
+FLUSH_INTERVAL = 1.0
+
+RANGES = {'1h': 3600, '6h': 6 * 3600, '24h': 24 * 3600, '7d': 7 * 86400, '30d': 30 * 86400, '1y': 365 * 86400}
+
+def is_error(status):
+    """Unreachable (0) or a server error; 4xx means the target answered"""
+    return status == 0 or status >= 500
+
+def now_ms():
+    """Current time in epoch milliseconds"""
+    return int(time.time() * 1000)
+
+class Segment:
+    """One fixed-size file of column arrays, mapped into memory"""
+
+    def __init__(self, path, columns, capacity=None):
+        self.path = path
+        self.columns = columns
+        if capacity is not None:
+            size = HEADER_SIZE + capacity * sum(struct.calcsize(code) for _, code in columns)
+            with open(path, 'wb') as f:
+                f.truncate(size)
+                f.write(HEADER.pack(MAGIC, 1, len(columns), capacity, 0, 0, 0))
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        magic, _, _, self.capacity, _, _, _ = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a time-series segment")
+
+        view = memoryview(self.map)
+        self.arrays = {}
+        offset = HEADER_SIZE
+        for name, code in columns:
+            width = struct.calcsize(code) * self.capacity
+            self.arrays[name] = view[offset:offset + width].cast(code)
+            offset += width
+
+    @property
+    def count(self):
+        """Records written so far (read from the file, so appends by other processes show up)"""
+        return HEADER.unpack_from(self.map)[4]
+
+    @property
+    def span(self):
+        """(first, last) timestamp"""
+        _, _, _, _, count, first, last = HEADER.unpack_from(self.map)
+        return first, last
+
+    def append(self, record):
+        """Write one record; the header count is updated last so readers never see a partial record"""
+        index = self.count
+        for name, _ in self.columns:
+            self.arrays[name][index] = record[name]
+        first = self.span[0] if index else record['ts']
+        HEADER.pack_into(self.map, 0, MAGIC, 1, len(self.columns), self.capacity, index + 1, first, record['ts'])
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def window(self, start, end):
+        """Index range of records with start <= ts < end"""
+        ts = self.arrays['ts'][:self.count]
+        return bisect_left(ts, start), bisect_left(ts, end)
+
+    def read(self, lo, hi):
+        """Columns for records [lo, hi) as lists"""
+        return {name: self.arrays[name][lo:hi].tolist() for name, _ in self.columns}
+
+    def close(self):
+        """Release the mapping (required before the file can be deleted on Windows)"""
+        if hasattr(self, 'arrays'):
+            for array in self.arrays.values():
+                array.release()
+            self.arrays = {}
+        self.map.close()
+        self.file.close()
+
+class Tier:
+    """A time-ordered run of segments at one resolution"""
+
+    def __init__(self, directory, name, bucket, columns, capacity, retention, max_segments):
+        self.directory = directory / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.bucket = bucket
+        self.columns = columns
+        self.capacity = capacity
+        self.retention = retention
+        self.max_segments = max_segments
+        self.segments = {}
+        self.listing = None
+
+    def refresh(self):
+        """Pick up segments created or dropped by other processes"""
+        stamp = os.stat(self.directory).st_mtime_ns
+        if stamp == self.listing:
+            return
+        names = {p.name for p in self.directory.glob('*.seg')}
+        for name in list(self.segments):
+            if name not in names:
+                self.segments.pop(name).close()
+        for name in names - set(self.segments):
+            try:
+                self.segments[name] = Segment(self.directory / name, self.columns)
+            except (OSError, ValueError):
+                continue
+        self.segments = dict(sorted(self.segments.items(), key=lambda item: int(item[0].split('.')[0])))
+        self.listing = stamp
+
+    def ordered(self):
+        """Segments oldest first"""
+        self.refresh()
+        return list(self.segments.values())
+
+    def append(self, record):
+        """Append to the newest segment, starting a new one when it is full"""
+        segments = self.ordered()
+        tail = segments[-1] if segments else None
+        if tail is None or tail.full:
+            name = f"{record['ts']}.seg"
+            tail = self.segments[name] = Segment(self.directory / name, self.columns, self.capacity)
+            self.listing = None
+        elif tail.count and record['ts'] < tail.span[1]:
+            # Columns stay sorted for bisect; a record a few ms behind (another process) is moved up
+            record = dict(record, ts=tail.span[1])
+        tail.append(record)
+
+    def last_ts(self):
+        """Timestamp of the newest record, or None"""
+        for segment in reversed(self.ordered()):
+            if segment.count:
+                return segment.span[1]
+        return None
+
+    def scan(self, start, end):
+        """Column lists for every record with start <= ts < end, oldest first"""
+        for segment in self.ordered():
+            count = segment.count
+            if not count:
+                continue
+            first, last = segment.span
+            if last < start or first >= end:
+                continue
+            lo, hi = segment.window(start, end)
+            if lo < hi:
+                yield segment.read(lo, hi)
+
+    def enforce_retention(self, now):
+        """Drop whole segments past the retention period, then the oldest beyond the size cap"""
+        segments = self.ordered()
+        doomed = []
+        for segment in segments[:-1]:
+            if self.retention is not None and segment.count and segment.span[1] < now - self.retention:
+                doomed.append(segment)
+        kept = len(segments) - len(doomed)
+        for segment in segments[:-1]:
+            if kept <= self.max_segments:
+                break
+            if segment not in doomed:
+                doomed.append(segment)
+                kept -= 1
+        for segment in doomed:
+            name = segment.path.name
+            segment.close()
+            del self.segments[name]
+            try:
+                os.remove(segment.path)
+            except OSError:
+                pass
+        if doomed:
+            self.listing = None
+        return len(doomed)
+
+class TimeSeriesStore:
+    """Raw samples for a day, 1-minute rollups for a month, hourly rollups for as long as the cap allows"""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.tiers = [Tier(self.directory, *spec) for spec in TIERS]
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.lock_file = open(self.directory / '.lock', 'a+b')
+        self.targets_file = self.directory / 'targets.json'
+        self.target_ids = {}
+        self.target_names = {}
+        self.next_rollup = 0
+
+    @contextmanager
+    def locked(self):
+        """Thread lock plus an advisory file lock where the platform has one"""
+        with self.lock:
+            # append() holds the lock while it calls rollup(); only the outermost level touches the file lock
+            self.depth += 1
+            if fcntl and self.depth == 1:
+                fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if fcntl and self.depth == 0:
+                    fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def load_targets(self):
+        """Target names by id, shared by every process using the store"""
+        try:
+            with open(self.targets_file, 'r', encoding='utf-8') as f:
+                self.target_ids = json.load(f)
+        except (OSError, ValueError):
+            self.target_ids = {}
+        self.target_names = {i: name for name, i in self.target_ids.items()}
+
+    def target_id(self, name):
+        """Id for a target name, registering it on first use (caller holds the lock)"""
+        if name not in self.target_ids:
+            self.load_targets()
+        if name not in self.target_ids:
+            self.target_ids[name] = max(self.target_ids.values(), default=0) + 1
+            self.target_names[self.target_ids[name]] = name
+            tmp = self.targets_file.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.target_ids, f)
+            os.replace(tmp, self.targets_file)
+        return self.target_ids[name]
+
+    def append(self, target, latency_ms, status, ts=None):
+        """Record one sample: latency in ms (None when there was no answer) and a status code (0 = unreachable)"""
+        ts = now_ms() if ts is None else int(ts)
+        with self.locked():
+            self.tiers[0].append({'ts': ts, 'target': self.target_id(target),
+                                  'latency': math.nan if latency_ms is None else latency_ms, 'status': status or 0})
+            if ts >= self.next_rollup:
+                self.rollup(ts)
+
+    def extend(self, samples):
+        """Record many (target, latency_ms, status, ts) samples under one lock"""
+        with self.locked():
+            for target, latency_ms, status, ts in samples:
+                self.append(target, latency_ms, status, ts)
+
+    def rollup(self, now=None):
+        """Fold completed minutes into the 1m tier and completed hours into the 1h tier, then apply retention"""
+        now = now_ms() if now is None else now
+        with self.locked():
+            added = 0
+            for source, target in zip(self.tiers, self.tiers[1:]):
+                last = target.last_ts()
+                start = last + target.bucket if last is not None else 0
+                end = now - now % target.bucket
+                if start < end:
+                    added += self.fold(source, target, start, end)
+            dropped = sum(tier.enforce_retention(now) for tier in self.tiers)
+            self.next_rollup = now - now % 60000 + 60000
+            return {'rolled_up': added, 'segments_dropped': dropped}
+
+    def fold(self, source, target, start, end):
+        """Aggregate source records in [start, end) into target buckets"""
+        buckets = {}
+        for chunk in source.scan(start, end):
+            if source.bucket == 0:
+                rows = zip(chunk['ts'], chunk['target'], chunk['latency'], chunk['status'])
+                for ts, tid, latency, status in rows:
+                    key = (ts - ts % target.bucket, tid)
+                    b = buckets.get(key)
+                    if b is None:
+                        b = buckets[key] = [0, 0, 0, 0.0, math.inf, -math.inf]
+                    b[0] += 1
+                    if is_error(status):
+                        b[1] += 1
+                    if latency == latency:
+                        b[2] += 1
+                        b[3] += latency
+                        if latency < b[4]:
+                            b[4] = latency
+                        if latency > b[5]:
+                            b[5] = latency
+            else:
+                rows = zip(chunk['ts'], chunk['target'], chunk['count'], chunk['errors'], chunk['measured'],
+                           chunk['sum'], chunk['min'], chunk['max'])
+                for ts, tid, count, errors, measured, total, low, high in rows:
+                    key = (ts - ts % target.bucket, tid)
+                    b = buckets.get(key)
+                    if b is None:
+                        b = buckets[key] = [0, 0, 0, 0.0, math.inf, -math.inf]
+                    b[0] += count
+                    b[1] += errors
+                    if measured:
+                        b[2] += measured
+                        b[3] += total
+                        b[4] = min(b[4], low)
+                        b[5] = max(b[5], high)
+        for (ts, tid), (count, errors, measured, total, low, high) in sorted(buckets.items()):
+            target.append({'ts': ts, 'target': tid, 'count': count, 'errors': errors, 'measured': measured,
+                           'sum': total, 'min': low if measured else math.nan, 'max': high if measured else math.nan})
+        return len(buckets)
+
+    def query(self, start=None, end=None, targets=None, points=DEFAULT_POINTS):
+        """Per-target buckets [t, avg, min, max, count, errors] over [start, end) in epoch ms
+
+        The coarsest tier no wider than the bucket size covers the range; finer tiers fill in
+        the tail that has not been rolled up yet.
+        """
+        end = now_ms() if end is None else end
+        start = end - 86400 * 1000 if start is None else start
+        width = max(1000, (end - start) // points)
+        with self.locked():
+            self.load_targets()
+            wanted = None if targets is None else {self.target_ids[t] for t in targets if t in self.target_ids}
+            usable = [i for i, tier in enumerate(self.tiers) if tier.bucket <= width]
+            chosen = max(usable)
+            # Raw samples only go back a day and minutes a month; older ranges fall through to coarser tiers
+            while chosen < len(self.tiers) - 1 and self.tiers[chosen].retention is not None \
+                    and start < end - self.tiers[chosen].retention:
+                chosen += 1
+
+            buckets = {}
+            cursor = start
+            for index in range(chosen, -1, -1):
+                tier = self.tiers[index]
+                if index > 0:
+                    last = tier.last_ts()
+                    stop = min(end, last + tier.bucket) if last is not None else cursor
+                else:
+                    stop = end
+                if stop <= cursor:
+                    continue
+                for chunk in tier.scan(cursor, stop):
+                    self.accumulate(buckets, chunk, tier.bucket == 0, width, wanted)
+                cursor = stop
+
+        series = {}
+        for (tid, ts), (count, errors, measured, total, low, high) in sorted(buckets.items()):
+            name = self.target_names.get(tid, f"#{tid}")
+            series.setdefault(name, []).append([
+                ts, round(total / measured, 2) if measured else None,
+                round(low, 2) if measured else None, round(high, 2) if measured else None, count, errors])
+        return {'start': start, 'end': end, 'bucket_ms': width, 'resolution': self.tiers[chosen].name,
+                'series': series}
+
+    @staticmethod
+    def accumulate(buckets, chunk, raw, width, wanted):
+        """Add a chunk of raw or aggregated records into query buckets"""
+        if raw:
+            rows = zip(chunk['ts'], chunk['target'], chunk['latency'], chunk['status'])
+            for ts, tid, latency, status in rows:
+                if wanted is not None and tid not in wanted:
+                    continue
+                key = (tid, ts - ts % width)
+                b = buckets.get(key)
+                if b is None:
+                    b = buckets[key] = [0, 0, 0, 0.0, math.inf, -math.inf]
+                b[0] += 1
+                b[1] += is_error(status)
+                if latency == latency:
+                    b[2] += 1
+                    b[3] += latency
+                    b[4] = min(b[4], latency)
+                    b[5] = max(b[5], latency)
+            return
+        rows = zip(chunk['ts'], chunk['target'], chunk['count'], chunk['errors'], chunk['measured'],
+                   chunk['sum'], chunk['min'], chunk['max'])
+        for ts, tid, count, errors, measured, total, low, high in rows:
+            if wanted is not None and tid not in wanted:
+                continue
+            key = (tid, ts - ts % width)
+            b = buckets.get(key)
+            if b is None:
+                b = buckets[key] = [0, 0, 0, 0.0, math.inf, -math.inf]
+            b[0] += count
+            b[1] += errors
+            if measured:
+                b[2] += measured
+                b[3] += total
+                b[4] = min(b[4], low)
+                b[5] = max(b[5], high)
+
+    def latest(self):
+        """Newest raw sample per target"""
+        with self.locked():
+            self.load_targets()
+            found = {}
+            for segment in reversed(self.tiers[0].ordered()):
+                count = segment.count
+                if not count:
+                    continue
+                chunk = segment.read(max(0, count - 4096), count)
+                for ts, tid, latency, status in zip(chunk['ts'], chunk['target'], chunk['latency'], chunk['status']):
+                    found[tid] = (ts, None if latency != latency else round(latency, 2), status)
+                if len(found) == len(self.target_ids):
+                    break
+            return {self.target_names.get(tid, f"#{tid}"): {'ts': ts, 'latency': latency, 'status': status}
+                    for tid, (ts, latency, status) in found.items()}
+
+    def disk_usage(self):
+        """Segments and bytes per tier"""
+        with self.locked():
+            return {tier.name: {'segments': len(tier.ordered()),
+                                'bytes': sum(s.path.stat().st_size for s in tier.ordered())}
+                    for tier in self.tiers}
+
+    def close(self):
+        """Unmap every segment"""
+        with self.locked():
+            for tier in self.tiers:
+                for segment in tier.segments.values():
+                    segment.close()
+                tier.segments = {}
+                tier.listing = None
+        self.lock_file.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """The process-wide store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TimeSeriesStore()
+        return _store
+
+def record(target, latency_ms, status, ts=None):
+    """Append a sample; history is best effort, so a full disk never breaks a dashboard"""
+    try:
+        get_store().append(target, latency_ms, status, ts)
+    except (OSError, ValueError) as e:
+        print(f"timeseries: could not record {target}: {e}", file=sys.stderr)
+
+_pending = deque()
+_flusher = None
+_flusher_lock = threading.Lock()
+_flush_lock = threading.Lock()
+
+def record_later(target, latency_ms, status):
+    """Queue a sample for the background writer: no lock or I/O, so it is cheap enough for a request path"""
+    _pending.append((target, latency_ms, status, now_ms()))
+    if _flusher is None:
+        start_flusher()
+
+def start_flusher():
+    """Start the thread that writes queued samples every FLUSH_INTERVAL seconds"""
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=flush_loop, name='timeseries-flush', daemon=True)
+            _flusher.start()
+            atexit.register(flush)
+
+def flush_loop():
+    """Body of the writer thread"""
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+def flush():
+    """Write every queued sample in one batch; returns how many were written"""
+    # One flush at a time, so batches reach the store in the order they were queued
+    with _flush_lock:
+        samples = []
+        while _pending:
+            samples.append(_pending.popleft())
+        if not samples:
+            return 0
+        try:
+            get_store().extend(samples)
+        except (OSError, ValueError) as e:
+            print(f"timeseries: could not record {len(samples)} samples: {e}", file=sys.stderr)
+        return len(samples)
+
+def history(range_name='24h', targets=None, points=DEFAULT_POINTS):
+    """Chart data for one of RANGES, plus the latest sample per target"""
+    flush()
+    seconds = RANGES.get(range_name, RANGES['24h'])
+    end = now_ms()
+    store = get_store()
+    started = time.perf_counter()
+    result = store.query(end - seconds * 1000, end, targets, points)
+    result.update(range=range_name if range_name in RANGES else '24h', ranges=list(RANGES),
+                  latest=store.latest(), disk=store.disk_usage(),
+                  elapsed_ms=round((time.perf_counter() - started) * 1000, 2))
+    return result
+
+def sample_projects():
+    """Probe every registered project once and record the results"""
+    from project_registry import load_projects, probe_supabase
+    from gembooth_dashboard import read_env_file
+
+    def probe(project):
+        env = read_env_file(project['env_file'])
+        if not (project['probe'] and env.get('VITE_SUPABASE_URL')):
+            return None
+        status = probe_supabase(env['VITE_SUPABASE_URL'], env.get('VITE_SUPABASE_ANON_KEY'))
+        record(f"probe:{project['name']}", status['ms'], status['code'] or 0)
+        return project['name'], status
+
+    projects = load_projects()
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(projects)))) as pool:
+        return [r for r in pool.map(probe, projects) if r]
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import Colors
+    from code_metrics import sparkline
+
+    args = sys.argv[1:]
+    if '--sample' in args:
+        interval = float(args[args.index('--sample') + 1]) if len(args) > args.index('--sample') + 1 \
+            else SAMPLE_INTERVAL
+        print(f"Probing every {interval:.0f}s into {STORE_DIR} (Ctrl+C to stop)")
+        try:
+            while True:
+                for name, status in sample_projects():
+                    print(f"  {name}: {status['status']} {status['ms'] or '-'} ms")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            return
+
+    range_name = args[args.index('--range') + 1] if '--range' in args else '24h'
+    data = history(range_name, points=60)
+    print(f"{Colors.BOLD}Latency over {data['range']}{Colors.ENDC} ({data['resolution']} data, "
+          f"{data['bucket_ms'] / 1000:.0f}s buckets, queried in {data['elapsed_ms']:.1f} ms)")
+    if not data['series']:
+        print("  No samples yet - run with --sample, or open the Projects page of a dashboard")
+    for target, points in sorted(data['series'].items()):
+        averages = [p[1] for p in points if p[1] is not None]
+        errors = sum(p[5] for p in points)
+        samples = sum(p[4] for p in points)
+        last = data['latest'].get(target, {})
+        print(f"  {target:<28} {sparkline(averages):<60} last {last.get('latency') or '-'} ms, "
+              f"{errors}/{samples} errors")
+    disk = data['disk']
+    print("  Store: " + ', '.join(f"{name} {d['segments']} segments / {d['bytes'] / 1024:.0f} KB"
+                                   for name, d in disk.items()))
+
+if __name__ == '__main__':
+    main()
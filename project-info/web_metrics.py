@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Web Metrics
+Request timings, sizes and section cache counters in Prometheus text format
+"""
+
+import threading
+from bisect import bisect_left
+
+# Upper bounds (seconds) tuned for a local dashboard: sub-millisecond cache hits up to multi-second scans
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def format_labels(names, values):
+    """Render {name="value",...} with Prometheus escaping"""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+def format_value(value):
+    """Integers without a decimal point, floats in full precision"""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        """Add to the count for one label set"""
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def set(self, *label_values, value):
+        """Replace the value for one label set (for counts kept elsewhere)"""
+        with self.lock:
+            self.values[label_values] = value
+
+    def samples(self):
+        """(suffix, labels, value) tuples"""
+        with self.lock:
+            return [('', format_labels(self.labels, key), value) for key, value in sorted(self.values.items())]
+
+class Gauge(Counter):
+    """Value that goes up and down"""
+
+    kind = 'gauge'
+
+class Histogram:
+    """Bucketed observations per label set; buckets are stored non-cumulative and summed on render"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """Record one observation"""
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        """(suffix, labels, value) tuples for every bucket, sum and count"""
+        with self.lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in sorted(self.series.items())]
+        out = []
+        for key, counts, total in snapshot:
+            running = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                running += count
+                out.append(('_bucket', format_labels(self.labels + ('le',), key + (bound,)), running))
+            labels = format_labels(self.labels, key)
+            out.append(('_sum', labels, total))
+            out.append(('_count', labels, running))
+        return out
+
+class Registry:
+    """Named metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        """Add a metric and return it"""
+        self.metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        """Call func() before each render, e.g. to copy counters kept elsewhere into gauges"""
+        self.collectors.append(func)
+        return func
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        for func in self.collectors:
+            func()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{metric.name}{suffix}{labels} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+class WebMetrics:
+    """The web dashboard's request and section cache metrics"""
+
+    def __init__(self):
+        self.registry = Registry()
+        self.requests = self.registry.register(Counter(
+            'gembooth_http_requests_total', 'Requests by route, method and status.', ('route', 'method', 'status')))
+        self.latency = self.registry.register(Histogram(
+            'gembooth_http_request_duration_seconds', 'Time from request start to response headers.',
+            ('route', 'method')))
+        self.sizes = self.registry.register(Histogram(
+            'gembooth_http_response_size_bytes', 'Response body size (streamed bodies are not counted).',
+            ('route',), SIZE_BUCKETS))
+        self.in_flight = self.registry.register(Gauge(
+            'gembooth_http_requests_in_flight', 'Requests currently being handled.'))
+        self.section_lookups = self.registry.register(Histogram(
+            'gembooth_section_lookup_seconds', 'Section cache lookups, including any wait for a computation.',
+            ('section', 'outcome')))
+        self.section_compute = self.registry.register(Histogram(
+            'gembooth_section_compute_seconds', 'Section computations, foreground and background.', ('section',)))
+        self.section_events = self.registry.register(Counter(
+            'gembooth_section_cache_events_total', 'Section cache hits, stale serves, misses, coalesced waits, '
+            'refreshes, errors and evictions since start.', ('section', 'event')))
+        self.section_bytes = self.registry.register(Gauge(
+            'gembooth_section_cache_bytes', 'Bytes held by the section cache.'))
+        self.active = 0
+        self.active_lock = threading.Lock()
+        self.registry.collector(lambda: self.in_flight.set(value=self.active))
+
+    def request_started(self):
+        """Count a request as in flight"""
+        with self.active_lock:
+            self.active += 1
+
+    def request_finished(self, route, method, status, size, seconds):
+        """Record one response"""
+        self.requests.inc(route, method, status)
+        self.latency.observe(seconds, route, method)
+        if size is not None:
+            self.sizes.observe(size, route)
+
+    def request_closed(self):
+        """Stop counting a request as in flight (also after errors)"""
+        with self.active_lock:
+            self.active -= 1
+
+    def watch_section_cache(self, cache):
+        """Copy a SectionCache's counters into gauges on every scrape"""
+        def collect():
+            summary = cache.summary()
+            self.section_bytes.set(value=summary['bytes'])
+            for section in summary['sections']:
+                for event in ('hits', 'stale', 'misses', 'coalesced', 'refreshes', 'errors', 'evictions'):
+                    self.section_events.set(section['section'], event, value=section[event])
+        self.registry.collector(collect)
+
+    def render(self):
+        """Every metric in Prometheus text format"""
+        return self.registry.render()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+GemBooth Dashboard - Stripe Webhook Replayer
+Signs realistic or recorded Stripe events and stress-tests a webhook endpoint
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from local_supabase import Database, PostgrestError, StandinHandler, StandinServer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+API_VERSION = '2024-11-20.acacia'
+WEBHOOK_PATH = '/functions/v1/stripe-webhook'
+SELF_TEST_SECRET = 'whsec_local_self_test'
+SIGNATURE_TOLERANCE = 300
+
+DEFAULT_CONCURRENCY = [1, 4, 16]
+DEFAULT_BURSTS = [20, 100]
+DEFAULT_RETRY_RATIO = 0.1
+REQUEST_TIMEOUT = 30
+
+# One subscriber's life, in the order Stripe emits it
+LIFECYCLE = [
+    'checkout.session.completed',
+    'customer.subscription.created',
+    'invoice.payment_succeeded',
+    'payment_intent.succeeded',
+    'customer.subscription.updated',
+    'invoice.payment_failed',
+    'customer.subscription.deleted'
+]
+
+# Subscription fields the webhook writes deterministically (periods use the wall clock)
+STATE_FIELDS = ('tier_id', 'status', 'stripe_subscription_id', 'cancel_at_period_end')
+
+def sign_payload(payload, secret, timestamp=None):
+    """Build a Stripe-Signature header for a raw payload"""
+    timestamp = int(timestamp or time.time())
+    signed = f"{timestamp}.".encode('utf-8') + payload
+    digest = hmac.new(secret.encode('utf-8'), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+def verify_signature(payload, header, secret, tolerance=SIGNATURE_TOLERANCE):
+    """Check a Stripe-Signature header the way stripe.webhooks.constructEvent does"""
+    parts = {}
+    for item in (header or '').split(','):
+        key, _, value = item.partition('=')
+        parts.setdefault(key.strip(), []).append(value.strip())
+    try:
+        timestamp = int(parts['t'][0])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = sign_payload(payload, secret, timestamp).split('v1=', 1)[1]
+    return any(hmac.compare_digest(expected, candidate) for candidate in parts.get('v1', []))
+
+def make_event(event_type, data, created):
+    """Wrap a data object in a Stripe event envelope"""
+    return {
+        'id': f"evt_{uuid.uuid4().hex[:24]}",
+        'object': 'event',
+        'api_version': API_VERSION,
+        'created': created,
+        'type': event_type,
+        'livemode': False,
+        'pending_webhooks': 1,
+        'request': {'id': f"req_{uuid.uuid4().hex[:14]}", 'idempotency_key': str(uuid.uuid4())},
+        'data': {'object': data}
+    }
+
+def lifecycle_events(user_id, customer_id, start, tier_id='pro'):
+    """Events for one subscriber from checkout to cancellation"""
+    subscription_id = f"sub_{uuid.uuid4().hex[:24]}"
+    period_start, period_end = start, start + 30 * 86400
+    metadata = {'user_id': user_id, 'tier_id': tier_id}
+    subscription = {
+        'id': subscription_id,
+        'object': 'subscription',
+        'customer': customer_id,
+        'status': 'active',
+        'current_period_start': period_start,
+        'current_period_end': period_end,
+        'cancel_at_period_end': False,
+        'metadata': metadata
+    }
+    invoice = {
+        'object': 'invoice',
+        'customer': customer_id,
+        'subscription': subscription_id,
+        'amount_paid': 999,
+        'currency': 'usd',
+        'description': 'Subscription creation'
+    }
+
+    objects = {
+        'checkout.session.completed': {
+            'id': f"cs_test_{uuid.uuid4().hex[:24]}",
+            'object': 'checkout.session',
+            'mode': 'subscription',
+            'customer': customer_id,
+            'subscription': subscription_id,
+            'payment_status': 'paid',
+            'metadata': metadata
+        },
+        'customer.subscription.created': subscription,
+        'invoice.payment_succeeded': {**invoice, 'id': f"in_{uuid.uuid4().hex[:24]}", 'status': 'paid'},
+        'payment_intent.succeeded': {
+            'id': f"pi_{uuid.uuid4().hex[:24]}",
+            'object': 'payment_intent',
+            'amount': 999,
+            'currency': 'usd',
+            'customer': customer_id,
+            'status': 'succeeded'
+        },
+        'customer.subscription.updated': {**subscription, 'cancel_at_period_end': True},
+        'invoice.payment_failed': {**invoice, 'id': f"in_{uuid.uuid4().hex[:24]}", 'status': 'open',
+                                   'amount_paid': 0},
+        'customer.subscription.deleted': {**subscription, 'status': 'canceled', 'cancel_at_period_end': True}
+    }
+    return [make_event(event_type, objects[event_type], start + i) for i, event_type in enumerate(LIFECYCLE)]
+
+def generate_events(count, users, start=None):
+    """`count` events spread over (user_id, customer_id) pairs, in emission order"""
+    start = int(start or time.time()) - 3600
+    events = []
+    for n, (user_id, customer_id) in enumerate(users):
+        events.extend(lifecycle_events(user_id, customer_id, start + n * len(LIFECYCLE)))
+        if len(events) >= count:
+            break
+    return sorted(events[:count], key=lambda e: e['created'])
+
+def load_events(path):
+    """Load recorded events: a JSON list, a Stripe list response, or JSON lines"""
+    text = Path(path).read_text(encoding='utf-8')
+    try:
+        data = json.loads(text)
+        events = data.get('data', []) if isinstance(data, dict) else data
+    except ValueError:
+        events = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return sorted(events, key=lambda e: e.get('created', 0))
+
+def with_retries(events, ratio, rng):
+    """Append late redeliveries of earlier events, like Stripe's retry schedule"""
+    retries = [rng.choice(events) for _ in range(int(len(events) * ratio))]
+    return events + retries
+
+# ---------------------------------------------------------------- webhook logic
+
+def apply_event(db, event):
+    """Mirror supabase/functions/stripe-webhook/index.ts; return rows changed"""
+    obj = event['data']['object']
+    metadata = obj.get('metadata') or {}
+    subscriptions = db.table('subscriptions')
+    now = time.time()
+
+    def update_user(user_id, changes):
+        changed = 0
+        for row_id in list(subscriptions.indexes['user_id'].get(user_id, ())):
+            before = {f: subscriptions.rows[row_id].get(f) for f in STATE_FIELDS}
+            row = subscriptions.update(row_id, changes)
+            changed += before != {f: row.get(f) for f in STATE_FIELDS}
+        return changed
+
+    def user_for_customer(customer_id):
+        ids = subscriptions.indexes['stripe_customer_id'].get(customer_id, set())
+        return subscriptions.rows[next(iter(ids))]['user_id'] if len(ids) == 1 else None
+
+    def iso(seconds):
+        return time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(seconds))
+
+    kind = event['type']
+    if kind == 'checkout.session.completed':
+        if metadata.get('user_id') and metadata.get('tier_id') and obj.get('subscription'):
+            return update_user(metadata['user_id'], {
+                'tier_id': metadata['tier_id'],
+                'stripe_subscription_id': obj['subscription'],
+                'status': 'active',
+                'current_period_start': iso(now),
+                'current_period_end': iso(now + 30 * 86400)
+            })
+    elif kind == 'customer.subscription.created':
+        if metadata.get('user_id') and metadata.get('tier_id'):
+            return update_user(metadata['user_id'], {
+                'tier_id': metadata['tier_id'],
+                'stripe_subscription_id': obj['id'],
+                'status': obj['status'],
+                'current_period_start': iso(obj['current_period_start']),
+                'current_period_end': iso(obj['current_period_end'])
+            })
+    elif kind == 'customer.subscription.updated':
+        if metadata.get('user_id'):
+            return update_user(metadata['user_id'], {
+                'status': obj['status'],
+                'current_period_start': iso(obj['current_period_start']),
+                'current_period_end': iso(obj['current_period_end']),
+                'cancel_at_period_end': obj['cancel_at_period_end']
+            })
+    elif kind == 'customer.subscription.deleted':
+        if metadata.get('user_id'):
+            return update_user(metadata['user_id'], {
+                'tier_id': 'free', 'status': 'canceled', 'stripe_subscription_id': None
+            })
+    elif kind == 'invoice.payment_succeeded':
+        user_id = user_for_customer(obj.get('customer')) if obj.get('subscription') else None
+        if user_id:
+            try:
+                db.table('payments').insert({
+                    'user_id': user_id,
+                    'stripe_payment_id': obj['id'],
+                    'amount': obj['amount_paid'] / 100,
+                    'currency': obj['currency'],
+                    'status': 'succeeded',
+                    'description': obj.get('description') or 'Subscription payment'
+                })
+                return 1
+            except PostgrestError:
+                # The edge function ignores the insert error; the unique key absorbs the retry
+                return 0
+    elif kind == 'invoice.payment_failed':
+        user_id = user_for_customer(obj.get('customer'))
+        if user_id:
+            return update_user(user_id, {'status': 'past_due'})
+    return 0
+
+def seed_users(db, users):
+    """Create subscribers for [(user_id, customer_id)] pairs"""
+    subscriptions = db.table('subscriptions')
+    for user_id, customer_id in users:
+        db.create_user(user_id)
+        for row_id in list(subscriptions.indexes['user_id'][user_id]):
+            subscriptions.update(row_id, {'stripe_customer_id': customer_id})
+
+def subscription_state(db, user_ids):
+    """{user_id: (tier_id, status, ...)} for comparing final states"""
+    subscriptions = db.table('subscriptions')
+    return {
+        user_id: tuple(subscriptions.rows[row_id].get(f) for f in STATE_FIELDS)
+        for user_id in user_ids
+        for row_id in subscriptions.indexes['user_id'].get(user_id, ())
+    }
+
+# ---------------------------------------------------------------- receiver
+
+class ReceiverHandler(StandinHandler):
+    """Local webhook receiver: verifies signatures and applies events to the stand-in database"""
+
+    secret = SELF_TEST_SECRET
+    stats = None
+
+    def do_POST(self):
+        """Handle webhook deliveries; everything else is the PostgREST stand-in"""
+        if not self.path.startswith(WEBHOOK_PATH):
+            return self.handle_request()
+
+        payload = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not verify_signature(payload, self.headers.get('Stripe-Signature'), self.secret):
+            with self.db.lock:
+                self.stats['bad_signatures'] += 1
+            return self.send_json(400, {'error': 'No signatures found matching the expected signature for payload'})
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return self.send_json(400, {'error': 'Invalid payload'})
+
+        with self.db.lock:
+            changed = apply_event(self.db, event)
+            seen = self.stats['seen']
+            self.stats['deliveries'] += 1
+            if event['id'] in seen:
+                self.stats['duplicates'] += 1
+                self.stats['duplicate_side_effects'] += bool(changed)
+            else:
+                # Only first attempts count as reordering; late retries are duplicates, counted above
+                customer = (event.get('data') or {}).get('object', {}).get('customer')
+                created = event.get('created') or 0
+                newest = self.stats['newest']
+                self.stats['out_of_order'] += created < newest.get(customer, created)
+                newest[customer] = max(created, newest.get(customer, created))
+            seen.add(event['id'])
+        self.send_json(200, {'received': True})
+
+    def do_GET(self):
+        """Expose delivery statistics at /__stats"""
+        if self.path == '/__stats':
+            with self.db.lock:
+                stats = {k: v for k, v in self.stats.items() if k not in ('seen', 'newest')}
+            return self.send_json(200, stats)
+        return self.handle_request()
+
+def start_receiver(db, secret=SELF_TEST_SECRET, port=0):
+    """Start a local receiver on a daemon thread; returns (server, webhook_url)"""
+    stats = {'deliveries': 0, 'duplicates': 0, 'duplicate_side_effects': 0, 'bad_signatures': 0, 'out_of_order': 0,
+             'seen': set(), 'newest': {}}
+    handler = type('Handler', (ReceiverHandler,), {'db': db, 'secret': secret, 'stats': stats})
+    server = StandinServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}{WEBHOOK_PATH}"
+
+# ---------------------------------------------------------------- replay
+
+def deliver(url, event, secret):
+    """POST one signed event; return (status, latency_seconds)"""
+    payload = json.dumps(event, separators=(',', ':')).encode('utf-8')
+    request = urllib.request.Request(url, data=payload, method='POST', headers={
+        'Content-Type': 'application/json; charset=utf-8',
+        'Stripe-Signature': sign_payload(payload, secret),
+        'User-Agent': 'Stripe/1.0 (+https://stripe.com/docs/webhooks)'
+    })
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - started
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def replay(url, events, secret, concurrency=1):
+    """Fire events at a URL with a fixed number of workers and summarize"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda e: deliver(url, e, secret), events))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        'sent': len(events),
+        'ok': sum(count for status, count in statuses.items() if 200 <= status < 300),
+        'statuses': statuses,
+        'throughput': round(len(events) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None
+    }
+
+def self_test_cell(burst, concurrency, retry_ratio, rng, secret=SELF_TEST_SECRET):
+    """One sweep cell against a fresh local receiver, with state checks"""
+    user_count = -(-burst // len(LIFECYCLE))
+    users = [(str(uuid.uuid4()), f"cus_{uuid.uuid4().hex[:14]}") for _ in range(user_count)]
+    events = generate_events(burst, users)
+    db = Database.from_migrations()
+    seed_users(db, users)
+
+    # Expected final state: every event once, in emission order
+    baseline_db = Database.from_migrations()
+    seed_users(baseline_db, users)
+    for event in events:
+        apply_event(baseline_db, event)
+
+    server, url = start_receiver(db, secret)
+    try:
+        result = replay(url, with_retries(events, retry_ratio, rng), secret, concurrency)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    user_ids = [u for u, _ in users]
+    expected = subscription_state(baseline_db, user_ids)
+    actual = subscription_state(db, user_ids)
+    stats = {k: v for k, v in server.RequestHandlerClass.stats.items() if k not in ('seen', 'newest')}
+    result.update({
+        'burst': burst,
+        'concurrency': concurrency,
+        'users': user_count,
+        'retries': int(len(events) * retry_ratio),
+        'out_of_order': stats['out_of_order'],
+        'idempotency_failures': stats['duplicate_side_effects'],
+        'state_mismatches': sum(1 for u in user_ids if expected.get(u) != actual.get(u)),
+        'bad_signatures': stats['bad_signatures']
+    })
+    return result
+
+def sweep(url=None, secret=None, events=None, concurrency_levels=DEFAULT_CONCURRENCY,
+          bursts=DEFAULT_BURSTS, retry_ratio=DEFAULT_RETRY_RATIO, seed=0):
+    """Run every (burst, concurrency) cell; without a URL, self-test against the local receiver"""
+    rng = random.Random(seed)
+    cells = []
+    for burst in bursts:
+        for concurrency in concurrency_levels:
+            if url is None:
+                cells.append(self_test_cell(burst, concurrency, retry_ratio, rng))
+                continue
+            batch = (events or generate_events(burst, [(f"user_{i}", f"cus_{i}")
+                                                       for i in range(-(-burst // len(LIFECYCLE)))]))[:burst]
+            result = replay(url, with_retries(batch, retry_ratio, rng), secret, concurrency)
+            result.update({'burst': burst, 'concurrency': concurrency, 'out_of_order': None,
+                           'idempotency_failures': None, 'state_mismatches': None})
+            cells.append(result)
+    return cells
+
+def parse_levels(args, flag, default):
+    """Comma-separated integers after a flag"""
+    return [int(v) for v in args[args.index(flag) + 1].split(',')] if flag in args else default
+
+def main():
+    """Command line entry point"""
+    from gembooth_dashboard import Colors, print_section, read_env_file
+
+    args = sys.argv[1:]
+    url = args[args.index('--url') + 1] if '--url' in args else None
+    events = load_events(args[args.index('--events') + 1]) if '--events' in args else None
+    secret = read_env_file(PROJECT_ROOT / '.env.local').get('STRIPE_WEBHOOK_SECRET')
+    if url and not secret:
+        print(f"{Colors.RED}STRIPE_WEBHOOK_SECRET is not set in .env.local{Colors.ENDC}")
+        sys.exit(1)
+
+    cells = sweep(url=url, secret=secret, events=events,
+                  concurrency_levels=parse_levels(args, '--concurrency', DEFAULT_CONCURRENCY),
+                  bursts=parse_levels(args, '--bursts', DEFAULT_BURSTS),
+                  retry_ratio=float(args[args.index('--retries') + 1]) if '--retries' in args else DEFAULT_RETRY_RATIO)
+
+    print_section(f"Webhook Replay - {url or 'local receiver self-test'}")
+    print(f"  {'burst':>6} {'conc':>5} {'ok':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'order':>6} {'idem':>5} {'state':>6}")
+    for cell in cells:
+        failed = (cell['ok'] < cell['sent'] or cell['out_of_order'] or cell['idempotency_failures']
+                  or cell['state_mismatches'])
+        color = Colors.RED if failed else Colors.GREEN
+        print(f"  {cell['burst']:>6} {cell['concurrency']:>5} {color}{cell['ok']:>4}/{cell['sent']:<4}{Colors.ENDC} "
+              f"{cell['throughput']:>8} {cell['p50_ms']:>8} {cell['p95_ms']:>8} {cell['p99_ms']:>8} "
+              f"{'-' if cell['out_of_order'] is None else cell['out_of_order']:>6} "
+              f"{'-' if cell['idempotency_failures'] is None else cell['idempotency_failures']:>5} "
+              f"{'-' if cell['state_mismatches'] is None else cell['state_mismatches']:>6}")
+    print(f"\n  {Colors.CYAN}order{Colors.ENDC}: first deliveries that arrived after a later event for the same customer")
+    print(f"  {Colors.CYAN}idem{Colors.ENDC}: redelivered events that changed state again")
+    print(f"  {Colors.CYAN}state{Colors.ENDC}: subscribers whose final state differs from in-order delivery")
+
+if __name__ == '__main__':
+    main()
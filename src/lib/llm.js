@@ -16,7 +16,10 @@ if (!apiKey) {
   console.error('GEMINI_API_KEY not found. Please add VITE_GEMINI_API_KEY to your environment variables.')
 }
 
-const ai = new GoogleGenAI({apiKey})
+// Optional local caching proxy for development (project-info/gemini_proxy.py)
+const baseUrl = import.meta.env.VITE_GEMINI_BASE_URL
+
+const ai = new GoogleGenAI({apiKey, ...(baseUrl ? {httpOptions: {baseUrl}} : {})})
 
 export default limitFunction(
   async ({model, prompt, inputFile, signal}) => {
@@ -19,9 +19,10 @@ serve(async (req) => {
     const supabase = createClient(supabaseUrl, supabaseKey)
     
     const geminiApiKey = Deno.env.get('GEMINI_API_KEY')
+    const geminiBaseUrl = Deno.env.get('GEMINI_BASE_URL') ?? 'https://generativelanguage.googleapis.com'
     
     const response = await fetch(
-      `https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image-preview:generateContent?key=${geminiApiKey}`,
+      `${geminiBaseUrl}/v1beta/models/gemini-2.5-flash-image-preview:generateContent?key=${geminiApiKey}`,
       {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },